@@ -0,0 +1,7 @@
+#!/bin/bash
+
+newline=$'\n'
+timestamp=$(date)
+output=$(curl DEPLOY_URL/tba/process-messages/)
+
+echo "$timestamp" "$output" "$newline" >> DEPLOY_PATH/logs/log-process-tba-messages.txt
@@ -0,0 +1,7 @@
+#!/bin/bash
+
+newline=$'\n'
+timestamp=$(date)
+output=$(curl DEPLOY_URL/form/run-question-backfills/)
+
+echo "$timestamp" "$output" "$newline" >> DEPLOY_PATH/logs/log-run-question-backfills.txt
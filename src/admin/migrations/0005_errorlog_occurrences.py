@@ -0,0 +1,18 @@
+# Generated by Django 5.2.15 on 2026-10-18 06:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin', '0004_errorlog_error_message'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='errorlog',
+            name='occurrences',
+            field=models.IntegerField(default=1),
+        ),
+    ]
@@ -11,6 +11,8 @@ class ErrorLog(models.Model):
     traceback = models.CharField(max_length=4000, blank=True, null=True)
     error_message = models.CharField(max_length=4000, blank=True, null=True)
     time = models.DateTimeField()
+    # Identical errors logged close together share one row
+    occurrences = models.IntegerField(default=1)
     void_ind = models.CharField(max_length=1, default="n")
 
     def __str__(self):
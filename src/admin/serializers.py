@@ -17,5 +17,6 @@ class ErrorLogSerializer(serializers.Serializer):
     error_message = serializers.CharField()
     traceback = serializers.CharField()
     time = serializers.DateTimeField()
+    occurrences = serializers.IntegerField()
 
     user = UserSerializer(required=False)
\ No newline at end of file
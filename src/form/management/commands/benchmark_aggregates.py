@@ -0,0 +1,202 @@
+import random
+import time
+from datetime import time as dt_time
+from types import SimpleNamespace
+
+from django.core.management.base import BaseCommand
+
+import form.util
+
+
+class _BenchmarkQuestion(dict):
+    """
+    Parsed question dict that also allows attribute access, aggregate_answers
+    reads the value multiplier as an attribute.
+    """
+
+    def __getattr__(self, key):
+        try:
+            return self[key]
+        except KeyError as e:
+            raise AttributeError(key) from e
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the columnar aggregation engine against aggregate_answers on a "
+        "synthetic in memory event, no database access is needed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--responses", type=int, default=1000)
+        parser.add_argument("--repeat", type=int, default=3)
+        parser.add_argument("--seed", type=int, default=3492)
+
+    def handle(self, *args, **options):
+        rnd = random.Random(options["seed"])
+        responses, questions, answer_matrix = self.build_event(
+            rnd, options["responses"]
+        )
+
+        self.stdout.write(
+            f"{len(responses)} responses, {len(questions)} questions, "
+            f"best of {options['repeat']}"
+        )
+        self.stdout.write(
+            f"{'aggregate':<12}{'direction':<12}{'current s':>12}{'engine s':>12}"
+            f"{'speedup':>10}  result"
+        )
+
+        plain = [q for q in questions if q["question_typ"]["question_typ"] == "number"]
+        flow = [q for q in questions if q["question_typ"]["question_typ"] != "number"]
+
+        cases = [
+            ("sum", questions, ["horizontal", "vertical"]),
+            ("avg", questions, ["horizontal", "vertical"]),
+            ("median", questions, ["horizontal", "vertical"]),
+            # the stdev of a single response's stdev is undefined
+            ("stdev", questions, ["vertical"]),
+            ("difference", plain, ["horizontal", "vertical"]),
+            ("logical", flow, ["horizontal", "vertical"]),
+        ]
+
+        for aggregate_typ, aggregate_questions, directions in cases:
+            question_aggregate = self.build_question_aggregate(
+                aggregate_typ, aggregate_questions
+            )
+
+            for direction in directions:
+                if direction == "horizontal":
+                    current = lambda: {
+                        response.id: form.util.aggregate_answers(
+                            question_aggregate,
+                            form.util.get_responses_question_answers(
+                                [response], aggregate_questions, answer_matrix
+                            ),
+                        )
+                        for response in responses
+                    }
+                    engine = lambda: form.util.aggregate_answers_by_response(
+                        question_aggregate,
+                        responses,
+                        aggregate_questions,
+                        answer_matrix,
+                    )
+                else:
+                    current = lambda: form.util.aggregate_answers(
+                        question_aggregate,
+                        form.util.get_responses_question_answers(
+                            responses, aggregate_questions, answer_matrix
+                        ),
+                    )
+                    engine = lambda: form.util.aggregate_answers_vertically(
+                        question_aggregate,
+                        responses,
+                        aggregate_questions,
+                        answer_matrix,
+                    )
+
+                current_time, current_result = self.time(current, options["repeat"])
+                engine_time, engine_result = self.time(engine, options["repeat"])
+
+                self.stdout.write(
+                    f"{aggregate_typ:<12}{direction:<12}{current_time:>12.4f}"
+                    f"{engine_time:>12.4f}{current_time / engine_time:>9.1f}x  "
+                    f"{'same' if current_result == engine_result else 'DIFFERENT'}"
+                )
+
+    def time(self, fn, repeat):
+        best = None
+        result = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = fn()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+
+        return best, result
+
+    def build_event(self, rnd, response_count):
+        number = {"question_typ": "number"}
+        button = SimpleNamespace(question_typ="mnt-psh-btn")
+
+        questions = []
+        for i in range(6):
+            questions.append(
+                _BenchmarkQuestion(
+                    id=i + 1,
+                    active="y",
+                    value_multiplier=str(rnd.randint(1, 5)) if i % 2 == 0 else None,
+                    question_typ=number,
+                )
+            )
+        for i in range(6, 10):
+            questions.append(
+                _BenchmarkQuestion(
+                    id=i + 1,
+                    active="y",
+                    value_multiplier="2" if i % 2 == 0 else None,
+                    question_typ={"question_typ": "mnt-psh-btn"},
+                )
+            )
+
+        flow_question_models = {
+            q["id"]: SimpleNamespace(
+                id=q["id"], question_typ=button, value_multiplier=q["value_multiplier"]
+            )
+            for q in questions[6:]
+        }
+
+        responses = [SimpleNamespace(id=i + 1) for i in range(response_count)]
+
+        answer_matrix = {}
+        for response in responses:
+            row = {}
+            for question in questions[:6]:
+                row[question["id"]] = {
+                    "answered": True,
+                    "value": str(rnd.randint(0, 20)),
+                    "flow_answers": [],
+                }
+            for question in questions[6:]:
+                row[question["id"]] = {
+                    "answered": False,
+                    "value": None,
+                    "flow_answers": [
+                        SimpleNamespace(
+                            question_id=question["id"],
+                            question=flow_question_models[question["id"]],
+                            value="1",
+                            value_time=dt_time(0, j // 60, j % 60),
+                        )
+                        for j in range(rnd.randint(0, 8))
+                    ],
+                }
+            answer_matrix[response.id] = row
+
+        return responses, questions, answer_matrix
+
+    def build_question_aggregate(self, aggregate_typ, questions):
+        return {
+            "id": 1,
+            "name": aggregate_typ,
+            "horizontal": True,
+            "use_answer_time": False,
+            "question_aggregate_typ": SimpleNamespace(
+                question_aggregate_typ=aggregate_typ
+            ),
+            "aggregate_questions": [
+                {
+                    "id": i,
+                    "question": question,
+                    "question_condition_typ": SimpleNamespace(
+                        question_condition_typ="gt-equal"
+                    ),
+                    "condition_value": "2",
+                    "order": i,
+                    "active": "y",
+                }
+                for i, question in enumerate(questions)
+            ],
+            "active": "y",
+        }
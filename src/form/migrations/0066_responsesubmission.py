@@ -0,0 +1,30 @@
+# Generated by Django 5.2.15 on 2026-10-18 05:52
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('form', '0065_flow_form_based'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResponseSubmission',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('idempotency_key', models.CharField(max_length=255)),
+                ('time', models.DateTimeField(default=django.utils.timezone.now)),
+                ('response', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='form.response')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('user', 'idempotency_key')},
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.15 on 2026-10-18 05:54
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('form', '0066_responsesubmission'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuestionBackfill',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('status', models.CharField(default='q', max_length=1)),
+                ('total', models.IntegerField(default=0)),
+                ('processed', models.IntegerField(default=0)),
+                ('error_message', models.TextField(blank=True, null=True)),
+                ('time', models.DateTimeField(default=django.utils.timezone.now)),
+                ('completed_time', models.DateTimeField(null=True)),
+                ('void_ind', models.CharField(default='n', max_length=1)),
+                ('question', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='form.question')),
+            ],
+        ),
+    ]
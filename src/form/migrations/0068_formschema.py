@@ -0,0 +1,22 @@
+# Generated by Django 5.2.15 on 2026-10-18 05:59
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('form', '0067_questionbackfill'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FormSchema',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('version', models.IntegerField(default=0)),
+                ('time', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+    ]
@@ -216,6 +216,46 @@ class FlowAnswer(models.Model):
         return f"{self.id} : {self.value}"
 
 
+class ResponseSubmission(models.Model):
+    id = models.AutoField(primary_key=True)
+    user = models.ForeignKey(User, models.PROTECT)
+    idempotency_key = models.CharField(max_length=255)
+    response = models.ForeignKey(Response, models.PROTECT)
+    time = models.DateTimeField(default=django.utils.timezone.now)
+
+    class Meta:
+        unique_together = ("user", "idempotency_key")
+
+    def __str__(self):
+        return f"{self.id} : {self.idempotency_key} : {self.response}"
+
+
+class QuestionBackfill(models.Model):
+    id = models.AutoField(primary_key=True)
+    question = models.ForeignKey(Question, models.PROTECT)
+    # q queued, r running, c complete, e error
+    status = models.CharField(max_length=1, default="q")
+    total = models.IntegerField(default=0)
+    processed = models.IntegerField(default=0)
+    error_message = models.TextField(blank=True, null=True)
+    time = models.DateTimeField(default=django.utils.timezone.now)
+    completed_time = models.DateTimeField(null=True)
+    void_ind = models.CharField(max_length=1, default="n")
+
+    def __str__(self):
+        return f"{self.id} : {self.question} : {self.status} : {self.processed}/{self.total}"
+
+
+class FormSchema(models.Model):
+    id = models.AutoField(primary_key=True)
+    # Bumped on every form edit so each process can tell its caches are stale
+    version = models.IntegerField(default=0)
+    time = models.DateTimeField(default=django.utils.timezone.now)
+
+    def __str__(self):
+        return f"{self.id} : {self.version}"
+
+
 class GraphQuestionType(models.Model):
     graph_question_typ = models.CharField(primary_key=True, max_length=10)
     graph_question_nm = models.CharField(max_length=255)
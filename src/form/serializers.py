@@ -92,6 +92,13 @@ class ResponseSerializer(serializers.Serializer):
     archive_ind = serializers.CharField()
 
 
+class ResponsesPageSerializer(serializers.Serializer):
+    count = serializers.IntegerField()
+    previous = serializers.IntegerField(allow_null=True)
+    next = serializers.IntegerField(allow_null=True)
+    responses = ResponseSerializer(many=True)
+
+
 class QuestionAggregateTypeSerializer(serializers.Serializer):
     question_aggregate_typ = serializers.CharField()
     question_aggregate_nm = serializers.CharField()
@@ -180,6 +187,32 @@ class ScoutFieldFormResponseSerializer(serializers.Serializer):
     response_id = serializers.IntegerField(required=False, allow_null=True)
 
 
+class ScoutFieldFormResponseBatchItemSerializer(ScoutFieldFormResponseSerializer):
+    idempotency_key = serializers.CharField(max_length=255)
+
+
+class ScoutFieldFormResponseBatchSerializer(serializers.Serializer):
+    responses = ScoutFieldFormResponseBatchItemSerializer(many=True)
+
+
+class ResponseBatchResultSerializer(serializers.Serializer):
+    idempotency_key = serializers.CharField()
+    status = serializers.CharField()
+    response_id = serializers.IntegerField(allow_null=True)
+    message = serializers.CharField(allow_null=True)
+
+
+class QuestionBackfillSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    question_id = serializers.IntegerField()
+    status = serializers.CharField()
+    total = serializers.IntegerField()
+    processed = serializers.IntegerField()
+    error_message = serializers.CharField(allow_null=True)
+    time = serializers.DateTimeField()
+    completed_time = serializers.DateTimeField(allow_null=True)
+
+
 class SaveResponseSerializer(serializers.Serializer):
     question_answers = AnswerSerializer(many=True)
     form_typ = serializers.CharField()
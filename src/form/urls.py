@@ -2,6 +2,9 @@ from django.urls import path
 
 from .views import (
     SaveAnswersView,
+    SaveAnswersBatchView,
+    QuestionBackfillView,
+    RunQuestionBackfillsView,
     FormEditorView,
     ResponseView,
     ResponsesView,
@@ -15,7 +18,10 @@ app_name = "form"
 
 urlpatterns = [
     path("question/", QuestionView.as_view(), name="question"),
+    path("question-backfill/", QuestionBackfillView.as_view(), name="question-backfill"),
+    path("run-question-backfills/", RunQuestionBackfillsView.as_view(), name="run-question-backfills"),
     path("save-answers/", SaveAnswersView.as_view(), name="save-answers"),
+    path("save-answers-batch/", SaveAnswersBatchView.as_view(), name="save-answers-batch"),
     path("form-editor/", FormEditorView.as_view(), name="form-editor"),
     path("response/", ResponseView.as_view(), name="response"),
     path("responses/", ResponsesView.as_view(), name="responses"),
@@ -1,17 +1,23 @@
 from typing import Any
 from statistics import median, stdev
-import copy
+from bisect import bisect_left
+from functools import lru_cache
+from collections import ChainMap
+import time
 
 from datetime import datetime, date, timedelta
 
 from django.conf import settings
-from django.db import transaction
-from django.db.models import Q, Exists, OuterRef
+from django.core.paginator import Paginator, PageNotAnInteger, EmptyPage
+from django.db import IntegrityError, transaction
+from django.db.models import Q, Exists, OuterRef, F
 from django.db.models.functions import Lower
+from django.utils import timezone
 
 from json import loads
 
 import form.models
+import scouting.field.util
 import scouting.models
 import scouting.util
 from form.models import (
@@ -38,12 +44,231 @@ from form.models import (
     GraphCategoryAttribute,
     GraphQuestionType,
     QuestionAggregateQuestion,
+    ResponseSubmission,
+    QuestionBackfill,
+    FormSchema,
 )
 from scouting.models import Match, FieldResponse, PitResponse, Event
 from general.send_message import send_email
 from general.security import ret_message
 
 
+# Process level question catalog, keyed by (season id, form type). Every entry is
+# stamped with the catalog version it was built from, saving a question, flow or
+# condition bumps the version so stale entries are rebuilt on their next lookup.
+_question_catalog: dict[tuple[int | None, str], dict[str, Any]] = {}
+_question_catalog_version = 0
+
+# The last form schema version read from the database and when it was read
+_form_schema: dict[str, Any] = {"version": None, "checked": None}
+form_schema_check_seconds = 5
+
+# Responses per page, and per answer query when loading every response
+responses_page_size = 50
+
+# Backfills up to this many responses run while saving the question, larger
+# ones are left queued for run_question_backfills
+question_backfill_chunk_size = 1000
+
+
+def invalidate_question_catalog():
+    """
+    Drop every cached question catalog, forcing the next lookup to rebuild.
+    """
+    global _question_catalog_version
+    _question_catalog_version += 1
+    _question_catalog.clear()
+    _form_schema["version"] = None
+    _form_schema["checked"] = None
+
+
+def question_catalog_changed():
+    """
+    Invalidate the question catalog now and again once the current transaction
+    commits, so a catalog rebuilt from uncommitted data is not kept. The shared
+    form schema version is bumped so other processes drop their caches too.
+    """
+    updated = FormSchema.objects.filter(id=1).update(
+        version=F("version") + 1, time=timezone.now()
+    )
+    if updated == 0:
+        FormSchema(id=1, version=1).save()
+
+    invalidate_question_catalog()
+    transaction.on_commit(invalidate_question_catalog)
+
+
+def get_form_schema_version() -> int:
+    """
+    Get the form schema version, re-reading it from the database at most every
+    form_schema_check_seconds. Local caches are dropped when another process
+    bumped it.
+
+    Returns:
+        The form schema version
+    """
+    if (
+        _form_schema["checked"] is None
+        or time.monotonic() - _form_schema["checked"] > form_schema_check_seconds
+    ):
+        version = (
+            FormSchema.objects.filter(id=1).values_list("version", flat=True).first()
+            or 0
+        )
+        if _form_schema["version"] is not None and version != _form_schema["version"]:
+            invalidate_question_catalog()
+
+        _form_schema["version"] = version
+        _form_schema["checked"] = time.monotonic()
+
+    return _form_schema["version"]
+
+
+def get_question_queryset():
+    """
+    Base queryset for parsing questions, with every relation parse_question reads
+    loaded up front so parsing does not touch the database per question.
+
+    Returns:
+        QuerySet of non void Question objects annotated with in_flow
+    """
+    return (
+        Question.objects.select_related("question_typ", "form_typ", "form_sub_typ")
+        .prefetch_related(
+            "questionoption_set",
+            "scout_question",
+            "condition_question_from__question_to",
+            "condition_question_to__question_condition_typ",
+            "flowquestion_set",
+        )
+        .annotate(
+            in_flow=Exists(
+                FlowQuestion.objects.filter(
+                    Q(question_id=OuterRef("pk")) & Q(active="y") & Q(void_ind="n")
+                )
+            )
+        )
+        .filter(void_ind="n")
+    )
+
+
+def parse_question_catalog_entry(in_question: Question) -> dict[str, Any]:
+    """
+    Parse a question along with the flags get_questions filters on.
+
+    Args:
+        in_question: Question object from get_question_queryset
+
+    Returns:
+        Dictionary holding the parsed question and its filter flags
+    """
+    conditions_to = in_question.condition_question_to.all()
+
+    return {
+        "question": parse_question(in_question),
+        "form_sub_typ_id": in_question.form_sub_typ_id,
+        "in_flow": in_question.in_flow,
+        "is_conditional": any(
+            qc.void_ind == "n" and qc.active == "y" for qc in conditions_to
+        ),
+        "is_not_conditional": len(conditions_to) == 0
+        or any(qc.active == "n" or qc.void_ind == "y" for qc in conditions_to),
+    }
+
+
+def build_question_catalog(form_typ: str, season_id: int | None) -> dict[str, Any]:
+    """
+    Parse every non void question of a form type, scoped to a season for field
+    and pit forms, into an ordered catalog.
+
+    Args:
+        form_typ: The form type to build the catalog for
+        season_id: Season to scope field and pit questions to
+
+    Returns:
+        Dictionary with the catalog version, the ordered question entries and an
+        index of those entries by question id
+    """
+    version = _question_catalog_version
+
+    q_season = Q()
+    if season_id is not None:
+        scout_questions = scouting.models.Question.objects.filter(
+            Q(void_ind="n") & Q(season_id=season_id)
+        )
+        q_season = Q(id__in=set(sq.question_id for sq in scout_questions))
+
+    qs = (
+        get_question_queryset()
+        .filter(Q(form_typ_id=form_typ) & q_season)
+        .order_by("form_sub_typ__order", "order", Lower("question"))
+    )
+
+    entries = [parse_question_catalog_entry(q) for q in qs]
+
+    return {
+        "version": version,
+        "entries": tuple(entries),
+        "by_id": {entry["question"]["id"]: entry for entry in entries},
+    }
+
+
+def get_question_catalog(form_typ: str, season_id: int | None = None) -> dict[str, Any]:
+    """
+    Get the cached question catalog for a form type, building it if it is
+    missing or was invalidated since it was built.
+
+    Args:
+        form_typ: The form type to get the catalog for
+        season_id: Season field and pit questions are scoped to
+
+    Returns:
+        The question catalog, see build_question_catalog
+    """
+    get_form_schema_version()
+
+    key = (season_id, form_typ)
+    catalog = _question_catalog.get(key)
+
+    if catalog is None or catalog["version"] != _question_catalog_version:
+        catalog = build_question_catalog(form_typ, season_id)
+        _question_catalog[key] = catalog
+
+    return catalog
+
+
+def get_catalog_question(question: Question) -> dict[str, Any]:
+    """
+    Get the parsed form of a question from the catalog, parsing it directly when
+    it is not part of a current catalog (voided or from another season).
+
+    Args:
+        question: The Question object to look up
+
+    Returns:
+        Dictionary containing parsed question data
+    """
+    season_id = None
+    if question.form_typ_id in ["field", "pit"]:
+        season_id = (
+            scouting.models.Season.objects.filter(current="y")
+            .values_list("id", flat=True)
+            .first()
+        )
+
+        if season_id is None:
+            return parse_question(question)
+
+    entry = get_question_catalog(question.form_typ_id, season_id)["by_id"].get(
+        question.id
+    )
+
+    if entry is None:
+        return parse_question(question)
+
+    return dict(entry["question"])
+
+
 def get_questions(
     form_typ: str | None = None,
     active: str = "",
@@ -56,6 +281,9 @@ def get_questions(
     """
     Get questions filtered by various criteria.
 
+    When a form type is given the questions come from the cached question
+    catalog, otherwise they are loaded from the database.
+
     Args:
         form_typ: Filter by form type ('field', 'pit', etc.)
         active: Filter by active status ('y' or 'n')
@@ -68,90 +296,47 @@ def get_questions(
     Returns:
         List of dictionaries containing parsed question data
     """
-    questions = []
-    q_season = Q()
-    q_active_ind = Q()
-    q_form_sub_typ_q = Q()
-    q_not_in_flow = Q()
-    q_is_conditional = Q()
-    q_is_not_conditional = Q()
-    q_id = Q()
-    q_form_typ = Q()
+    if form_typ is None:
+        qs = (
+            get_question_queryset()
+            .filter(Q(id=qid) if qid is not None else Q())
+            .order_by("form_sub_typ__order", "order", Lower("question"))
+        )
+        entries = [parse_question_catalog_entry(q) for q in qs]
+    else:
+        season_id = None
+        if form_typ == "field" or form_typ == "pit":
+            season_id = scouting.util.get_current_season().id
 
-    if form_typ is not None:
-        q_form_typ = Q(form_typ_id=form_typ)
+        entries = get_question_catalog(form_typ, season_id)["entries"]
 
-    if form_typ == "field" or form_typ == "pit":
-        current_season = scouting.util.get_current_season()
-        scout_questions = scouting.models.Question.objects.filter(
-            Q(void_ind="n") & Q(season=current_season)
-        )
-        q_season = Q(id__in=set(sq.question.id for sq in scout_questions))
+    questions = []
+    for entry in entries:
+        question = entry["question"]
 
-    if active != "":
-        q_active_ind = Q(active=active)
+        if qid is not None and question["id"] != qid:
+            continue
 
-    if form_sub_typ is None:
-        q_form_sub_typ_q = Q(form_sub_typ_id__isnull=True)
-    elif form_sub_typ != "":
-        q_form_sub_typ_q = Q(form_sub_typ_id=form_sub_typ)
+        if active != "" and question["active"] != active:
+            continue
 
-    if not_in_flow:
-        q_not_in_flow = Q(in_flow=False)
+        if form_sub_typ is None and entry["form_sub_typ_id"] is not None:
+            continue
 
-    if is_conditional:
-        q_is_conditional = Q(
-            Q(condition_question_to__void_ind="n")
-            & Q(condition_question_to__active="y")
-        )
+        if form_sub_typ not in [None, ""] and entry["form_sub_typ_id"] != form_sub_typ:
+            continue
 
-    if is_not_conditional:
-        q_is_not_conditional = Q(
-            Q(condition_question_to__isnull=True)
-            | (
-                Q(condition_question_to__isnull=False)
-                & (
-                    Q(condition_question_to__active="n")
-                    | Q(condition_question_to__void_ind="y")
-                )
-            )
-        )
+        if not_in_flow and entry["in_flow"]:
+            continue
 
-    if qid is not None:
-        q_id = Q(id=qid)
+        if is_conditional and not entry["is_conditional"]:
+            continue
 
-    qs = (
-        Question.objects.prefetch_related(
-            "questionoption_set",
-            "scout_question",
-            "question_typ",
-            "condition_question_from",
-            "condition_question_to",
-            "flowquestion_set",
-        )
-        .annotate(
-            in_flow=Exists(
-                FlowQuestion.objects.filter(
-                    Q(question_id=OuterRef("pk")) & Q(active="y") & Q(void_ind="n")
-                )
-            )
-        )
-        .filter(
-            q_id
-            & q_season
-            & q_form_typ
-            & q_form_sub_typ_q
-            & q_active_ind
-            & q_not_in_flow
-            & q_is_conditional
-            & q_is_not_conditional
-            & Q(void_ind="n")
-        )
-        .order_by("form_sub_typ__order", "order", Lower("question"))
-    )
+        if is_not_conditional and not entry["is_not_conditional"]:
+            continue
 
-    for q in qs:
-        questions.append(parse_question(q))
+        # hand out copies so callers adding keys do not change the catalog
+        questions.append(dict(question))
 
     return questions
 
@@ -160,6 +345,9 @@ def parse_question(in_question: Question) -> dict[str, Any]:
     """
     Parse a Question object into a comprehensive dictionary with all related data.
 
+    Relations are read through .all() and filtered here so querysets built with
+    get_question_queryset are parsed without further queries.
+
     Args:
         in_question: The Question object to parse
 
@@ -174,22 +362,26 @@ def parse_question(in_question: Question) -> dict[str, Any]:
     }
 
     # Scout Question
-    try:
-        sq = in_question.scout_question.get(Q(void_ind="n"))
-
+    sq = next(
+        (sq for sq in in_question.scout_question.all() if sq.void_ind == "n"), None
+    )
+    if sq is not None:
         scout_question = {
             "id": sq.id,
             "question_id": sq.id,
-            "season_id": sq.season.id,
+            "season_id": sq.season_id,
         }
-        season = sq.season.id
-    except scouting.models.Question.DoesNotExist as e:
+        season = sq.season_id
+    else:
         scout_question = None
         season = None
 
     # List of options if applicable
     questionoption_set = []
-    for qo in in_question.questionoption_set.filter(Q(void_ind="n") & Q(active="y")):
+    for qo in in_question.questionoption_set.all():
+        if qo.void_ind != "n" or qo.active != "y":
+            continue
+
         questionoption_set.append(
             {
                 "question_opt_id": qo.question_opt_id,
@@ -200,28 +392,28 @@ def parse_question(in_question: Question) -> dict[str, Any]:
         )
 
     # Flag if question has conditions
-    try:
-        conditional_questions = in_question.condition_question_from.filter(
-            Q(void_ind="n") & Q(active="y") & Q(question_to__active="y")
-        )
-    except QuestionCondition.DoesNotExist:
-        conditional_questions = None
+    conditional_questions = [
+        qc
+        for qc in in_question.condition_question_from.all()
+        if qc.void_ind == "n" and qc.active == "y" and qc.question_to.active == "y"
+    ]
 
     # Flag if question is condition of another
-    try:
-        conditional_on_questions = in_question.condition_question_to.filter(
-            Q(void_ind="n") & Q(active="y")
-        )
-    except QuestionCondition.DoesNotExist:
-        conditional_on_questions = None
+    conditional_on_questions = [
+        qc
+        for qc in in_question.condition_question_to.all()
+        if qc.void_ind == "n" and qc.active == "y"
+    ]
 
-    flow_questions = in_question.flowquestion_set.filter(
-        Q(active="y") & Q(void_ind="n")
-    )
+    flow_questions = [
+        qf
+        for qf in in_question.flowquestion_set.all()
+        if qf.active == "y" and qf.void_ind == "n"
+    ]
 
     return {
         "id": in_question.id,
-        "flow_id_set": set(qf.flow.id for qf in flow_questions),
+        "flow_id_set": set(qf.flow_id for qf in flow_questions),
         "season_id": season,
         "question": in_question.question,
         "table_col_width": in_question.table_col_width,
@@ -245,14 +437,14 @@ def parse_question(in_question: Question) -> dict[str, Any]:
         "scout_question": scout_question,
         "conditional_on_questions": [
             {
-                "conditional_on": qc.question_from.id,
+                "conditional_on": qc.question_from_id,
                 "condition_value": qc.value,
                 "question_condition_typ": qc.question_condition_typ,
             }
             for qc in conditional_on_questions
         ],
         "conditional_question_id_set": set(
-            cq.question_to.id for cq in conditional_questions
+            cq.question_to_id for cq in conditional_questions
         ),
     }
 
@@ -317,40 +509,9 @@ def save_question(data):
 
     if data.get("id", None) is None:
         # If adding a new question we need to make a null answer for it for all questions already answered
-        match data["form_typ"]["form_typ"]:
-            case "pit":
-                pit_responses = PitResponse.objects.filter(
-                    Q(void_ind="n")
-                    & Q(
-                        event__in=Event.objects.filter(
-                            Q(void_ind="n") & Q(season=current_season)
-                        )
-                    )
-                )
-                questions_answered = Response.objects.filter(
-                    Q(void_ind="n")
-                    & Q(id__in=set(pr.response_id for pr in pit_responses))
-                )
-            case "field":
-                field_responses = FieldResponse.objects.filter(
-                    Q(void_ind="n")
-                    & Q(
-                        event__in=Event.objects.filter(
-                            Q(void_ind="n") & Q(season=current_season)
-                        )
-                    )
-                )
-                questions_answered = Response.objects.filter(
-                    Q(void_ind="n")
-                    & Q(id__in=set(fr.response_id for fr in field_responses))
-                )
-            case _:
-                questions_answered = Response.objects.filter(
-                    Q(void_ind="n") & Q(form_typ_id=data["form_typ"])
-                )
+        queue_question_backfill(question)
 
-        for qa in questions_answered:
-            Answer(response=qa, question=question, value="!EXIST", void_ind="n").save()
+    question_catalog_changed()
 
     if (
         data["question_typ"]["is_list"] == "y"
@@ -373,6 +534,171 @@ def save_question(data):
 
         qop.save()
 
+    question_catalog_changed()
+
+    if data["form_typ"]["form_typ"] == "field":
+        # Rollups hold values computed with the old multiplier and active questions
+        scouting.field.util.rebuild_current_field_response_rollups()
+
+
+def get_question_backfill_responses(question: Question):
+    """
+    Get the responses that were collected before a question existed and do not
+    have an answer for it yet.
+
+    Args:
+        question: The question being backfilled
+
+    Returns:
+        Response QuerySet, evaluated by the database as a single subquery
+    """
+    match question.form_typ_id:
+        case "pit" | "field":
+            scout_response = PitResponse if question.form_typ_id == "pit" else FieldResponse
+            q_responses = Q(
+                id__in=scout_response.objects.filter(
+                    Q(void_ind="n")
+                    & Q(event__void_ind="n")
+                    & Q(
+                        event__season_id__in=scouting.models.Question.objects.filter(
+                            question=question
+                        ).values("season_id")
+                    )
+                ).values("response_id")
+            )
+        case _:
+            q_responses = Q(form_typ_id=question.form_typ_id)
+
+    return (
+        Response.objects.filter(Q(void_ind="n") & q_responses)
+        .exclude(
+            Exists(
+                Answer.objects.filter(
+                    Q(response_id=OuterRef("id"))
+                    & Q(question=question)
+                    & Q(void_ind="n")
+                )
+            )
+        )
+        .order_by("id")
+    )
+
+
+def queue_question_backfill(question: Question) -> QuestionBackfill:
+    """
+    Queue the "!EXIST" answers for a new question, small backfills are run
+    straight away.
+
+    Args:
+        question: The question that was added
+
+    Returns:
+        The QuestionBackfill tracking the progress
+    """
+    question_backfill = QuestionBackfill(
+        question=question,
+        total=get_question_backfill_responses(question).count(),
+        void_ind="n",
+    )
+    question_backfill.save()
+
+    if question_backfill.total <= question_backfill_chunk_size:
+        run_question_backfill(question_backfill)
+
+    return question_backfill
+
+
+def run_question_backfill(question_backfill: QuestionBackfill) -> int:
+    """
+    Insert the missing "!EXIST" answers for a queued backfill in chunks,
+    recording the progress after each chunk. Safe to run again after a failure,
+    responses already answered are skipped.
+
+    Args:
+        question_backfill: The backfill to run
+
+    Returns:
+        Number of answers inserted
+    """
+    question_backfill.status = "r"
+    question_backfill.save()
+
+    inserted = 0
+    try:
+        while True:
+            with transaction.atomic():
+                # Lock the job so overlapping runs do not insert the same answers
+                QuestionBackfill.objects.select_for_update().get(
+                    id=question_backfill.id
+                )
+
+                response_ids = list(
+                    get_question_backfill_responses(
+                        question_backfill.question
+                    ).values_list("id", flat=True)[:question_backfill_chunk_size]
+                )
+                Answer.objects.bulk_create(
+                    [
+                        Answer(
+                            response_id=response_id,
+                            question_id=question_backfill.question_id,
+                            value="!EXIST",
+                            void_ind="n",
+                        )
+                        for response_id in response_ids
+                    ]
+                )
+
+                inserted += len(response_ids)
+                question_backfill.processed += len(response_ids)
+                question_backfill.total = max(
+                    question_backfill.total, question_backfill.processed
+                )
+                question_backfill.save()
+
+            if len(response_ids) < question_backfill_chunk_size:
+                break
+
+        question_backfill.status = "c"
+        question_backfill.completed_time = timezone.now()
+    except Exception as e:
+        question_backfill.status = "e"
+        question_backfill.error_message = str(e)
+
+    question_backfill.save()
+    return inserted
+
+
+def run_question_backfills() -> str:
+    """
+    Run every queued question backfill, along with any left running or failed
+    by an earlier run.
+
+    Returns:
+        A message describing what was backfilled
+    """
+    message = ""
+    for question_backfill in QuestionBackfill.objects.select_related(
+        "question"
+    ).filter(Q(status__in=["q", "r", "e"]) & Q(void_ind="n")).order_by("id"):
+        inserted = run_question_backfill(question_backfill)
+        message += f"Question {question_backfill.question_id}: {inserted} answers"
+        if question_backfill.status == "e":
+            message += f" error {question_backfill.error_message}"
+        message += "\n"
+
+    return message if message != "" else "No question backfills queued."
+
+
+def get_question_backfills(question_id=None):
+    q_question = Q()
+    if question_id is not None:
+        q_question = Q(question_id=question_id)
+
+    return QuestionBackfill.objects.filter(q_question & Q(void_ind="n")).order_by(
+        "-time"
+    )
+
 
 def get_question_types():
     qts = QuestionType.objects.filter(void_ind="n").order_by(Lower("question_typ_nm"))
@@ -449,64 +775,354 @@ def save_question_flow_answer(data, answer: Answer):
     return flow_answer
 
 
-def get_response(response_id: int):
-    res = Response.objects.get(Q(id=response_id) & Q(void_ind="n"))
-    questions = get_questions(res.form_typ, "y")
+def validate_answers(answers) -> list[dict[str, Any]]:
+    """
+    Check a set of answers before saving them, in a constant number of queries.
 
-    for question in questions:
-        question["answer"] = get_response_question_answer(res, question["id"])
+    Args:
+        answers: Answer dictionaries as sent by the client
 
-    return questions
+    Returns:
+        List of errors, each with the index of the answer and a message, empty
+        when every answer is valid
+    """
+    question_ids = set()
+    flow_ids = set()
+    for data in answers:
+        if data.get("question", None) is not None:
+            question_ids.add(data["question"].get("id", None))
+        if data.get("flow", None) is not None:
+            flow_ids.add(data["flow"].get("id", None))
+        for flow_answer in data.get("flow_answers", None) or []:
+            question_ids.add(flow_answer.get("question", {}).get("id", None))
+
+    existing_question_ids = set(
+        Question.objects.filter(
+            Q(id__in=question_ids - {None}) & Q(void_ind="n")
+        ).values_list("id", flat=True)
+    )
+    existing_flow_ids = set(
+        Flow.objects.filter(Q(id__in=flow_ids - {None}) & Q(void_ind="n")).values_list(
+            "id", flat=True
+        )
+    )
 
+    errors = []
+    for i, data in enumerate(answers):
+        if data.get("question", None) is None and data.get("flow", None) is None:
+            errors.append({"index": i, "message": "No question or flow"})
+            continue
+
+        if (
+            data.get("question", None) is not None
+            and data["question"].get("id", None) not in existing_question_ids
+        ):
+            errors.append(
+                {
+                    "index": i,
+                    "message": f"Question {data['question'].get('id', None)} does not exist.",
+                }
+            )
 
-def save_response(data):
-    if data.get("response_id", None) is None:
-        response = Response()
-    else:
-        response = Response.objects.get(response_id=data["response_id"])
+        if (
+            data.get("flow", None) is not None
+            and data["flow"].get("id", None) not in existing_flow_ids
+        ):
+            errors.append(
+                {
+                    "index": i,
+                    "message": f"Flow {data['flow'].get('id', None)} does not exist.",
+                }
+            )
 
-    response.form_typ_id = data["form_typ"]
-    response.time = data["time"]
-    response.archive_ind = data["archive_ind"]
+        for flow_answer in data.get("flow_answers", None) or []:
+            flow_question_id = flow_answer.get("question", {}).get("id", None)
+            if flow_question_id not in existing_question_ids:
+                errors.append(
+                    {
+                        "index": i,
+                        "message": f"Flow answer question {flow_question_id} does not exist.",
+                    }
+                )
+            if flow_answer.get("value_time", None) is None:
+                errors.append(
+                    {"index": i, "message": "Flow answer is missing its value time."}
+                )
+
+    return errors
+
+
+def save_answers_bulk(answers, response: Response, new_response=False) -> list[Answer]:
+    """
+    Save a set of answers and their flow answers against a response with bulk
+    inserts. Existing answers to the same question are updated like
+    save_or_update_answer does.
+
+    Args:
+        answers: Answer dictionaries, see validate_answers
+        response: The Response the answers belong to
+        new_response: True if the response was just created and has no answers
+
+    Returns:
+        The saved Answer objects in the order of answers
+    """
+    question_ids = set(
+        data["question"]["id"]
+        for data in answers
+        if data.get("question", None) is not None
+    )
+
+    existing_answers = {}
+    if not new_response and len(question_ids) > 0:
+        for answer in Answer.objects.filter(
+            Q(response=response) & Q(question_id__in=question_ids) & Q(void_ind="n")
+        ).order_by("-id"):
+            existing_answers[answer.question_id] = answer
+
+    new_answers = []
+    updated_answers = {}
+    saved_answers = []
+    for data in answers:
+        if data.get("question", None) is None and data.get("flow", None) is None:
+            raise Exception("No question or flow")
+
+        question_id = (data.get("question", None) or {}).get("id", None)
+
+        if question_id is not None and question_id in existing_answers:
+            answer = existing_answers[question_id]
+            answer.value = data.get("value", "")
+
+            if answer.id is not None:
+                updated_answers[answer.id] = answer
+        else:
+            answer = Answer(
+                question_id=question_id,
+                flow_id=(data.get("flow", None) or {}).get("id", None),
+                value=data.get("value", ""),
+                response=response,
+                void_ind="n",
+            )
+            new_answers.append(answer)
+
+            # flows are not unique, only answers to questions are updated
+            if question_id is not None:
+                existing_answers[question_id] = answer
+
+        saved_answers.append(answer)
+
+    with transaction.atomic():
+        Answer.objects.bulk_create(new_answers)
+        if any(answer.id is None for answer in new_answers):
+            set_created_answer_ids(new_answers, response)
+        Answer.objects.bulk_update(updated_answers.values(), ["value"])
+
+        FlowAnswer.objects.bulk_create(
+            [
+                FlowAnswer(
+                    answer=answer,
+                    question_id=flow_answer["question"]["id"],
+                    value=flow_answer.get("value", ""),
+                    value_time=flow_answer["value_time"],
+                    void_ind="n",
+                )
+                for answer, data in zip(saved_answers, answers)
+                for flow_answer in data.get("flow_answers", None) or []
+            ]
+        )
+
+    return saved_answers
+
+
+def set_created_answer_ids(answers: list[Answer], response: Response):
+    """
+    Set the ids of bulk created answers by reading them back, MySQL does not
+    return the ids of bulk inserted rows.
+
+    Args:
+        answers: The bulk created answers, in the order they were inserted
+        response: The Response the answers belong to
+    """
+    created_ids = {}
+    for answer_id, question_id, flow_id in (
+        Answer.objects.filter(Q(response=response) & Q(void_ind="n"))
+        .order_by("id")
+        .values_list("id", "question_id", "flow_id")
+    ):
+        created_ids.setdefault((question_id, flow_id), []).append(answer_id)
+
+    # the answers just inserted are the newest rows for their question or flow
+    new_counts = {}
+    for answer in answers:
+        key = (answer.question_id, answer.flow_id)
+        new_counts[key] = new_counts.get(key, 0) + 1
+
+    for key, count in new_counts.items():
+        created_ids[key] = created_ids.get(key, [])[-count:]
+
+    for answer in answers:
+        answer.id = created_ids[(answer.question_id, answer.flow_id)].pop(0)
+        answer._state.adding = False
+
+
+def get_response(response_id: int):
+    res = Response.objects.get(Q(id=response_id) & Q(void_ind="n"))
+    questions = get_questions(res.form_typ_id, "y")
+
+    answers = get_responses_answer_values([res.id], questions)
+    for question in questions:
+        question["answer"] = answers.get((res.id, question["id"]), "!FOUND")
+
+    return questions
+
+
+def save_response(data):
+    if data.get("response_id", None) is None:
+        response = Response()
+    else:
+        response = Response.objects.get(response_id=data["response_id"])
+
+    response.form_typ_id = data["form_typ"]
+    response.time = data["time"]
+    response.archive_ind = data["archive_ind"]
 
     response.save()
 
 
 def delete_response(response_id: int):
-    res = Response.objects.get(response_id=response_id)
+    res = Response.objects.get(id=response_id)
 
     res.void_ind = "y"
     res._change_reason = "User deleted"
     res.save()
 
+    for field_response in FieldResponse.objects.select_related("event__season").filter(
+        Q(response=res) & Q(void_ind="n")
+    ):
+        scouting.field.util.update_field_response_rollups(field_response, remove=True)
+        scouting.field.util.record_field_response_change(field_response, "void")
+
     return res
 
 
-def get_responses(form_typ: int, archive_ind: str):
+def get_responses(form_typ: str, archive_ind: str):
     responses = []
-    resps = Response.objects.filter(
+    resps = get_responses_queryset(form_typ, archive_ind)
+    questions = get_questions(form_typ, "y")
+
+    # Stream the responses in chunks, each chunk's answers are one query
+    chunk = []
+    for res in resps.iterator(chunk_size=responses_page_size):
+        chunk.append(res)
+        if len(chunk) == responses_page_size:
+            responses += parse_responses(chunk, questions)
+            chunk = []
+
+    responses += parse_responses(chunk, questions)
+
+    return responses
+
+
+def get_responses_page(form_typ: str, archive_ind: str, pg: int = 1):
+    """
+    Get one page of the responses to a form with their answers.
+
+    Args:
+        form_typ: The form type of the responses
+        archive_ind: y for archived responses, n for the rest
+        pg: Page number
+
+    Returns:
+        Dictionary containing:
+            - count: Total number of pages
+            - previous/next: Page numbers for pagination
+            - responses: Responses on the page, see parse_responses
+    """
+    paginator = Paginator(
+        get_responses_queryset(form_typ, archive_ind), responses_page_size
+    )
+    try:
+        resps = paginator.page(pg)
+    except PageNotAnInteger:
+        resps = paginator.page(1)
+    except EmptyPage:
+        resps = paginator.page(paginator.num_pages)
+
+    return {
+        "count": paginator.num_pages,
+        "previous": resps.previous_page_number() if resps.has_previous() else None,
+        "next": resps.next_page_number() if resps.has_next() else None,
+        "responses": parse_responses(
+            list(resps.object_list), get_questions(form_typ, "y")
+        ),
+    }
+
+
+def get_responses_queryset(form_typ: str, archive_ind: str):
+    return Response.objects.filter(
         Q(form_typ__form_typ=form_typ) & Q(archive_ind=archive_ind) & Q(void_ind="n")
-    ).order_by("-time")
+    ).order_by("-time", "-id")
 
-    questions_copy = get_questions(form_typ, "y")
 
-    for res in resps:
-        questions = copy.deepcopy(questions_copy)
+def parse_responses(responses, questions):
+    """
+    Pair each response with the answers to the questions. The question list is
+    shared, each response gets a ChainMap view adding its answer on top of the
+    question rather than a copy of it.
 
-        for question in questions:
-            question["answer"] = get_response_question_answer(res, question["id"])
+    Args:
+        responses: Response objects
+        questions: Parsed questions of the form
 
-        responses.append(
-            {
-                "id": res.id,
-                "form_typ": res.form_typ.form_typ,
-                "time": res.time,
-                "archive_ind": res.archive_ind,
-                "questionanswer_set": questions,
-            }
+    Returns:
+        List of response dictionaries with a questionanswer_set
+    """
+    answers = get_responses_answer_values([res.id for res in responses], questions)
+
+    return [
+        {
+            "id": res.id,
+            "form_typ": res.form_typ_id,
+            "time": res.time,
+            "archive_ind": res.archive_ind,
+            "questionanswer_set": [
+                ChainMap(
+                    {"answer": answers.get((res.id, question["id"]), "!FOUND")},
+                    question,
+                )
+                for question in questions
+            ],
+        }
+        for res in responses
+    ]
+
+
+def get_responses_answer_values(response_ids, questions):
+    """
+    Load the answer values for a set of responses and questions in one query.
+
+    Args:
+        response_ids: Ids of the responses
+        questions: Parsed questions
+
+    Returns:
+        Dictionary of answer value by (response id, question id)
+    """
+    if len(response_ids) == 0 or len(questions) == 0:
+        return {}
+
+    answers = {}
+    for response_id, question_id, value in (
+        Answer.objects.filter(
+            Q(response_id__in=response_ids)
+            & Q(question_id__in=[question["id"] for question in questions])
+            & Q(void_ind="n")
         )
+        .order_by("id")
+        .values_list("response_id", "question_id", "value")
+    ):
+        answers.setdefault((response_id, question_id), value)
 
-    return responses
+    return answers
 
 
 def get_response_question_answer(response: form.models.Response, question_id: int):
@@ -558,7 +1174,7 @@ def parse_question_aggregate(question_aggregate: QuestionAggregate):
             {
                 "id": question_aggregate_question.id,
                 "question_condition_typ": question_aggregate_question.question_condition_typ,
-                "question": parse_question(question_aggregate_question.question),
+                "question": get_catalog_question(question_aggregate_question.question),
                 "condition_value": question_aggregate_question.condition_value,
                 "order": question_aggregate_question.order,
                 "active": question_aggregate_question.active,
@@ -619,6 +1235,13 @@ def save_question_aggregate(data):
             qaq.active = question_aggregate_question["active"]
             qaq.save()
 
+    question_catalog_changed()
+
+    if qa.questionaggregatequestion_set.filter(
+        Q(question__form_typ_id="field")
+    ).exists():
+        scouting.field.util.rebuild_current_field_response_rollups()
+
     return qa
 
 
@@ -650,8 +1273,8 @@ def get_question_conditions(form_typ: str):
                 "question_condition_id": qc.question_condition_id,
                 "question_condition_typ": qc.question_condition_typ,
                 "value": qc.value,
-                "question_from": parse_question(qc.question_from),
-                "question_to": parse_question(qc.question_to),
+                "question_from": get_catalog_question(qc.question_from),
+                "question_to": get_catalog_question(qc.question_to),
                 "active": qc.active,
             }
         )
@@ -682,6 +1305,8 @@ def save_question_condition(data):
 
     qc.save()
 
+    question_catalog_changed()
+
     return qc
 
 
@@ -689,8 +1314,8 @@ def format_question_condition_values(qc: QuestionCondition):
     return {
         "question_condition_id": qc.question_condition_id,
         "condition": qc.condition,
-        "question_from": parse_question(qc.question_from),
-        "question_to": parse_question(qc.question_to),
+        "question_from": get_catalog_question(qc.question_from),
+        "question_to": get_catalog_question(qc.question_to),
         "active": qc.active,
     }
 
@@ -734,6 +1359,8 @@ def save_flow_condition(data):
 
     qfc.save()
 
+    question_catalog_changed()
+
     return qfc
 
 
@@ -764,7 +1391,7 @@ def format_flow_values(flow: Flow):
             {
                 "id": qf.id,
                 "flow_id": flow.id,
-                "question": parse_question(qf.question),
+                "question": get_catalog_question(qf.question),
                 "press_to_continue": qf.press_to_continue,
                 "order": qf.order,
                 "active": qf.active,
@@ -814,7 +1441,7 @@ def get_response_answers(response: Response):
         answers.append(
             {
                 "question": (
-                    get_questions(qid=question_answer.question.id)[0]
+                    get_catalog_question(question_answer.question)
                     if question_answer.question is not None
                     else None
                 ),
@@ -826,7 +1453,7 @@ def get_response_answers(response: Response):
                 "answer": question_answer.value,
                 "flow_answers": list(
                     {
-                        "question": parse_question(qfa.question),
+                        "question": get_catalog_question(qfa.question),
                         "value": qfa.value,
                         "value_time": qfa.value_time,
                     }
@@ -850,22 +1477,25 @@ def save_field_response(data, user_id):
 
     form_type = FormType.objects.get(form_typ=data["form_typ"])
 
-    response = form.models.Response(form_typ=form_type)
-    response.save()
+    with transaction.atomic():
+        response = form.models.Response(form_typ=form_type)
+        response.save()
 
-    field_response = FieldResponse(
-        event=current_event,
-        team_id=data["team_id"],
-        match=m,
-        user_id=user_id,
-        response=response,
-        void_ind="n",
-    )
-    field_response.save()
+        field_response = FieldResponse(
+            event=current_event,
+            team_id=data["team_id"],
+            match=m,
+            user_id=user_id,
+            response=response,
+            void_ind="n",
+        )
+        field_response.save()
+
+        # Save the answers against the response object
+        save_answers_bulk(data.get("answers", []), response, new_response=True)
 
-    # Save the answers against the response object
-    for answer in data.get("answers", []):
-        save_or_update_answer(answer, response)
+        scouting.field.util.update_field_response_rollups(field_response)
+        scouting.field.util.record_field_response_change(field_response, "insert")
 
     return field_response
 
@@ -874,36 +1504,134 @@ def save_pit_response(data, user_id):
     current_event = scouting.util.get_current_event()
 
     form_type = FormType.objects.get(form_typ=data["form_typ"])
-    # Build or get pit scout object
-    try:
-        sp = PitResponse.objects.get(
-            Q(team_id=data["team_id"]) & Q(void_ind="n") & Q(event=current_event)
-        )
-        response = sp.response
 
-        if response.void_ind == "y":
+    with transaction.atomic():
+        new_response = False
+        # Build or get pit scout object
+        try:
+            sp = PitResponse.objects.select_related("response").get(
+                Q(team_id=data["team_id"]) & Q(void_ind="n") & Q(event=current_event)
+            )
+            response = sp.response
+
+            if response.void_ind == "y":
+                response = form.models.Response(form_typ=form_type)
+                response.save()
+                new_response = True
+                sp.response = response
+                sp.save()
+        except PitResponse.DoesNotExist:
             response = form.models.Response(form_typ=form_type)
             response.save()
-            sp.response = response
+            new_response = True
+
+            sp = PitResponse(
+                event=current_event,
+                team_id=data["team_id"],
+                user_id=user_id,
+                response=response,
+                void_ind="n",
+            )
             sp.save()
-    except PitResponse.DoesNotExist:
-        response = form.models.Response(form_typ=form_type)
-        response.save()
 
-        sp = PitResponse(
-            event=current_event,
-            team_id=data["team_id"],
-            user_id=user_id,
-            response=response,
-            void_ind="n",
+        # Save the answers against the response object
+        save_answers_bulk(data.get("answers", []), response, new_response)
+
+    return sp
+
+
+def save_response_batch(items, user_id) -> list[dict[str, Any]]:
+    """
+    Save a batch of field and pit responses queued by an offline client in one
+    transaction. Each item carries a client generated idempotency key, an item
+    whose key was already saved by the user is reported as a duplicate and not
+    saved again, so replaying a batch never duplicates responses.
+
+    Args:
+        items: Field or pit response dictionaries with an idempotency_key
+        user_id: The user submitting the batch
+
+    Returns:
+        One result per item, in order, with the idempotency key, a status of
+        saved, duplicate or error, the response id and an error message
+    """
+    submissions = {
+        submission.idempotency_key: submission.response_id
+        for submission in ResponseSubmission.objects.filter(
+            Q(user_id=user_id)
+            & Q(idempotency_key__in=[item["idempotency_key"] for item in items])
         )
-        sp.save()
+    }
+
+    results = []
+    with transaction.atomic():
+        for item in items:
+            key = item["idempotency_key"]
+            result = {
+                "idempotency_key": key,
+                "status": "duplicate",
+                "response_id": submissions.get(key, None),
+                "message": None,
+            }
+            results.append(result)
 
-    # Save the answers against the response object
-    for d in data.get("answers", []):
-        save_or_update_answer(d, response)
+            if key in submissions:
+                continue
 
-    return sp
+            errors = validate_answers(item.get("answers", []))
+            if len(errors) > 0:
+                result["status"] = "error"
+                result["message"] = "\n".join(
+                    f"Answer {error['index']}: {error['message']}" for error in errors
+                )
+                continue
+
+            duplicate = False
+            try:
+                # Each item gets a savepoint so one failure does not undo the batch
+                with transaction.atomic():
+                    if item["form_typ"] == "field":
+                        response_id = save_field_response(item, user_id).response_id
+                    elif item["form_typ"] == "pit":
+                        response_id = save_pit_response(item, user_id).response_id
+                    else:
+                        raise Exception(
+                            f"Form type {item['form_typ']} can not be batched."
+                        )
+
+                    try:
+                        ResponseSubmission(
+                            user_id=user_id, idempotency_key=key, response_id=response_id
+                        ).save()
+                    except IntegrityError:
+                        # A concurrent replay of the same item saved it first
+                        duplicate = True
+                        raise
+
+                result["status"] = "saved"
+                result["response_id"] = response_id
+                submissions[key] = response_id
+            except IntegrityError as e:
+                if not duplicate:
+                    result["status"] = "error"
+                    result["message"] = str(e)
+                    continue
+
+                # The other replay's row may not be in this transaction's snapshot,
+                # a locking read sees the committed row
+                submission = (
+                    ResponseSubmission.objects.select_for_update()
+                    .filter(Q(user_id=user_id) & Q(idempotency_key=key))
+                    .first()
+                )
+                if submission is not None:
+                    result["response_id"] = submission.response_id
+                    submissions[key] = submission.response_id
+            except Exception as e:
+                result["status"] = "error"
+                result["message"] = str(e)
+
+    return results
 
 
 def save_answers(data):
@@ -914,8 +1642,9 @@ def save_answers(data):
         response.save()
 
         # Save the answers against the response object
-        for d in data.get("question_answers", []):
-            save_or_update_answer(d, response)
+        save_answers_bulk(
+            data.get("question_answers", []), response, new_response=True
+        )
 
     response.refresh_from_db()
     return response
@@ -998,6 +1727,8 @@ def save_flow(data):
                 flow=flow, season=scouting.util.get_current_season()
             ).save()
 
+    question_catalog_changed()
+
     return flow
 
 
@@ -1030,7 +1761,7 @@ def parse_graph_category_attribute(graph_category_attribute: GraphCategoryAttrib
         "id": graph_category_attribute.id,
         "graph_category_id": graph_category_attribute.graph_category.id,
         "question": (
-            parse_question(graph_category_attribute.question)
+            get_catalog_question(graph_category_attribute.question)
             if graph_category_attribute.question is not None
             else None
         ),
@@ -1050,7 +1781,7 @@ def parse_graph_question(graph_question: GraphQuestion):
         "id": graph_question.id,
         "graph_id": graph_question.graph.id,
         "question": (
-            parse_question(graph_question.question)
+            get_catalog_question(graph_question.question)
             if graph_question.question is not None
             else None
         ),
@@ -1282,108 +2013,218 @@ def save_graph(data, user_id, for_current_season=False):
                 )
 
 
-def graph_responses(graph_id, responses, aggregate_responses=None):
-    graph = get_graphs(graph_id=graph_id)[0]
+def get_graph_question_ids(graph) -> set[int]:
+    """
+    Collect the ids of every question a parsed graph reads answers for.
+
+    Args:
+        graph: Parsed graph dictionary from get_graphs
+
+    Returns:
+        Set of question ids used by the graph questions and category attributes
+    """
+    question_ids = set()
+
+    graph_sources = list(graph["graphquestion_set"])
+    for graph_category in graph["graphcategory_set"]:
+        graph_sources += graph_category["graphcategoryattribute_set"]
+
+    for graph_source in graph_sources:
+        if graph_source.get("question", None) is not None:
+            question_ids.add(graph_source["question"]["id"])
+
+        if graph_source.get("question_aggregate", None) is not None:
+            for question_aggregate_question in graph_source["question_aggregate"][
+                "aggregate_questions"
+            ]:
+                question_ids.add(question_aggregate_question["question"]["id"])
+
+    return question_ids
+
+
+def get_graph_source_values(
+    graph_source, responses, answer_matrix, numeric=True
+) -> list:
+    """
+    Compute the value a graph question or category attribute takes for every
+    response in one pass over the answer matrix.
+
+    A question's value is its answer with the value multiplier applied, or when
+    it was not answered directly the combined value of its flow answers.
+
+    Args:
+        graph_source: Parsed graph question or graph category attribute
+        responses: Response objects to compute values for
+        answer_matrix: Matrix from get_answer_matrix holding the answers
+        numeric: Convert every answer to a number, when False answers to
+            questions that are not numeric are left as entered
+
+    Returns:
+        List of values in the same order as responses, None for a response
+        that has no answer for the question
+    """
+    if graph_source["question"] is None:
+        question_aggregate = graph_source["question_aggregate"]
+        aggregates = aggregate_answers_by_response(
+            question_aggregate,
+            responses,
+            [
+                question_aggregate_question["question"]
+                for question_aggregate_question in question_aggregate[
+                    "aggregate_questions"
+                ]
+            ],
+            answer_matrix,
+        )
+
+        return [aggregates[response.id] for response in responses]
+
+    question = graph_source["question"]
+    numeric = numeric or is_numeric_question(question)
+    multiplier = question.get("value_multiplier", None)
+    multiplier = int(multiplier) if multiplier is not None else 1
+
+    values = []
+    for response in responses:
+        cell = get_answer_matrix_cell(answer_matrix, response.id, question["id"])
+
+        value = None
+        if cell["answered"] and cell["value"] not in [None, "!EXIST"]:
+            value = int(cell["value"]) * multiplier if numeric else cell["value"]
+        else:
+            # flow answers need combined as they span the whole response
+            for flow_answer in cell["flow_answers"]:
+                if flow_answer.value == "!EXISTS":
+                    continue
+
+                if flow_answer.question.question_typ.question_typ == "mnt-psh-btn":
+                    flow_value = 1
+                else:
+                    flow_value = int(flow_answer.value)
+
+                if flow_answer.question.value_multiplier is not None:
+                    flow_value *= int(flow_answer.question.value_multiplier)
+
+                value = flow_value if value is None else value + flow_value
+
+        values.append(value)
+
+    return values
+
+
+def is_numeric_question(question) -> bool:
+    """
+    Check if a question's answers are numbers, either a number question or one
+    with a value multiplier.
+
+    Args:
+        question: Parsed question
+
+    Returns:
+        True if the answers can be converted to numbers
+    """
+    question_typ = question.get("question_typ", None) or {}
+    return (
+        question.get("value_multiplier", None) is not None
+        or question_typ.get("question_typ", None) == "number"
+    )
+
+
+def get_graph_source_label(graph_source):
+    return (
+        graph_source["question"]["question"]
+        if graph_source["question"] is not None
+        else graph_source["question_aggregate"]["name"]
+    )
+
+
+def graph_responses(
+    graph_id, responses, aggregate_responses=None, graph=None, answer_matrix=None
+):
+    """
+    Build the data for a graph from a set of responses.
+
+    The graph definition and every answer it needs are loaded once, then each
+    graph question is reduced to one value per response in a single pass and
+    the series are built from those values.
+
+    Args:
+        graph_id: Id of the Graph to build
+        responses: Response objects to graph
+        aggregate_responses: Responses for the reference point of a res-plot,
+            the graphed responses are used if not supplied
+        graph: Parsed graph from get_graphs, loaded if not supplied
+        answer_matrix: Matrix from get_answer_matrix covering the responses and
+            graph questions, loaded if not supplied
+
+    Returns:
+        Graph data in the shape for the graph type
+    """
+    if graph is None:
+        graph = get_graphs(graph_id=graph_id)[0]
+
+    if answer_matrix is None:
+        answer_matrix = get_answer_matrix(
+            set(response.id for response in responses)
+            | set(response.id for response in (aggregate_responses or [])),
+            get_graph_question_ids(graph),
+        )
 
     data = None
     match graph["graph_typ"].graph_typ:
         case "histogram":
             all_bins = []
 
+            graph_bins = [
+                {"bin": int(gb.bin), "width": int(gb.width)}
+                for gb in graph["graphbin_set"]
+            ]
+
             for graph_question in graph["graphquestion_set"]:
-                question_bins = {
-                    "label": (
-                        graph_question["question"]["question"]
-                        if graph_question["question"] is not None
-                        else graph_question["question_aggregate"]["name"]
-                    ),
-                    "bins": [],
-                }
-                all_bins.append(question_bins)
-
-                for gb in graph["graphbin_set"]:
-                    graph_bin = {"bin": int(gb.bin), "width": int(gb.width), "count": 0}
-                    for response in responses:
-                        if graph_question["question"] is not None:
-                            question = graph_question["question"]
-
-                            try:
-                                answer = Answer.objects.get(
-                                    Q(response=response)
-                                    & Q(void_ind="n")
-                                    & Q(question_id=question["id"])
-                                ).order_by("response__time")
-
-                                value = answer.value
-
-                                if (
-                                    graph_bin["bin"]
-                                    <= value
-                                    < graph_bin["bin"] + graph_bin["width"]
-                                ):
-                                    graph_bin["count"] += 1
-                            except Answer.DoesNotExist:
-                                pass
-
-                            # check flow answers, they need combined as they span the whole match
-                            flow_answers = FlowAnswer.objects.filter(
-                                Q(question_id=question["id"])
-                                & Q(void_ind="n")
-                                & Q(answer__response=response)
-                            ).order_by("value_time")
-                            value = 0
-                            for flow_answer in flow_answers:
-
-                                if (
-                                    flow_answer.question.question_typ.question_typ
-                                    == "mnt-psh-btn"
-                                ):
-                                    value += 1
-                                else:
-                                    value += int(flow_answer.value)
+                # sort the values once, each bin is then counted with two binary searches
+                values = sorted(
+                    value if value is not None else 0
+                    for value in get_graph_source_values(
+                        graph_question, responses, answer_matrix
+                    )
+                )
 
-                            if (
-                                graph_bin["bin"]
-                                <= value
-                                < graph_bin["bin"] + graph_bin["width"]
-                            ):
-                                graph_bin["count"] += 1
-                        # based on a question aggregate
-                        else:
-                            questions = [
-                                question_aggregate_question["question"]
-                                for question_aggregate_question in graph_question[
-                                    "question_aggregate"
-                                ]["aggregate_questions"]
-                            ]
-
-                            for response in responses:
-                                aggregate = aggregate_answers_horizontally(
-                                    graph_question["question_aggregate"],
-                                    response,
-                                    questions,
+                all_bins.append(
+                    {
+                        "label": get_graph_source_label(graph_question),
+                        "bins": [
+                            {
+                                "bin": f"{graph_bin['bin']} - {graph_bin['bin'] + graph_bin['width'] - 1}",
+                                "width": graph_bin["width"],
+                                "count": bisect_left(
+                                    values, graph_bin["bin"] + graph_bin["width"]
                                 )
-
-                                if (
-                                    graph_bin["bin"]
-                                    <= aggregate
-                                    < graph_bin["bin"] + graph_bin["width"]
-                                ):
-                                    graph_bin["count"] += 1
-                    graph_bin["bin"] = (
-                        f"{graph_bin['bin']} - {graph_bin['bin'] + graph_bin['width'] - 1}"
-                    )
-                    question_bins["bins"].append(graph_bin)
+                                - bisect_left(values, graph_bin["bin"]),
+                            }
+                            for graph_bin in graph_bins
+                        ],
+                    }
+                )
             data = all_bins
         case "ctg-hstgrm":
             categories = []
             for graph_category in graph["graphcategory_set"]:
-                """categories.append({
-                    "id": graph_category["id"],
-                    "bin": graph_category["category"],
-                    "graphcategoryattribute_set": graph_category["graphcategoryattribute_set"],
-                    "count": 0
-                })"""
+                # which responses pass each attribute, computed for all responses at once
+                attributes_passed = [
+                    is_question_condition_passed_column(
+                        category_attribute[
+                            "question_condition_typ"
+                        ].question_condition_typ,
+                        get_graph_source_values(
+                            category_attribute, responses, answer_matrix, False
+                        ),
+                        category_attribute["value"],
+                    )
+                    for category_attribute in graph_category[
+                        "graphcategoryattribute_set"
+                    ]
+                ]
+
                 categories.append(
                     {
                         "label": graph_category["category"],
@@ -1391,111 +2232,23 @@ def graph_responses(graph_id, responses, aggregate_responses=None):
                             "graphcategoryattribute_set"
                         ],
                         "bins": [{"bin": "Dataset", "count": 0}],
+                        "passed": [
+                            all(passed[i] for passed in attributes_passed)
+                            for i in range(len(responses))
+                        ],
                     }
                 )
 
-            # go response by response to find which match a catrgory
-            for response in responses:
-                # process categories and see which answers pass it
+            # a response counts toward the first category it passes
+            for i in range(len(responses)):
                 for category in categories:
-                    passed_category = True
-                    for category_attribute in category["graphcategoryattribute_set"]:
-
-                        # category attribute is based on a question
-                        if category_attribute["question"] is not None:
-                            # check regular question answers
-                            answers = Answer.objects.filter(
-                                Q(response=response)
-                                & Q(void_ind="n")
-                                & Q(question_id=category_attribute["question"]["id"])
-                            ).order_by("response__time")
-
-                            for answer in answers:
-                                if answer.question is not None:
-                                    value = answer.value
-
-                                    if answer.question.value_multiplier is not None:
-                                        value = int(value) * int(
-                                            answer.question.value_multiplier
-                                        )
-
-                                    passed_category = (
-                                        passed_category
-                                        and is_question_condition_passed(
-                                            category_attribute[
-                                                "question_condition_typ"
-                                            ].question_condition_typ,
-                                            value,
-                                            category_attribute["value"],
-                                        )
-                                    )
-
-                            # check flow answers, they need combined as they span the whole match
-                            flow_answers = FlowAnswer.objects.filter(
-                                Q(question_id=category_attribute["question"]["id"])
-                                & Q(void_ind="n")
-                                & Q(answer__response=response)
-                            ).order_by("value_time")
-
-                            if len(flow_answers) <= 0:
-                                passed_category = False
-
-                            value = 0
-                            for flow_answer in flow_answers:
-                                if (
-                                    flow_answer.question.question_typ.question_typ
-                                    == "mnt-psh-btn"
-                                ):
-                                    value += 1
-                                else:
-                                    raise Exception("not accounted for yet")
-                                    value = flow_answer.value
-
-                                if flow_answer.question.value_multiplier is not None:
-                                    value *= int(flow_answer.question.value_multiplier)
-
-                            passed_category = (
-                                passed_category
-                                and is_question_condition_passed(
-                                    category_attribute[
-                                        "question_condition_typ"
-                                    ].question_condition_typ,
-                                    value,
-                                    category_attribute["value"],
-                                )
-                            )
-
-                        # category attribute is based on a question aggregate
-                        else:
-                            aggregate = aggregate_answers_horizontally(
-                                category_attribute["question_aggregate"],
-                                response,
-                                [
-                                    question_aggregate_question.question
-                                    for question_aggregate_question in category_attribute[
-                                        "question_aggregate"
-                                    ][
-                                        "aggregate_questions"
-                                    ]
-                                ],
-                            )
-
-                            passed_category = (
-                                passed_category
-                                and is_question_condition_passed(
-                                    category_attribute[
-                                        "question_condition_typ"
-                                    ].question_condition_typ,
-                                    aggregate,
-                                    category_attribute["value"],
-                                )
-                            )
-
-                    # passes attribute, stop processing and move onto next response.
-                    if passed_category:
+                    if category["passed"][i]:
                         category["bins"][0]["count"] += 1
                         break
 
+            for category in categories:
+                del category["passed"]
+
             data = categories
         case "res-plot":
             plot = []
@@ -1514,169 +2267,43 @@ def graph_responses(graph_id, responses, aggregate_responses=None):
                         "aggregate_questions"
                     ]
                 ],
+                answer_matrix,
             )
-            graph_questions = [
-                gq
-                for gq in graph["graphquestion_set"]
-                if gq["graph_question_typ"] is None
-            ]
-
-            for graph_question in graph_questions:
-                plot_entry = {
-                    "label": (
-                        graph_question["question"]["question"]
-                        if graph_question["question"] is not None
-                        else graph_question["question_aggregate"]["name"]
-                    ),
-                    "points": [],
-                }
-                plot.append(plot_entry)
-
-                # go response by response to compute difference
-                for response in responses:
-                    if graph_question["question"] is not None:
-                        question = graph_question["question"]
-                        # check regular question answers
-                        try:
-                            answer = Answer.objects.get(
-                                Q(response=response)
-                                & Q(void_ind="n")
-                                & Q(question_id=question["id"])
-                            ).order_by("response__time")
-
-                            value = int(answer.value)
-
-                            if answer.question.value_multiplier is not None:
-                                value *= int(answer.question.value_multiplier)
-
-                            plot_entry["points"].append(
-                                {"point": value - aggregate, "time": answer.time}
-                            )
-                        except Answer.DoesNotExist:
-                            pass
-
-                        # check flow answers, they need combined as they span the whole match
-                        flow_answers = FlowAnswer.objects.filter(
-                            Q(question_id=question["id"])
-                            & Q(void_ind="n")
-                            & Q(answer__response=response)
-                        ).order_by("value_time")
-
-                        value = 0
-                        time = None
-                        for flow_answer in flow_answers:
-                            time = flow_answer.answer.response.time
 
-                            if (
-                                flow_answer.question.question_typ.question_typ
-                                == "mnt-psh-btn"
-                            ):
-                                value += 1
-                            else:
-                                raise Exception("not accounted for yet")
-                                value = flow_answer.value
-
-                            if flow_answer.question.value_multiplier is not None:
-                                value *= int(flow_answer.question.value_multiplier)
+            for graph_question in graph["graphquestion_set"]:
+                if graph_question["graph_question_typ"] is not None:
+                    continue
 
-                        if len(flow_answers) > 0:
-                            plot_entry["points"].append(
-                                {"point": value - aggregate, "time": time}
-                            )
+                values = get_graph_source_values(
+                    graph_question, responses, answer_matrix
+                )
 
-                    # based on a question aggregate
-                    else:
-                        questions = [
-                            question_aggregate_question.question
-                            for question_aggregate_question in graph_question[
-                                "question_aggregate"
-                            ]["aggregate_questions"]
-                        ]
-                        aggregate_value = aggregate_answers_horizontally(
-                            category_attribute[
-                                "question_aggregate"
-                            ].question_aggregate_typ.question_aggregate_typ,
-                            response,
-                            questions,
-                        )
-                        plot_entry["points"].append(
-                            {
-                                "point": aggregate_value - aggregate,
-                                "time": field_response.time,
-                            }
-                        )
+                plot.append(
+                    {
+                        "label": get_graph_source_label(graph_question),
+                        "points": [
+                            {"point": value - aggregate, "time": response.time}
+                            for response, value in zip(responses, values)
+                            if value is not None
+                        ],
+                    }
+                )
 
             data = plot
         case "diff-plot":
             plot = []
+
             for graph_question in graph["graphquestion_set"]:
-                plot_entry = {
-                    "label": (
-                        graph_question["question"]["question"]
-                        if graph_question["question"] is not None
-                        else graph_question["question_aggregate"]["name"]
-                    ),
-                    "points": [],
-                }
-                plot.append(plot_entry)
+                values = get_graph_source_values(
+                    graph_question, responses, answer_matrix
+                )
 
-                # go response by response to compute difference
+                # difference from the previous response
+                points = []
                 previous = None
-                for response in responses:
-                    if graph_question["question"] is not None:
-                        question = graph_question["question"]
-                        # check regular question answers
-                        try:
-                            answer = Answer.objects.get(
-                                Q(response=response)
-                                & Q(void_ind="n")
-                                & Q(question_id=question["id"])
-                            ).order_by("response__time")
-
-                            value = int(answer.value)
-
-                            if answer.question.value_multiplier is not None:
-                                value *= int(answer.question.value_multiplier)
-
-                        except Answer.DoesNotExist:
-                            pass
-
-                        # check flow answers, they need combined as they span the whole match
-                        flow_answers = FlowAnswer.objects.filter(
-                            Q(question_id=question["id"])
-                            & Q(void_ind="n")
-                            & Q(answer__response=response)
-                        ).order_by("value_time")
-
-                        value = 0
-                        for flow_answer in flow_answers:
-
-                            if (
-                                flow_answer.question.question_typ.question_typ
-                                == "mnt-psh-btn"
-                            ):
-                                value += 1
-                            else:
-                                raise Exception("not accounted for yet")
-                                value = flow_answer.value
-
-                            if flow_answer.question.value_multiplier is not None:
-                                value *= int(flow_answer.question.value_multiplier)
-                    # based on a question aggregate
-                    else:
-                        questions = [
-                            question_aggregate_question["question"]
-                            for question_aggregate_question in graph_question[
-                                "question_aggregate"
-                            ]["aggregate_questions"]
-                        ]
-                        value = aggregate_answers_horizontally(
-                            graph_question["question_aggregate"],
-                            response,
-                            questions,
-                        )
-
-                    plot_entry["points"].append(
+                for response, value in zip(responses, values):
+                    value = value if value is not None else 0
+                    points.append(
                         {
                             "point": value - previous if previous is not None else 0,
                             "time": response.time,
@@ -1684,159 +2311,73 @@ def graph_responses(graph_id, responses, aggregate_responses=None):
                     )
                     previous = value
 
+                plot.append(
+                    {"label": get_graph_source_label(graph_question), "points": points}
+                )
+
             data = plot
         case "box-wskr":
             plot = []
 
             for graph_question in graph["graphquestion_set"]:
-                plot_entry = {
-                    "label": (
-                        graph_question["question"]["question"]
-                        if graph_question["question"] is not None
-                        else graph_question["question_aggregate"]["name"]
-                    ),
-                    "dataset": [],
-                }
-
-                # go response by response to compute difference
-                for response in responses:
-                    if graph_question["question"] is not None:
-                        question = graph_question["question"]
-                        # check regular question answers
-                        try:
-                            answer = Answer.objects.get(
-                                Q(response=response)
-                                & Q(void_ind="n")
-                                & Q(question_id=question["id"])
-                            ).order_by("response__time")
-
-                            value = int(answer.value)
-
-                            if answer.question.value_multiplier is not None:
-                                value *= int(answer.question.value_multiplier)
-
-                        except Answer.DoesNotExist:
-                            pass
-
-                        # check flow answers, they need combined as they span the whole match
-                        flow_answers = FlowAnswer.objects.filter(
-                            Q(question_id=question["id"])
-                            & Q(void_ind="n")
-                            & Q(answer__response=response)
-                        ).order_by("value_time")
-
-                        value = 0
-                        for flow_answer in flow_answers:
-
-                            if (
-                                flow_answer.question.question_typ.question_typ
-                                == "mnt-psh-btn"
-                            ):
-                                value += 1
-                            else:
-                                raise Exception("not accounted for yet")
-                                value = flow_answer.value
-
-                            if flow_answer.question.value_multiplier is not None:
-                                value *= int(flow_answer.question.value_multiplier)
-                    # based on a question aggregate
-                    else:
-                        questions = [
-                            question_aggregate_question.question
-                            for question_aggregate_question in graph_question[
-                                "question_aggregate"
-                            ]["aggregate_questions"]
-                        ]
-                        value = aggregate_answers_horizontally(
-                            graph_question["question_aggregate"], response, questions
-                        )
-
-                    plot_entry["dataset"].append(value)
+                dataset = sorted(
+                    value if value is not None else 0
+                    for value in get_graph_source_values(
+                        graph_question, responses, answer_matrix
+                    )
+                )
 
                 # sort data to build box and whisker plot
-                if len(plot_entry["dataset"]) > 0:
-                    plot_entry["dataset"].sort()
-                    quartiles = compute_quartiles(plot_entry["dataset"])
-                    plot_entry["q1"] = quartiles["Q1"]
-                    plot_entry["q2"] = quartiles["Q2"]
-                    plot_entry["q3"] = quartiles["Q3"]
-                    plot_entry["min"] = plot_entry["dataset"][0]
-                    plot_entry["max"] = plot_entry["dataset"][
-                        len(plot_entry["dataset"]) - 1
-                    ]
-                    plot.append(plot_entry)
+                if len(dataset) > 0:
+                    quartiles = compute_quartiles(dataset)
+                    plot.append(
+                        {
+                            "label": get_graph_source_label(graph_question),
+                            "dataset": dataset,
+                            "q1": quartiles["Q1"],
+                            "q2": quartiles["Q2"],
+                            "q3": quartiles["Q3"],
+                            "min": dataset[0],
+                            "max": dataset[-1],
+                        }
+                    )
 
             data = plot
         case "touch-map":
             maps = []
 
             for graph_question in graph["graphquestion_set"]:
+                if graph_question["question"] is None:
+                    raise Exception("not accounted for yet")
+
+                question = graph_question["question"]
                 map_entry = {
-                    "label": graph_question["question"]["question"],
-                    "question": graph_question["question"],
+                    "label": question["question"],
+                    "question": question,
                     "points": [],
                 }
 
-                # go response by response to compute difference
                 for response in responses:
-                    if graph_question["question"] is not None:
-                        question = graph_question["question"]
-                        # check regular question answers
-                        try:
-                            answer = Answer.objects.get(
-                                Q(response=response)
-                                & Q(void_ind="n")
-                                & Q(question_id=question["id"])
-                            ).order_by("response__time")
-
-                            if (
-                                answer.question.question_typ.question_typ
-                                == "mnt-psh-btn"
-                            ):
-                                map_entry["points"].append(loads(answer.value))
-                            else:
-                                raise Exception("not accounted for yet")
-                                value = answer.value
-
-                        except Answer.DoesNotExist:
-                            pass
-
-                        # check flow answers, they need combined as they span the whole match
-                        flow_answers = FlowAnswer.objects.filter(
-                            Q(question_id=question["id"])
-                            & Q(void_ind="n")
-                            & Q(answer__response=response)
-                        ).order_by("value_time")
-
-                        for flow_answer in flow_answers:
-
-                            if (
-                                flow_answer.question.question_typ.question_typ
-                                == "mnt-psh-btn"
-                            ):
-                                map_entry["points"].append(loads(flow_answer.value))
-                            else:
-                                raise Exception("not accounted for yet")
-                                value = flow_answer.value
-
-                    # based on a question aggregate
-                    else:
-                        questions = [
-                            question_aggregate_question.question
-                            for question_aggregate_question in graph_question[
-                                "question_aggregate"
-                            ]["aggregate_questions"]
-                        ]
-
-                        value = aggregate_answers_horizontally(
-                            category_attribute[
-                                "question_aggregate"
-                            ].question_aggregate_typ.question_aggregate_typ,
-                            response,
-                            questions,
-                        )
+                    cell = get_answer_matrix_cell(
+                        answer_matrix, response.id, question["id"]
+                    )
 
-                        raise Exception("not accounted for yet")
+                    # check regular question answers
+                    if cell["answered"]:
+                        if question["question_typ"]["question_typ"] == "mnt-psh-btn":
+                            map_entry["points"].append(loads(cell["value"]))
+                        else:
+                            raise Exception("not accounted for yet")
+
+                    # check flow answers, they need combined as they span the whole match
+                    for flow_answer in cell["flow_answers"]:
+                        if (
+                            flow_answer.question.question_typ.question_typ
+                            == "mnt-psh-btn"
+                        ):
+                            map_entry["points"].append(loads(flow_answer.value))
+                        else:
+                            raise Exception("not accounted for yet")
 
                 maps.append(map_entry)
 
@@ -1844,78 +2385,22 @@ def graph_responses(graph_id, responses, aggregate_responses=None):
         case "line":
             plot = []
             for graph_question in graph["graphquestion_set"]:
-                plot_entry = {
-                    "label": (
-                        graph_question["question"]["question"]
-                        if graph_question["question"] is not None
-                        else graph_question["question_aggregate"]["name"]
-                    ),
-                    "points": [],
-                }
-                plot.append(plot_entry)
-
-                # go response by response to get points
-                for response in responses:
-                    if graph_question["question"] is not None:
-                        question = graph_question["question"]
-                        # check regular question answers
-                        try:
-                            answer = Answer.objects.get(
-                                Q(response=response)
-                                & Q(void_ind="n")
-                                & Q(question_id=question["id"])
-                            ).order_by("response__time")
-
-                            value = int(answer.value)
-
-                            if answer.question.value_multiplier is not None:
-                                value *= int(answer.question.value_multiplier)
-
-                        except Answer.DoesNotExist:
-                            pass
-
-                        # check flow answers, they need combined as they span the whole match
-                        flow_answers = FlowAnswer.objects.filter(
-                            Q(question_id=question["id"])
-                            & Q(void_ind="n")
-                            & Q(answer__response=response)
-                        ).order_by("value_time")
-
-                        value = 0
-                        for flow_answer in flow_answers:
-
-                            if (
-                                flow_answer.question.question_typ.question_typ
-                                == "mnt-psh-btn"
-                            ):
-                                value += 1
-                            else:
-                                raise Exception("not accounted for yet")
-                                value = flow_answer.value
-
-                            if flow_answer.question.value_multiplier is not None:
-                                value *= int(flow_answer.question.value_multiplier)
-                    # based on a question aggregate
-                    else:
-                        questions = [
-                            question_aggregate_question["question"]
-                            for question_aggregate_question in graph_question[
-                                "question_aggregate"
-                            ]["aggregate_questions"]
-                        ]
-                        value = aggregate_answers_horizontally(
-                            graph_question["question_aggregate"],
-                            response,
-                            questions,
-                        )
+                values = get_graph_source_values(
+                    graph_question, responses, answer_matrix
+                )
 
-                    plot_entry["points"].append(
-                        {
-                            "point": value,
-                            "time": response.time,
-                        }
-                    )
-                    previous = value
+                plot.append(
+                    {
+                        "label": get_graph_source_label(graph_question),
+                        "points": [
+                            {
+                                "point": value if value is not None else 0,
+                                "time": response.time,
+                            }
+                            for response, value in zip(responses, values)
+                        ],
+                    }
+                )
 
             data = plot
     return data
@@ -1924,62 +2409,215 @@ def graph_responses(graph_id, responses, aggregate_responses=None):
 def is_question_condition_passed(
     question_condition_typ: str, answer_value, match_value=None
 ):
-    if answer_value is None:
-        return False
-
-    match question_condition_typ:
-        case "equal":
-            return answer_value == match_value
-        case "gt":
-            return int(answer_value) > int(match_value)
-        case "gt-equal":
-            return int(answer_value) >= int(match_value)
-        case "lt-equal":
-            return int(answer_value) <= int(match_value)
-        case "lt":
-            return int(answer_value) < int(match_value)
-        case "exist":
-            return answer_value is not None and len(str(answer_value)) > 0
-        case _:
-            raise Exception("no type")
+    return compile_question_condition(question_condition_typ, match_value)(
+        answer_value
+    )
+
+
+@lru_cache(maxsize=1024)
+def compile_question_condition(question_condition_typ: str, match_value=None):
+    """
+    Compile a condition into a predicate with the comparison value parsed once,
+    so it can be applied to every answer in a column without re-parsing.
+
+    Args:
+        question_condition_typ: The condition type, ex gt-equal
+        match_value: The value answers are compared to
 
+    Returns:
+        Function taking an answer value and returning if the condition passed,
+        unanswered (None) values never pass
+    """
+    try:
+        match question_condition_typ:
+            case "equal":
+                # answers may already be numbers, the match value is always text
+                return lambda answer_value: (
+                    answer_value is not None and str(answer_value) == str(match_value)
+                )
+            case "gt":
+                match_number = int(match_value)
+                return lambda answer_value: (
+                    answer_value is not None and int(answer_value) > match_number
+                )
+            case "gt-equal":
+                match_number = int(match_value)
+                return lambda answer_value: (
+                    answer_value is not None and int(answer_value) >= match_number
+                )
+            case "lt-equal":
+                match_number = int(match_value)
+                return lambda answer_value: (
+                    answer_value is not None and int(answer_value) <= match_number
+                )
+            case "lt":
+                match_number = int(match_value)
+                return lambda answer_value: (
+                    answer_value is not None and int(answer_value) < match_number
+                )
+            case "exist":
+                return lambda answer_value: (
+                    answer_value is not None and len(str(answer_value)) > 0
+                )
+    except (TypeError, ValueError):
+        pass
+
+    # An unknown type or an unusable match value only fails once an answer is checked
+    def uncompiled(answer_value):
+        if answer_value is None:
+            return False
+
+        if question_condition_typ in ["gt", "gt-equal", "lt-equal", "lt"]:
+            int(answer_value)
+            int(match_value)
+
+        raise Exception("no type")
+
+    return uncompiled
+
+
+def is_question_condition_passed_column(
+    question_condition_typ: str, answer_values, match_value=None
+) -> list[bool]:
+    """
+    Check a condition against a whole column of answers.
+
+    Args:
+        question_condition_typ: The condition type, ex gt-equal
+        answer_values: The answer values, None for unanswered
+        match_value: The value answers are compared to
+
+    Returns:
+        If the condition passed for each answer value
+    """
+    predicate = compile_question_condition(question_condition_typ, match_value)
+    return list(map(predicate, answer_values))
+
+
+def aggregate_answers_horizontally(
+    question_aggregate, response: Response, questions, answer_matrix=None
+):
+    return aggregate_answers_by_response(
+        question_aggregate, [response], questions, answer_matrix
+    )[response.id]
+
+
+def aggregate_answers_vertically(
+    question_aggregate, responses, questions, answer_matrix=None
+):
+    answer_columns = get_aggregate_answer_columns(
+        question_aggregate, responses, questions, answer_matrix
+    )
+
+    return aggregate_response_values(
+        question_aggregate, answer_columns["responses_values"]
+    )
+
+
+def get_answer_matrix(
+    response_ids, question_ids
+) -> dict[int, dict[int, dict[str, Any]]]:
+    """
+    Load the answers for a set of responses and questions in a constant number of queries.
+
+    The matrix is dense, every requested response has an entry for every requested
+    question. A cell records if a plain answer exists, its value, and the flow answers
+    for the question ordered by value_time.
+
+    Args:
+        response_ids: Ids of the Response objects to load answers for
+        question_ids: Ids of the Question objects to load answers for
+
+    Returns:
+        Dictionary keyed by response id then question id, each cell containing
+        answered, value and flow_answers
+    """
+    response_ids = set(response_ids)
+    question_ids = set(question_ids)
+
+    answer_matrix = {
+        response_id: {
+            question_id: {"answered": False, "value": None, "flow_answers": []}
+            for question_id in question_ids
+        }
+        for response_id in response_ids
+    }
+
+    if len(response_ids) <= 0 or len(question_ids) <= 0:
+        return answer_matrix
+
+    answers = (
+        Answer.objects.filter(
+            Q(response_id__in=response_ids)
+            & Q(question_id__in=question_ids)
+            & Q(void_ind="n")
+        )
+        .order_by("id")
+        .values_list("response_id", "question_id", "value")
+    )
+
+    for response_id, question_id, value in answers:
+        cell = answer_matrix[response_id][question_id]
+        if not cell["answered"]:
+            cell["answered"] = True
+            cell["value"] = value
+
+    flow_answers = (
+        FlowAnswer.objects.select_related(
+            "question__question_typ", "answer__response"
+        )
+        .filter(
+            Q(question_id__in=question_ids)
+            & Q(void_ind="n")
+            & Q(answer__response_id__in=response_ids)
+        )
+        .order_by("value_time", "id")
+    )
+
+    for flow_answer in flow_answers:
+        answer_matrix[flow_answer.answer.response_id][flow_answer.question_id][
+            "flow_answers"
+        ].append(flow_answer)
+
+    return answer_matrix
 
-def aggregate_answers_horizontally(question_aggregate, response: Response, questions):
-    response_question_answers = get_responses_question_answers([response], questions)
 
-    return aggregate_answers(question_aggregate, response_question_answers)
+def get_answer_matrix_cell(answer_matrix, response_id: int, question_id: int):
+    """
+    Get a single cell of an answer matrix, an empty cell if it was not loaded.
 
+    Args:
+        answer_matrix: Matrix built by get_answer_matrix
+        response_id: Id of the response
+        question_id: Id of the question
 
-def aggregate_answers_vertically(question_aggregate, responses, questions):
-    response_question_answers = get_responses_question_answers(responses, questions)
+    Returns:
+        Dictionary containing answered, value and flow_answers
+    """
+    return answer_matrix.get(response_id, {}).get(
+        question_id, {"answered": False, "value": None, "flow_answers": []}
+    )
 
-    return aggregate_answers(question_aggregate, response_question_answers)
 
+def get_responses_question_answers(responses, questions, answer_matrix=None):
+    if answer_matrix is None:
+        answer_matrix = get_answer_matrix(
+            [response.id for response in responses],
+            [question["id"] for question in questions],
+        )
 
-def get_responses_question_answers(responses, questions):
     response_question_answers = []
     for response in responses:
         question_answers = []
         for question in questions:
-            try:
-                answer = Answer.objects.get(
-                    Q(response=response)
-                    & Q(question_id=question["id"])
-                    & Q(void_ind="n")
-                )
+            cell = get_answer_matrix_cell(answer_matrix, response.id, question["id"])
 
-                question_answers.append({"value": answer.value, "question": question})
-            except Answer.DoesNotExist:
-                pass
+            if cell["answered"]:
+                question_answers.append({"value": cell["value"], "question": question})
 
             # check flow answers, they need combined as they span the whole response
-            flow_answers = FlowAnswer.objects.filter(
-                Q(question_id=question["id"])
-                & Q(void_ind="n")
-                & Q(answer__response=response)
-            ).order_by("value_time")
             question_answers.append(
-                {"flow_answers": flow_answers, "question": question}
+                {"flow_answers": cell["flow_answers"], "question": question}
             )
         response_question_answers.append(
             {"response_id": response.id, "question_answers": question_answers}
@@ -1987,6 +2625,162 @@ def get_responses_question_answers(responses, questions):
     return response_question_answers
 
 
+def get_aggregate_answer_columns(
+    question_aggregate, responses, questions, answer_matrix=None
+) -> dict[str, Any]:
+    """
+    Reduce the answers of a set of responses to an aggregate's questions, one
+    question column at a time.
+
+    Everything that only depends on the question (multiplier, condition, order)
+    is resolved once per column instead of once per answer, and answer strings
+    are converted to numbers a single time.
+
+    Args:
+        question_aggregate: Parsed question aggregate
+        responses: Response objects to aggregate, the rows of the matrix
+        questions: Parsed questions of the aggregate, the columns of the matrix
+        answer_matrix: Matrix from get_answer_matrix, loaded if not supplied
+
+    Returns:
+        Dictionary with the response ids and, in the same order, the values
+        each response contributes to the aggregate (a 1 or 0 for logical
+        aggregates)
+    """
+    aggregate_typ = question_aggregate["question_aggregate_typ"].question_aggregate_typ
+    is_logical = aggregate_typ == "logical"
+    is_difference = aggregate_typ == "difference"
+    use_answer_time = question_aggregate["use_answer_time"]
+
+    if answer_matrix is None:
+        answer_matrix = get_answer_matrix(
+            [response.id for response in responses],
+            [question["id"] for question in questions],
+        )
+
+    aggregate_questions = {}
+    for aggregate_question in question_aggregate["aggregate_questions"]:
+        aggregate_questions.setdefault(
+            aggregate_question["question"]["id"], aggregate_question
+        )
+
+    if use_answer_time:
+        questions = sorted(
+            questions, key=lambda q: aggregate_questions[q["id"]]["order"]
+        )
+
+    responses_values = [[] for _ in responses]
+    logical_values = [True for _ in responses]
+    flow_multipliers = {}
+    empty_cell = {"answered": False, "value": None, "flow_answers": []}
+    rows = [answer_matrix.get(response.id, {}) for response in responses]
+
+    for question in questions:
+        multiplier = question["value_multiplier"]
+        multiplier = int(multiplier) if multiplier is not None else 1
+        # logical conditions can compare text answers, everything else is summed
+        numeric = not is_logical or is_numeric_question(question)
+
+        condition = None
+        if is_logical and question["active"] == "y":
+            aggregate_question = aggregate_questions.get(question["id"], None)
+            if aggregate_question is not None:
+                condition = compile_question_condition(
+                    aggregate_question[
+                        "question_condition_typ"
+                    ].question_condition_typ,
+                    aggregate_question["condition_value"],
+                )
+
+        question_id = question["id"]
+        for i, row in enumerate(rows):
+            cell = row.get(question_id, empty_cell)
+
+            plain_value = None
+            if cell["answered"] and cell["value"] not in [None, "!EXIST"]:
+                plain_value = (
+                    int(cell["value"]) * multiplier if numeric else cell["value"]
+                )
+
+                if use_answer_time:
+                    plain_value = responses[i].time
+
+                responses_values[i].append(plain_value)
+
+            flow_value = None
+            for flow_answer in cell["flow_answers"]:
+                if flow_answer.value == "!EXISTS":
+                    continue
+
+                if flow_answer.question_id not in flow_multipliers:
+                    if flow_answer.question.question_typ.question_typ != "mnt-psh-btn":
+                        raise Exception("not accounted for yet")
+
+                    flow_multiplier = flow_answer.question.value_multiplier
+                    flow_multipliers[flow_answer.question_id] = (
+                        int(flow_multiplier) if flow_multiplier is not None else 1
+                    )
+
+                value = flow_multipliers[flow_answer.question_id]
+
+                if use_answer_time:
+                    value = datetime.combine(date.today(), flow_answer.value_time)
+
+                if flow_value is None:
+                    flow_value = value
+                elif is_difference:
+                    flow_value = flow_value - value
+                else:
+                    flow_value += value
+
+            if flow_value is not None:
+                responses_values[i].append(flow_value)
+
+            if condition is not None and logical_values[i]:
+                checked_values = [
+                    value for value in [plain_value, flow_value] if value is not None
+                ]
+                logical_values[i] = len(checked_values) > 0 and all(
+                    map(condition, checked_values)
+                )
+
+    return {
+        "response_ids": [response.id for response in responses],
+        "responses_values": (
+            [1 if logical_value else 0 for logical_value in logical_values]
+            if is_logical
+            else responses_values
+        ),
+    }
+
+
+def aggregate_answers_by_response(
+    question_aggregate, responses, questions, answer_matrix=None
+) -> dict[int, Any]:
+    """
+    Aggregate each response on its own, all responses in one pass.
+
+    Args:
+        question_aggregate: Parsed question aggregate
+        responses: Response objects to aggregate
+        questions: Parsed questions of the aggregate
+        answer_matrix: Matrix from get_answer_matrix, loaded if not supplied
+
+    Returns:
+        Dictionary of response id to the aggregate value for that response
+    """
+    answer_columns = get_aggregate_answer_columns(
+        question_aggregate, responses, questions, answer_matrix
+    )
+
+    return {
+        response_id: aggregate_response_values(question_aggregate, [response_values])
+        for response_id, response_values in zip(
+            answer_columns["response_ids"], answer_columns["responses_values"]
+        )
+    }
+
+
 def aggregate_answers(question_aggregate, response_question_answers):
     is_logical = (
         question_aggregate["question_aggregate_typ"].question_aggregate_typ == "logical"
@@ -2092,6 +2886,21 @@ def aggregate_answers(question_aggregate, response_question_answers):
         else:
             responses_values.append(response_values)
 
+    return aggregate_response_values(question_aggregate, responses_values)
+
+
+def aggregate_response_values(question_aggregate, responses_values):
+    """
+    Reduce the values of each response into the final aggregate value.
+
+    Args:
+        question_aggregate: Parsed question aggregate
+        responses_values: A list of values per response, or a 1 or 0 per
+            response for logical aggregates
+
+    Returns:
+        The aggregate value
+    """
     match question_aggregate["question_aggregate_typ"].question_aggregate_typ:
         case "sum":
             return sum([sum(values) for values in responses_values])
@@ -11,8 +11,12 @@ from form.serializers import (
     QuestionSerializer,
     SaveResponseSerializer,
     ScoutFieldFormResponseSerializer,
+    ScoutFieldFormResponseBatchSerializer,
+    ResponseBatchResultSerializer,
+    QuestionBackfillSerializer,
     FormInitializationSerializer,
     ResponseSerializer,
+    ResponsesPageSerializer,
     QuestionAggregateSerializer,
     QuestionAggregateTypeSerializer,
     QuestionConditionSerializer,
@@ -134,6 +138,62 @@ class FormEditorView(APIView):
             )
 
 
+class QuestionBackfillView(APIView):
+    """
+    API endpoint to get the progress of filling in answers for new questions
+    """
+
+    authentication_classes = (JWTAuthentication,)
+    permission_classes = (IsAuthenticated,)
+    endpoint = "question-backfill/"
+
+    def get(self, request, format=None):
+        try:
+            if has_access(request.user.id, ["admin", "scoutadmin"]):
+                question_backfills = form.util.get_question_backfills(
+                    request.query_params.get("question_id", None)
+                )
+                serializer = QuestionBackfillSerializer(question_backfills, many=True)
+                return Response(serializer.data)
+            else:
+                return ret_message(
+                    "You do not have access.",
+                    True,
+                    app_url + self.endpoint,
+                    request.user.id,
+                )
+        except Exception as e:
+            return ret_message(
+                "An error occurred while getting question backfills.",
+                True,
+                app_url + self.endpoint,
+                request.user.id,
+                e,
+            )
+
+
+class RunQuestionBackfillsView(APIView):
+    """
+    API endpoint to run queued question backfills, called by cron
+    """
+
+    endpoint = "run-question-backfills/"
+
+    def get(self, request, format=None):
+        try:
+            ret = "QUESTION BACKFILLS: "
+            ret += form.util.run_question_backfills()
+            return ret_message(ret)
+        except Exception as e:
+            return ret_message(
+                "An error occurred while running question backfills.",
+                True,
+                app_url + self.endpoint,
+                -1,
+                e,
+            )
+
+
 class SaveAnswersView(APIView):
     """
     API endpoint to save answers
@@ -163,6 +223,18 @@ class SaveAnswersView(APIView):
                     # Try to deserialize as a field or pit answer
                     serializer = ScoutFieldFormResponseSerializer(data=request.data)
                     if serializer.is_valid():
+                        errors = form.util.validate_answers(
+                            serializer.validated_data.get("answers", [])
+                        )
+                        if len(errors) > 0:
+                            return ret_message(
+                                error_msg,
+                                True,
+                                app_url + self.endpoint,
+                                request.user.id,
+                                error_message=errors,
+                            )
+
                         if serializer.validated_data["form_typ"] == "field":
                             form.util.save_field_response(
                                 serializer.validated_data, request.user.id
@@ -193,6 +265,18 @@ class SaveAnswersView(APIView):
                 # regular response
                 serializer = SaveResponseSerializer(data=request.data)
                 if serializer.is_valid():
+                    errors = form.util.validate_answers(
+                        serializer.validated_data.get("question_answers", [])
+                    )
+                    if len(errors) > 0:
+                        return ret_message(
+                            error_msg,
+                            True,
+                            app_url + self.endpoint,
+                            request.user.id,
+                            error_message=errors,
+                        )
+
                     response = form.util.save_answers(serializer.validated_data)
 
                     if form_typ in ["team-app", "team-cntct"]:
@@ -217,6 +301,56 @@ class SaveAnswersView(APIView):
             )
 
 
+class SaveAnswersBatchView(APIView):
+    """
+    API endpoint to save a batch of field and pit responses queued offline
+    """
+
+    authentication_classes = (JWTAuthentication,)
+    permission_classes = (IsAuthenticated,)
+    endpoint = "save-answers-batch/"
+
+    def post(self, request, format=None):
+        try:
+            error_msg = "An error occurred while saving the response batch."
+            serializer = ScoutFieldFormResponseBatchSerializer(data=request.data)
+            if not serializer.is_valid():
+                return ret_message(
+                    error_msg,
+                    True,
+                    app_url + self.endpoint,
+                    request.user.id,
+                    error_message=serializer.errors,
+                )
+
+            items = serializer.validated_data["responses"]
+
+            # Check each permission once for the whole batch
+            for form_typ in set(item["form_typ"] for item in items):
+                if form_typ not in ["field", "pit"] or not has_access(
+                    request.user.id, "scoutfield" if form_typ == "field" else "scoutpit"
+                ):
+                    return ret_message(
+                        "You do not have access.",
+                        True,
+                        app_url + self.endpoint,
+                        request.user.id,
+                    )
+
+            results = form.util.save_response_batch(items, request.user.id)
+
+            serializer = ResponseBatchResultSerializer(results, many=True)
+            return Response(serializer.data)
+        except Exception as e:
+            return ret_message(
+                error_msg,
+                True,
+                app_url + self.endpoint,
+                request.user.id,
+                e,
+            )
+
+
 class ResponseView(APIView):
     """
     API endpoint to get a form response
@@ -316,11 +450,19 @@ class ResponsesView(APIView):
     def get(self, request, format=None):
         try:
             if has_access(request.user.id, "admin"):
-                responses = form.util.get_responses(
-                    request.query_params["form_typ"],
-                    request.query_params.get("archive_ind", "n"),
-                )
-                serializer = ResponseSerializer(responses, many=True)
+                if request.query_params.get("pg", None) is not None:
+                    responses = form.util.get_responses_page(
+                        request.query_params["form_typ"],
+                        request.query_params.get("archive_ind", "n"),
+                        request.query_params["pg"],
+                    )
+                    serializer = ResponsesPageSerializer(responses)
+                else:
+                    responses = form.util.get_responses(
+                        request.query_params["form_typ"],
+                        request.query_params.get("archive_ind", "n"),
+                    )
+                    serializer = ResponseSerializer(responses, many=True)
                 return Response(serializer.data)
             else:
                 return ret_message(
@@ -0,0 +1,15 @@
+import general.security
+
+
+class UserPermissionsMiddleware:
+    """
+    Loads each user's permissions at most once per request, however many
+    times the request checks access.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with general.security.user_permissions_request():
+            return self.get_response(request)
@@ -0,0 +1,166 @@
+import asyncio
+import json
+import threading
+from typing import Any
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+# Events a slow subscriber can fall behind by before it is told to resync
+subscription_queue_size = 100
+
+
+class Subscription:
+    """
+    One subscriber's queue of messages on a channel.
+
+    Messages are published from request threads and read on the subscriber's
+    event loop, so they are handed over with call_soon_threadsafe.
+    """
+
+    def __init__(self, broker: "LocalBroker", channel: str):
+        self.broker = broker
+        self.channel = channel
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=subscription_queue_size)
+        self.overflowed = False
+
+    def put(self, message: dict[str, Any]):
+        self.loop.call_soon_threadsafe(self._put, message)
+
+    def _put(self, message: dict[str, Any]):
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # The subscriber missed messages, it has to reload instead of
+            # applying deltas
+            self.overflowed = True
+
+    async def get(self, timeout: float | None = None) -> dict[str, Any] | None:
+        """
+        Wait for the next message.
+
+        Args:
+            timeout: Seconds to wait, None to wait forever
+
+        Returns:
+            The message, a resync message if messages were dropped, or None if
+            the timeout passed
+        """
+        if self.overflowed:
+            self.overflowed = False
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            return {"typ": "resync", "data": {}, "sequence": None}
+
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class LocalBroker:
+    """
+    In process pub/sub, only subscribers in the publishing process are reached.
+
+    Deployments running several workers can point PUBSUB_BROKER at a broker
+    with the same publish/subscribe/unsubscribe methods that fans messages out
+    between processes.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.subscriptions: dict[str, set[Subscription]] = {}
+
+    def publish(self, channel: str, message: dict[str, Any]):
+        with self.lock:
+            subscriptions = list(self.subscriptions.get(channel, []))
+
+        for subscription in subscriptions:
+            subscription.put(message)
+
+    def subscribe(self, channel: str) -> Subscription:
+        subscription = Subscription(self, channel)
+        with self.lock:
+            self.subscriptions.setdefault(channel, set()).add(subscription)
+
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self.lock:
+            subscriptions = self.subscriptions.get(subscription.channel, set())
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                self.subscriptions.pop(subscription.channel, None)
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker() -> LocalBroker:
+    """
+    Get the process's broker, built from the PUBSUB_BROKER setting.
+
+    Returns:
+        The broker
+    """
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = import_string(
+                    getattr(settings, "PUBSUB_BROKER", "general.pubsub.LocalBroker")
+                )()
+
+    return _broker
+
+
+def reset_broker():
+    """
+    Drop the process's broker and its subscriptions.
+    """
+    global _broker
+    _broker = None
+
+
+def publish(channel: str, typ: str, data: dict[str, Any], sequence: int | None = None):
+    """
+    Publish a message once the current transaction commits, subscribers never
+    hear about changes that were rolled back.
+
+    Args:
+        channel: Channel to publish on
+        typ: Type of the message, streamed as the SSE event name
+        data: JSON serializable message data
+        sequence: Optional sequence clients can resume from
+    """
+    message = {"typ": typ, "data": data, "sequence": sequence}
+    transaction.on_commit(lambda: get_broker().publish(channel, message))
+
+
+def format_server_sent_event(message: dict[str, Any]) -> str:
+    """
+    Format a message as a server sent event.
+
+    Args:
+        message: Message with typ, data and an optional sequence
+
+    Returns:
+        The event, its id is the sequence so reconnecting clients send it back
+        as Last-Event-ID
+    """
+    event = ""
+    if message.get("sequence", None) is not None:
+        event += f"id: {message['sequence']}\n"
+
+    return (
+        event
+        + f"event: {message['typ']}\n"
+        + f"data: {json.dumps(message['data'], cls=DjangoJSONEncoder)}\n\n"
+    )
@@ -1,14 +1,49 @@
+import atexit
+import contextlib
+import contextvars
+import os
+import queue
+import threading
+import time
 import traceback
 from typing import Callable, Any
+from django.conf import settings
 from django.utils import timezone
-from django.db.models import QuerySet
+from django.db import close_old_connections, transaction
+from django.db.models import F, QuerySet
 from django.contrib.auth.models import Group
 
 import json
 from admin.models import ErrorLog
 from user.serializers import RetMessageSerializer
 from rest_framework.response import Response
-from user.models import User, Permission
+from user.models import User, Permission, PermissionVersion
+
+# Permission codenames by user id, each with when they were loaded
+_user_permissions: dict[int, dict[str, Any]] = {}
+user_permissions_ttl_seconds = 60
+
+# The last permission version read from the database and when it was read
+_permission_version: dict[str, Any] = {"version": None, "checked": None}
+permission_version_check_seconds = 5
+
+# Errors waiting for the writer thread, and how many were dropped because the
+# queue was full
+_error_queue: queue.Queue = queue.Queue(maxsize=1000)
+_error_sink: dict[str, Any] = {"thread": None, "pid": None, "dropped": 0}
+_error_lock = threading.Lock()
+error_batch_size = 100
+
+# Errors logged within the window, by signature, later identical errors are
+# added to their occurrences instead of getting their own row
+_coalesced_errors: dict[tuple, dict[str, Any]] = {}
+_error_write_lock = threading.Lock()
+error_coalesce_seconds = 60
+
+# Permission codenames by user id for the request being handled
+_request_permissions: contextvars.ContextVar[dict[int, frozenset[str]] | None] = (
+    contextvars.ContextVar("request_permissions", default=None)
+)
 
 
 def has_access(user_id: int, sec_permission: str | list[str]) -> bool:
@@ -26,14 +61,120 @@ def has_access(user_id: int, sec_permission: str | list[str]) -> bool:
         has_access(request.user.id, 'admin')
         has_access(request.user.id, ['admin', 'scoutadmin'])
     """
-    prmsns = get_user_permissions(user_id, False)
-
     if not isinstance(sec_permission, list):
         sec_permission = [sec_permission]
 
-    prmsn = prmsns.filter(codename__in=sec_permission)
+    return not get_user_permission_codenames(user_id).isdisjoint(sec_permission)
+
+
+def get_user_permission_codenames(user_id: int) -> frozenset[str]:
+    """
+    Get the codenames of a user's permissions. They are cached for the process
+    for up to user_permissions_ttl_seconds, dropped when the shared permission
+    version changes and memoized for the request being handled.
+
+    Args:
+        user_id: The ID of the user
+
+    Returns:
+        Frozenset of permission codenames
+    """
+    request_permissions = _request_permissions.get()
+    if request_permissions is not None and user_id in request_permissions:
+        return request_permissions[user_id]
+
+    get_permission_version()
+
+    user_permissions = _user_permissions.get(user_id, None)
+    if (
+        user_permissions is None
+        or time.monotonic() - user_permissions["loaded"] > user_permissions_ttl_seconds
+    ):
+        user_permissions = {
+            "codenames": frozenset(
+                get_user_permissions(user_id, False).values_list("codename", flat=True)
+            ),
+            "loaded": time.monotonic(),
+        }
+        _user_permissions[user_id] = user_permissions
 
-    return len(prmsn) > 0
+    if request_permissions is not None:
+        request_permissions[user_id] = user_permissions["codenames"]
+
+    return user_permissions["codenames"]
+
+
+def invalidate_user_permissions():
+    """
+    Drop every cached user permission set, forcing the next check to reload.
+    """
+    _user_permissions.clear()
+    _permission_version["version"] = None
+    _permission_version["checked"] = None
+
+    request_permissions = _request_permissions.get()
+    if request_permissions is not None:
+        request_permissions.clear()
+
+
+def user_permissions_changed():
+    """
+    Invalidate cached user permissions now and again once the current
+    transaction commits. The shared permission version is bumped so other
+    processes drop their caches too.
+    """
+    updated = PermissionVersion.objects.filter(id=1).update(
+        version=F("version") + 1, time=timezone.now()
+    )
+    if updated == 0:
+        PermissionVersion(id=1, version=1).save()
+
+    invalidate_user_permissions()
+    transaction.on_commit(invalidate_user_permissions)
+
+
+def get_permission_version() -> int:
+    """
+    Get the permission version, re-reading it from the database at most every
+    permission_version_check_seconds. Cached permissions are dropped when
+    another process bumped it.
+
+    Returns:
+        The permission version
+    """
+    if (
+        _permission_version["checked"] is None
+        or time.monotonic() - _permission_version["checked"]
+        > permission_version_check_seconds
+    ):
+        version = (
+            PermissionVersion.objects.filter(id=1)
+            .values_list("version", flat=True)
+            .first()
+            or 0
+        )
+        if (
+            _permission_version["version"] is not None
+            and version != _permission_version["version"]
+        ):
+            invalidate_user_permissions()
+
+        _permission_version["version"] = version
+        _permission_version["checked"] = time.monotonic()
+
+    return _permission_version["version"]
+
+
+@contextlib.contextmanager
+def user_permissions_request():
+    """
+    Load each user's permissions at most once while handling a request.
+    """
+    token = _request_permissions.set({})
+    try:
+        yield
+    finally:
+        _request_permissions.reset(token)
 
 
 def access_response(
@@ -129,7 +270,8 @@ def ret_message(
     Create a standardized response message and log errors if applicable.
     
     This function is the standard way to return responses from API endpoints.
-    When error=True, it logs the error to the database and prints debug information.
+    When error=True, the error is handed to the error sink, which logs it to the
+    database and prints debug information, see log_error.
     
     Args:
         message: The message to return to the user
@@ -142,78 +284,22 @@ def ret_message(
     Returns:
         Response object with the message, error flag, and error details
     """
-    # TODO Make all of these optional in the DB
     if error:
-        print("----------ERROR START----------")
-
-        try:
-            user = User.objects.get(id=user_id)
-        except User.DoesNotExist:
-            user = User.objects.get(id=-1)
-            err_msg = "Ran into DoesNotExist exception finding user"
-            print(err_msg)
-            message += f"\n{err_msg}\n"
-
         tb = traceback.format_exc()
 
-        tb = (tb[:4000] + "..") if len(tb) > 4000 else tb
-
-        print("Error in: " + path)
-        print("Message: " + message)
-        print(
-            "Error by: " + user.username + " " + user.first_name + " " + user.last_name
+        message += log_error(
+            {
+                "signature": (path, type(exception).__name__, str(exception)),
+                "message": message,
+                "path": path,
+                "user_id": user_id,
+                "exception": exception,
+                "traceback": (tb[:4000] + "..") if len(tb) > 4000 else tb,
+                "error_message": error_message,
+                "time": timezone.now(),
+            }
         )
-        print("Exception: ")
-        print(exception)
 
-        print("TraceBack: ")
-        print(tb)
-
-        print("----------ERROR END----------")
-
-        try:
-            ErrorLog(
-                user=user,
-                path=path,
-                message=str(message)[:1000],
-                exception=str(exception)[:4000],
-                traceback=str(tb)[:4000],
-                error_message=(
-                    str(error_message)[:4000] if error_message is not None else None
-                ),
-                time=timezone.now(),
-                void_ind="n",
-            ).save()
-        except Exception as e:
-            try:
-                ErrorLog(
-                    user=User.objects.get(id=-1),
-                    path=f"general.security.ret_message-{path}",
-                    message=f"Error logging error:\n{message}",
-                    exception=str(e)[:4000],
-                    time=timezone.now(),
-                    void_ind="n",
-                ).save()
-            except Exception as e:
-                message += "\nCritical Error: please email the team admin at team3492@gmail.com\nSend them this message:\n"
-                message += str(e)
-                print("The most fatal of errors nothing was logged in db")
-                print("Exception: ")
-                print(e)
-
-            return Response(
-                RetMessageSerializer(
-                    {
-                        "retMessage": message,
-                        "error": error,
-                        "errorMessage": (
-                            json.dumps(error_message)
-                            if error_message is not None
-                            else ""
-                        ),
-                    }
-                ).data
-            )
     return Response(
         RetMessageSerializer(
             {
@@ -225,3 +311,227 @@ def ret_message(
             }
         ).data
     )
+
+
+def log_error(error: dict[str, Any]) -> str:
+    """
+    Hand an error to the error sink. By default it is only queued, a background
+    writer thread logs it, so the request does not wait on the database. With
+    the ERROR_SINK_ASYNC setting off it is logged right away.
+
+    Args:
+        error: The error, see ret_message
+
+    Returns:
+        Text to add to the message returned to the user, only set when the
+        error was logged right away and logging failed
+    """
+    if not getattr(settings, "ERROR_SINK_ASYNC", True):
+        return write_errors([error])
+
+    start_error_writer()
+    try:
+        _error_queue.put_nowait(error)
+    except queue.Full:
+        with _error_lock:
+            _error_sink["dropped"] += 1
+
+    return ""
+
+
+def start_error_writer():
+    """
+    Start the error writer thread if this process does not have one running yet.
+    """
+    with _error_lock:
+        if (
+            _error_sink["thread"] is None
+            or not _error_sink["thread"].is_alive()
+            or _error_sink["pid"] != os.getpid()
+        ):
+            _error_sink["thread"] = threading.Thread(
+                target=run_error_writer, name="error-writer", daemon=True
+            )
+            _error_sink["pid"] = os.getpid()
+            _error_sink["thread"].start()
+
+
+def run_error_writer():
+    """
+    Drain the error queue, writing each batch of errors that are waiting.
+    """
+    while True:
+        errors = [_error_queue.get()]
+        while len(errors) < error_batch_size:
+            try:
+                errors.append(_error_queue.get_nowait())
+            except queue.Empty:
+                break
+
+        try:
+            write_errors(errors)
+        except Exception as e:
+            print("Error writer failed")
+            print(e)
+        finally:
+            close_old_connections()
+            for _ in errors:
+                _error_queue.task_done()
+
+
+def flush_errors():
+    """
+    Wait until every queued error has been written.
+    """
+    if _error_sink["thread"] is not None and _error_sink["thread"].is_alive():
+        _error_queue.join()
+
+
+atexit.register(flush_errors)
+
+
+def write_errors(errors: list[dict[str, Any]]) -> str:
+    """
+    Print and log errors. Errors with the same signature as one logged within
+    error_coalesce_seconds only add to its occurrences.
+
+    Args:
+        errors: The errors, see ret_message
+
+    Returns:
+        Text to add to the message returned to the user, problems met while
+        logging the errors
+    """
+    with _error_lock:
+        dropped = _error_sink["dropped"]
+        _error_sink["dropped"] = 0
+
+    if dropped > 0:
+        errors = errors + [
+            {
+                "signature": ("general.security.log_error", "dropped", str(dropped)),
+                "message": f"Error queue was full, dropped {dropped} errors",
+                "path": "general.security.log_error",
+                "user_id": -1,
+                "exception": None,
+                "traceback": None,
+                "error_message": None,
+                "time": timezone.now(),
+            }
+        ]
+
+    batch: dict[tuple, dict[str, Any]] = {}
+    for error in errors:
+        if error["signature"] in batch:
+            batch[error["signature"]]["occurrences"] += 1
+        else:
+            batch[error["signature"]] = {"error": error, "occurrences": 1}
+
+    message = ""
+    with _error_write_lock:
+        now = timezone.now()
+        for signature in [
+            signature
+            for signature, coalesced in _coalesced_errors.items()
+            if (now - coalesced["time"]).total_seconds() > error_coalesce_seconds
+        ]:
+            _coalesced_errors.pop(signature)
+
+        for signature, entry in batch.items():
+            coalesced = _coalesced_errors.get(signature, None)
+            if coalesced is not None:
+                ErrorLog.objects.filter(error_log_id=coalesced["error_log_id"]).update(
+                    occurrences=F("occurrences") + entry["occurrences"]
+                )
+                continue
+
+            error_log_id, note = write_error(entry["error"], entry["occurrences"])
+            message += note
+            if error_log_id is not None:
+                _coalesced_errors[signature] = {
+                    "error_log_id": error_log_id,
+                    "time": entry["error"]["time"],
+                }
+
+    return message
+
+
+def write_error(error: dict[str, Any], occurrences: int) -> tuple[int | None, str]:
+    """
+    Print an error and log it to the database.
+
+    Args:
+        error: The error, see ret_message
+        occurrences: How many times it happened
+
+    Returns:
+        The id of the ErrorLog, None if it could not be logged, and text to add
+        to the message returned to the user
+    """
+    # TODO Make all of these optional in the DB
+    message = error["message"]
+    path = error["path"]
+    exception = error["exception"]
+    tb = error["traceback"]
+    error_message = error["error_message"]
+
+    note = ""
+
+    print("----------ERROR START----------")
+
+    try:
+        user = User.objects.get(id=error["user_id"])
+    except User.DoesNotExist:
+        user = User.objects.get(id=-1)
+        err_msg = "Ran into DoesNotExist exception finding user"
+        print(err_msg)
+        note = f"\n{err_msg}\n"
+        message += note
+
+    print("Error in: " + path)
+    print("Message: " + message)
+    print("Error by: " + user.username + " " + user.first_name + " " + user.last_name)
+    if occurrences > 1:
+        print(f"Occurrences: {occurrences}")
+    print("Exception: ")
+    print(exception)
+
+    print("TraceBack: ")
+    print(tb)
+
+    print("----------ERROR END----------")
+
+    try:
+        error_log = ErrorLog(
+            user=user,
+            path=path,
+            message=str(message)[:1000],
+            exception=str(exception)[:4000],
+            traceback=str(tb)[:4000],
+            error_message=(
+                str(error_message)[:4000] if error_message is not None else None
+            ),
+            time=error["time"],
+            occurrences=occurrences,
+            void_ind="n",
+        )
+        error_log.save()
+        return error_log.error_log_id, note
+    except Exception as e:
+        try:
+            ErrorLog(
+                user=User.objects.get(id=-1),
+                path=f"general.security.ret_message-{path}",
+                message=f"Error logging error:\n{message}",
+                exception=str(e)[:4000],
+                time=timezone.now(),
+                void_ind="n",
+            ).save()
+        except Exception as e:
+            print("The most fatal of errors nothing was logged in db")
+            print("Exception: ")
+            print(e)
+            note += "\nCritical Error: please email the team admin at team3492@gmail.com\nSend them this message:\n"
+            note += str(e)
+
+    return None, note
@@ -59,6 +59,8 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "corsheaders.middleware.CorsMiddleware",
+    "scouting.middleware.CurrentSeasonEventMiddleware",
+    "general.middleware.UserPermissionsMiddleware",
 ]
 
 ROOT_URLCONF = "parts_webapi.urls"
@@ -215,3 +217,10 @@ WEBPUSH_SETTINGS = {
     "VAPID_PRIVATE_KEY": os.getenv("VAPID_PRIVATE_KEY", ""),
     "VAPID_ADMIN_EMAIL": os.getenv("VAPID_ADMIN_EMAIL", ""),
 }
+
+# Pub/sub broker for live updates, the local broker only reaches subscribers
+# in the publishing process
+PUBSUB_BROKER = os.getenv("PUBSUB_BROKER", "general.pubsub.LocalBroker")
+
+# Log errors from ret_message on a background thread instead of in the request
+ERROR_SINK_ASYNC = os.getenv("ERROR_SINK_ASYNC", "True").lower() in ("true", "1", "t")
@@ -51,6 +51,8 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "corsheaders.middleware.CorsMiddleware",
+    "scouting.middleware.CurrentSeasonEventMiddleware",
+    "general.middleware.UserPermissionsMiddleware",
 ]
 
 CORS_ORIGIN_WHITELIST = [
@@ -185,3 +187,6 @@ LOGGING = {
         'level': 'WARNING',
     },
 }
+
+# Log errors from ret_message in the request so tests can check them
+ERROR_SINK_ASYNC = False
@@ -18,7 +18,7 @@ def get_competition_information() -> dict[str, Any]:
     )
     team3492 = Team.objects.get(team_no=3492)
 
-    matches = Match.objects.filter(
+    matches = Match.objects.select_related("event", "comp_level").filter(
         Q(event=event)
         & Q(void_ind="n")
         & Q(
@@ -31,6 +31,6 @@ def get_competition_information() -> dict[str, Any]:
         )
     ).order_by("comp_level__comp_lvl_order", "match_number")
 
-    matches = list(scouting.util.parse_match(m) for m in matches)
+    matches = scouting.util.get_match_board(matches)
 
     return {"event": event, "matches": matches}
@@ -15,6 +15,8 @@ from scouting.models import (
     Schedule,
     ScoutAuthGroup,
     FieldResponse,
+    FieldResponseChange,
+    FieldResponseRollup,
     FieldSchedule,
     PitResponse,
     Season,
@@ -25,6 +27,7 @@ from scouting.models import (
     FieldForm,
     UserSeason,
 )
+import scouting.field.util
 import scouting.util
 import scouting.models
 import alerts.util
@@ -69,6 +72,8 @@ def set_current_season_event(
 
         msg += f"\nCompetition page {'active' if competition_page_active == 'y' else 'inactive'}"
 
+    scouting.util.current_season_event_changed()
+
     return msg
 
 
@@ -104,6 +109,9 @@ def delete_event(event_id: int) -> dict[str, Any]:
     for t in teams_at_event:
         t.event_set.remove(e)
 
+    FieldResponseChange.objects.filter(event=e).delete()
+    FieldResponseRollup.objects.filter(event=e).delete()
+
     scout_fields = FieldResponse.objects.filter(event=e)
     for sf in scout_fields:
         scout_field_answers = Answer.objects.filter(response=sf.response)
@@ -196,6 +204,8 @@ def save_season(data: dict[str, Any]) -> Season:
     season.game = data["game"]
     season.manual = data["manual"]
     season.save()
+
+    scouting.util.current_season_event_changed()
     return season
 
 
@@ -315,6 +325,8 @@ def save_event(data: dict[str, Any]) -> Event:
         )
 
     event.save()
+
+    scouting.util.current_season_event_changed()
     return event
 
 
@@ -619,11 +631,24 @@ def save_scouting_user_info(data: dict[str, Any]) -> UserInfo:
     else:
         user_info = UserInfo(user_id=data["user"]["id"])
 
+    eliminate_results_changed = (
+        user_info.eliminate_results != data["eliminate_results"]
+    )
+
     user_info.group_leader = data["group_leader"]
     user_info.under_review = data["under_review"]
     user_info.eliminate_results = data["eliminate_results"]
 
     user_info.save()
+
+    if eliminate_results_changed:
+        # the user's responses are added to or taken out of the rollups
+        for event in Event.objects.filter(
+            Q(fieldresponse__user_id=user_info.user_id)
+            & Q(fieldresponse__void_ind="n")
+        ).distinct():
+            scouting.field.util.rebuild_field_response_rollups(event)
+
     return user_info
 
 
@@ -638,8 +663,17 @@ def void_field_response(id: int) -> FieldResponse:
         The updated FieldResponse object
     """
     sf = FieldResponse.objects.get(id=id)
+    # a response deleted through the form was already taken out of the rollups
+    was_void = sf.void_ind == "y" or (
+        sf.response is not None and sf.response.void_ind == "y"
+    )
     sf.void_ind = "y"
     sf.save()
+
+    if not was_void:
+        scouting.field.util.update_field_response_rollups(sf, remove=True)
+        scouting.field.util.record_field_response_change(sf, "void")
+
     return sf
 
 
@@ -21,14 +21,16 @@ class FieldResponseAnswerSerializer(serializers.BaseSerializer):
 
 
 class FieldResponsesSerializer(serializers.Serializer):
-    count = serializers.IntegerField()
-    previous = serializers.IntegerField()
-    next = serializers.IntegerField()
+    count = serializers.IntegerField(allow_null=True)
+    previous = serializers.IntegerField(allow_null=True)
+    next = serializers.IntegerField(allow_null=True)
+    next_cursor = serializers.CharField(required=False, allow_null=True)
     # scoutCols = ColSerializer(many=True)
     scoutAnswers = FieldResponseAnswerSerializer(many=True)
     current_season = SeasonSerializer()
     current_event = EventSerializer()
     removed_responses = serializers.ListField()
+    sequence = serializers.IntegerField(required=False)
 
 
 class FieldResponseSerializer(serializers.Serializer):
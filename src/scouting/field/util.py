@@ -1,4 +1,12 @@
 from typing import Any
+import bisect
+import hashlib
+import json
+import math
+import statistics
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+from django.db import transaction
 from django.db.models import Q, Exists, OuterRef, QuerySet
 from django.conf import settings
 from django.utils import timezone
@@ -7,15 +15,19 @@ from django.core.paginator import Paginator, PageNotAnInteger, EmptyPage
 from form.models import (
     QuestionAggregate,
     Answer,
+    FlowAnswer,
     QuestionAggregateQuestion,
 )
-import form.urls
+import form.models
 import scouting.models
 import scouting.util
 import form
 from scouting.models import (
+    Event,
     EventTeamInfo,
     FieldResponse,
+    FieldResponseChange,
+    FieldResponseRollup,
     FieldSchedule,
     Season,
     UserInfo,
@@ -24,6 +36,47 @@ import general.util
 import form.util
 
 
+# Field responses per page
+responses_page_size = 40
+
+# Changes returned per sync, clients keep syncing until they get fewer
+field_response_changes_limit = 500
+
+# Table columns by season id, each with the form schema version they were built for
+_table_columns: dict[int | None, dict[str, Any]] = {}
+
+
+def get_cached_table_columns(season: Season | None) -> dict[str, Any]:
+    """
+    Get the field scouting table columns for a season, rebuilt only when the
+    form schema version changed since they were cached.
+
+    Args:
+        season: The Season the columns are for
+
+    Returns:
+        Dictionary containing:
+            - columns: The table columns, see get_table_columns
+            - etag: Hash of the columns, the same in every process
+    """
+    version = form.util.get_form_schema_version()
+    season_id = season.id if season is not None else None
+
+    table_columns = _table_columns.get(season_id, None)
+    if table_columns is None or table_columns["version"] != version:
+        columns = get_table_columns(get_field_question_aggregates(season))
+        table_columns = {
+            "version": version,
+            "columns": columns,
+            "etag": hashlib.sha1(
+                json.dumps(columns, sort_keys=True, default=str).encode()
+            ).hexdigest(),
+        }
+        _table_columns[season_id] = table_columns
+
+    return table_columns
+
+
 def get_table_columns(
     question_aggregates: QuerySet[QuestionAggregate],
 ) -> list[dict[str, Any]]:
@@ -66,8 +119,11 @@ def get_table_columns(
         },
     ]
 
+    property_names = set(tc["PropertyName"] for tc in table_cols)
+
     for form_sub_type in form_questions["form_sub_types"]:
         for question in form_sub_type["questions"]:
+            property_names.add("ans" + str(question["id"]))
             table_cols.append(
                 {
                     "PropertyName": "ans" + str(question["id"]),
@@ -88,9 +144,8 @@ def get_table_columns(
             for question_flow in flow["flow_questions"]:
                 property_name = f"ans{question_flow['question']['id']}"
 
-                try:
-                    [tc for tc in table_cols if tc["PropertyName"] == property_name][0]
-                except IndexError:
+                if property_name not in property_names:
+                    property_names.add(property_name)
                     table_cols.append(
                         {
                             "PropertyName": property_name,
@@ -151,26 +206,40 @@ def get_responses(
     team: int | None = None,
     user: int | None = None,
     after_scout_field_id: int | None = None,
+    cursor: str | None = None,
+    after_sequence: int | None = None,
 ) -> dict[str, Any]:
     """
     Get paginated field scouting responses with answers and metadata.
 
+    Pages are either numbered, or when a cursor is passed keyset paged on
+    (time, id) which skips counting the responses. An empty cursor gets the
+    first page. Each page is hydrated in a fixed number of queries.
+
+    With after_sequence only the responses changed since that change log
+    sequence are returned, so polling clients only load what changed.
+
     Args:
         pg: Page number for pagination (default: 1)
         team: Optional team number to filter by
         user: Optional user ID to filter by
         after_scout_field_id: Optional ID to get responses after (for incremental loading)
+        cursor: Optional next_cursor of the previous page, for keyset pagination
+        after_sequence: Optional sequence of the last change the client has seen
 
     Returns:
         Dictionary containing:
-            - count: Total number of pages
+            - count: Total number of pages, None when keyset paging
             - previous/next: Page numbers for pagination
+            - next_cursor: Cursor for the next page when keyset paging
             - scoutAnswers: List of responses with parsed answers
             - current_season: Current season object
             - current_event: Current event object
             - removed_responses: List of IDs that were removed
+            - sequence: Latest change log sequence included, to sync from next
     """
     loading_all = False
+    removed_responses = None
 
     current_season = scouting.util.get_current_season()
 
@@ -183,6 +252,10 @@ def get_responses(
     q_team = Q()
     q_user = Q()
     q_after_scout_field_id = Q()
+    q_changed = Q()
+    # Read before the responses so a change made while loading is synced again
+    # rather than missed
+    sequence = get_field_response_sequence(current_event)
     # Pull responses by what input
     if team is not None:
         # get response for individual team
@@ -190,6 +263,16 @@ def get_responses(
     elif user is not None:
         # get response for individual scout
         q_user = Q(user=user)
+    elif after_sequence is not None:
+        # get responses changed since the client last synced
+        changes = get_field_response_changes(current_event, after_sequence)
+        sequence = changes[-1].id if len(changes) > 0 else int(after_sequence)
+        q_changed = Q(
+            id__in=set(c.field_response_id for c in changes if c.change_typ != "void")
+        )
+        removed_responses = sorted(
+            set(c.field_response_id for c in changes if c.change_typ == "void")
+        )
     elif after_scout_field_id is not None:
         # get response for individual scout
         q_after_scout_field_id = Q(id__gt=after_scout_field_id)
@@ -197,94 +280,113 @@ def get_responses(
         loading_all = True
         # get everything
 
-    q_eliminate_results = Exists(
-        UserInfo.objects.filter(
-            Q(user_id=OuterRef("user_id")) & Q(eliminate_results=True) & Q(void_ind="n")
-        )
-    )
+    q_eliminate_results = get_eliminate_results_filter()
 
     scout_field_responses = (
-        FieldResponse.objects.prefetch_related("team__eventteaminfo_set")
+        FieldResponse.objects.select_related("response", "match", "user")
         .filter(
             Q(event=current_event)
             & Q(void_ind="n")
             & q_team
             & q_user
             & q_after_scout_field_id
+            & q_changed
             & ~q_eliminate_results
         )
         .order_by("-time", "-id")
     )
 
-    paginator = Paginator(scout_field_responses, 40)
-    try:
-        scout_field_responses = paginator.page(pg)
-    except PageNotAnInteger:
-        # If page is not an integer, deliver first page.
-        scout_field_responses = paginator.page(1)
-    except EmptyPage:
-        # If page is out of range (e.g. 9999),
-        # deliver last page of results.
-        scout_field_responses = paginator.page(paginator.num_pages)
-
-    previous_pg = (
-        None
-        if not scout_field_responses.has_previous()
-        else scout_field_responses.previous_page_number()
-    )
-    next_pg = (
-        None
-        if not scout_field_responses.has_next()
-        else scout_field_responses.next_page_number()
+    count = None
+    previous_pg = None
+    next_pg = None
+    next_cursor = None
+    if after_sequence is not None:
+        # bounded by the number of changes read
+        scout_field_responses = list(scout_field_responses)
+    elif cursor is not None:
+        q_cursor = Q()
+        if cursor != "":
+            cursor_time, cursor_id = parse_responses_cursor(cursor)
+            q_cursor = Q(time__lt=cursor_time) | (
+                Q(time=cursor_time) & Q(id__lt=cursor_id)
+            )
+
+        # One row past the page tells if there is a next page without counting
+        scout_field_responses = list(
+            scout_field_responses.filter(q_cursor)[: responses_page_size + 1]
+        )
+        if len(scout_field_responses) > responses_page_size:
+            scout_field_responses = scout_field_responses[:responses_page_size]
+            next_cursor = format_responses_cursor(scout_field_responses[-1])
+    else:
+        paginator = Paginator(scout_field_responses, responses_page_size)
+        try:
+            scout_field_responses = paginator.page(pg)
+        except PageNotAnInteger:
+            # If page is not an integer, deliver first page.
+            scout_field_responses = paginator.page(1)
+        except EmptyPage:
+            # If page is out of range (e.g. 9999),
+            # deliver last page of results.
+            scout_field_responses = paginator.page(paginator.num_pages)
+
+        count = paginator.num_pages
+        previous_pg = (
+            None
+            if not scout_field_responses.has_previous()
+            else scout_field_responses.previous_page_number()
+        )
+        next_pg = (
+            None
+            if not scout_field_responses.has_next()
+            else scout_field_responses.next_page_number()
+        )
+        scout_field_responses = list(scout_field_responses)
+
+    # Load the answers every aggregate needs for the whole page at once
+    answer_matrix = form.util.get_answer_matrix(
+        [scout_field.response_id for scout_field in scout_field_responses],
+        set(
+            question["id"]
+            for parsed_question_aggregate in parsed_question_aggregates
+            for question in parsed_question_aggregate["questions"]
+        ),
     )
 
-    # Loop over all the responses selected and put in table
-    for scout_field in scout_field_responses:
-        answers = Answer.objects.filter(
-            Q(response=scout_field.response) & Q(void_ind="n")
+    # Aggregate every response on the page in one pass per aggregate
+    page_aggregates = {
+        parsed_question_aggregate["parsed_question_aggregate"][
+            "id"
+        ]: form.util.aggregate_answers_by_response(
+            parsed_question_aggregate["parsed_question_aggregate"],
+            [scout_field.response for scout_field in scout_field_responses],
+            parsed_question_aggregate["questions"],
+            answer_matrix,
         )
+        for parsed_question_aggregate in parsed_question_aggregates
+    }
 
-        response = {}
-        for answer in answers:
-            if answer.question is not None:
-                response[f"ans{answer.question.id}"] = answer.value
-            if answer.flow is not None:
-                flow_answers = answer.flowanswer_set.filter(void_ind="n")
-                for flow_answer in flow_answers:
+    page_answers = get_responses_answer_values(
+        [scout_field.response_id for scout_field in scout_field_responses]
+    )
 
-                    if response.get(f"ans{flow_answer.question.id}", None) is None:
-                        response[f"ans{flow_answer.question.id}"] = []
+    ranks = {}
+    for team_id, rank in EventTeamInfo.objects.filter(
+        Q(event=current_event)
+        & Q(team_id__in=set(scout_field.team_id for scout_field in scout_field_responses))
+        & Q(void_ind="n")
+    ).values_list("team_id", "rank"):
+        ranks.setdefault(team_id, rank)
 
-                    response[f"ans{flow_answer.question.id}"].append(
-                        {
-                            "round": len(response[f"ans{flow_answer.question.id}"]) + 1,
-                            "value": flow_answer.value,
-                        }
-                    )
-                """
-                for flow_answer in answer.flowanswer_set.filter(void_ind="n"):
-
-                    
-                    if flow_answer.question.question_typ.question_typ == "number":
-                        response[f"ans{flow_answer.question.id}"] = (
-                            float(flow_answer.value)
-                            if len(flow_answer.value) > 0
-                            else 0
-                        ) + response.get(f"ans{flow_answer.question.id}", 0)
-                    else:
-                        response[f"ans{flow_answer.question.id}"] = 1 + response.get(
-                            f"ans{flow_answer.question.id}", 0
-                        )
-                """
-
-        for parsed_question_aggregate in parsed_question_aggregates:
-            response[
-                f"ans_sqa{parsed_question_aggregate['parsed_question_aggregate']['id']}"
-            ] = form.util.aggregate_answers_horizontally(
-                parsed_question_aggregate["parsed_question_aggregate"],
-                scout_field.response,
-                parsed_question_aggregate["questions"],
-            )
+    # Loop over all the responses selected and put in table
+    for scout_field in scout_field_responses:
+        # Copied, field responses can share a form response
+        response = dict(page_answers.get(scout_field.response_id, {}))
+
+        for question_aggregate_id, aggregates in page_aggregates.items():
+            response[f"ans_sqa{question_aggregate_id}"] = aggregates[
+                scout_field.response_id
+            ]
 
         response["match"] = (
             scout_field.match.match_number if scout_field.match else None
@@ -296,36 +398,197 @@ def get_responses(
         response["user_id"] = scout_field.user.id
         response["team_id"] = scout_field.team_id
         response["id"] = scout_field.id
-
-        try:
-            eti = scout_field.team.eventteaminfo_set.get(
-                Q(event=current_event) & Q(team=scout_field.team) & Q(void_ind="n")
-            )
-            response["rank"] = eti.rank
-        except EventTeamInfo.DoesNotExist:
-            response["rank"] = ""
+        response["rank"] = ranks.get(scout_field.team_id, "")
 
         field_scouting_responses.append(response)
 
     data = {
-        "count": paginator.num_pages,
+        "count": count,
         "previous": previous_pg,
         "next": next_pg,
+        "next_cursor": next_cursor,
         "scout_field_responses": None,
         "scoutAnswers": field_scouting_responses,
         "current_season": current_season,
         "current_event": current_event,
-        "removed_responses": [
-            field_response.id
-            for field_response in (
-                get_removed_responses(after_scout_field_id) if not loading_all else []
-            )
-        ],
+        "removed_responses": (
+            removed_responses
+            if removed_responses is not None
+            else [
+                field_response.id
+                for field_response in (
+                    get_removed_responses(after_scout_field_id)
+                    if not loading_all
+                    else []
+                )
+            ]
+        ),
+        "sequence": sequence,
     }
 
     return data
 
 
+def get_responses_answer_values(response_ids) -> dict[int, dict[str, Any]]:
+    """
+    Load the table values of every answer of a set of field responses, in two
+    queries however many responses and flow answers there are.
+
+    Args:
+        response_ids: Ids of the form responses
+
+    Returns:
+        Dictionary by response id of the values keyed ans<question id>, flow
+        questions hold a list of rounds
+    """
+    flow_answers = {}
+    for flow_answer in FlowAnswer.objects.filter(
+        Q(answer__response_id__in=response_ids) & Q(void_ind="n")
+    ).order_by("id"):
+        flow_answers.setdefault(flow_answer.answer_id, []).append(flow_answer)
+
+    responses = {response_id: {} for response_id in response_ids}
+    for answer in Answer.objects.filter(
+        Q(response_id__in=response_ids) & Q(void_ind="n")
+    ).order_by("id"):
+        response = responses[answer.response_id]
+
+        if answer.question_id is not None:
+            response[f"ans{answer.question_id}"] = answer.value
+
+        if answer.flow_id is not None:
+            for flow_answer in flow_answers.get(answer.id, []):
+                rounds = response.get(f"ans{flow_answer.question_id}", None)
+                if rounds is None:
+                    rounds = response[f"ans{flow_answer.question_id}"] = []
+
+                rounds.append({"round": len(rounds) + 1, "value": flow_answer.value})
+
+    return responses
+
+
+def format_responses_cursor(field_response: FieldResponse) -> str:
+    """
+    Build the keyset cursor pointing after a field response.
+
+    Args:
+        field_response: Last field response of a page
+
+    Returns:
+        Opaque cursor string
+    """
+    return urlsafe_b64encode(
+        json.dumps([field_response.time.isoformat(), field_response.id]).encode()
+    ).decode()
+
+
+def parse_responses_cursor(cursor: str):
+    """
+    Read the time and id back out of a keyset cursor.
+
+    Args:
+        cursor: Cursor from format_responses_cursor
+
+    Returns:
+        Tuple of the time and id of the last field response of the previous page
+    """
+    try:
+        cursor_time, cursor_id = json.loads(urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(cursor_time), int(cursor_id)
+    except (ValueError, TypeError) as e:
+        raise Exception("Invalid cursor.") from e
+
+
+def record_field_response_change(field_response: FieldResponse, change_typ: str):
+    """
+    Append a field response change to the change log clients sync from.
+
+    Args:
+        field_response: The FieldResponse that changed
+        change_typ: insert or void
+
+    Returns:
+        The FieldResponseChange, its id is the change's sequence
+    """
+    with transaction.atomic():
+        # Writers for an event take turns so sequences are committed in order and
+        # a client syncing from one never skips a change committed later
+        Event.objects.select_for_update().filter(id=field_response.event_id).first()
+
+        change = FieldResponseChange(
+            event_id=field_response.event_id,
+            field_response=field_response,
+            change_typ=change_typ,
+        )
+        change.save()
+
+        scouting.util.publish_event_update(
+            field_response.event_id,
+            "field-response",
+            format_field_response_change(change),
+            change.id,
+        )
+
+    return change
+
+
+def format_field_response_change(change: FieldResponseChange) -> dict[str, Any]:
+    """
+    Format a field response change as a compact live update.
+
+    Args:
+        change: The FieldResponseChange, with its field response loaded
+
+    Returns:
+        Dictionary with the field response id, change type, team and match
+    """
+    return {
+        "id": change.field_response_id,
+        "change_typ": change.change_typ,
+        "team_id": change.field_response.team_id,
+        "match_id": change.field_response.match_id,
+    }
+
+
+def get_field_response_changes(
+    event: Event, after_sequence: int
+) -> list[FieldResponseChange]:
+    """
+    Get the next batch of changes to an event's field responses.
+
+    Args:
+        event: The Event to get changes for
+        after_sequence: Only changes after this sequence are returned
+
+    Returns:
+        Up to field_response_changes_limit changes in sequence order
+    """
+    return list(
+        FieldResponseChange.objects.filter(Q(event=event) & Q(id__gt=after_sequence))
+        .select_related("field_response")
+        .order_by("id")[:field_response_changes_limit]
+    )
+
+
+def get_field_response_sequence(event: Event) -> int:
+    """
+    Get the latest change log sequence of an event's field responses.
+
+    Args:
+        event: The Event
+
+    Returns:
+        The sequence, 0 if nothing changed yet
+    """
+    return (
+        FieldResponseChange.objects.filter(event=event)
+        .order_by("-id")
+        .values_list("id", flat=True)
+        .first()
+        or 0
+    )
+
+
 def get_removed_responses(
     before_scout_field_id: int | None = None,
 ) -> QuerySet[FieldResponse]:
@@ -410,7 +673,7 @@ def get_parsed_field_question_aggregates(
                     question_aggregate
                 ),
                 "questions": [
-                    form.util.parse_question(question_aggregate_question.question)
+                    form.util.get_catalog_question(question_aggregate_question.question)
                     for question_aggregate_question in question_aggregate.questionaggregatequestion_set.filter(
                         Q(void_ind="n")
                         & Q(active="y")
@@ -544,3 +807,358 @@ def get_scouting_responses() -> list[dict[str, Any]]:
         )
 
     return parsed_responses
+
+
+def parse_rollup_number(value) -> int | None:
+    """
+    Parse an answer value into a number for rollups.
+
+    Args:
+        value: Answer value to parse
+
+    Returns:
+        The value as an int, None if it is not numeric
+    """
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def get_field_response_rollup_values(
+    responses: list[form.models.Response],
+    questions: list[dict[str, Any]],
+    parsed_question_aggregates: list[dict[str, Any]],
+    answer_matrix=None,
+) -> dict[int, list[tuple[int | None, int | None, float]]]:
+    """
+    Compute the numeric value each response contributes to the rollups of its team.
+
+    A question's value is its answer with the value multiplier applied, or the
+    combined value of its flow answers. Non numeric answers and aggregates that
+    cannot be computed for a response are left out.
+
+    Args:
+        responses: Response objects of field responses
+        questions: Parsed field questions to roll up
+        parsed_question_aggregates: Aggregates from get_parsed_field_question_aggregates
+        answer_matrix: Matrix from form.util.get_answer_matrix, loaded if not supplied
+
+    Returns:
+        Dictionary of response id to a list of (question id, question aggregate id, value)
+    """
+    if answer_matrix is None:
+        answer_matrix = form.util.get_answer_matrix(
+            [response.id for response in responses],
+            set(question["id"] for question in questions)
+            | set(
+                question["id"]
+                for parsed_question_aggregate in parsed_question_aggregates
+                for question in parsed_question_aggregate["questions"]
+            ),
+        )
+
+    rollup_values = {response.id: [] for response in responses}
+
+    for question in questions:
+        multiplier = parse_rollup_number(question["value_multiplier"])
+        multiplier = multiplier if multiplier is not None else 1
+
+        for response in responses:
+            cell = form.util.get_answer_matrix_cell(
+                answer_matrix, response.id, question["id"]
+            )
+
+            value = None
+            if cell["answered"]:
+                value = parse_rollup_number(cell["value"])
+                value = value * multiplier if value is not None else None
+            else:
+                for flow_answer in cell["flow_answers"]:
+                    if flow_answer.question.question_typ.question_typ == "mnt-psh-btn":
+                        flow_value = 1
+                    else:
+                        flow_value = parse_rollup_number(flow_answer.value)
+
+                    if flow_value is None:
+                        continue
+
+                    flow_multiplier = parse_rollup_number(
+                        flow_answer.question.value_multiplier
+                    )
+                    if flow_multiplier is not None:
+                        flow_value *= flow_multiplier
+
+                    value = flow_value if value is None else value + flow_value
+
+            if value is not None:
+                rollup_values[response.id].append((question["id"], None, value))
+
+    for parsed_question_aggregate in parsed_question_aggregates:
+        question_aggregate = parsed_question_aggregate["parsed_question_aggregate"]
+        try:
+            aggregates = form.util.aggregate_answers_by_response(
+                question_aggregate,
+                responses,
+                parsed_question_aggregate["questions"],
+                answer_matrix,
+            )
+        except Exception:
+            # some aggregates can't be taken of a single response, stdev for one
+            continue
+
+        for response in responses:
+            value = aggregates[response.id]
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                rollup_values[response.id].append(
+                    (None, question_aggregate["id"], value)
+                )
+
+    return rollup_values
+
+
+def get_field_rollup_sources(
+    season: Season,
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """
+    Get the questions and aggregates field responses are rolled up by.
+
+    Args:
+        season: The season of the event being rolled up
+
+    Returns:
+        Tuple of the active parsed field questions and the parsed field aggregates
+    """
+    questions = [
+        entry["question"]
+        for entry in form.util.get_question_catalog("field", season.id)["entries"]
+        if entry["question"]["active"] == "y"
+    ]
+
+    return questions, get_parsed_field_question_aggregates(season)
+
+
+def get_eliminate_results_filter() -> Exists:
+    """
+    Filter for field responses by scouts whose results are eliminated from analysis.
+
+    Returns:
+        Exists expression to exclude from a FieldResponse queryset
+    """
+    return Exists(
+        UserInfo.objects.filter(
+            Q(user_id=OuterRef("user_id")) & Q(eliminate_results=True) & Q(void_ind="n")
+        )
+    )
+
+
+def add_rollup_value(rollup: FieldResponseRollup, value) -> None:
+    rollup.count += 1
+    rollup.sum += value
+    rollup.sum_sq += value * value
+    bisect.insort(rollup.samples, value)
+    rollup.min = rollup.samples[0]
+    rollup.max = rollup.samples[-1]
+
+
+def remove_rollup_value(rollup: FieldResponseRollup, value) -> bool:
+    index = bisect.bisect_left(rollup.samples, value)
+    if index >= len(rollup.samples) or rollup.samples[index] != value:
+        return False
+
+    rollup.samples.pop(index)
+    rollup.count -= 1
+    rollup.sum -= value
+    rollup.sum_sq -= value * value
+    rollup.min = rollup.samples[0] if len(rollup.samples) > 0 else None
+    rollup.max = rollup.samples[-1] if len(rollup.samples) > 0 else None
+    return True
+
+
+def update_field_response_rollups(
+    field_response: FieldResponse, remove: bool = False
+) -> None:
+    """
+    Add a field response's values to, or remove them from, its team's rollups.
+    Responses by scouts whose results are eliminated are left out. When a value
+    to remove is not in the rollup, the response no longer computes to what it
+    added, so the team's rollups are rebuilt instead.
+
+    Args:
+        field_response: The FieldResponse that was saved or voided
+        remove: True to take the response out of the rollups
+    """
+    if field_response.response is None:
+        return
+
+    if UserInfo.objects.filter(
+        Q(user_id=field_response.user_id) & Q(eliminate_results=True) & Q(void_ind="n")
+    ).exists():
+        return
+
+    questions, parsed_question_aggregates = get_field_rollup_sources(
+        field_response.event.season
+    )
+    rollup_values = get_field_response_rollup_values(
+        [field_response.response], questions, parsed_question_aggregates
+    )[field_response.response.id]
+
+    with transaction.atomic():
+        # Take the event lock record_field_response_change takes, the unique
+        # constraint does not stop duplicate rows while question or aggregate
+        # is null, so concurrent saves must not both create a missing rollup
+        Event.objects.select_for_update().filter(id=field_response.event_id).first()
+
+        rollups = {
+            (rollup.question_id, rollup.question_aggregate_id): rollup
+            for rollup in FieldResponseRollup.objects.select_for_update().filter(
+                Q(event_id=field_response.event_id) & Q(team_id=field_response.team_id)
+            )
+        }
+
+        stale = False
+        for question_id, question_aggregate_id, value in rollup_values:
+            rollup = rollups.get((question_id, question_aggregate_id), None)
+
+            if remove:
+                if rollup is None or not remove_rollup_value(rollup, value):
+                    stale = True
+                    continue
+            else:
+                if rollup is None:
+                    rollup = FieldResponseRollup(
+                        event_id=field_response.event_id,
+                        team_id=field_response.team_id,
+                        question_id=question_id,
+                        question_aggregate_id=question_aggregate_id,
+                        samples=[],
+                    )
+                add_rollup_value(rollup, value)
+
+            rollup.save()
+
+        if stale:
+            rebuild_field_response_rollups(
+                field_response.event, field_response.team_id
+            )
+
+
+def rebuild_field_response_rollups(
+    event: scouting.models.Event, team_id: int | None = None
+) -> int:
+    """
+    Rebuild the rollups of every team at an event from its field responses.
+
+    Args:
+        event: The Event to rebuild
+        team_id: Only rebuild this team's rollups
+
+    Returns:
+        Number of rollup rows written
+    """
+    q_team = Q()
+    if team_id is not None:
+        q_team = Q(team_id=team_id)
+
+    with transaction.atomic():
+        # Same event lock as update_field_response_rollups, so a response saved
+        # while rebuilding is not lost
+        Event.objects.select_for_update().filter(id=event.id).first()
+
+        field_responses = list(
+            FieldResponse.objects.select_related("response").filter(
+                Q(event=event)
+                & q_team
+                & Q(void_ind="n")
+                & Q(response__isnull=False)
+                & Q(response__void_ind="n")
+                & ~get_eliminate_results_filter()
+            )
+        )
+
+        questions, parsed_question_aggregates = get_field_rollup_sources(event.season)
+        rollup_values = get_field_response_rollup_values(
+            [field_response.response for field_response in field_responses],
+            questions,
+            parsed_question_aggregates,
+        )
+
+        rollups = {}
+        for field_response in field_responses:
+            for question_id, question_aggregate_id, value in rollup_values[
+                field_response.response_id
+            ]:
+                key = (field_response.team_id, question_id, question_aggregate_id)
+                if key not in rollups:
+                    rollups[key] = FieldResponseRollup(
+                        event=event,
+                        team_id=field_response.team_id,
+                        question_id=question_id,
+                        question_aggregate_id=question_aggregate_id,
+                        samples=[],
+                    )
+                add_rollup_value(rollups[key], value)
+
+        FieldResponseRollup.objects.filter(Q(event=event) & q_team).delete()
+        FieldResponseRollup.objects.bulk_create(rollups.values())
+
+    return len(rollups)
+
+
+def rebuild_current_field_response_rollups() -> None:
+    """
+    Rebuild the current event's rollups after the questions or aggregates they
+    are computed from changed. Nothing is rolled up without a current event.
+    """
+    try:
+        event = scouting.util.get_current_event()
+    except Exception:
+        return
+
+    rebuild_field_response_rollups(event)
+
+
+def get_team_rollups(
+    event: scouting.models.Event, team_ids: list[int]
+) -> dict[int, dict[str, dict[int, dict[str, Any]]]]:
+    """
+    Get the rolled up statistics of teams at an event.
+
+    Args:
+        event: The Event to read
+        team_ids: Team numbers to read
+
+    Returns:
+        Dictionary of team number to questions and question_aggregates, each a
+        dictionary of id to count, avg, median, stdev, min and max
+    """
+    team_rollups = {
+        team_id: {"questions": {}, "question_aggregates": {}} for team_id in team_ids
+    }
+
+    for rollup in FieldResponseRollup.objects.filter(
+        Q(event=event) & Q(team_id__in=team_ids) & Q(count__gt=0)
+    ):
+        variance = None
+        if rollup.count > 1:
+            variance = max(
+                0, (rollup.sum_sq - rollup.sum * rollup.sum / rollup.count)
+            ) / (rollup.count - 1)
+
+        stats = {
+            "count": rollup.count,
+            "avg": rollup.sum / rollup.count,
+            "median": statistics.median(rollup.samples),
+            "stdev": math.sqrt(variance) if variance is not None else None,
+            "min": rollup.min,
+            "max": rollup.max,
+        }
+
+        if rollup.question_id is not None:
+            team_rollups[rollup.team_id]["questions"][rollup.question_id] = stats
+        else:
+            team_rollups[rollup.team_id]["question_aggregates"][
+                rollup.question_aggregate_id
+            ] = stats
+
+    return team_rollups
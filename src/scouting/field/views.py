@@ -68,14 +68,20 @@ class ResponseColumnsView(APIView):
     def get(self, request, format=None):
         try:
             if has_access(request.user.id, [auth_obj, auth_view_obj]):
-                req = scouting.field.util.get_table_columns(
-                    scouting.field.util.get_field_question_aggregates(
-                        scouting.util.get_current_season()
-                    )
+                table_columns = scouting.field.util.get_cached_table_columns(
+                    scouting.util.get_current_season()
                 )
+                etag = f'"{table_columns["etag"]}"'
 
-                serializer = ColSerializer(req, many=True)
-                return Response(serializer.data)
+                # Clients polling with the columns they already have get a 304
+                if etag in [
+                    tag.strip().removeprefix("W/")
+                    for tag in request.headers.get("If-None-Match", "").split(",")
+                ]:
+                    return Response(status=304, headers={"ETag": etag})
+
+                serializer = ColSerializer(table_columns["columns"], many=True)
+                return Response(serializer.data, headers={"ETag": etag})
             else:
                 return ret_message(
                     "You do not have access.",
@@ -111,6 +117,8 @@ class ResponsesView(APIView):
                     after_scout_field_id=request.query_params.get(
                         "after_scout_field_id", None
                     ),
+                    cursor=request.query_params.get("cursor", None),
+                    after_sequence=request.query_params.get("after_sequence", None),
                 )
 
                 if type(req) == Response:
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+
+import scouting.field.util
+import scouting.util
+from scouting.models import Event
+
+
+class Command(BaseCommand):
+    help = "Rebuild the per team field response rollups of an event from scratch."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--event",
+            type=int,
+            help="Id of the event to rebuild, defaults to the current event.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            if options["event"] is not None:
+                event = Event.objects.get(id=options["event"])
+            else:
+                event = scouting.util.get_current_event()
+        except Event.DoesNotExist:
+            raise CommandError(f"Event {options['event']} does not exist.")
+        except Exception as e:
+            raise CommandError(str(e))
+
+        count = scouting.field.util.rebuild_field_response_rollups(event)
+
+        self.stdout.write(f"Rebuilt {count} rollups for {event.event_nm}.")
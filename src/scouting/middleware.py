@@ -0,0 +1,15 @@
+import scouting.util
+
+
+class CurrentSeasonEventMiddleware:
+    """
+    Resolves the current season and event at most once per request, however
+    many times the request looks them up.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with scouting.util.current_season_event_request():
+            return self.get_response(request)
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.15 on 2026-10-18 05:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('form', '0065_flow_form_based'),
+        ('scouting', '0071_userseason'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FieldResponseRollup',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('count', models.IntegerField(default=0)),
+                ('sum', models.FloatField(default=0)),
+                ('sum_sq', models.FloatField(default=0)),
+                ('min', models.FloatField(null=True)),
+                ('max', models.FloatField(null=True)),
+                ('samples', models.JSONField(default=list)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='scouting.event')),
+                ('question', models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, to='form.question')),
+                ('question_aggregate', models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, to='form.questionaggregate')),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='scouting.team')),
+            ],
+            options={
+                'unique_together': {('event', 'team', 'question', 'question_aggregate')},
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.15 on 2026-10-18 06:03
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scouting', '0072_fieldresponserollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FieldResponseChange',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('change_typ', models.CharField(max_length=10)),
+                ('time', models.DateTimeField(default=django.utils.timezone.now)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='scouting.event')),
+                ('field_response', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='scouting.fieldresponse')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['event', 'id'], name='scouting_fi_event_i_c91bc9_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.15 on 2026-10-18 06:11
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scouting', '0073_fieldresponsechange'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CurrentSeasonEvent',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('version', models.IntegerField(default=0)),
+                ('time', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+    ]
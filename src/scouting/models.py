@@ -59,6 +59,17 @@ class Event(models.Model):
         return f"{self.id} : {self.event_nm} : {self.season}"
 
 
+class CurrentSeasonEvent(models.Model):
+    id = models.AutoField(primary_key=True)
+    # Bumped when the current season or event changes or is edited so each
+    # process can tell its cached copy is stale
+    version = models.IntegerField(default=0)
+    time = models.DateTimeField(default=now)
+
+    def __str__(self):
+        return f"{self.id} : {self.version}"
+
+
 class EventTeamInfo(models.Model):
     event = models.ForeignKey(Event, models.PROTECT)
     team = models.ForeignKey(Team, models.PROTECT)
@@ -151,6 +162,44 @@ class FieldResponse(models.Model):
         return f"{self.id} : {self.team} : {self.match} : {self.event} : {self.user}"
 
 
+class FieldResponseChange(models.Model):
+    # The id is the sequence clients sync field responses from
+    id = models.AutoField(primary_key=True)
+    event = models.ForeignKey(Event, models.PROTECT)
+    field_response = models.ForeignKey(FieldResponse, models.PROTECT)
+    # insert or void
+    change_typ = models.CharField(max_length=10)
+    time = models.DateTimeField(default=now)
+
+    class Meta:
+        indexes = [models.Index(fields=["event", "id"])]
+
+    def __str__(self):
+        return f"{self.id} : {self.change_typ} : {self.field_response_id}"
+
+
+class FieldResponseRollup(models.Model):
+    id = models.AutoField(primary_key=True)
+    event = models.ForeignKey(Event, models.PROTECT)
+    team = models.ForeignKey(Team, models.PROTECT)
+    question = models.ForeignKey(form.models.Question, models.PROTECT, null=True)
+    question_aggregate = models.ForeignKey(
+        form.models.QuestionAggregate, models.PROTECT, null=True
+    )
+    count = models.IntegerField(default=0)
+    sum = models.FloatField(default=0)
+    sum_sq = models.FloatField(default=0)
+    min = models.FloatField(null=True)
+    max = models.FloatField(null=True)
+    samples = models.JSONField(default=list)
+
+    class Meta:
+        unique_together = (("event", "team", "question", "question_aggregate"),)
+
+    def __str__(self):
+        return f"{self.id} : {self.event} : {self.team} : {self.question} : {self.question_aggregate}"
+
+
 class PitResponse(models.Model):
     id = models.AutoField(primary_key=True)
     response = models.ForeignKey(form.models.Response, models.PROTECT)
@@ -4,8 +4,10 @@ from .views import (
     MatchStrategyView,
     AllianceSelectionView,
     GraphTeamView,
+    TeamRollupsView,
     DashboardView,
     DashboardViewTypeView,
+    LiveUpdatesView,
 )
 
 app_name = "scouting_strategizing"
@@ -15,6 +17,8 @@ urlpatterns = [
     path("match-strategy/", MatchStrategyView.as_view(), name="match-strategy"),
     path("alliance-selection/", AllianceSelectionView.as_view(), name="alliance-selection"),
     path("graph-team/", GraphTeamView.as_view(), name="graph-team"),
+    path("team-rollups/", TeamRollupsView.as_view(), name="team-rollups"),
     path("dashboard/", DashboardView.as_view(), name="dashboard"),
     path("dashboard-view-types/", DashboardViewTypeView.as_view(), name="dashboard-view-types"),
+    path("live-updates/", LiveUpdatesView.as_view(), name="live-updates"),
 ]
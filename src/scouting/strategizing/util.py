@@ -6,6 +6,7 @@ from django.db import transaction
 import alerts.util
 import general.cloudinary
 import scouting
+import scouting.field.util
 import scouting.util
 from general.security import ret_message
 from scouting.models import (
@@ -129,27 +130,18 @@ def get_match_strategies(
     if event is not None:
         q_event = Q(match__event=event)
 
-    match_strategies = (
-        MatchStrategy.objects.prefetch_related(
-            "match__event",
-            "match__blue_one",
-            "match__blue_two",
-            "match__blue_three",
-            "match__red_one",
-            "match__red_two",
-            "match__red_three",
-            "match__fieldresponse_set",
-            "match__blue_one__eventteaminfo_set",
-            "match__blue_two__eventteaminfo_set",
-            "match__blue_three__eventteaminfo_set",
-            "match__red_one__eventteaminfo_set",
-            "match__red_two__eventteaminfo_set",
-            "match__red_three__eventteaminfo_set",
+    match_strategies = list(
+        MatchStrategy.objects.select_related(
+            "user", "match__event", "match__comp_level"
         )
         .filter(q_match_id & q_event & Q(void_ind="n"))
         .order_by("-time")
     )
 
+    scouting.util.load_match_board(
+        [ms.match for ms in match_strategies if ms.match is not None]
+    )
+
     parsed_match_strategies = []
     for ms in match_strategies:
         parsed_match_strategies.append(
@@ -267,28 +259,46 @@ def graph_team(
     Returns:
         List of graph data structures appropriate for the graph type
     """
+    # ids arrive as strings from the query string, responses are keyed by int
+    team_ids = [int(team_id) for team_id in team_ids]
+    has_reference_team = reference_team_id is not None and reference_team_id != "null"
+    if has_reference_team:
+        reference_team_id = int(reference_team_id)
+
+    # load the responses of every team in one query
+    graph_team_ids = set(team_ids)
+    if has_reference_team:
+        graph_team_ids.add(reference_team_id)
+
+    team_responses = {team_id: [] for team_id in graph_team_ids}
+    for resp in FieldResponse.objects.select_related("response").filter(
+        Q(team_id__in=graph_team_ids)
+        & Q(void_ind="n")
+        & Q(event=scouting.util.get_current_event())
+    ):
+        team_responses[resp.team_id].append(resp.response)
+
+    # parse the graph and load its answers once for all teams
+    parsed_graph = form.util.get_graphs(graph_id=graph.id)[0]
+    answer_matrix = form.util.get_answer_matrix(
+        set(
+            response.id
+            for responses in team_responses.values()
+            for response in responses
+        ),
+        form.util.get_graph_question_ids(parsed_graph),
+    )
+
     all_graphs = []
     for team_id in team_ids:
-        responses = [
-            resp.response
-            for resp in FieldResponse.objects.filter(
-                Q(team_id=team_id)
-                & Q(void_ind="n")
-                & Q(event=scouting.util.get_current_event())
-            )
-        ]
+        responses = team_responses[team_id]
         aggregate_responses = None
-        if reference_team_id is not None and reference_team_id != "null":
-            aggregate_responses = [
-                resp.response
-                for resp in FieldResponse.objects.filter(
-                    Q(team_id=reference_team_id)
-                    & Q(void_ind="n")
-                    & Q(event=scouting.util.get_current_event())
-                )
-            ]
+        if has_reference_team:
+            aggregate_responses = team_responses[reference_team_id]
 
-        team_graph = form.util.graph_responses(graph.id, responses, aggregate_responses)
+        team_graph = form.util.graph_responses(
+            graph.id, responses, aggregate_responses, parsed_graph, answer_matrix
+        )
 
         if len(team_ids) <= 1:
             all_graphs = team_graph
@@ -326,6 +336,23 @@ def graph_team(
     return all_graphs
 
 
+def get_team_rollups(team_ids: list[int]) -> dict[int, dict[str, Any]]:
+    """
+    Get the rolled up field statistics of teams at the current event, read from
+    the rollup table rather than recomputed from answers.
+
+    Args:
+        team_ids: List of team numbers to read
+
+    Returns:
+        Dictionary of team number to question and question aggregate stats,
+        see scouting.field.util.get_team_rollups
+    """
+    return scouting.field.util.get_team_rollups(
+        scouting.util.get_current_event(), [int(team_id) for team_id in team_ids]
+    )
+
+
 def serialize_graph_team(
     graph_id: int, team_ids: list[int], reference_team_id: int | None = None
 ) -> list[dict[str, Any]]:
@@ -530,3 +557,31 @@ def get_dashboard_view_types() -> QuerySet[DashboardViewType]:
         QuerySet of DashboardViewType objects
     """
     return DashboardViewType.objects.all()
+
+
+def get_live_update_backlog(event: Event, after_sequence: int) -> list[dict[str, Any]]:
+    """
+    Get the field response changes a live updates client missed while it was
+    disconnected.
+
+    Args:
+        event: The Event the client is following
+        after_sequence: The last sequence the client received
+
+    Returns:
+        Field response messages in sequence order, or a single resync message
+        if the client missed more than one batch of changes
+    """
+    changes = scouting.field.util.get_field_response_changes(event, after_sequence)
+
+    if len(changes) >= scouting.field.util.field_response_changes_limit:
+        return [{"typ": "resync", "data": {}, "sequence": None}]
+
+    return [
+        {
+            "typ": "field-response",
+            "data": scouting.field.util.format_field_response_change(change),
+            "sequence": change.id,
+        }
+        for change in changes
+    ]
@@ -1,9 +1,14 @@
+from asgiref.sync import sync_to_async
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.authentication import JWTAuthentication
+from django.core.handlers.asgi import ASGIRequest
 from django.db import transaction
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views import View
 
+import general.pubsub
 from general.security import ret_message, has_access
 import scouting.strategizing
 from scouting.serializers import (
@@ -253,6 +258,37 @@ class GraphTeamView(APIView):
             )
 
 
+class TeamRollupsView(APIView):
+    """API endpoint to get the rolled up field statistics of teams"""
+
+    endpoint = "team-rollups/"
+    authentication_classes = (JWTAuthentication,)
+    permission_classes = (IsAuthenticated,)
+
+    def get(self, request, format=None):
+        try:
+            if has_access(request.user.id, auth_obj):
+                data = scouting.strategizing.util.get_team_rollups(
+                    request.query_params.getlist("team_ids", []),
+                )
+                return Response(data)
+            else:
+                return ret_message(
+                    "You do not have access.",
+                    True,
+                    app_url + self.endpoint,
+                    request.user.id,
+                )
+
+        except Exception as e:
+            return ret_message(
+                "An error occurred while getting team rollups.",
+                True,
+                app_url + self.endpoint,
+                exception=e,
+            )
+
+
 class DashboardView(APIView):
     """
     API endpoint to manage dashboards
@@ -351,3 +387,104 @@ class DashboardViewTypeView(APIView):
                 -1,
                 e,
             )
+
+
+class LiveUpdatesView(View):
+    """
+    API endpoint streaming live updates for the current event as server sent
+    events. Streams wait on the event loop, so this is refused unless served by
+    the ASGI application. EventSource cannot send headers, so the access token
+    can be passed as the token query parameter.
+    """
+
+    endpoint = "live-updates/"
+    # Seconds between comments that keep idle proxies from closing the stream
+    keepalive_seconds = 15
+
+    async def get(self, request, format=None):
+        user_id = -1
+        try:
+            # WSGI buffers the whole never ending stream, holding a worker forever
+            if not isinstance(request, ASGIRequest):
+                ret = await sync_to_async(ret_message)(
+                    "Live updates are only served by the ASGI application.",
+                    True,
+                    app_url + self.endpoint,
+                    user_id,
+                )
+                return JsonResponse(ret.data, status=503)
+
+            auth = await sync_to_async(self.authenticate)(request)
+            user_id = auth[0].id if auth is not None else -1
+
+            if auth is not None and await sync_to_async(has_access)(
+                user_id, [auth_obj, auth_view_obj_scout_field]
+            ):
+                event = await sync_to_async(scouting.util.get_current_event)()
+
+                # Reconnecting EventSources send the last id they received
+                after_sequence = request.headers.get(
+                    "Last-Event-ID", request.GET.get("after_sequence", None)
+                )
+                if after_sequence is not None:
+                    after_sequence = int(after_sequence)
+
+                response = StreamingHttpResponse(
+                    self.stream(event, after_sequence),
+                    content_type="text/event-stream",
+                )
+                response["Cache-Control"] = "no-cache"
+                response["X-Accel-Buffering"] = "no"
+                return response
+            else:
+                ret = await sync_to_async(ret_message)(
+                    "You do not have access.",
+                    True,
+                    app_url + self.endpoint,
+                    user_id,
+                )
+                return JsonResponse(ret.data)
+        except Exception as e:
+            ret = await sync_to_async(ret_message)(
+                "An error occurred while streaming live updates.",
+                True,
+                app_url + self.endpoint,
+                user_id,
+                e,
+            )
+            return JsonResponse(ret.data)
+
+    def authenticate(self, request):
+        jwt_authentication = JWTAuthentication()
+        token = request.GET.get("token", None)
+        if token is None:
+            return jwt_authentication.authenticate(request)
+
+        validated_token = jwt_authentication.get_validated_token(token)
+        return jwt_authentication.get_user(validated_token), validated_token
+
+    async def stream(self, event, after_sequence):
+        # Subscribe before loading the backlog so no change falls between them
+        subscription = general.pubsub.get_broker().subscribe(
+            scouting.util.get_event_channel(event.id)
+        )
+        try:
+            yield "retry: 5000\n\n"
+
+            sequence = 0
+            if after_sequence is not None:
+                sequence = after_sequence
+                for message in await sync_to_async(
+                    scouting.strategizing.util.get_live_update_backlog
+                )(event, after_sequence):
+                    yield general.pubsub.format_server_sent_event(message)
+                    sequence = message["sequence"] or sequence
+
+            while True:
+                message = await subscription.get(self.keepalive_seconds)
+                if message is None:
+                    yield ": keepalive\n\n"
+                elif message["sequence"] is None or message["sequence"] > sequence:
+                    yield general.pubsub.format_server_sent_event(message)
+        finally:
+            subscription.close()
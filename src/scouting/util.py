@@ -1,8 +1,16 @@
 from typing import Any
-from django.db.models import Q, Case, When, OuterRef, Subquery, Exists, QuerySet
+import contextlib
+import contextvars
+import copy
+import time
+from django.db import transaction
+from django.db.models import F, Q, Case, When, OuterRef, Exists, QuerySet
+from django.utils import timezone
 
 import general.cloudinary
+import general.pubsub
 from scouting.models import (
+    CurrentSeasonEvent,
     Event,
     EventTeamInfo,
     Match,
@@ -62,6 +70,125 @@ def get_or_create_season(year: str) -> Season:
     return season
 
 
+# The current season and event cached for the process, with the current season
+# event version they were loaded at and when that version was last checked
+_current_season_event: dict[str, Any] = {
+    "version": None,
+    "checked": None,
+    "season": None,
+    "event": None,
+}
+current_season_event_check_seconds = 5
+
+# The current season and event resolved for the request being handled
+_request_season_event: contextvars.ContextVar[dict[str, Any] | None] = (
+    contextvars.ContextVar("request_season_event", default=None)
+)
+
+
+def invalidate_current_season_event():
+    """
+    Drop the cached current season and event, forcing the next lookup to reload.
+    """
+    _current_season_event["version"] = None
+    _current_season_event["checked"] = None
+    _current_season_event["season"] = None
+    _current_season_event["event"] = None
+
+    request_season_event = _request_season_event.get()
+    if request_season_event is not None:
+        request_season_event.clear()
+
+
+def current_season_event_changed():
+    """
+    Invalidate the current season and event now and again once the current
+    transaction commits. The shared version is bumped so other processes drop
+    their copies too.
+    """
+    updated = CurrentSeasonEvent.objects.filter(id=1).update(
+        version=F("version") + 1, time=timezone.now()
+    )
+    if updated == 0:
+        CurrentSeasonEvent(id=1, version=1).save()
+
+    invalidate_current_season_event()
+    transaction.on_commit(invalidate_current_season_event)
+
+
+@contextlib.contextmanager
+def current_season_event_request():
+    """
+    Resolve the current season and event at most once while handling a request.
+    """
+    token = _request_season_event.set({})
+    try:
+        yield
+    finally:
+        _request_season_event.reset(token)
+
+
+def get_current_season_event() -> dict[str, Any]:
+    """
+    Get the current season and event. They are cached for the process and
+    reloaded when the shared version changed, which is re-read at most every
+    current_season_event_check_seconds. Within a request every call gets the
+    same copies.
+
+    Returns:
+        Dictionary containing:
+            - season: The current Season, None if no season is set
+            - event: The current Event of that season, None if no event is set
+    """
+    request_season_event = _request_season_event.get()
+    if request_season_event:
+        return request_season_event
+
+    if (
+        _current_season_event["checked"] is None
+        or time.monotonic() - _current_season_event["checked"]
+        > current_season_event_check_seconds
+    ):
+        version = (
+            CurrentSeasonEvent.objects.filter(id=1)
+            .values_list("version", flat=True)
+            .first()
+            or 0
+        )
+        if version != _current_season_event["version"]:
+            try:
+                season = Season.objects.get(current="y")
+            except Season.DoesNotExist:
+                season = None
+
+            try:
+                event = (
+                    Event.objects.select_related("season").get(
+                        Q(season=season) & Q(current="y")
+                    )
+                    if season is not None
+                    else None
+                )
+            except Event.DoesNotExist:
+                event = None
+
+            _current_season_event["season"] = season
+            _current_season_event["event"] = event
+            _current_season_event["version"] = version
+
+        _current_season_event["checked"] = time.monotonic()
+
+    # Callers get their own copies, they may change and save them
+    season_event = {
+        "season": copy.deepcopy(_current_season_event["season"]),
+        "event": copy.deepcopy(_current_season_event["event"]),
+    }
+    if request_season_event is not None:
+        request_season_event.update(season_event)
+
+    return season_event
+
+
 def get_current_season() -> Season:
     """
     Get the currently active season.
@@ -72,12 +199,12 @@ def get_current_season() -> Season:
     Raises:
         Exception: If no season is set as current
     """
-    try:
-        current_season = Season.objects.get(current="y")
-        return current_season
-    except Season.DoesNotExist as e:
+    current_season = get_current_season_event()["season"]
+    if current_season is None:
         raise Exception("No season set, see an admin.")
 
+    return current_season
+
 
 def get_all_events() -> QuerySet[Event]:
     """
@@ -99,12 +226,14 @@ def get_current_event() -> Event:
     Raises:
         Exception: If no event is set as current for the current season
     """
-    try:
-        event = Event.objects.get(Q(season=get_current_season()) & Q(current="y"))
-        return event
-    except Event.DoesNotExist as e:
+    get_current_season()
+
+    event = get_current_season_event()["event"]
+    if event is None:
         raise Exception("No event set, see an admin.")
 
+    return event
+
 
 def get_event(event_cd: str) -> Event:
     """
@@ -136,6 +265,34 @@ def get_events(season: Season) -> QuerySet[Event]:
     return event
 
 
+def get_event_channel(event_id: int) -> str:
+    """
+    Get the pub/sub channel live updates for an event are published on.
+
+    Args:
+        event_id: The id of the event
+
+    Returns:
+        The channel name
+    """
+    return f"scouting.event.{event_id}"
+
+
+def publish_event_update(
+    event_id: int, typ: str, data: dict[str, Any], sequence: int | None = None
+):
+    """
+    Publish a live update for an event once the current transaction commits.
+
+    Args:
+        event_id: The id of the event that changed
+        typ: field-response, match or rank
+        data: Compact description of the change
+        sequence: The field response change sequence, if any
+    """
+    general.pubsub.publish(get_event_channel(event_id), typ, data, sequence)
+
+
 def get_teams(current: bool) -> list[dict[str, Any]]:
     """
     Get teams, optionally filtered to the current event.
@@ -468,80 +625,91 @@ def parse_schedule(s: Schedule):
 
 
 def get_matches(event: Event):
-
     matches = (
-        Match.objects.annotate(
-            blue_one_rank=Subquery(rank_query("blue_one")),
-            blue_two_rank=Subquery(rank_query("blue_two")),
-            blue_three_rank=Subquery(rank_query("blue_three")),
-            red_one_rank=Subquery(rank_query("red_one")),
-            red_two_rank=Subquery(rank_query("red_two")),
-            red_three_rank=Subquery(rank_query("red_three")),
-            blue_one_field_response=Exists(field_response_query("blue_one")),
-            blue_two_field_response=Exists(field_response_query("blue_two")),
-            blue_three_field_response=Exists(field_response_query("blue_three")),
-            red_one_field_response=Exists(field_response_query("red_one")),
-            red_two_field_response=Exists(field_response_query("red_two")),
-            red_three_field_response=Exists(field_response_query("red_three")),
-        )
-        # .prefetch_related("event", "blue_one", "blue_two", "blue_three", "red_one", "red_two", "red_three",
-        #                  "fieldresponse_set",
-        #                  "blue_one__eventteaminfo_set", "blue_two__eventteaminfo_set", "blue_three__eventteaminfo_set", "red_one__eventteaminfo_set", "red_two__eventteaminfo_set", "red_three__eventteaminfo_set")
-        .filter(Q(event=event) & Q(void_ind="n")).order_by(
-            "comp_level__comp_lvl_order", "match_number"
-        )
+        Match.objects.select_related("event", "comp_level")
+        .filter(Q(event=event) & Q(void_ind="n"))
+        .order_by("comp_level__comp_lvl_order", "match_number")
     )
 
-    parsed_matches = []
+    return get_match_board(matches)
+
+
+match_team_slots = [
+    "blue_one",
+    "blue_two",
+    "blue_three",
+    "red_one",
+    "red_two",
+    "red_three",
+]
+
+
+def get_match_board(matches: QuerySet[Match] | list[Match]) -> list[dict[str, Any]]:
+    """
+    Parse matches with their teams' ranks and field response presence,
+    loading the whole board in three queries.
+
+    Args:
+        matches: The matches, in the order they are returned
+
+    Returns:
+        List of parsed match dictionaries, see parse_match
+    """
+    matches = list(matches)
+    load_match_board(matches)
+
+    return [parse_match(m) for m in matches]
+
+
+def load_match_board(matches: list[Match]) -> None:
+    """
+    Load the ranks and field response presence of every team slot of the
+    matches and attach them to each match as its board.
+
+    Args:
+        matches: The matches to load
+    """
+    if len(matches) == 0:
+        return
+
+    ranks = {
+        (event_id, team_id): rank
+        for event_id, team_id, rank in EventTeamInfo.objects.filter(
+            Q(event_id__in=set(m.event_id for m in matches)) & Q(void_ind="n")
+        ).values_list("event_id", "team_id", "rank")
+    }
+
+    # Any response counts towards scout_field_result, only active ones per team
+    matches_with_responses = set()
+    match_team_responses = set()
+    for match_id, team_id, void_ind in (
+        FieldResponse.objects.filter(match_id__in=[m.match_key for m in matches])
+        .values_list("match_id", "team_id", "void_ind")
+        .distinct()
+    ):
+        matches_with_responses.add(match_id)
+        if void_ind == "n":
+            match_team_responses.add((match_id, team_id))
+
     for m in matches:
-        parsed_matches.append(parse_match(m))
+        board = {"scout_field_result": m.match_key in matches_with_responses}
+        for slot in match_team_slots:
+            team_id = getattr(m, f"{slot}_id")
+            board[f"{slot}_rank"] = ranks.get((m.event_id, team_id), None)
+            board[f"{slot}_field_response"] = (
+                m.match_key,
+                team_id,
+            ) in match_team_responses
 
-    return parsed_matches
+        m.board = board
 
 
 def parse_match(in_match: Match):
-    # print (in_match)
-    blue_one_rank = get_rank(
-        in_match.blue_one, in_match.event, getattr(in_match, "blue_one_rank", None)
-    )
-    blue_two_rank = get_rank(
-        in_match.blue_two, in_match.event, getattr(in_match, "blue_two_rank", None)
-    )
-    blue_three_rank = get_rank(
-        in_match.blue_three, in_match.event, getattr(in_match, "blue_three_rank", None)
-    )
-    red_one_rank = get_rank(
-        in_match.red_one, in_match.event, getattr(in_match, "red_one_rank", None)
-    )
-    red_two_rank = get_rank(
-        in_match.red_two, in_match.event, getattr(in_match, "red_two_rank", None)
-    )
-    red_three_rank = get_rank(
-        in_match.red_three, in_match.event, getattr(in_match, "red_three_rank", None)
-    )
+    # Matches parsed on their own load their board here
+    if getattr(in_match, "board", None) is None:
+        load_match_board([in_match])
 
-    blue_one_field_response = get_match_team_has_response(
-        in_match, in_match.blue_one, getattr(in_match, "blue_one_field_response", None)
-    )
-    blue_two_field_response = get_match_team_has_response(
-        in_match, in_match.blue_two, getattr(in_match, "blue_two_field_response", None)
-    )
-    blue_three_field_response = get_match_team_has_response(
-        in_match,
-        in_match.blue_three,
-        getattr(in_match, "blue_three_field_response", None),
-    )
-    red_one_field_response = get_match_team_has_response(
-        in_match, in_match.red_one, getattr(in_match, "red_one_field_response", None)
-    )
-    red_two_field_response = get_match_team_has_response(
-        in_match, in_match.red_two, getattr(in_match, "red_two_field_response", None)
-    )
-    red_three_field_response = get_match_team_has_response(
-        in_match,
-        in_match.red_three,
-        getattr(in_match, "red_three_field_response", None),
-    )
+    board = in_match.board
 
     return {
         "match_key": in_match.match_key,
@@ -551,58 +719,28 @@ def parse_match(in_match: Match):
         "blue_score": in_match.blue_score,
         "time": in_match.time,
         "blue_one_id": in_match.blue_one_id,
-        "blue_one_rank": blue_one_rank,
-        "blue_one_field_response": blue_one_field_response,
+        "blue_one_rank": board["blue_one_rank"],
+        "blue_one_field_response": board["blue_one_field_response"],
         "blue_two_id": in_match.blue_two_id,
-        "blue_two_rank": blue_two_rank,
-        "blue_two_field_response": blue_two_field_response,
+        "blue_two_rank": board["blue_two_rank"],
+        "blue_two_field_response": board["blue_two_field_response"],
         "blue_three_id": in_match.blue_three_id,
-        "blue_three_rank": blue_three_rank,
-        "blue_three_field_response": blue_three_field_response,
+        "blue_three_rank": board["blue_three_rank"],
+        "blue_three_field_response": board["blue_three_field_response"],
         "red_one_id": in_match.red_one_id,
-        "red_one_rank": red_one_rank,
-        "red_one_field_response": red_one_field_response,
+        "red_one_rank": board["red_one_rank"],
+        "red_one_field_response": board["red_one_field_response"],
         "red_two_id": in_match.red_two_id,
-        "red_two_rank": red_two_rank,
-        "red_two_field_response": red_two_field_response,
+        "red_two_rank": board["red_two_rank"],
+        "red_two_field_response": board["red_two_field_response"],
         "red_three_id": in_match.red_three_id,
-        "red_three_rank": red_three_rank,
-        "red_three_field_response": red_three_field_response,
+        "red_three_rank": board["red_three_rank"],
+        "red_three_field_response": board["red_three_field_response"],
         "comp_level": in_match.comp_level,
-        "scout_field_result": len(in_match.fieldresponse_set.all()) > 0,
+        "scout_field_result": board["scout_field_result"],
     }
 
 
-def rank_query(outer_ref: str):
-    return EventTeamInfo.objects.filter(
-        Q(event=OuterRef("event")) & Q(void_ind="n") & Q(team=OuterRef(outer_ref))
-    ).values("rank")[:1]
-
-
-def field_response_query(outer_ref):
-    return FieldResponse.objects.filter(
-        Q(void_ind="n")
-        & Q(team=OuterRef(outer_ref))
-        & Q(event=OuterRef("event"))
-        & Q(match_id=OuterRef("pk"))
-    )
-
-
-def get_rank(team: Team, event: Event, rank=None):
-    if rank is None:
-        eti = get_event_team_info(team, event)
-        rank = None if eti is None else eti.rank
-
-    return rank
-
-
-def get_match_team_has_response(match: Match, team: Team, has_response=None):
-    if has_response is None:
-        return match_team_has_result(match, team)
-
-    return has_response
-
-
 def get_event_team_info(team: Team, event: Event):
     try:
         info = team.eventteaminfo_set.get(Q(event=event) & Q(void_ind="n"))
@@ -612,10 +750,6 @@ def get_event_team_info(team: Team, event: Event):
     return info
 
 
-def match_team_has_result(match: Match, team: Team) -> bool:
-    return len(match.fieldresponse_set.filter(Q(void_ind="n") & Q(team=team))) > 0
-
-
 def get_scout_field_schedule(id):
     return FieldSchedule.objects.get(id=id)
 
@@ -0,0 +1,186 @@
+import hmac
+import json
+import time
+from hashlib import sha256
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+
+import tba.util
+from scouting.models import CompetitionLevel, Event, Season
+from tba.replay import ReplayServer, build_district
+from tba.views import WebhookView
+
+
+class Command(BaseCommand):
+    help = (
+        "Time the TBA syncs and a webhook burst against a local replay of a "
+        "synthetic district, The Blue Alliance is never contacted and every "
+        "database change is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--teams", type=int, default=60)
+        parser.add_argument("--events", type=int, default=10)
+        parser.add_argument("--matches", type=int, default=1200)
+        parser.add_argument("--webhooks", type=int, default=200)
+        parser.add_argument(
+            "--latency", type=float, default=0.05, help="Seconds per TBA request"
+        )
+        parser.add_argument("--no-etags", action="store_true")
+        parser.add_argument("--season", default="2050")
+        parser.add_argument("--seed", type=int, default=3492)
+
+    def handle(self, *args, **options):
+        responses = build_district(
+            options["teams"],
+            options["events"],
+            options["matches"],
+            options["season"],
+            options["seed"],
+        )
+        server = ReplayServer(
+            responses, options["latency"], not options["no_etags"]
+        )
+
+        self.stdout.write(
+            f"{options['teams']} teams, {options['events']} events, "
+            f"{options['matches']} matches, {options['latency']}s latency, "
+            f"etags {'off' if options['no_etags'] else 'on'}"
+        )
+        self.stdout.write(f"{'step':<28}{'seconds':>10}{'queries':>10}{'requests':>10}")
+
+        url = tba.util.tba_url
+        with server:
+            tba.util.tba_url = server.url
+            try:
+                with transaction.atomic():
+                    self.run_steps(server, options)
+                    transaction.set_rollback(True)
+            finally:
+                tba.util.tba_url = url
+
+    def run_steps(self, server, options):
+        CompetitionLevel.objects.get_or_create(
+            comp_lvl_typ="qm",
+            defaults={"comp_lvl_typ_nm": "Qualification", "comp_lvl_order": 1},
+        )
+        season = Season.objects.filter(season=options["season"]).first()
+        if season is None:
+            season = Season.objects.create(season=options["season"], current="n")
+
+        self.step("sync_season cold", server, lambda: tba.util.sync_season(season.id))
+        self.step("sync_season warm", server, lambda: tba.util.sync_season(season.id))
+
+        event_cd = f"{options['season']}dst0"
+        Event.objects.filter(current="y").update(current="n")
+        Event.objects.filter(event_cd=event_cd).update(current="y")
+        event = Event.objects.get(event_cd=event_cd)
+
+        self.step(
+            "sync_event warm", server, lambda: tba.util.sync_event(season, event_cd)
+        )
+        teams = server.responses[f"/event/{event_cd}/teams"]
+        server.update(
+            f"/event/{event_cd}/teams",
+            [{**team, "nickname": f"Renamed {team['team_number']}"} for team in teams],
+        )
+        self.step(
+            "sync_event renamed roster",
+            server,
+            lambda: tba.util.sync_event(season, event_cd),
+        )
+
+        self.step("sync_matches cold", server, lambda: tba.util.sync_matches(event))
+        self.step("sync_matches warm", server, lambda: tba.util.sync_matches(event))
+        matches = server.responses[f"/event/{event_cd}/matches"]
+        server.update(
+            f"/event/{event_cd}/matches",
+            [
+                self.rescore(tba_match) if i % 10 == 0 else tba_match
+                for i, tba_match in enumerate(matches)
+            ],
+        )
+        self.step(
+            "sync_matches rescored", server, lambda: tba.util.sync_matches(event)
+        )
+
+        self.step(
+            "sync_event_team_info cold",
+            server,
+            lambda: tba.util.sync_event_team_info(1),
+        )
+        self.step(
+            "sync_event_team_info warm",
+            server,
+            lambda: tba.util.sync_event_team_info(1),
+        )
+
+        factory = APIRequestFactory()
+        view = WebhookView.as_view()
+        posts = [
+            self.match_score(event, matches[i % len(matches)], i)
+            for i in range(options["webhooks"])
+        ]
+        self.step(
+            f"webhook burst {len(posts)}",
+            server,
+            lambda: [
+                view(
+                    factory.post(
+                        "/tba/webhook/",
+                        body,
+                        content_type="application/json",
+                        HTTP_X_TBA_HMAC=signature,
+                    )
+                )
+                for body, signature in posts
+            ],
+        )
+        self.step("process_messages", server, tba.util.process_messages)
+
+    def step(self, name, server, fn):
+        requests = server.requests
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            fn()
+            elapsed = time.perf_counter() - start
+
+        self.stdout.write(
+            f"{name:<28}{elapsed:>10.3f}{len(queries.captured_queries):>10}"
+            f"{server.requests - requests:>10}"
+        )
+
+    def rescore(self, tba_match):
+        alliances = tba_match["alliances"]
+        return {
+            **tba_match,
+            "alliances": {
+                "red": {**alliances["red"], "score": alliances["red"]["score"] + 1},
+                "blue": alliances["blue"],
+            },
+        }
+
+    def match_score(self, event, tba_match, i):
+        tba_match = {
+            **self.rescore(tba_match),
+            "time": tba_match["time"] + i,
+        }
+        data = {
+            "message_type": "match_score",
+            "message_data": {
+                "event_key": event.event_cd,
+                "match_key": tba_match["key"],
+                "event_name": event.event_nm,
+                "match": tba_match,
+            },
+        }
+        signature = hmac.new(
+            settings.TBA_WEBHOOK_SECRET.encode("utf-8"),
+            json.dumps(data, ensure_ascii=True).encode("utf-8"),
+            sha256,
+        ).hexdigest()
+        return json.dumps(data), signature
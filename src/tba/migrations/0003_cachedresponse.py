@@ -0,0 +1,25 @@
+# Generated by Django 5.2.15 on 2026-10-18 06:19
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tba', '0002_message_processed'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CachedResponse',
+            fields=[
+                ('url_hash', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('url', models.TextField()),
+                ('etag', models.CharField(blank=True, max_length=4000, null=True)),
+                ('last_modified', models.CharField(blank=True, max_length=4000, null=True)),
+                ('body', models.TextField()),
+                ('time', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+    ]
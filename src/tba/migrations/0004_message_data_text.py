@@ -0,0 +1,18 @@
+# Generated by Django 5.2.15 on 2026-10-18 06:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tba', '0003_cachedresponse'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='message',
+            name='message_data',
+            field=models.TextField(blank=True, null=True),
+        ),
+    ]
@@ -5,10 +5,27 @@ from django.db import models
 class Message(models.Model):
     message_id = models.AutoField(primary_key=True)
     message_type = models.CharField(max_length=4000, blank=True, null=True)
-    message_data = models.CharField(max_length=4000, blank=True, null=True)
+    message_data = models.TextField(blank=True, null=True)
     time = models.DateTimeField(default=django.utils.timezone.now)
+    # n waiting to be processed, p being processed, y processed, e processing failed
     processed = models.CharField(max_length=1, default="n")
+    # when a run claimed the message, a claim older than the timeout is retried
+    claimed_at = models.DateTimeField(blank=True, null=True)
     void_ind = models.CharField(max_length=1, default="n")
 
     def __str__(self):
         return f"{self.message_id} message type: {self.message_type} data: {self.message_data}"
+
+
+# TBA responses with their validators, so repeat requests can be conditional
+class CachedResponse(models.Model):
+    # sha256 hex of the url, urls are too long to key on in MySQL
+    url_hash = models.CharField(max_length=64, primary_key=True)
+    url = models.TextField()
+    etag = models.CharField(max_length=4000, blank=True, null=True)
+    last_modified = models.CharField(max_length=4000, blank=True, null=True)
+    body = models.TextField()
+    time = models.DateTimeField(default=django.utils.timezone.now)
+
+    def __str__(self):
+        return f"{self.url} etag: {self.etag} last modified: {self.last_modified}"
@@ -0,0 +1,228 @@
+import asyncio
+import datetime
+import random
+import threading
+from typing import Any
+
+from aiohttp import web
+
+
+def build_district(
+    teams: int = 60,
+    events: int = 10,
+    matches: int = 1200,
+    season: str = "2050",
+    seed: int = 3492,
+) -> dict[str, Any]:
+    """
+    Build the TBA responses for a synthetic district, team 3492 attends every event.
+
+    Args:
+        teams: Teams in the district
+        events: Events in the district
+        matches: Qualification matches across all events
+        season: The season the events are in
+        seed: Seed for the random rosters and scores
+
+    Returns:
+        The responses by path under the TBA api url
+    """
+    rnd = random.Random(seed)
+    team_nos = [3492] + rnd.sample([n for n in range(1, 10000) if n != 3492], teams - 1)
+    event_cds = [f"{season}dst{i}" for i in range(events)]
+    start = datetime.date(int(season), 3, 1)
+
+    responses = {f"/team/frc{team_no}/events/{season}": [] for team_no in team_nos}
+    for i, event_cd in enumerate(event_cds):
+        event_teams = [3492] + rnd.sample(team_nos[1:], min(teams, 40) - 1)
+        date_st = start + datetime.timedelta(days=7 * i)
+
+        responses[f"/event/{event_cd}"] = {
+            "key": event_cd,
+            "name": f"District Event {i + 1}",
+            "start_date": date_st.isoformat(),
+            "end_date": (date_st + datetime.timedelta(days=2)).isoformat(),
+            "timezone": "America/New_York",
+            "event_url": None,
+            "gmaps_url": None,
+            "address": None,
+            "city": None,
+            "state_prov": None,
+            "postal_code": None,
+            "location_name": None,
+            "webcasts": [],
+        }
+        responses[f"/event/{event_cd}/teams"] = [
+            {"team_number": team_no, "nickname": f"Team {team_no}"}
+            for team_no in event_teams
+        ]
+        for team_no in event_teams:
+            responses[f"/team/frc{team_no}/events/{season}"].append({"key": event_cd})
+
+        records = {team_no: {"wins": 0, "losses": 0, "ties": 0} for team_no in event_teams}
+        event_matches = []
+        for match_number in range(1, matches // events + 1):
+            alliances = rnd.sample(event_teams, 6)
+            scores = [rnd.randint(20, 150), rnd.randint(20, 150)]
+            event_matches.append(
+                build_match(event_cd, match_number, alliances, scores, date_st)
+            )
+            for alliance, score, other in [(alliances[:3], *scores), (alliances[3:], *scores[::-1])]:
+                for team_no in alliance:
+                    records[team_no][
+                        "wins" if score > other else "losses" if score < other else "ties"
+                    ] += 1
+        responses[f"/event/{event_cd}/matches"] = event_matches
+
+        ranked = sorted(event_teams, key=lambda team_no: -records[team_no]["wins"])
+        responses[f"/event/{event_cd}/rankings"] = {
+            "rankings": [
+                {
+                    "team_key": f"frc{team_no}",
+                    "rank": rank,
+                    "matches_played": sum(records[team_no].values()),
+                    "qual_average": 0,
+                    "record": records[team_no],
+                    "dq": 0,
+                }
+                for rank, team_no in enumerate(ranked, 1)
+            ]
+        }
+
+    responses[f"/team/frc3492/events/{season}"] = [
+        {"key": event_cd} for event_cd in event_cds
+    ]
+    return responses
+
+
+def build_match(
+    event_cd: str,
+    match_number: int,
+    alliances: list[int],
+    scores: list[int | None],
+    date_st: datetime.date,
+) -> dict[str, Any]:
+    """
+    Build a qualification match the way TBA returns it.
+
+    Args:
+        event_cd: The event code
+        match_number: The match number
+        alliances: Red then blue team numbers
+        scores: Red and blue scores, None before the match is played
+        date_st: The day the event starts
+
+    Returns:
+        The match
+    """
+    return {
+        "key": f"{event_cd}_qm{match_number}",
+        "event_key": event_cd,
+        "comp_level": "qm",
+        "set_number": 1,
+        "match_number": match_number,
+        "time": int(
+            datetime.datetime.combine(date_st, datetime.time(9), datetime.timezone.utc)
+            .timestamp()
+        )
+        + match_number * 480,
+        "videos": [],
+        "alliances": {
+            "red": {
+                "team_keys": [f"frc{team_no}" for team_no in alliances[:3]],
+                "score": scores[0],
+            },
+            "blue": {
+                "team_keys": [f"frc{team_no}" for team_no in alliances[3:]],
+                "score": scores[1],
+            },
+        },
+    }
+
+
+class ReplayServer:
+    """
+    Local stand in for The Blue Alliance API serving recorded or synthetic
+    responses over HTTP, so tba.util can be exercised without the network.
+
+    Responses get an ETag that changes whenever update is called for their
+    path, conditional requests for unchanged responses are answered 304.
+    Point tba.util.tba_url at url while it runs.
+    """
+
+    def __init__(
+        self, responses: dict[str, Any], latency: float = 0.0, etags: bool = True
+    ):
+        self.responses = dict(responses)
+        self.versions = {path: 1 for path in self.responses}
+        self.latency = latency
+        self.etags = etags
+        self.requests = 0
+        self.not_modified = 0
+        self.url = None
+        self.loop = None
+        self.thread = None
+        self.runner = None
+
+    def update(self, path: str, body: Any):
+        """
+        Replace a response, changing its ETag.
+
+        Args:
+            path: The path under the TBA api url
+            body: The new response
+        """
+        self.responses[path] = body
+        self.versions[path] = self.versions.get(path, 0) + 1
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        if self.latency > 0:
+            await asyncio.sleep(self.latency)
+
+        path = request.path
+        if path not in self.responses:
+            return web.json_response({"Error": f"{path} not found"}, status=404)
+
+        headers = {}
+        if self.etags:
+            headers["ETag"] = f'"{self.versions[path]}"'
+            if request.headers.get("If-None-Match", None) == headers["ETag"]:
+                self.not_modified += 1
+                return web.Response(status=304, headers=headers)
+
+        return web.json_response(self.responses[path], headers=headers)
+
+    def start(self) -> str:
+        """
+        Start serving on a free local port in a background thread.
+
+        Returns:
+            The url to use as tba_url
+        """
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+
+        app = web.Application()
+        app.router.add_get("/{path:.*}", self.handle)
+        self.runner = web.AppRunner(app)
+        asyncio.run_coroutine_threadsafe(self.runner.setup(), self.loop).result()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        asyncio.run_coroutine_threadsafe(site.start(), self.loop).result()
+
+        self.url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+        return self.url
+
+    def stop(self):
+        asyncio.run_coroutine_threadsafe(self.runner.cleanup(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+    def __enter__(self) -> "ReplayServer":
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
@@ -5,6 +5,7 @@ from .views import (
     SyncMatchesView,
     SyncEventTeamInfoView,
     WebhookView,
+    ProcessMessagesView,
 )
 
 app_name = "tba"
@@ -17,4 +18,5 @@ urlpatterns = [
     path("sync-matches/", SyncMatchesView.as_view(), name="sync-matches"),
     path("sync-event-team-info/", SyncEventTeamInfoView.as_view(), name="sync-event-team-info"),
     path("webhook/", WebhookView.as_view(), name="webhook"),
+    path("process-messages/", ProcessMessagesView.as_view(), name="process-messages"),
 ]
@@ -1,11 +1,16 @@
+import asyncio
+import threading
 from typing import Any
+import aiohttp
+from asgiref.sync import async_to_sync
 import requests
+from requests.adapters import HTTPAdapter
 import datetime
 from json import loads, dumps
 from hashlib import sha256
 import hmac
 from django.conf import settings
-from django.db import IntegrityError
+from django.db import transaction
 from django.db.models import Q
 import pytz
 from django.utils import timezone
@@ -19,9 +24,232 @@ from scouting.models import (
     Match,
 )
 import scouting.util
-from tba.models import Message
+from tba.models import CachedResponse, Message
 
 tba_url = "https://www.thebluealliance.com/api/v3"
+tba_timeout_seconds = 30
+
+# Requests get_tba_all runs at once, and how often one rate limited by TBA is retried
+tba_concurrency = 8
+tba_retries = 3
+
+# Shared by every TBA request so connections are kept alive and reused
+session = requests.Session()
+session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
+# Changed responses fetched with if_changed, by url, cached by
+# remember_tba_response once what they returned is saved. Kept per thread so
+# concurrent syncs do not remember each other's responses
+pending_responses = threading.local()
+
+
+def get_tba(path: str, if_changed: bool = False) -> Any:
+    """
+    Get a response from The Blue Alliance API.
+
+    Requests for a cached path are conditional, TBA answers 304 Not Modified
+    without a body when nothing changed. Responses are only cached with their
+    ETag and Last-Modified headers when fetched with if_changed and
+    remember_tba_response is called after their data is saved, so a plain read
+    never hides a change from the sync that saves it.
+
+    Args:
+        path: The path under tba_url, e.g. '/event/2024pahat'
+        if_changed: Return None instead of the cached body when TBA reports
+            the response has not changed
+
+    Returns:
+        The parsed JSON response
+    """
+    url = f"{tba_url}{path}"
+    cached = CachedResponse.objects.filter(url_hash=get_tba_url_hash(url)).first()
+
+    response = session.get(
+        url, headers=get_tba_headers(cached), timeout=tba_timeout_seconds
+    )
+
+    return read_tba_response(
+        url, cached, response.status_code, response.headers, response.text, if_changed
+    )
+
+
+def get_tba_all(paths: list[str], if_changed: bool = False) -> dict[str, Any]:
+    """
+    Get several responses from The Blue Alliance API concurrently, see get_tba.
+
+    At most tba_concurrency requests run at once. Requests TBA rate limits are
+    retried once the Retry-After it sends has passed.
+
+    Args:
+        paths: The paths under tba_url
+        if_changed: Return None instead of the cached body for responses TBA
+            reports have not changed
+
+    Returns:
+        The parsed JSON responses by path
+    """
+    urls = {path: f"{tba_url}{path}" for path in paths}
+    cached = {
+        cached_response.url: cached_response
+        for cached_response in CachedResponse.objects.filter(
+            url_hash__in=[get_tba_url_hash(url) for url in urls.values()]
+        )
+    }
+
+    responses = async_to_sync(fetch_tba_all)(
+        {url: get_tba_headers(cached.get(url, None)) for url in urls.values()}
+    )
+
+    return {
+        path: read_tba_response(
+            url, cached.get(url, None), *responses[url], if_changed
+        )
+        for path, url in urls.items()
+    }
+
+
+async def fetch_tba_all(
+    requests_headers: dict[str, dict[str, str]],
+) -> dict[str, tuple[int, dict[str, str], str]]:
+    """
+    Request urls concurrently, see get_tba_all.
+
+    Args:
+        requests_headers: The headers to send by url
+
+    Returns:
+        The status code, validator headers and body by url
+    """
+    semaphore = asyncio.Semaphore(tba_concurrency)
+
+    async with aiohttp.ClientSession(
+        timeout=aiohttp.ClientTimeout(total=tba_timeout_seconds)
+    ) as client:
+
+        async def fetch(url: str) -> tuple[str, tuple[int, dict[str, str], str]]:
+            async with semaphore:
+                for attempt in range(tba_retries + 1):
+                    async with client.get(url, headers=requests_headers[url]) as response:
+                        if response.status != 429 or attempt == tba_retries:
+                            return url, (
+                                response.status,
+                                {
+                                    header: response.headers[header]
+                                    for header in ["ETag", "Last-Modified"]
+                                    if header in response.headers
+                                },
+                                await response.text(),
+                            )
+
+                        try:
+                            retry_after = float(response.headers.get("Retry-After", 1))
+                        except ValueError:
+                            retry_after = 1
+
+                    await asyncio.sleep(retry_after)
+
+        return dict(await asyncio.gather(*[fetch(url) for url in requests_headers]))
+
+
+def get_tba_headers(cached: CachedResponse | None) -> dict[str, str]:
+    """
+    Build the headers for a TBA request.
+
+    Args:
+        cached: The cached response for the url, if there is one
+
+    Returns:
+        The auth header, and the cached validators to make the request conditional
+    """
+    headers = {"X-TBA-Auth-Key": settings.TBA_KEY}
+    if cached is not None:
+        if cached.etag is not None:
+            headers["If-None-Match"] = cached.etag
+        if cached.last_modified is not None:
+            headers["If-Modified-Since"] = cached.last_modified
+
+    return headers
+
+
+def read_tba_response(
+    url: str,
+    cached: CachedResponse | None,
+    status_code: int,
+    headers: Any,
+    text: str,
+    if_changed: bool,
+) -> Any:
+    """
+    Parse a TBA response. A changed response with validators fetched with
+    if_changed is held for remember_tba_response.
+
+    Args:
+        url: The requested url
+        cached: The cached response the request was conditional on, if any
+        status_code: The response status code
+        headers: The response headers
+        text: The response body
+        if_changed: Return None instead of the cached body on 304 Not Modified
+
+    Returns:
+        The parsed JSON response
+    """
+    if status_code == 304 and cached is not None:
+        return None if if_changed else loads(cached.body)
+
+    etag = headers.get("ETag", None)
+    last_modified = headers.get("Last-Modified", None)
+    if (
+        if_changed
+        and status_code == 200
+        and (etag is not None or last_modified is not None)
+    ):
+        get_pending_tba_responses()[url] = CachedResponse(
+            url_hash=get_tba_url_hash(url),
+            url=url,
+            etag=etag,
+            last_modified=last_modified,
+            body=text,
+            time=timezone.now(),
+        )
+
+    return loads(text)
+
+
+def get_tba_url_hash(url: str) -> str:
+    return sha256(url.encode("utf-8")).hexdigest()
+
+
+def get_pending_tba_responses() -> dict[str, CachedResponse]:
+    if not hasattr(pending_responses, "responses"):
+        pending_responses.responses = {}
+    return pending_responses.responses
+
+
+def remember_tba_response(path: str):
+    """
+    Cache a response fetched with if_changed, called once what it returned is
+    saved so the next request for it is conditional.
+
+    Args:
+        path: The path under tba_url
+    """
+    cached = get_pending_tba_responses().pop(f"{tba_url}{path}", None)
+    if cached is not None:
+        cached.save()
+
+
+def forget_tba_response(path: str):
+    """
+    Drop a cached TBA response so the next request for it gets the full body,
+    used when saving what it returned failed.
+
+    Args:
+        path: The path under tba_url
+    """
+    url = f"{tba_url}{path}"
+    get_pending_tba_responses().pop(url, None)
+    CachedResponse.objects.filter(url_hash=get_tba_url_hash(url)).delete()
 
 
 def get_events_for_team(
@@ -39,11 +267,7 @@ def get_events_for_team(
         List of dictionaries containing event data
     """
 
-    request = requests.get(
-        f"{tba_url}/team/frc{team.team_no}/events/{season.season}",
-        headers={"X-TBA-Auth-Key": settings.TBA_KEY},
-    )
-    request = loads(request.text)
+    request = get_tba(f"/team/frc{team.team_no}/events/{season.season}")
 
     parsed = []
 
@@ -71,11 +295,7 @@ def get_matches_for_team_event(team_key: str, event_key: str) -> list[dict[str,
     Returns:
         List of match data dictionaries from TBA
     """
-    request = requests.get(
-        f"{tba_url}/team/frc{team_key}/event/{event_key}/matches",
-        headers={"X-TBA-Auth-Key": settings.TBA_KEY},
-    )
-    matches = loads(request.text)
+    matches = get_tba(f"/team/frc{team_key}/event/{event_key}/matches")
     # for match in matches:
     # print(match)
 
@@ -86,6 +306,9 @@ def sync_season(season_id: int) -> str:
     """
     Synchronize all events for team 3492 in a specific season from The Blue Alliance.
 
+    Every event and its teams are fetched concurrently first, then saved one
+    event at a time.
+
     Args:
         season_id: The ID of the Season to synchronize
 
@@ -94,26 +317,35 @@ def sync_season(season_id: int) -> str:
     """
     season = Season.objects.get(id=season_id)
 
-    request = requests.get(
-        f"{tba_url}/team/frc3492/events/{season.season}",
-        headers={"X-TBA-Auth-Key": settings.TBA_KEY},
-    )
-    request = loads(request.text)
+    request = get_tba(f"/team/frc3492/events/{season.season}")
+    event_cds = [event["key"] for event in request]
+
+    tba_responses = {}
+    if len(event_cds) > 0:
+        tba_responses = get_tba_all(
+            [
+                path
+                for event_cd in event_cds
+                for path in [f"/event/{event_cd}", f"/event/{event_cd}/teams"]
+            ],
+            True,
+        )
 
     messages = ""
-    for event in request:
-        messages += sync_event(season, event["key"])
+    for event_cd in event_cds:
+        messages += sync_event(season, event_cd, tba_responses)
         messages += "------------------------------------------------\n"
 
     return messages
 
 
-def get_tba_event(event_cd: str) -> dict[str, Any]:
+def get_tba_event(event_cd: str, if_changed: bool = False) -> dict[str, Any] | None:
     """
     Fetch event details from The Blue Alliance API.
 
     Args:
         event_cd: The event code (e.g., '2024pahat')
+        if_changed: Return None if the event has not changed since it was last fetched
 
     Returns:
         Dictionary containing parsed event data (event_nm, date_st, date_end, event_cd, time_zone)
@@ -121,11 +353,24 @@ def get_tba_event(event_cd: str) -> dict[str, Any]:
     Raises:
         Exception: If TBA returns an error
     """
-    request = requests.get(
-        f"{tba_url}/event/{event_cd}",
-        headers={"X-TBA-Auth-Key": settings.TBA_KEY},
-    )
-    tba_event = loads(request.text)
+    return parse_tba_event(get_tba(f"/event/{event_cd}", if_changed))
+
+
+def parse_tba_event(tba_event: dict[str, Any] | None) -> dict[str, Any] | None:
+    """
+    Parse an event from The Blue Alliance API.
+
+    Args:
+        tba_event: The event as TBA returns it, None if it was not changed
+
+    Returns:
+        Dictionary containing parsed event data, see get_tba_event
+
+    Raises:
+        Exception: If TBA returned an error
+    """
+    if tba_event is None:
+        return None
 
     if tba_event.get("Error", None) is not None:
         raise Exception(tba_event["Error"])
@@ -161,21 +406,36 @@ def get_tba_event(event_cd: str) -> dict[str, Any]:
     }
 
 
-def get_tba_event_teams(event_cd: str) -> list[dict[str, Any]]:
+def get_tba_event_teams(
+    event_cd: str, if_changed: bool = False
+) -> list[dict[str, Any]] | None:
     """
     Get list of teams at an event from The Blue Alliance API.
 
     Args:
         event_cd: The event code (e.g., '2024pahat')
+        if_changed: Return None if the teams have not changed since they were last fetched
 
     Returns:
         List of dictionaries with team_no and team_nm fields
     """
-    request = requests.get(
-        f"{tba_url}/event/{event_cd}/teams",
-        headers={"X-TBA-Auth-Key": settings.TBA_KEY},
-    )
-    tba_teams = loads(request.text)
+    return parse_tba_event_teams(get_tba(f"/event/{event_cd}/teams", if_changed))
+
+
+def parse_tba_event_teams(
+    tba_teams: list[dict[str, Any]] | None,
+) -> list[dict[str, Any]] | None:
+    """
+    Parse the teams at an event from The Blue Alliance API.
+
+    Args:
+        tba_teams: The teams as TBA returns them, None if they were not changed
+
+    Returns:
+        List of dictionaries with team_no and team_nm fields
+    """
+    if tba_teams is None:
+        return None
 
     parsed = []
 
@@ -185,23 +445,65 @@ def get_tba_event_teams(event_cd: str) -> list[dict[str, Any]]:
     return parsed
 
 
-def sync_event(season: Season, event_cd: str) -> str:
+def sync_event(
+    season: Season, event_cd: str, tba_responses: dict[str, Any] | None = None
+) -> str:
     """
     Synchronize an event and its teams from The Blue Alliance.
 
     Creates or updates the event and team records, linking teams to the event.
-    Removes teams that are no longer at the event.
+    Removes teams that are no longer at the event. Nothing is written if TBA
+    reports neither the event nor its teams changed since the last sync.
 
     Args:
         season: The Season object the event belongs to
         event_cd: The event code from TBA
+        tba_responses: Responses by path already fetched with get_tba_all, the
+            event and its teams are fetched when not given
 
     Returns:
         Message string detailing what was added, updated, or removed
     """
-    data = get_tba_event(event_cd)
-    data["teams"] = get_tba_event_teams(event_cd)
+    if tba_responses is None:
+        data = get_tba_event(event_cd, True)
+        teams = get_tba_event_teams(event_cd, True)
+    else:
+        data = parse_tba_event(tba_responses[f"/event/{event_cd}"])
+        teams = parse_tba_event_teams(tba_responses[f"/event/{event_cd}/teams"])
+
+    if (
+        data is None
+        and teams is None
+        and Event.objects.filter(event_cd=event_cd, void_ind="n").exists()
+    ):
+        return f"(NO CHANGE) Event: {event_cd}\n"
+
+    data = data if data is not None else get_tba_event(event_cd)
+    data["teams"] = teams if teams is not None else get_tba_event_teams(event_cd)
+
+    try:
+        messages = save_tba_event(season, data)
+    except Exception:
+        forget_tba_response(f"/event/{event_cd}")
+        forget_tba_response(f"/event/{event_cd}/teams")
+        raise
+
+    remember_tba_response(f"/event/{event_cd}")
+    remember_tba_response(f"/event/{event_cd}/teams")
+    return messages
 
+
+def save_tba_event(season: Season, data: dict[str, Any]) -> str:
+    """
+    Save an event and its teams fetched from The Blue Alliance.
+
+    Args:
+        season: The Season object the event belongs to
+        data: The event from get_tba_event with its teams from get_tba_event_teams
+
+    Returns:
+        Message string detailing what was added, updated, or removed
+    """
     messages = ""
     try:
         event = Event.objects.get(event_cd=data["event_cd"])
@@ -236,32 +538,68 @@ def sync_event(season: Season, event_cd: str) -> str:
     event.timezone = data["timezone"]
     event.save()
 
-    # remove teams that have been removed from an event
-    teams = Team.objects.filter(
-        ~Q(team_no__in=set(team["team_no"] for team in data["teams"])) & Q(event=event)
-    )
-    for team in teams:
-        team.event_set.remove(event)
-        messages += f"(REMOVE) Removed team: {team.team_no} {team.team_nm} from event: {data['event_cd']}\n"
+    if event.current == "y":
+        scouting.util.current_season_event_changed()
 
-    for team_ in data["teams"]:
-        try:
-            team = Team(
-                team_no=team_["team_no"], team_nm=team_["team_nm"], void_ind="n"
-            )
-            team.save(force_insert=True)
-            messages += f"(ADD) Added team: {team_['team_no']} {team_['team_nm']}\n"
-        except IntegrityError:
-            team = Team.objects.get(team_no=team_["team_no"])
-            messages += (
-                f"(NO ADD) Already have team: {team_['team_no']} {team_['team_nm']}\n"
+    messages += save_event_roster(event, data["teams"])
+
+    return messages
+
+
+def save_event_roster(event: Event, tba_teams: list[dict[str, Any]]) -> str:
+    """
+    Reconcile the teams linked to an event with its roster on The Blue Alliance.
+
+    The roster is diffed against the saved teams and links, then missing teams
+    are added, renamed teams updated, and links added and removed in bulk.
+
+    Args:
+        event: The Event object the roster belongs to
+        tba_teams: The teams from get_tba_event_teams
+
+    Returns:
+        Message string detailing what was added, linked, renamed or removed
+    """
+    messages = ""
+    roster = {team["team_no"]: team for team in tba_teams}
+    linked = {team.team_no: team for team in event.teams.all()}
+    existing = {team.team_no: team for team in Team.objects.filter(team_no__in=roster)}
+
+    # remove teams that have been removed from an event
+    removed = [team for team_no, team in linked.items() if team_no not in roster]
+    for team in removed:
+        messages += f"(REMOVE) Removed team: {team.team_no} {team.team_nm} from event: {event.event_cd}\n"
+
+    new_teams = []
+    renamed_teams = []
+    new_links = []
+    for team_no, team_ in roster.items():
+        team = existing.get(team_no, None)
+        if team is None:
+            new_teams.append(
+                Team(team_no=team_no, team_nm=team_["team_nm"], void_ind="n")
             )
+            messages += f"(ADD) Added team: {team_no} {team_['team_nm']}\n"
+        else:
+            messages += f"(NO ADD) Already have team: {team_no} {team_['team_nm']}\n"
+            if team.team_nm != team_["team_nm"]:
+                messages += f"(UPDATE) Renamed team: {team_no} {team.team_nm} to {team_['team_nm']}\n"
+                team.team_nm = team_["team_nm"]
+                renamed_teams.append(team)
+
+        if team_no in linked:
+            messages += f"(NO LINK) Team: {team_no} {team_['team_nm']} already at event: {event.event_cd}\n"
+        else:
+            new_links.append(Event.teams.through(event_id=event.id, team_id=team_no))
+            messages += f"(LINK) Added team: {team_no} {team_['team_nm']} to event: {event.event_cd}\n"
 
-        try:  # TODO it doesn't throw an error, but re-linking many to many only keeps one entry in the table for the link
-            team.event_set.add(event)
-            messages += f"(LINK) Added team: {team_['team_no']} {team_['team_nm']} to event: {data['event_cd']}\n"
-        except IntegrityError:
-            messages += f"(NO LINK) Team: {team_['team_no']} {team_['team_nm']} already at event: {data['event_cd']}\n"
+    if len(removed) + len(new_teams) + len(renamed_teams) + len(new_links) > 0:
+        with transaction.atomic():
+            if len(removed) > 0:
+                event.teams.remove(*removed)
+            Team.objects.bulk_create(new_teams, ignore_conflicts=True)
+            Team.objects.bulk_update(renamed_teams, ["team_nm"])
+            Event.teams.through.objects.bulk_create(new_links, ignore_conflicts=True)
 
     return messages
 
@@ -277,37 +615,40 @@ def sync_matches(event: Event) -> str:
         Message string detailing sync results
     """
     messages = ""
-    request = requests.get(
-        f"{tba_url}/event/{event.event_cd}/matches",
-        headers={"X-TBA-Auth-Key": settings.TBA_KEY},
-    )
-    matches = loads(request.text)
-    match_number = ""
+    matches = get_tba(f"/event/{event.event_cd}/matches", True)
+    if matches is None:
+        return f"(NO CHANGE) {event.event_nm} matches\n"
+
     try:
-        for match in matches:
-            match_number = match.get("match_number", 0)
-            messages += save_tba_match(match)
+        messages, failed = save_tba_matches(event, matches)
     except Exception as e:
-        messages += f"(ERROR) {event.event_nm} {match_number} {e}\n"
+        failed = {event.event_cd: e}
+        messages += f"(ERROR) {event.event_nm} {e}\n"
+
+    if len(failed) > 0:
+        forget_tba_response(f"/event/{event.event_cd}/matches")
+    else:
+        remember_tba_response(f"/event/{event.event_cd}/matches")
     return messages
 
 
-def get_tba_event_team_info(event_cd: str) -> list[dict[str, Any]]:
+def get_tba_event_team_info(
+    event_cd: str, if_changed: bool = False
+) -> list[dict[str, Any]] | None:
     """
     Get team ranking and performance info from The Blue Alliance.
 
     Args:
         event_cd: The event code to get rankings for
+        if_changed: Return None if the rankings have not changed since they were last fetched
 
     Returns:
         List of dictionaries containing team stats including:
             - matches_played, qual_average, wins, losses, ties, rank, dq, team_id
     """
-    request = requests.get(
-        f"{tba_url}/event/{event_cd}/rankings",
-        headers={"X-TBA-Auth-Key": settings.TBA_KEY},
-    )
-    rankings = loads(request.text)
+    rankings = get_tba(f"/event/{event_cd}/rankings", if_changed)
+    if if_changed and rankings is None:
+        return None
 
     ret = []
     if rankings is not None:
@@ -353,9 +694,10 @@ def sync_event_team_info(force: int) -> str:
     Returns:
         Message string describing what was synced
     """
-    messages = ""
     event = Event.objects.get(current="y")
 
+    # Keep the roster current so every ranked team is saved, this is a
+    # conditional request that writes nothing when the roster has not changed
     sync_event(event.season, event.event_cd)
 
     now = datetime.datetime.combine(timezone.now(), datetime.time.min)
@@ -364,33 +706,85 @@ def sync_event_team_info(force: int) -> str:
 
     # Only sync information if the event is active or forcing an update
     if force == 1 or date_st <= now <= date_end:
-        for info in get_tba_event_team_info(event.event_cd):
-            try:
-                eti = EventTeamInfo.objects.get(
-                    Q(event=event) & Q(team_id=info["team_id"]) & Q(void_ind="n")
-                )
-                messages += f"(UPDATE) {event.event_nm} {eti.team.team_no}\n"
-            except EventTeamInfo.DoesNotExist:
-                eti = EventTeamInfo(
-                    event=event,
-                    team_id=info["team_id"],
-                )
-                messages += f"(ADD) {event.event_nm} {eti.team.team_no}\n"
-
-            eti.matches_played = info["matches_played"]
-            eti.qual_average = info["qual_average"]
-            eti.losses = info["losses"]
-            eti.wins = info["wins"]
-            eti.ties = info["ties"]
-            eti.rank = info["rank"]
-            eti.dq = info["dq"]
-
-            eti.save()
+        messages = sync_event_rankings(event)
     else:
         messages = "No active event"
     return messages
 
 
+# Stats from TBA rankings saved on EventTeamInfo
+event_team_info_fields = [
+    "matches_played",
+    "qual_average",
+    "losses",
+    "wins",
+    "ties",
+    "rank",
+    "dq",
+]
+
+
+def sync_event_rankings(event: Event) -> str:
+    """
+    Synchronize the rankings for an event from The Blue Alliance.
+
+    The event's team info is loaded at once and diffed against the rankings,
+    only rows whose stats changed are written. Nothing is read or written if
+    TBA reports the rankings have not changed.
+
+    Args:
+        event: The Event object to sync rankings for
+
+    Returns:
+        Message string describing what was synced
+    """
+    infos = get_tba_event_team_info(event.event_cd, True)
+    if infos is None:
+        return f"(NO CHANGE) {event.event_nm}\n"
+
+    existing = {
+        eti.team_id: eti
+        for eti in EventTeamInfo.objects.filter(Q(event=event) & Q(void_ind="n"))
+    }
+
+    messages = ""
+    new_etis = []
+    changed_etis = []
+    changed_ranks = []
+    for info in infos:
+        team_id = int(info["team_id"])
+        eti = existing.get(team_id, None)
+        if eti is None:
+            eti = EventTeamInfo(event=event, team_id=team_id)
+            new_etis.append(eti)
+            messages += f"(ADD) {event.event_nm} {team_id}\n"
+        elif any(getattr(eti, field) != info[field] for field in event_team_info_fields):
+            changed_etis.append(eti)
+            messages += f"(UPDATE) {event.event_nm} {team_id}\n"
+        else:
+            messages += f"(NO UPDATE) {event.event_nm} {team_id}\n"
+            continue
+
+        if eti.rank != info["rank"]:
+            changed_ranks.append(eti)
+
+        for field in event_team_info_fields:
+            setattr(eti, field, info[field])
+
+    with transaction.atomic():
+        EventTeamInfo.objects.bulk_create(new_etis)
+        EventTeamInfo.objects.bulk_update(changed_etis, event_team_info_fields)
+
+        for eti in changed_ranks:
+            scouting.util.publish_event_update(
+                event.id, "rank", {"team_id": eti.team_id, "rank": eti.rank}
+            )
+
+        remember_tba_response(f"/event/{event.event_cd}/rankings")
+
+    return messages
+
+
 def save_tba_match(tba_match: dict[str, Any]) -> str:
     """
     Save or update a match from The Blue Alliance data.
@@ -402,86 +796,187 @@ def save_tba_match(tba_match: dict[str, Any]) -> str:
 
     Returns:
         Message string indicating if match was added or updated
+
+    Raises:
+        Exception: If the match could not be saved
     """
     event = Event.objects.get(event_cd=tba_match["event_key"])
-    messages = ""
-    match_number = tba_match.get("match_number", 0)
-    red_one = Team.objects.get(
-        Q(team_no=replace_frc_in_str(tba_match["alliances"]["red"]["team_keys"][0]))
-        & Q(void_ind="n")
-    )
-    red_two = Team.objects.get(
-        Q(team_no=replace_frc_in_str(tba_match["alliances"]["red"]["team_keys"][1]))
-        & Q(void_ind="n")
-    )
-    red_three = Team.objects.get(
-        Q(team_no=replace_frc_in_str(tba_match["alliances"]["red"]["team_keys"][2]))
-        & Q(void_ind="n")
-    )
-    blue_one = Team.objects.get(
-        Q(team_no=replace_frc_in_str(tba_match["alliances"]["blue"]["team_keys"][0]))
-        & Q(void_ind="n")
-    )
-    blue_two = Team.objects.get(
-        Q(team_no=replace_frc_in_str(tba_match["alliances"]["blue"]["team_keys"][1]))
-        & Q(void_ind="n")
-    )
-    blue_three = Team.objects.get(
-        Q(team_no=replace_frc_in_str(tba_match["alliances"]["blue"]["team_keys"][2]))
-        & Q(void_ind="n")
-    )
-    red_score = tba_match["alliances"]["red"].get("score", None)
-    blue_score = tba_match["alliances"]["blue"].get("score", None)
-    comp_level = CompetitionLevel.objects.get(
-        Q(comp_lvl_typ=tba_match.get("comp_level", " ")) & Q(void_ind="n")
-    )
-    time = (
-        datetime.datetime.fromtimestamp(
-            tba_match["time"], pytz.timezone("America/New_York")
+    messages, failed = save_tba_matches(event, [tba_match])
+
+    for e in failed.values():
+        raise e
+
+    return messages
+
+
+# Fields a match from TBA overwrites on a match that was already saved
+match_update_fields = [
+    "red_one",
+    "red_two",
+    "red_three",
+    "blue_one",
+    "blue_two",
+    "blue_three",
+    "red_score",
+    "blue_score",
+    "comp_level",
+    "time",
+    "void_ind",
+]
+
+
+def save_tba_matches(
+    event: Event, tba_matches: list[dict[str, Any]]
+) -> tuple[str, dict[str, Exception]]:
+    """
+    Save or update a batch of matches for an event from The Blue Alliance data.
+
+    Teams, competition levels and existing matches are loaded up front, new and
+    changed matches are then written in one upsert. A match that can not be
+    saved is reported and skipped, the rest of the batch is still saved.
+
+    Args:
+        event: The Event object the matches belong to
+        tba_matches: Matches from the TBA API, see save_tba_match
+
+    Returns:
+        Message string indicating which matches were added, updated or failed,
+        and the exception for each match that failed by match key
+    """
+    team_nos = set()
+    for tba_match in tba_matches:
+        for alliance in tba_match.get("alliances", {}).values():
+            for team_key in alliance.get("team_keys", []):
+                team_nos.add(replace_frc_in_str(team_key))
+
+    teams = {
+        team.team_no: team
+        for team in Team.objects.filter(Q(team_no__in=team_nos) & Q(void_ind="n"))
+    }
+    comp_levels = {
+        comp_level.comp_lvl_typ: comp_level
+        for comp_level in CompetitionLevel.objects.filter(void_ind="n")
+    }
+    existing_matches = {
+        match.match_key: match
+        for match in Match.objects.filter(
+            match_key__in=[tba_match.get("key", None) for tba_match in tba_matches]
         )
-        if tba_match["time"]
-        else None
-    )
-    match_key = tba_match["key"]
+    }
 
-    try:
-        match = Match.objects.get(Q(match_key=match_key))
-
-        match.red_one = red_one
-        match.red_two = red_two
-        match.red_three = red_three
-        match.blue_one = blue_one
-        match.blue_two = blue_two
-        match.blue_three = blue_three
-        match.red_score = red_score
-        match.blue_score = blue_score
-        match.comp_level = comp_level
-        match.time = time
-        match.void_ind = "n"
-
-        match.save()
-        messages += f"(UPDATE) {event.event_nm} {comp_level.comp_lvl_typ_nm} {match_number} {match_key}\n"
-    except Match.DoesNotExist:
-        match = Match(
-            match_key=match_key,
-            match_number=match_number,
-            event=event,
-            red_one=red_one,
-            red_two=red_two,
-            red_three=red_three,
-            blue_one=blue_one,
-            blue_two=blue_two,
-            blue_three=blue_three,
-            red_score=red_score,
-            blue_score=blue_score,
-            comp_level=comp_level,
-            time=time,
-            void_ind="n",
+    messages = ""
+    failed = {}
+    new_matches = {}
+    changed_matches = {}
+    changed_scores = []
+    for tba_match in tba_matches:
+        match_number = tba_match.get("match_number", 0)
+        try:
+            match = parse_tba_match(event, tba_match, teams, comp_levels)
+            existing = existing_matches.get(match.match_key, None)
+
+            if existing is None:
+                new_matches[match.match_key] = match
+                score_changed = (
+                    match.red_score is not None or match.blue_score is not None
+                )
+                messages += f"(ADD) {event.event_nm} {match.comp_level.comp_lvl_typ_nm} {match_number} {match.match_key}\n"
+            else:
+                score_changed = (existing.red_score, existing.blue_score) != (
+                    match.red_score,
+                    match.blue_score,
+                )
+                if any(
+                    getattr(existing, Match._meta.get_field(field).attname)
+                    != getattr(match, Match._meta.get_field(field).attname)
+                    for field in match_update_fields
+                ):
+                    changed_matches[match.match_key] = match
+                messages += f"(UPDATE) {event.event_nm} {match.comp_level.comp_lvl_typ_nm} {match_number} {match.match_key}\n"
+
+            if score_changed:
+                changed_scores.append(match)
+        except Exception as e:
+            failed[tba_match.get("key", str(match_number))] = e
+            messages += f"(ERROR) {event.event_nm} {match_number} {e}\n"
+
+    # existing matches are already loaded, so new and changed matches are
+    # written separately rather than with an upsert MySQL does not support
+    with transaction.atomic():
+        Match.objects.bulk_create(new_matches.values(), batch_size=500)
+        Match.objects.bulk_update(
+            changed_matches.values(), match_update_fields, batch_size=500
         )
-        match.save()
-        messages += f"(ADD) {event.event_nm} {comp_level.comp_lvl_typ_nm} {match_number} {match_key}\n"
 
-    return messages
+        for match in changed_scores:
+            scouting.util.publish_event_update(
+                event.id,
+                "match",
+                {
+                    "match_key": match.match_key,
+                    "red_score": match.red_score,
+                    "blue_score": match.blue_score,
+                },
+            )
+
+    return messages, failed
+
+
+def parse_tba_match(
+    event: Event,
+    tba_match: dict[str, Any],
+    teams: dict[int, Team],
+    comp_levels: dict[str, CompetitionLevel],
+) -> Match:
+    """
+    Build an unsaved match from The Blue Alliance data.
+
+    Args:
+        event: The Event object the match belongs to
+        tba_match: The match from the TBA API, see save_tba_match
+        teams: Non void teams by team number
+        comp_levels: Non void competition levels by type
+
+    Returns:
+        The Match object
+
+    Raises:
+        Exception: If a team or the competition level is not saved
+    """
+    alliance_teams = []
+    for alliance in ["red", "blue"]:
+        for team_key in tba_match["alliances"][alliance]["team_keys"][:3]:
+            team_no = int(replace_frc_in_str(team_key))
+            if team_no not in teams:
+                raise Exception(f"No team {team_no}")
+            alliance_teams.append(teams[team_no])
+
+    comp_lvl_typ = tba_match.get("comp_level", " ")
+    if comp_lvl_typ not in comp_levels:
+        raise Exception(f"No competition level {comp_lvl_typ}")
+
+    return Match(
+        match_key=tba_match["key"],
+        match_number=tba_match.get("match_number", 0),
+        event=event,
+        red_one=alliance_teams[0],
+        red_two=alliance_teams[1],
+        red_three=alliance_teams[2],
+        blue_one=alliance_teams[3],
+        blue_two=alliance_teams[4],
+        blue_three=alliance_teams[5],
+        red_score=tba_match["alliances"]["red"].get("score", None),
+        blue_score=tba_match["alliances"]["blue"].get("score", None),
+        comp_level=comp_levels[comp_lvl_typ],
+        time=(
+            datetime.datetime.fromtimestamp(
+                tba_match["time"], pytz.timezone("America/New_York")
+            )
+            if tba_match["time"]
+            else None
+        ),
+        void_ind="n",
+    )
 
 
 def save_message(message: dict[str, Any]) -> Message:
@@ -496,12 +991,122 @@ def save_message(message: dict[str, Any]) -> Message:
     """
     msg = Message(
         message_type=message["message_type"],
-        message_data=str(message["message_data"])[:4000],
+        message_data=dumps(message["message_data"]),
     )
     msg.save()
     return msg
 
 
+# Webhook messages process_messages handles in one run, and how long a claimed
+# message waits before it is assumed its run died and it is claimed again
+message_batch_size = 500
+message_claim_timeout_seconds = 600
+
+
+def process_messages() -> str:
+    """
+    Process the webhook messages waiting in the inbox, oldest first.
+
+    Schedule updates are coalesced so each event is synced once, then match
+    scores are saved in one batch per event, the latest message for a match
+    winning. The batch is claimed in a short transaction first, so overlapping
+    runs skip it without waiting on locks held while TBA is called. Messages
+    whose run died before finishing them are claimed again after
+    message_claim_timeout_seconds.
+
+    Returns:
+        Message string describing what was processed
+    """
+    ret = ""
+    now = timezone.now()
+    with transaction.atomic():
+        messages = list(
+            Message.objects.select_for_update(skip_locked=True)
+            .filter(
+                (
+                    Q(processed="n")
+                    | Q(
+                        Q(processed="p")
+                        & Q(
+                            claimed_at__lt=now
+                            - datetime.timedelta(seconds=message_claim_timeout_seconds)
+                        )
+                    )
+                )
+                & Q(void_ind="n")
+            )
+            .order_by("message_id")[:message_batch_size]
+        )
+        Message.objects.filter(
+            message_id__in=[message.message_id for message in messages]
+        ).update(processed="p", claimed_at=now)
+
+    schedule_updates: dict[str, list[Message]] = {}
+    match_scores: dict[str, dict[str, dict[str, Any]]] = {}
+    match_score_messages: dict[str, list[Message]] = {}
+    for message in messages:
+        message.processed = "y"
+        try:
+            message_data = loads(message.message_data)
+            match message.message_type:
+                case "schedule_updated":
+                    schedule_updates.setdefault(
+                        message_data["event_key"], []
+                    ).append(message)
+                case "match_score":
+                    tba_match = message_data["match"]
+                    match_scores.setdefault(tba_match["event_key"], {})[
+                        tba_match["key"]
+                    ] = tba_match
+                    match_score_messages.setdefault(
+                        tba_match["event_key"], []
+                    ).append(message)
+        except Exception as e:
+            message.processed = "e"
+            ret += f"(ERROR) Message {message.message_id} {e}\n"
+
+    for event_key, event_messages in schedule_updates.items():
+        try:
+            with transaction.atomic():
+                season = scouting.util.get_or_create_season(event_key[:4])
+                sync_event(season, event_key)
+                messages_ = sync_matches(scouting.util.get_event(event_key))
+                ret += messages_
+
+            # sync_matches reports the matches it could not save without raising
+            if "(ERROR)" in messages_:
+                for message in event_messages:
+                    message.processed = "e"
+        except Exception as e:
+            for message in event_messages:
+                message.processed = "e"
+            ret += f"(ERROR) Schedule {event_key} {e}\n"
+
+    for event_key, tba_matches in match_scores.items():
+        try:
+            with transaction.atomic():
+                event = Event.objects.get(event_cd=event_key)
+                messages_, failed = save_tba_matches(
+                    event, list(tba_matches.values())
+                )
+                ret += messages_
+        except Exception as e:
+            failed = {event_key: e}
+            ret += f"(ERROR) Match scores {event_key} {e}\n"
+
+        if len(failed) > 0:
+            for message in match_score_messages[event_key]:
+                if (
+                    event_key in failed
+                    or loads(message.message_data)["match"]["key"] in failed
+                ):
+                    message.processed = "e"
+
+    Message.objects.bulk_update(messages, ["processed"])
+
+    return ret if ret != "" else "No messages waiting."
+
+
 def verify_tba_webhook_call(request: Any) -> bool:
     """
     Verify that a webhook call is legitimately from The Blue Alliance.
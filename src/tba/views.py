@@ -143,15 +143,13 @@ class WebhookView(APIView):
                             )
                             return Response(500)
                     case "match_score":
+                        # processed later by tba.util.process_messages
                         serializer = EventUpdatedSerializer(data=request.data)
                         if serializer.is_valid():
-                            tba.util.save_tba_match(
-                                serializer.validated_data["message_data"]["match"]
-                            )
-                            message.processed = "y"
-                            message.save()
                             return Response(200)
                         else:
+                            message.processed = "e"
+                            message.save()
                             ret_message(
                                 "Webhook Error - Match Score",
                                 True,
@@ -160,19 +158,13 @@ class WebhookView(APIView):
                             )
                             return Response(500)
                     case "schedule_updated":
+                        # processed later by tba.util.process_messages
                         serializer = ScheduleUpdatedSerializer(data=request.data)
                         if serializer.is_valid():
-                            event_key = serializer.validated_data["message_data"][
-                                "event_key"
-                            ]
-                            season = scouting.util.get_or_create_season(event_key[:4])
-                            tba.util.sync_event(season, event_key)
-                            event = scouting.util.get_event(event_key)
-                            tba.util.sync_matches(event)
-                            message.processed = "y"
-                            message.save()
                             return Response(200)
                         else:
+                            message.processed = "e"
+                            message.save()
                             ret_message(
                                 "Webhook Error - Schedule Updated",
                                 True,
@@ -195,5 +187,27 @@ class WebhookView(APIView):
         return Response(500)
 
 
+class ProcessMessagesView(APIView):
+    """
+    API endpoint to process the webhook messages waiting in the inbox, called by cron
+    """
+
+    endpoint = "process-messages/"
+
+    def get(self, request, format=None):
+        try:
+            ret = "TBA MESSAGES: "
+            ret += tba.util.process_messages()
+            return ret_message(ret)
+        except Exception as e:
+            return ret_message(
+                "An error occurred while processing TBA messages.",
+                True,
+                app_url + self.endpoint,
+                -1,
+                e,
+            )
+
+
 # Backward compatibility aliases (can be removed in future versions)
 Webhook = WebhookView
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.15 on 2026-10-18 06:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0013_remove_user_img_id_remove_user_img_ver_userimage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PermissionVersion',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('version', models.IntegerField(default=0)),
+                ('time', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -125,4 +125,14 @@ class UserImage(models.Model):
     void_ind = models.CharField(max_length=1, default="n")
 
     def __str__(self):
-        return str(self.id) + " " + str(self.user)
\ No newline at end of file
+        return str(self.id) + " " + str(self.user)
+
+class PermissionVersion(models.Model):
+    id = models.AutoField(primary_key=True)
+    # Bumped on every group, permission or membership edit so each process can
+    # tell its cached user permissions are stale
+    version = models.IntegerField(default=0)
+    time = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.id} : {self.version}"
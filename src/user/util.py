@@ -161,6 +161,8 @@ def save_user(data: dict[str, Any]) -> User:
         for user_group in user_groups:
             user_group.user_set.remove(u)
 
+        general.security.user_permissions_changed()
+
     return u
 
 
@@ -277,6 +279,8 @@ def save_group(data: dict[str, Any]) -> None:
     for gpr_prmsn in gpr_prmsns:
         gpr_prmsn.group_set.remove(group)
 
+    general.security.user_permissions_changed()
+
 
 def delete_group(group_id: int) -> None:
     """
@@ -290,6 +294,7 @@ def delete_group(group_id: int) -> None:
     except ScoutAuthGroup.DoesNotExist:
         pass
     Group.objects.get(id=group_id).delete()
+    general.security.user_permissions_changed()
 
 
 def get_permissions(codename: str | None = None) -> QuerySet[Permission]:
@@ -326,10 +331,12 @@ def save_permission(data: dict[str, Any]) -> None:
     prmsn.content_type_id = -1
 
     prmsn.save()
+    general.security.user_permissions_changed()
 
 
 def delete_permission(prmsn_id: int):
     Permission.objects.get(id=prmsn_id).delete()
+    general.security.user_permissions_changed()
 
 
 def run_security_audit():
@@ -113,3 +113,30 @@ def system_user(db):
         user.id = -1
         user.save(update_fields=[])
     return user
+
+
+@pytest.fixture(autouse=True)
+def clear_process_caches():
+    """Resets process level caches so state does not leak between tests."""
+    import form.util
+    import general.pubsub
+    import general.security
+    import scouting.field.util
+    import scouting.util
+    import tba.util
+
+    form.util.invalidate_question_catalog()
+    scouting.field.util._table_columns.clear()
+    general.pubsub.reset_broker()
+    scouting.util.invalidate_current_season_event()
+    general.security.invalidate_user_permissions()
+    general.security._coalesced_errors.clear()
+    tba.util.get_pending_tba_responses().clear()
+    yield
+    form.util.invalidate_question_catalog()
+    scouting.field.util._table_columns.clear()
+    general.pubsub.reset_broker()
+    scouting.util.invalidate_current_season_event()
+    general.security.invalidate_user_permissions()
+    general.security._coalesced_errors.clear()
+    tba.util.get_pending_tba_responses().clear()
@@ -0,0 +1,178 @@
+"""
+Tests for the batch answer matrix loader in form/util.py.
+"""
+import pytest
+from datetime import time
+
+
+def _make_question(form_typ, question_typ, question="Q?", value_multiplier=None):
+    from form.models import Question
+
+    return Question.objects.create(
+        form_typ=form_typ,
+        question_typ=question_typ,
+        question=question,
+        table_col_width="100",
+        order=1,
+        required="n",
+        value_multiplier=value_multiplier,
+        active="y",
+        void_ind="n",
+    )
+
+
+@pytest.fixture
+def matrix_data(db):
+    from form.models import FormType, QuestionType, Response, Answer, FlowAnswer, Flow
+
+    form_type = FormType.objects.create(form_typ="mtx", form_nm="Matrix")
+    number = QuestionType.objects.create(question_typ="number", question_typ_nm="Number")
+    button = QuestionType.objects.create(
+        question_typ="mnt-psh-btn", question_typ_nm="Button"
+    )
+    flow = Flow.objects.create(name="Flow", form_typ=form_type)
+
+    plain_question = _make_question(form_type, number, "Plain?")
+    flow_question = _make_question(form_type, button, "Flow?")
+
+    responses = [Response.objects.create(form_typ=form_type) for _ in range(3)]
+
+    for i, response in enumerate(responses):
+        Answer.objects.create(
+            response=response, question=plain_question, value=str(i), void_ind="n"
+        )
+        flow_answer = Answer.objects.create(response=response, flow=flow, void_ind="n")
+        FlowAnswer.objects.create(
+            answer=flow_answer, question=flow_question, value="b", value_time=time(0, 2)
+        )
+        FlowAnswer.objects.create(
+            answer=flow_answer, question=flow_question, value="a", value_time=time(0, 1)
+        )
+
+    # voided rows never show up
+    Answer.objects.create(
+        response=responses[0], question=plain_question, value="99", void_ind="y"
+    )
+
+    return {
+        "responses": responses,
+        "plain_question": plain_question,
+        "flow_question": flow_question,
+    }
+
+
+@pytest.mark.django_db
+class TestGetAnswerMatrix:
+    def test_dense_matrix(self, matrix_data):
+        from form.util import get_answer_matrix
+
+        responses = matrix_data["responses"]
+        plain_question = matrix_data["plain_question"]
+        flow_question = matrix_data["flow_question"]
+
+        matrix = get_answer_matrix(
+            [r.id for r in responses], [plain_question.id, flow_question.id, 99999]
+        )
+
+        assert set(matrix.keys()) == set(r.id for r in responses)
+        for i, response in enumerate(responses):
+            plain_cell = matrix[response.id][plain_question.id]
+            assert plain_cell["answered"] is True
+            assert plain_cell["value"] == str(i)
+            assert plain_cell["flow_answers"] == []
+
+            flow_cell = matrix[response.id][flow_question.id]
+            assert flow_cell["answered"] is False
+            assert [fa.value for fa in flow_cell["flow_answers"]] == ["a", "b"]
+
+            assert matrix[response.id][99999]["answered"] is False
+
+    def test_constant_queries(self, matrix_data, django_assert_num_queries):
+        from form.util import get_answer_matrix
+
+        with django_assert_num_queries(2):
+            matrix = get_answer_matrix(
+                [r.id for r in matrix_data["responses"]],
+                [matrix_data["plain_question"].id, matrix_data["flow_question"].id],
+            )
+            for row in matrix.values():
+                for cell in row.values():
+                    for flow_answer in cell["flow_answers"]:
+                        flow_answer.question.question_typ.question_typ
+                        flow_answer.answer.response.time
+
+    def test_empty_inputs_skip_queries(self, django_assert_num_queries):
+        from form.util import get_answer_matrix
+
+        with django_assert_num_queries(0):
+            assert get_answer_matrix([], [1, 2]) == {}
+            assert get_answer_matrix([1], []) == {1: {}}
+
+    def test_missing_cell(self):
+        from form.util import get_answer_matrix_cell
+
+        cell = get_answer_matrix_cell({}, 1, 2)
+        assert cell == {"answered": False, "value": None, "flow_answers": []}
+
+
+@pytest.mark.django_db
+class TestMatrixConsumers:
+    def test_get_responses_question_answers_uses_matrix(
+        self, matrix_data, django_assert_num_queries
+    ):
+        from form.util import get_answer_matrix, get_responses_question_answers
+
+        responses = matrix_data["responses"]
+        questions = [
+            {"id": matrix_data["plain_question"].id},
+            {"id": matrix_data["flow_question"].id},
+        ]
+        matrix = get_answer_matrix([r.id for r in responses], [q["id"] for q in questions])
+
+        with django_assert_num_queries(0):
+            result = get_responses_question_answers(responses, questions, matrix)
+
+        assert [r["response_id"] for r in result] == [r.id for r in responses]
+        # plain answer, plain flow answers, flow question flow answers
+        assert len(result[1]["question_answers"]) == 3
+        assert result[1]["question_answers"][0]["value"] == "1"
+
+    def test_get_responses_question_answers_loads_matrix(
+        self, matrix_data, django_assert_num_queries
+    ):
+        from form.util import get_responses_question_answers
+
+        responses = matrix_data["responses"]
+        questions = [{"id": matrix_data["plain_question"].id}]
+
+        with django_assert_num_queries(2):
+            result = get_responses_question_answers(responses, questions)
+
+        assert result[2]["question_answers"][0]["value"] == "2"
+
+    def test_get_graph_question_ids(self):
+        from form.util import get_graph_question_ids
+
+        graph = {
+            "graphquestion_set": [
+                {"question": {"id": 1}, "question_aggregate": None},
+                {
+                    "question": None,
+                    "question_aggregate": {
+                        "aggregate_questions": [
+                            {"question": {"id": 2}},
+                            {"question": {"id": 3}},
+                        ]
+                    },
+                },
+            ],
+            "graphcategory_set": [
+                {
+                    "graphcategoryattribute_set": [
+                        {"question": {"id": 4}, "question_aggregate": None}
+                    ]
+                }
+            ],
+        }
+
+        assert get_graph_question_ids(graph) == {1, 2, 3, 4}
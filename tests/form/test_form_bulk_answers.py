@@ -0,0 +1,289 @@
+"""
+Tests for the bulk answer write path in form/util.py.
+"""
+import json
+import pytest
+from unittest.mock import MagicMock, PropertyMock, patch
+
+
+@pytest.fixture
+def bulk_form(db):
+    from django.contrib.auth import get_user_model
+    from form.models import FormType, QuestionType, Question, Flow
+
+    user = get_user_model().objects.create_user(
+        username="bulk", email="bulk@test.com", password="pass"
+    )
+    form_type = FormType.objects.create(form_typ="field", form_nm="Field")
+    FormType.objects.create(form_typ="pit", form_nm="Pit")
+    number = QuestionType.objects.create(question_typ="number", question_typ_nm="Num")
+
+    questions = [
+        Question.objects.create(
+            form_typ=form_type,
+            question_typ=number,
+            question=f"Q{i}",
+            table_col_width="100",
+            order=i,
+            required="n",
+            active="y",
+            void_ind="n",
+        )
+        for i in range(3)
+    ]
+    flow = Flow.objects.create(name="Flow", form_typ=form_type)
+
+    return {"user": user, "questions": questions, "flow": flow}
+
+
+def _flow_answer_data(question, seconds):
+    return {
+        "question": {"id": question.id},
+        "value": "1",
+        "value_time": f"00:00:{seconds:02d}",
+    }
+
+
+def _flow_data(bulk_form, presses):
+    flow_question = bulk_form["questions"][2]
+    return {
+        "flow": {"id": bulk_form["flow"].id},
+        "value": "",
+        "flow_answers": [_flow_answer_data(flow_question, i) for i in range(presses)],
+    }
+
+
+def _event():
+    from scouting.models import Event, Season, Team
+
+    season = Season.objects.create(season="2050", current="y")
+    Team.objects.create(team_no=3492, team_nm="PARTs")
+    return Event.objects.create(
+        season=season,
+        event_cd="2050bulk",
+        event_nm="Bulk",
+        date_st="2050-01-01T00:00:00Z",
+        date_end="2050-01-02T00:00:00Z",
+        current="y",
+        void_ind="n",
+    )
+
+
+def _response():
+    from form.models import Response
+
+    return Response.objects.create(form_typ_id="field")
+
+
+@pytest.mark.django_db
+class TestSaveAnswersBulk:
+    @pytest.mark.parametrize("presses", [1, 25])
+    def test_query_count_independent_of_flow_answers(
+        self, bulk_form, presses, django_assert_max_num_queries
+    ):
+        from form.models import FlowAnswer
+        from form.util import save_answers_bulk
+
+        response = _response()
+        answers = [
+            {"question": {"id": bulk_form["questions"][0].id}, "value": "3"},
+            _flow_data(bulk_form, presses),
+        ]
+
+        # existing answers, answer insert, flow answer insert and the savepoint
+        with django_assert_max_num_queries(5):
+            save_answers_bulk(answers, response)
+
+        assert FlowAnswer.objects.filter(answer__response=response).count() == presses
+
+    def test_updates_existing_and_creates_new(self, bulk_form):
+        from form.models import Answer
+        from form.util import save_answers_bulk
+
+        first, second, _ = bulk_form["questions"]
+        response = _response()
+        existing = Answer.objects.create(
+            response=response, question=first, value="1", void_ind="n"
+        )
+
+        saved = save_answers_bulk(
+            [
+                {"question": {"id": first.id}, "value": "2"},
+                {"question": {"id": second.id}, "value": "5"},
+                {"question": {"id": second.id}, "value": "6"},
+            ],
+            response,
+        )
+
+        existing.refresh_from_db()
+        assert existing.value == "2"
+        assert saved[0].id == existing.id
+        assert list(
+            Answer.objects.filter(response=response, question=second).values_list(
+                "value", flat=True
+            )
+        ) == ["6"]
+
+    def test_ids_read_back_without_returning_inserts(self, bulk_form):
+        from django.db import connection
+        from form.models import Answer, FlowAnswer
+        from form.util import save_answers_bulk
+
+        response = _response()
+        save_answers_bulk([_flow_data(bulk_form, 1)], response)
+
+        # MySQL does not return the ids of bulk inserted rows
+        with patch.object(
+            type(connection.features),
+            "can_return_rows_from_bulk_insert",
+            new_callable=PropertyMock,
+            return_value=False,
+        ):
+            saved = save_answers_bulk(
+                [
+                    {"question": {"id": bulk_form["questions"][0].id}, "value": "3"},
+                    _flow_data(bulk_form, 2),
+                ],
+                response,
+            )
+
+        answers = Answer.objects.filter(response=response).order_by("id")
+        assert [answer.id for answer in saved] == [answer.id for answer in answers][1:]
+        assert FlowAnswer.objects.filter(answer=saved[1]).count() == 2
+
+    def test_flows_always_create(self, bulk_form):
+        from form.models import Answer
+        from form.util import save_answers_bulk
+
+        response = _response()
+        save_answers_bulk([_flow_data(bulk_form, 1)], response)
+        save_answers_bulk([_flow_data(bulk_form, 2)], response)
+
+        assert Answer.objects.filter(response=response, flow=bulk_form["flow"]).count() == 2
+
+    def test_missing_question_and_flow_raises(self, bulk_form):
+        from form.util import save_answers_bulk
+
+        with pytest.raises(Exception, match="No question or flow"):
+            save_answers_bulk([{"value": "1"}], _response())
+
+
+@pytest.mark.django_db
+class TestSaveResponsesAtomic:
+    def test_field_response_rolls_back(self, bulk_form):
+        from form.models import Answer, Response
+        from form.util import save_field_response
+        from scouting.models import FieldResponse
+
+        with patch("form.util.scouting.util.get_current_event", return_value=_event()):
+            with pytest.raises(Exception, match="No question or flow"):
+                save_field_response(
+                    {
+                        "form_typ": "field",
+                        "team_id": 3492,
+                        "answers": [
+                            {"question": {"id": bulk_form["questions"][0].id}, "value": "1"},
+                            {"value": "2"},
+                        ],
+                    },
+                    bulk_form["user"].id,
+                )
+
+        assert FieldResponse.objects.count() == 0
+        assert Response.objects.count() == 0
+        assert Answer.objects.count() == 0
+
+    def test_pit_response_updates_answers(self, bulk_form):
+        from form.models import Answer
+        from form.util import save_pit_response
+
+        event = _event()
+        question = bulk_form["questions"][0]
+
+        with patch("form.util.scouting.util.get_current_event", return_value=event):
+            first = save_pit_response(
+                {
+                    "form_typ": "pit",
+                    "team_id": 3492,
+                    "answers": [{"question": {"id": question.id}, "value": "a"}],
+                },
+                bulk_form["user"].id,
+            )
+            second = save_pit_response(
+                {
+                    "form_typ": "pit",
+                    "team_id": 3492,
+                    "answers": [{"question": {"id": question.id}, "value": "b"}],
+                },
+                bulk_form["user"].id,
+            )
+
+        assert first.id == second.id
+        assert list(
+            Answer.objects.filter(response=second.response).values_list("value", flat=True)
+        ) == ["b"]
+
+
+@pytest.mark.django_db
+class TestValidateAnswers:
+    def test_valid(self, bulk_form, django_assert_num_queries):
+        from form.util import validate_answers
+
+        with django_assert_num_queries(2):
+            errors = validate_answers(
+                [
+                    {"question": {"id": bulk_form["questions"][0].id}, "value": "1"},
+                    _flow_data(bulk_form, 10),
+                ]
+            )
+
+        assert errors == []
+
+    def test_errors_by_index(self, bulk_form):
+        from form.util import validate_answers
+
+        errors = validate_answers(
+            [
+                {"question": {"id": bulk_form["questions"][0].id}, "value": "1"},
+                {"value": "1"},
+                {"question": {"id": -1}, "value": "1"},
+                {
+                    "flow": {"id": bulk_form["flow"].id},
+                    "flow_answers": [{"question": {"id": -2}, "value": "1"}],
+                },
+            ]
+        )
+
+        assert errors == [
+            {"index": 1, "message": "No question or flow"},
+            {"index": 2, "message": "Question -1 does not exist."},
+            {"index": 3, "message": "Flow answer question -2 does not exist."},
+            {"index": 3, "message": "Flow answer is missing its value time."},
+        ]
+
+    def test_view_reports_errors_without_saving(self, bulk_form):
+        from rest_framework.test import APIRequestFactory, force_authenticate
+        from form.models import Response
+        from form.views import SaveAnswersView
+
+        data = {
+            "form_typ": "field",
+            "team_id": 3492,
+            "answers": [{"question": {"id": -1}, "value": "1"}],
+        }
+        request = APIRequestFactory().post("/form/save-answers/", data, format="json")
+        force_authenticate(request, user=bulk_form["user"])
+
+        with (
+            patch("form.views.has_access", return_value=True),
+            patch("form.views.ScoutFieldFormResponseSerializer") as serializer,
+        ):
+            serializer.return_value = MagicMock(validated_data=data)
+            serializer.return_value.is_valid.return_value = True
+            response = SaveAnswersView.as_view()(request)
+
+        assert response.data["error"] is True
+        assert json.loads(response.data["errorMessage"]) == [
+            {"index": 0, "message": "Question -1 does not exist."}
+        ]
+        assert Response.objects.count() == 0
@@ -0,0 +1,359 @@
+"""
+Tests for the single pass graph pipeline in form/util.py.
+"""
+import pytest
+from datetime import datetime
+from types import SimpleNamespace
+
+
+def _response(rid):
+    return SimpleNamespace(id=rid, time=datetime(2025, 3, 1, 12, rid))
+
+
+def _cell(value=None, flow_presses=0, question_id=None):
+    return {
+        "answered": value is not None,
+        "value": value,
+        "flow_answers": [
+            SimpleNamespace(
+                question_id=question_id,
+                question=SimpleNamespace(
+                    question_typ=SimpleNamespace(question_typ="mnt-psh-btn"),
+                    value_multiplier=None,
+                ),
+                value="1",
+            )
+            for _ in range(flow_presses)
+        ],
+    }
+
+
+def _graph_question(qid, label, value_multiplier=None, graph_question_typ=None):
+    return {
+        "question": {
+            "id": qid,
+            "question": label,
+            "active": "y",
+            "value_multiplier": value_multiplier,
+        },
+        "question_aggregate": None,
+        "graph_question_typ": graph_question_typ,
+    }
+
+
+def _sum_aggregate(questions, name="Total"):
+    return {
+        "id": 9,
+        "name": name,
+        "use_answer_time": False,
+        "question_aggregate_typ": SimpleNamespace(question_aggregate_typ="sum"),
+        "aggregate_questions": [
+            {"question": q["question"], "order": i} for i, q in enumerate(questions)
+        ],
+    }
+
+
+def _graph(graph_typ, graph_questions=None, bins=None, categories=None):
+    return {
+        "id": 1,
+        "graph_typ": SimpleNamespace(graph_typ=graph_typ),
+        "graphbin_set": [SimpleNamespace(bin=b, width=w) for b, w in (bins or [])],
+        "graphcategory_set": categories or [],
+        "graphquestion_set": graph_questions or [],
+    }
+
+
+@pytest.fixture
+def event():
+    responses = [_response(1), _response(2), _response(3), _response(4)]
+    answer_matrix = {
+        1: {1: _cell("2"), 2: _cell(flow_presses=3, question_id=2)},
+        2: {1: _cell("5"), 2: _cell(flow_presses=1, question_id=2)},
+        3: {1: _cell("!EXIST"), 2: _cell()},
+        4: {1: _cell("9"), 2: _cell(flow_presses=6, question_id=2)},
+    }
+    return responses, answer_matrix
+
+
+class TestGraphSourceValues:
+    def test_question_values(self, event):
+        from form.util import get_graph_source_values
+
+        responses, answer_matrix = event
+
+        assert get_graph_source_values(
+            _graph_question(1, "Q1", "2"), responses, answer_matrix
+        ) == [4, 10, None, 18]
+        assert get_graph_source_values(
+            _graph_question(2, "Q2"), responses, answer_matrix
+        ) == [3, 1, None, 6]
+
+    def test_aggregate_values(self, event):
+        from form.util import get_graph_source_values
+
+        responses, answer_matrix = event
+        questions = [_graph_question(1, "Q1"), _graph_question(2, "Q2")]
+        source = {"question": None, "question_aggregate": _sum_aggregate(questions)}
+
+        assert get_graph_source_values(source, responses, answer_matrix) == [
+            5,
+            6,
+            0,
+            15,
+        ]
+
+
+class TestGraphResponses:
+    @pytest.mark.django_db
+    def test_no_queries_with_graph_and_matrix(self, event, django_assert_num_queries):
+        from form.util import graph_responses
+
+        responses, answer_matrix = event
+        graph = _graph(
+            "histogram", [_graph_question(1, "Q1")], bins=[("0", "5"), ("5", "5")]
+        )
+
+        with django_assert_num_queries(0):
+            graph_responses(1, responses, graph=graph, answer_matrix=answer_matrix)
+
+    def test_histogram(self, event):
+        from form.util import graph_responses
+
+        responses, answer_matrix = event
+        questions = [_graph_question(1, "Q1"), _graph_question(2, "Q2")]
+        graph = _graph(
+            "histogram",
+            questions
+            + [{"question": None, "question_aggregate": _sum_aggregate(questions)}],
+            bins=[("0", "5"), ("5", "5"), ("10", "10")],
+        )
+
+        result = graph_responses(1, responses, graph=graph, answer_matrix=answer_matrix)
+
+        assert [r["label"] for r in result] == ["Q1", "Q2", "Total"]
+        assert result[0]["bins"] == [
+            {"bin": "0 - 4", "width": 5, "count": 2},
+            {"bin": "5 - 9", "width": 5, "count": 2},
+            {"bin": "10 - 19", "width": 10, "count": 0},
+        ]
+        assert [b["count"] for b in result[1]["bins"]] == [3, 1, 0]
+        assert [b["count"] for b in result[2]["bins"]] == [1, 2, 1]
+
+    def test_ctg_hstgrm_counts_first_passing_category(self, event):
+        from form.util import graph_responses
+
+        responses, answer_matrix = event
+        gt_equal = SimpleNamespace(question_condition_typ="gt-equal")
+        categories = [
+            {
+                "category": "High",
+                "graphcategoryattribute_set": [
+                    dict(
+                        _graph_question(1, "Q1"),
+                        question_condition_typ=gt_equal,
+                        value="5",
+                    )
+                ],
+            },
+            {
+                "category": "Pressed",
+                "graphcategoryattribute_set": [
+                    dict(
+                        _graph_question(2, "Q2"),
+                        question_condition_typ=gt_equal,
+                        value="1",
+                    )
+                ],
+            },
+        ]
+        graph = _graph("ctg-hstgrm", categories=categories)
+
+        result = graph_responses(1, responses, graph=graph, answer_matrix=answer_matrix)
+
+        assert [(c["label"], c["bins"][0]["count"]) for c in result] == [
+            ("High", 2),
+            ("Pressed", 1),
+        ]
+        assert "passed" not in result[0]
+
+    def test_ctg_hstgrm_equal_on_text_answers(self):
+        from form.util import graph_responses
+
+        responses = [_response(1), _response(2), _response(3)]
+        answer_matrix = {
+            1: {1: _cell("Red"), 2: _cell("4")},
+            2: {1: _cell("Blue"), 2: _cell("2")},
+            3: {1: _cell("Red"), 2: _cell("2")},
+        }
+        equal = SimpleNamespace(question_condition_typ="equal")
+        select = dict(_graph_question(1, "Alliance"))
+        select["question"]["question_typ"] = {"question_typ": "select"}
+        doubled = _graph_question(2, "Doubled", value_multiplier="2")
+        categories = [
+            {
+                "category": "Eight",
+                "graphcategoryattribute_set": [
+                    dict(doubled, question_condition_typ=equal, value="8")
+                ],
+            },
+            {
+                "category": "Red",
+                "graphcategoryattribute_set": [
+                    dict(select, question_condition_typ=equal, value="Red")
+                ],
+            },
+        ]
+        graph = _graph("ctg-hstgrm", categories=categories)
+
+        result = graph_responses(1, responses, graph=graph, answer_matrix=answer_matrix)
+
+        assert [(c["label"], c["bins"][0]["count"]) for c in result] == [
+            ("Eight", 1),
+            ("Red", 1),
+        ]
+
+    def test_logical_aggregate_equal_on_text_answers(self):
+        from form.util import get_graph_source_values
+
+        responses = [_response(1), _response(2)]
+        answer_matrix = {1: {1: _cell("Red")}, 2: {1: _cell("Blue")}}
+        question = _graph_question(1, "Alliance")["question"]
+        question["question_typ"] = {"question_typ": "select"}
+        source = {
+            "question": None,
+            "question_aggregate": {
+                "id": 9,
+                "name": "Is Red",
+                "use_answer_time": False,
+                "question_aggregate_typ": SimpleNamespace(
+                    question_aggregate_typ="logical"
+                ),
+                "aggregate_questions": [
+                    {
+                        "question": question,
+                        "order": 0,
+                        "question_condition_typ": SimpleNamespace(
+                            question_condition_typ="equal"
+                        ),
+                        "condition_value": "Red",
+                    }
+                ],
+            },
+        }
+
+        assert get_graph_source_values(source, responses, answer_matrix) == [1, 0]
+
+    def test_res_plot(self, event):
+        from form.util import graph_responses
+
+        responses, answer_matrix = event
+        ref_question = _graph_question(1, "Q1")
+        ref_point = {
+            "question": None,
+            "question_aggregate": _sum_aggregate([ref_question]),
+            "graph_question_typ": SimpleNamespace(graph_question_typ="ref-pnt"),
+        }
+        graph = _graph("res-plot", [ref_point, _graph_question(2, "Q2")])
+
+        result = graph_responses(
+            1,
+            responses,
+            aggregate_responses=responses[:1],
+            graph=graph,
+            answer_matrix=answer_matrix,
+        )
+
+        assert result == [
+            {
+                "label": "Q2",
+                "points": [
+                    {"point": 1, "time": responses[0].time},
+                    {"point": -1, "time": responses[1].time},
+                    {"point": 4, "time": responses[3].time},
+                ],
+            }
+        ]
+
+    def test_diff_plot_and_line(self, event):
+        from form.util import graph_responses
+
+        responses, answer_matrix = event
+
+        diff = graph_responses(
+            1,
+            responses,
+            graph=_graph("diff-plot", [_graph_question(1, "Q1")]),
+            answer_matrix=answer_matrix,
+        )
+        line = graph_responses(
+            1,
+            responses,
+            graph=_graph("line", [_graph_question(1, "Q1")]),
+            answer_matrix=answer_matrix,
+        )
+
+        assert [p["point"] for p in diff[0]["points"]] == [0, 3, -5, 9]
+        assert [p["point"] for p in line[0]["points"]] == [2, 5, 0, 9]
+
+    def test_box_wskr(self, event):
+        from form.util import graph_responses
+
+        responses, answer_matrix = event
+        result = graph_responses(
+            1,
+            responses,
+            graph=_graph("box-wskr", [_graph_question(2, "Q2")]),
+            answer_matrix=answer_matrix,
+        )
+
+        assert result[0]["dataset"] == [0, 1, 3, 6]
+        assert (result[0]["min"], result[0]["max"]) == (0, 6)
+        assert result[0]["q2"] == 2
+
+
+@pytest.mark.django_db
+class TestGraphTeam:
+    def test_string_team_ids(self, test_user):
+        from unittest.mock import MagicMock, patch
+        from form.models import Graph, GraphType
+        from scouting.strategizing.util import graph_team
+
+        graph = Graph.objects.create(
+            name="Team Graph",
+            graph_typ=GraphType.objects.get_or_create(
+                graph_typ="histogram", defaults={"graph_nm": "Histogram"}
+            )[0],
+            creator=test_user,
+            active="y",
+            void_ind="n",
+            x_scale_min=0,
+            x_scale_max=100,
+            y_scale_min=0,
+            y_scale_max=50,
+        )
+        field_responses = [
+            SimpleNamespace(team_id=3492, response=_response(1)),
+            SimpleNamespace(team_id=1234, response=_response(2)),
+        ]
+        with (
+            patch(
+                "scouting.strategizing.util.scouting.util.get_current_event",
+                return_value=MagicMock(id=1),
+            ),
+            patch(
+                "scouting.strategizing.util.FieldResponse.objects.select_related",
+                return_value=MagicMock(
+                    filter=MagicMock(return_value=field_responses)
+                ),
+            ),
+            patch(
+                "scouting.strategizing.util.form.util.graph_responses",
+                return_value=[],
+            ) as graph_responses,
+        ):
+            # GraphTeamView passes the query string values through as strings
+            graph_team(graph, ["3492"], reference_team_id="1234")
+
+        args = graph_responses.call_args[0]
+        assert [r.id for r in args[1]] == [1]
+        assert [r.id for r in args[2]] == [2]
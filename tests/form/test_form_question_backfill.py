@@ -0,0 +1,197 @@
+"""
+Tests for the "!EXIST" answer backfill run when a question is added mid season.
+"""
+import pytest
+from unittest.mock import patch
+
+
+@pytest.fixture
+def backfill_season(db):
+    from django.contrib.auth import get_user_model
+    from form.models import FormType, QuestionType, Response
+    from scouting.models import Event, FieldResponse, Season, Team
+
+    user = get_user_model().objects.create_user(
+        username="backfill", email="backfill@test.com", password="pass"
+    )
+    FormType.objects.create(form_typ="field", form_nm="Field")
+    QuestionType.objects.create(question_typ="number", question_typ_nm="Num")
+    team = Team.objects.create(team_no=3492, team_nm="PARTs")
+
+    def make_event(season, event_cd):
+        return Event.objects.create(
+            season=season,
+            event_cd=event_cd,
+            event_nm=event_cd,
+            date_st="2050-01-01T00:00:00Z",
+            date_end="2050-01-02T00:00:00Z",
+            current="n",
+            void_ind="n",
+        )
+
+    season = Season.objects.create(season="2050", current="y")
+    old_season = Season.objects.create(season="2049", current="n")
+    events = [make_event(season, "2050a"), make_event(old_season, "2049a")]
+
+    responses = []
+    for event, void_ind in [
+        (events[0], "n"),
+        (events[0], "n"),
+        (events[0], "n"),
+        (events[0], "y"),
+        (events[1], "n"),
+    ]:
+        response = Response.objects.create(form_typ_id="field")
+        FieldResponse.objects.create(
+            event=event, team=team, user=user, response=response, void_ind=void_ind
+        )
+        responses.append(response)
+
+    with patch("form.util.scouting.util.get_current_season", return_value=season):
+        yield {"season": season, "responses": responses}
+
+
+def _question_data(question="Added?"):
+    return {
+        "form_typ": {"form_typ": "field"},
+        "question_typ": {"question_typ": "number", "is_list": "n"},
+        "question": question,
+        "table_col_width": "100",
+        "order": 1,
+        "active": "y",
+        "required": "n",
+        "scout_question": {},
+        "questionoption_set": [],
+    }
+
+
+def _exist_response_ids(question_text="Added?"):
+    from form.models import Answer
+
+    return sorted(
+        Answer.objects.filter(
+            question__question=question_text, value="!EXIST"
+        ).values_list("response_id", flat=True)
+    )
+
+
+@pytest.mark.django_db
+class TestQuestionBackfill:
+    def test_small_backfill_runs_inline(self, backfill_season):
+        from form.models import QuestionBackfill
+        from form.util import save_question
+
+        save_question(_question_data())
+
+        assert _exist_response_ids() == [r.id for r in backfill_season["responses"][:3]]
+        question_backfill = QuestionBackfill.objects.get()
+        assert (question_backfill.status, question_backfill.total) == ("c", 3)
+        assert question_backfill.processed == 3
+        assert question_backfill.completed_time is not None
+
+    def test_query_count_independent_of_responses(
+        self, backfill_season, django_assert_num_queries
+    ):
+        from form.models import Question, QuestionBackfill
+        from form.util import run_question_backfill
+
+        question = Question.objects.create(
+            form_typ_id="field",
+            question_typ_id="number",
+            question="Added?",
+            table_col_width="100",
+            order=1,
+            active="y",
+            required="n",
+        )
+        question.scout_question.create(season=backfill_season["season"])
+        question_backfill = QuestionBackfill.objects.create(question=question, total=3)
+
+        # status, savepoint, lock, select, insert, progress, release, final status
+        with django_assert_num_queries(8):
+            assert run_question_backfill(question_backfill) == 3
+
+    def test_large_backfill_is_deferred(self, backfill_season):
+        from form.models import QuestionBackfill
+        from form.util import run_question_backfills, save_question
+
+        with patch("form.util.question_backfill_chunk_size", 2):
+            save_question(_question_data())
+
+            question_backfill = QuestionBackfill.objects.get()
+            assert (question_backfill.status, question_backfill.processed) == ("q", 0)
+            assert _exist_response_ids() == []
+
+            message = run_question_backfills()
+
+        question_backfill.refresh_from_db()
+        assert message == f"Question {question_backfill.question_id}: 3 answers\n"
+        assert (question_backfill.status, question_backfill.processed) == ("c", 3)
+        assert len(_exist_response_ids()) == 3
+
+        assert run_question_backfills() == "No question backfills queued."
+
+    def test_rerun_skips_answered_responses(self, backfill_season):
+        from form.models import QuestionBackfill
+        from form.util import run_question_backfill, save_question
+
+        save_question(_question_data())
+        question_backfill = QuestionBackfill.objects.get()
+
+        assert run_question_backfill(question_backfill) == 0
+        assert len(_exist_response_ids()) == 3
+
+    def test_failure_is_recorded(self, backfill_season):
+        from form.models import QuestionBackfill
+        from form.util import save_question
+
+        with patch("form.util.Answer.objects.bulk_create", side_effect=Exception("boom")):
+            save_question(_question_data())
+
+        question_backfill = QuestionBackfill.objects.get()
+        assert (question_backfill.status, question_backfill.error_message) == ("e", "boom")
+
+    def test_other_form_types(self, db):
+        from form.models import FormType, QuestionType, Response
+        from form.util import save_question
+
+        FormType.objects.create(form_typ="survey", form_nm="Survey")
+        QuestionType.objects.create(question_typ="number", question_typ_nm="Num")
+        responses = [Response.objects.create(form_typ_id="survey") for _ in range(2)]
+
+        data = _question_data()
+        data["form_typ"] = {"form_typ": "survey"}
+        save_question(data)
+
+        assert _exist_response_ids() == [r.id for r in responses]
+
+
+@pytest.mark.django_db
+class TestQuestionBackfillViews:
+    def test_run_view(self, backfill_season):
+        from rest_framework.test import APIRequestFactory
+        from form.views import RunQuestionBackfillsView
+
+        request = APIRequestFactory().get("/form/run-question-backfills/")
+        response = RunQuestionBackfillsView.as_view()(request)
+
+        assert response.data["retMessage"] == (
+            "QUESTION BACKFILLS: No question backfills queued."
+        )
+
+    def test_progress_view(self, backfill_season):
+        from django.contrib.auth import get_user_model
+        from rest_framework.test import APIRequestFactory, force_authenticate
+        from form.util import save_question
+        from form.views import QuestionBackfillView
+
+        save_question(_question_data())
+
+        request = APIRequestFactory().get("/form/question-backfill/")
+        force_authenticate(request, user=get_user_model().objects.get(username="backfill"))
+        with patch("form.views.has_access", return_value=True):
+            response = QuestionBackfillView.as_view()(request)
+
+        assert [(b["status"], b["processed"], b["total"]) for b in response.data] == [
+            ("c", 3, 3)
+        ]
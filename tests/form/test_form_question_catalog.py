@@ -0,0 +1,194 @@
+"""
+Tests for the process level question catalog in form/util.py.
+"""
+import pytest
+
+
+def _make_question(form_typ, question_typ, question="Q?", order=1, form_sub_typ=None):
+    from form.models import Question
+
+    return Question.objects.create(
+        form_typ=form_typ,
+        question_typ=question_typ,
+        form_sub_typ=form_sub_typ,
+        question=question,
+        table_col_width="100",
+        order=order,
+        required="n",
+        active="y",
+        void_ind="n",
+    )
+
+
+@pytest.fixture
+def catalog_data(db):
+    from form.models import FormType, FormSubType, QuestionType, QuestionOption
+
+    form_type = FormType.objects.create(form_typ="cat", form_nm="Catalog")
+    sub_type = FormSubType.objects.create(
+        form_sub_typ="cat-sub", form_sub_nm="Sub", form_typ=form_type, order=1
+    )
+    question_type = QuestionType.objects.create(
+        question_typ="select-cat", question_typ_nm="Select", is_list="y"
+    )
+
+    first = _make_question(form_type, question_type, "First", 1, sub_type)
+    second = _make_question(form_type, question_type, "Second", 2)
+    QuestionOption.objects.create(question=first, option="A", active="y", void_ind="n")
+
+    return {
+        "form_type": form_type,
+        "sub_type": sub_type,
+        "first": first,
+        "second": second,
+    }
+
+
+@pytest.mark.django_db
+class TestQuestionCatalog:
+    def test_catalog_is_reused(self, catalog_data, django_assert_num_queries):
+        from form.util import get_questions
+
+        questions = {q["question"]: q for q in get_questions("cat")}
+        assert set(questions) == {"First", "Second"}
+        assert [o["option"] for o in questions["First"]["questionoption_set"]] == ["A"]
+
+        with django_assert_num_queries(0):
+            assert len(get_questions("cat")) == 2
+            assert len(get_questions("cat", "y", "cat-sub")) == 1
+            assert get_questions("cat", form_sub_typ=None)[0]["question"] == "Second"
+
+    def test_catalog_build_query_count(self, catalog_data, django_assert_num_queries):
+        from form.util import get_questions
+
+        # the schema version, the question query and one per prefetched relation,
+        # however many questions
+        with django_assert_num_queries(7):
+            get_questions("cat")
+
+    def test_returned_dicts_are_copies(self, catalog_data):
+        from form.util import get_questions
+
+        questions = get_questions("cat")
+        questions[0]["answer"] = "changed"
+
+        assert "answer" not in get_questions("cat")[0]
+
+    def test_save_question_condition_invalidates(self, catalog_data):
+        from form.models import QuestionConditionType
+        from form.util import get_questions, save_question_condition
+
+        assert get_questions("cat", is_conditional=True) == []
+
+        QuestionConditionType.objects.create(
+            question_condition_typ="equal", question_condition_nm="Equal"
+        )
+        save_question_condition(
+            {
+                "value": "A",
+                "question_condition_typ": {"question_condition_typ": "equal"},
+                "active": "y",
+                "question_from": {"id": catalog_data["first"].id},
+                "question_to": {"id": catalog_data["second"].id},
+            }
+        )
+
+        conditional = get_questions("cat", is_conditional=True)
+        assert [q["id"] for q in conditional] == [catalog_data["second"].id]
+        assert [q["id"] for q in get_questions("cat", is_not_conditional=True)] == [
+            catalog_data["first"].id
+        ]
+
+    def test_save_flow_invalidates(self, catalog_data):
+        from form.util import get_questions, save_flow
+
+        assert len(get_questions("cat", not_in_flow=True)) == 2
+
+        first = get_questions("cat", qid=catalog_data["first"].id)[0]
+        first["form_typ"] = {"form_typ": "cat"}
+        first["form_sub_typ"] = {"form_sub_typ": "cat-sub"}
+
+        save_flow(
+            {
+                "name": "Flow",
+                "single_run": False,
+                "form_based": False,
+                "form_typ": {"form_typ": "cat"},
+                "flow_questions": [
+                    {"question": first, "press_to_continue": False, "order": 1}
+                ],
+            }
+        )
+
+        not_in_flow = get_questions("cat", not_in_flow=True)
+        assert [q["id"] for q in not_in_flow] == [catalog_data["second"].id]
+
+    def test_catalog_question_lookup(self, catalog_data, django_assert_num_queries):
+        from form.util import get_catalog_question, get_questions
+
+        get_questions("cat")
+
+        with django_assert_num_queries(0):
+            parsed = get_catalog_question(catalog_data["first"])
+
+        assert parsed["id"] == catalog_data["first"].id
+
+    def test_catalog_question_falls_back_for_void(self, catalog_data):
+        from form.util import get_catalog_question
+
+        question = catalog_data["second"]
+        question.void_ind = "y"
+        question.save()
+
+        assert get_catalog_question(question)["id"] == question.id
+
+    def test_season_scoped(self, catalog_data):
+        from form.models import FormType, QuestionType
+        from scouting.models import Season, Question as ScoutQuestion
+        from form.util import get_questions
+        from scouting.util import current_season_event_changed
+
+        field = FormType.objects.create(form_typ="field", form_nm="Field")
+        question_type = QuestionType.objects.create(
+            question_typ="number-cat", question_typ_nm="Number"
+        )
+        old_season = Season.objects.create(season="2000", current="n")
+        new_season = Season.objects.create(season="2001", current="y")
+
+        old_question = _make_question(field, question_type, "Old")
+        new_question = _make_question(field, question_type, "New")
+        ScoutQuestion.objects.create(question=old_question, season=old_season)
+        ScoutQuestion.objects.create(question=new_question, season=new_season)
+
+        assert [q["id"] for q in get_questions("field")] == [new_question.id]
+
+        new_season.current = "n"
+        new_season.save()
+        old_season.current = "y"
+        old_season.save()
+        current_season_event_changed()
+
+        assert [q["id"] for q in get_questions("field")] == [old_question.id]
+
+    def test_other_process_edit_invalidates(self, catalog_data):
+        from form.models import FormSchema
+        import form.util
+
+        form.util.get_questions("cat")
+        catalog_data["second"].question = "Renamed"
+        catalog_data["second"].save()
+
+        # another process saved a form edit, seen once the version is re-read
+        FormSchema.objects.create(id=1, version=5)
+        assert "Renamed" not in [q["question"] for q in form.util.get_questions("cat")]
+
+        form.util._form_schema["checked"] -= form.util.form_schema_check_seconds + 1
+        assert "Renamed" in [q["question"] for q in form.util.get_questions("cat")]
+
+    def test_edit_bumps_schema_version(self, catalog_data):
+        from form.util import get_form_schema_version, question_catalog_changed
+
+        version = get_form_schema_version()
+        question_catalog_changed()
+
+        assert get_form_schema_version() == version + 1
@@ -0,0 +1,60 @@
+"""
+Tests for the compiled question condition predicates in form/util.py.
+"""
+import pytest
+
+
+CASES = [
+    ("equal", "a", "a", True),
+    ("equal", "b", "a", False),
+    ("equal", None, None, False),
+    ("gt", "5", "4", True),
+    ("gt", 4, "4", False),
+    ("gt-equal", 4, "4", True),
+    ("lt-equal", "3", "4", True),
+    ("lt", 4, "4", False),
+    ("lt", None, "4", False),
+    ("exist", "", None, False),
+    ("exist", 0, None, True),
+]
+
+
+class TestCompileQuestionCondition:
+    @pytest.mark.parametrize("typ,answer_value,match_value,passed", CASES)
+    def test_predicates(self, typ, answer_value, match_value, passed):
+        from form.util import compile_question_condition, is_question_condition_passed
+
+        assert compile_question_condition(typ, match_value)(answer_value) is passed
+        assert is_question_condition_passed(typ, answer_value, match_value) is passed
+
+    def test_compiled_once(self):
+        from form.util import compile_question_condition
+
+        assert compile_question_condition("gt", "3") is compile_question_condition(
+            "gt", "3"
+        )
+
+    def test_column(self):
+        from form.util import is_question_condition_passed_column
+
+        assert is_question_condition_passed_column(
+            "gt-equal", ["1", None, 5, "9"], "5"
+        ) == [False, False, True, True]
+
+    def test_unknown_type_fails_when_checked(self):
+        from form.util import compile_question_condition
+
+        predicate = compile_question_condition("between", "1")
+
+        assert predicate(None) is False
+        with pytest.raises(Exception, match="no type"):
+            predicate("1")
+
+    def test_bad_match_value_fails_when_checked(self):
+        from form.util import compile_question_condition
+
+        predicate = compile_question_condition("gt", "many")
+
+        assert predicate(None) is False
+        with pytest.raises(ValueError):
+            predicate("1")
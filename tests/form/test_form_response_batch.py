@@ -0,0 +1,193 @@
+"""
+Tests for the offline response batch upload in form/util.py and form/views.py.
+"""
+import pytest
+from unittest.mock import patch
+
+
+@pytest.fixture
+def batch_form(db):
+    from django.contrib.auth import get_user_model
+    from form.models import FormType, QuestionType, Question
+    from scouting.models import Event, Season, Team
+
+    user = get_user_model().objects.create_user(
+        username="batch", email="batch@test.com", password="pass"
+    )
+    field = FormType.objects.create(form_typ="field", form_nm="Field")
+    FormType.objects.create(form_typ="pit", form_nm="Pit")
+    number = QuestionType.objects.create(question_typ="number", question_typ_nm="Num")
+    question = Question.objects.create(
+        form_typ=field,
+        question_typ=number,
+        question="Points",
+        table_col_width="100",
+        order=1,
+        required="n",
+        active="y",
+        void_ind="n",
+    )
+
+    season = Season.objects.create(season="2050", current="y")
+    event = Event.objects.create(
+        season=season,
+        event_cd="2050batch",
+        event_nm="Batch",
+        date_st="2050-01-01T00:00:00Z",
+        date_end="2050-01-02T00:00:00Z",
+        current="y",
+        void_ind="n",
+    )
+    Team.objects.create(team_no=3492, team_nm="PARTs")
+
+    with patch("form.util.scouting.util.get_current_event", return_value=event):
+        yield {"user": user, "question": question}
+
+
+def _item(batch_form, key, form_typ="field", value="1", question_id=None):
+    return {
+        "idempotency_key": key,
+        "form_typ": form_typ,
+        "team_id": 3492,
+        "answers": [
+            {
+                "question": {"id": question_id or batch_form["question"].id},
+                "value": value,
+            }
+        ],
+    }
+
+
+@pytest.mark.django_db
+class TestSaveResponseBatch:
+    def test_saves_and_dedupes_replays(self, batch_form):
+        from form.util import save_response_batch
+        from scouting.models import FieldResponse
+
+        items = [_item(batch_form, "a"), _item(batch_form, "b", value="2")]
+        first = save_response_batch(items, batch_form["user"].id)
+        replay = save_response_batch(items, batch_form["user"].id)
+
+        assert [r["status"] for r in first] == ["saved", "saved"]
+        assert [r["status"] for r in replay] == ["duplicate", "duplicate"]
+        assert [r["response_id"] for r in replay] == [r["response_id"] for r in first]
+        assert FieldResponse.objects.count() == 2
+
+    def test_duplicate_key_in_same_batch(self, batch_form):
+        from form.util import save_response_batch
+        from scouting.models import FieldResponse
+
+        results = save_response_batch(
+            [_item(batch_form, "a"), _item(batch_form, "a")], batch_form["user"].id
+        )
+
+        assert [r["status"] for r in results] == ["saved", "duplicate"]
+        assert FieldResponse.objects.count() == 1
+
+    def test_failed_item_does_not_undo_batch(self, batch_form):
+        from form.models import ResponseSubmission
+        from form.util import save_response_batch
+        from scouting.models import FieldResponse
+
+        results = save_response_batch(
+            [
+                _item(batch_form, "a"),
+                _item(batch_form, "b", question_id=-1),
+                _item(batch_form, "c", form_typ="team-app"),
+                _item(batch_form, "d", form_typ="pit"),
+            ],
+            batch_form["user"].id,
+        )
+
+        assert [r["status"] for r in results] == ["saved", "error", "error", "saved"]
+        assert results[1]["message"] == "Answer 0: Question -1 does not exist."
+        assert results[2]["message"] == "Form type team-app can not be batched."
+        assert FieldResponse.objects.count() == 1
+        assert set(ResponseSubmission.objects.values_list("idempotency_key", flat=True)) == {
+            "a",
+            "d",
+        }
+
+    def test_concurrent_replay_reported_as_duplicate(self, batch_form):
+        from form.models import ResponseSubmission
+        from form.util import save_answers, save_response_batch
+        from scouting.models import FieldResponse
+
+        response = save_answers({"form_typ": "field", "question_answers": []})
+
+        def saved_elsewhere(answers):
+            # another request commits the same key after the duplicate lookup
+            ResponseSubmission.objects.create(
+                user=batch_form["user"], idempotency_key="a", response=response
+            )
+            return []
+
+        with patch("form.util.validate_answers", side_effect=saved_elsewhere):
+            results = save_response_batch([_item(batch_form, "a")], batch_form["user"].id)
+
+        assert results[0]["status"] == "duplicate"
+        assert results[0]["response_id"] == response.id
+        assert FieldResponse.objects.count() == 0
+
+    def test_insert_conflict_reported_as_duplicate(self, batch_form):
+        from form.models import ResponseSubmission
+        from form.util import save_answers, save_response_batch
+        from scouting.models import FieldResponse
+
+        response = save_answers({"form_typ": "field", "question_answers": []})
+        ResponseSubmission.objects.create(
+            user=batch_form["user"], idempotency_key="a", response=response
+        )
+
+        # the duplicate lookup misses the other replay's row, as it would outside
+        # of its snapshot, so the submission insert raises an IntegrityError
+        with patch.object(ResponseSubmission.objects, "filter", return_value=[]):
+            results = save_response_batch([_item(batch_form, "a")], batch_form["user"].id)
+
+        assert results[0]["status"] == "duplicate"
+        assert results[0]["response_id"] == response.id
+        assert results[0]["message"] is None
+        assert FieldResponse.objects.count() == 0
+
+
+@pytest.mark.django_db
+class TestSaveAnswersBatchView:
+    def _post(self, batch_form, items):
+        from rest_framework.test import APIRequestFactory, force_authenticate
+        from form.views import SaveAnswersBatchView
+
+        request = APIRequestFactory().post(
+            "/form/save-answers-batch/", {"responses": items}, format="json"
+        )
+        force_authenticate(request, user=batch_form["user"])
+        return SaveAnswersBatchView.as_view()(request)
+
+    def test_checks_access_once_per_form_type(self, batch_form):
+        items = [
+            {"idempotency_key": str(i), "form_typ": "field", "team_id": "3492", "answers": []}
+            for i in range(5)
+        ]
+
+        with patch("form.views.has_access", return_value=True) as has_access:
+            response = self._post(batch_form, items)
+
+        assert has_access.call_count == 1
+        assert [r["status"] for r in response.data] == ["saved"] * 5
+
+    def test_no_access(self, batch_form):
+        from scouting.models import FieldResponse
+
+        items = [
+            {"idempotency_key": "a", "form_typ": "field", "team_id": "3492", "answers": []}
+        ]
+
+        with patch("form.views.has_access", return_value=False):
+            response = self._post(batch_form, items)
+
+        assert response.data["error"] is True
+        assert FieldResponse.objects.count() == 0
+
+    def test_invalid(self, batch_form):
+        response = self._post(batch_form, [{"form_typ": "field"}])
+
+        assert response.data["error"] is True
@@ -0,0 +1,132 @@
+"""
+Tests for loading form responses with their answers in form/util.py.
+"""
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+
+@pytest.fixture
+def survey(db):
+    from form.models import Answer, FormType, Question, QuestionType, Response
+
+    form_type = FormType.objects.create(form_typ="survey", form_nm="Survey")
+    question_type = QuestionType.objects.create(
+        question_typ="text", question_typ_nm="Text"
+    )
+    questions = [
+        Question.objects.create(
+            form_typ=form_type,
+            question_typ=question_type,
+            question=f"Q{i}",
+            table_col_width="100",
+            order=i,
+            required="n",
+            active="y",
+            void_ind="n",
+        )
+        for i in range(3)
+    ]
+
+    start = datetime(2050, 1, 1, tzinfo=timezone.utc)
+    responses = []
+    for i in range(120):
+        response = Response.objects.create(
+            form_typ=form_type, time=start + timedelta(minutes=i)
+        )
+        responses.append(response)
+        # the last question is left unanswered
+        for question in questions[:2]:
+            Answer.objects.create(
+                response=response, question=question, value=f"{i}-{question.order}"
+            )
+
+    # newest first
+    return {"questions": questions, "responses": responses[::-1]}
+
+
+@pytest.mark.django_db
+class TestGetResponses:
+    def test_answers(self, survey):
+        from form.util import get_responses
+
+        responses = get_responses("survey", "n")
+
+        assert [r["id"] for r in responses] == [r.id for r in survey["responses"]]
+        assert [q["answer"] for q in responses[0]["questionanswer_set"]] == [
+            "119-0",
+            "119-1",
+            "!FOUND",
+        ]
+
+    def test_query_count_per_chunk(self, survey, django_assert_num_queries):
+        from form.util import get_questions, get_responses
+
+        get_questions("survey", "y")
+
+        # the response query plus one answer query per 50 responses
+        with django_assert_num_queries(4):
+            get_responses("survey", "n")
+
+    def test_questions_are_shared(self, survey):
+        from form.util import get_responses
+
+        first, second = get_responses("survey", "n")[:2]
+
+        assert first["questionanswer_set"][0]["question"] == "Q0"
+        assert (
+            first["questionanswer_set"][0].maps[1]
+            is second["questionanswer_set"][0].maps[1]
+        )
+
+    def test_page(self, survey):
+        from form.util import get_responses_page
+
+        page = get_responses_page("survey", "n", 2)
+
+        assert (page["count"], page["previous"], page["next"]) == (3, 1, 3)
+        assert [r["id"] for r in page["responses"]] == [
+            r.id for r in survey["responses"][50:100]
+        ]
+        assert get_responses_page("survey", "n", "x")["previous"] is None
+        assert len(get_responses_page("survey", "n", 99)["responses"]) == 20
+
+    def test_get_response(self, survey, django_assert_num_queries):
+        from form.util import get_questions, get_response
+
+        get_questions("survey", "y")
+        response = survey["responses"][0]
+
+        with django_assert_num_queries(2):
+            questions = get_response(response.id)
+
+        assert [q["answer"] for q in questions] == ["119-0", "119-1", "!FOUND"]
+
+
+@pytest.mark.django_db
+class TestResponsesView:
+    def _get(self, params):
+        from django.contrib.auth import get_user_model
+        from rest_framework.test import APIRequestFactory, force_authenticate
+        from form.views import ResponsesView
+
+        user = get_user_model().objects.create_user(
+            username="responses", email="responses@test.com", password="pass"
+        )
+        request = APIRequestFactory().get("/form/responses/", params)
+        force_authenticate(request, user=user)
+        with patch("form.views.has_access", return_value=True):
+            return ResponsesView.as_view()(request)
+
+    def test_page(self, survey):
+        response = self._get({"form_typ": "survey", "pg": 3})
+
+        assert (response.data["count"], response.data["next"]) == (3, None)
+        assert len(response.data["responses"]) == 20
+        assert response.data["responses"][-1]["questionanswer_set"][1]["answer"] == "0-1"
+
+    def test_all(self, survey):
+        response = self._get({"form_typ": "survey"})
+
+        assert len(response.data) == 120
+        assert response.data[0]["questionanswer_set"][2]["answer"] == "!FOUND"
@@ -140,15 +140,14 @@ class TestParseQuestion:
         """parse_question when scout question exists."""
         from form.util import parse_question
 
+        from scouting.models import Season, Question as ScoutQuestion
+
         q = _make_question()
-        # Mock scout_question related manager
-        mock_sq = Mock()
-        mock_sq.id = 5
-        mock_sq.season = Mock(id=2024)
-        mock_get = Mock(return_value=mock_sq)
-        with patch.object(type(q.scout_question), "get", mock_get):
-            result = parse_question(q)
-        assert result["season_id"] == 2024
+        season = Season.objects.get_or_create(season="2024", defaults={"current": "n"})[0]
+        sq = ScoutQuestion.objects.create(question=q, season=season, void_ind="n")
+        result = parse_question(q)
+        assert result["season_id"] == season.id
+        assert result["scout_question"]["id"] == sq.id
 
     def test_parse_question_inactive_question(self):
         """parse_question with inactive question includes 'Deactivated' in display."""
@@ -796,7 +795,7 @@ class TestFormatQuestionConditionValues:
         mock_qc.condition = "equal"
         mock_qc.active = "y"
 
-        with patch("form.util.parse_question", return_value={}):
+        with patch("form.util.get_catalog_question", return_value={}):
             result = format_question_condition_values(mock_qc)
         assert result["question_condition_id"] == 1
 
@@ -0,0 +1,136 @@
+"""
+Tests for the error sink behind general.security.ret_message.
+"""
+import queue
+import pytest
+from datetime import timedelta
+from unittest.mock import patch
+
+
+@pytest.fixture
+def error_user(db):
+    from django.contrib.auth import get_user_model
+
+    User = get_user_model()
+    User.objects.create(id=-1, username="default", email="default@test.com")
+    return User.objects.create_user(
+        username="errors", email="errors@test.com", password="pass"
+    )
+
+
+@pytest.mark.django_db
+class TestErrorSink:
+    def test_identical_errors_coalesce(self, error_user):
+        from admin.models import ErrorLog
+        from general.security import ret_message
+
+        for _ in range(3):
+            ret_message(
+                "Failed", True, "api/a", error_user.id, Exception("Boom")
+            )
+        ret_message("Failed", True, "api/b", error_user.id, Exception("Boom"))
+
+        errors = ErrorLog.objects.order_by("path")
+        assert [(e.path, e.occurrences) for e in errors] == [
+            ("api/a", 3),
+            ("api/b", 1),
+        ]
+
+    def test_batch_coalesces_before_writing(self, error_user):
+        from admin.models import ErrorLog
+        from django.utils import timezone
+        from general.security import write_errors
+
+        error = {
+            "signature": ("api/a", "Exception", "Boom"),
+            "message": "Failed",
+            "path": "api/a",
+            "user_id": error_user.id,
+            "exception": Exception("Boom"),
+            "traceback": None,
+            "error_message": None,
+            "time": timezone.now(),
+        }
+
+        assert write_errors([error] * 5) == ""
+        assert ErrorLog.objects.get().occurrences == 5
+
+    def test_new_window_gets_new_row(self, error_user):
+        import general.security
+        from admin.models import ErrorLog
+
+        general.security.ret_message(
+            "Failed", True, "api/a", error_user.id, Exception("Boom")
+        )
+        for coalesced in general.security._coalesced_errors.values():
+            coalesced["time"] -= timedelta(
+                seconds=general.security.error_coalesce_seconds + 1
+            )
+        general.security.ret_message(
+            "Failed", True, "api/a", error_user.id, Exception("Boom")
+        )
+
+        assert ErrorLog.objects.count() == 2
+
+    def test_async_only_enqueues(self, error_user, settings, django_assert_num_queries):
+        import general.security
+
+        settings.ERROR_SINK_ASYNC = True
+        errors = queue.Queue(maxsize=2)
+
+        with (
+            patch("general.security._error_queue", errors),
+            patch("general.security.start_error_writer") as start_error_writer,
+            django_assert_num_queries(0),
+        ):
+            response = general.security.ret_message(
+                "Failed", True, "api/a", error_user.id, Exception("Boom")
+            )
+
+        start_error_writer.assert_called_once()
+        assert response.data["retMessage"] == "Failed"
+        assert errors.get_nowait()["signature"] == ("api/a", "Exception", "Boom")
+
+    def test_full_queue_drops_and_logs_count(self, error_user, settings):
+        import general.security
+        from admin.models import ErrorLog
+
+        settings.ERROR_SINK_ASYNC = True
+        errors = queue.Queue(maxsize=1)
+
+        with (
+            patch("general.security._error_queue", errors),
+            patch("general.security.start_error_writer"),
+            patch.dict(general.security._error_sink, {"dropped": 0}),
+        ):
+            for path in ["api/a", "api/b", "api/c"]:
+                general.security.ret_message(
+                    "Failed", True, path, error_user.id, Exception("Boom")
+                )
+            assert general.security._error_sink["dropped"] == 2
+
+            general.security.write_errors([errors.get_nowait()])
+            assert general.security._error_sink["dropped"] == 0
+
+        assert ErrorLog.objects.filter(
+            path="general.security.log_error",
+            message="Error queue was full, dropped 2 errors",
+        ).exists()
+        assert ErrorLog.objects.filter(path="api/a").exists()
+
+
+@pytest.mark.django_db(transaction=True)
+class TestErrorWriter:
+    def test_writer_thread_writes(self, error_user, settings):
+        import general.security
+        from admin.models import ErrorLog
+
+        settings.ERROR_SINK_ASYNC = True
+
+        with patch("general.security.close_old_connections"):
+            general.security.ret_message(
+                "Failed", True, "api/a", error_user.id, Exception("Boom")
+            )
+            general.security.flush_errors()
+
+        assert ErrorLog.objects.get().path == "api/a"
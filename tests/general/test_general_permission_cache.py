@@ -0,0 +1,155 @@
+"""
+Tests for the cached user permissions behind general.security.has_access.
+"""
+import pytest
+
+
+@pytest.fixture
+def permissions(db):
+    from django.contrib.auth import get_user_model
+    from django.contrib.auth.models import Group, Permission
+    from django.contrib.contenttypes.models import ContentType
+
+    user = get_user_model().objects.create_user(
+        username="perm", email="perm@test.com", password="pass"
+    )
+    # custom permissions use content type -1
+    content_type = ContentType.objects.create(id=-1, app_label="custom", model="custom")
+    admin = Permission.objects.create(
+        name="Admin", codename="admin", content_type=content_type
+    )
+    scout = Permission.objects.create(
+        name="Scout", codename="scoutfield", content_type=content_type
+    )
+    group = Group.objects.create(name="Scouts")
+    group.permissions.add(scout)
+    user.groups.add(group)
+
+    return {"user": user, "group": group, "admin": admin, "scout": scout}
+
+
+@pytest.mark.django_db
+class TestPermissionCache:
+    def test_warm_checks_do_not_query(self, permissions, django_assert_num_queries):
+        from general.security import has_access
+
+        user_id = permissions["user"].id
+
+        # version, user and permissions
+        with django_assert_num_queries(3):
+            assert has_access(user_id, "scoutfield") is True
+
+        with django_assert_num_queries(0):
+            assert has_access(user_id, ["admin", "scoutfield"]) is True
+            assert has_access(user_id, "admin") is False
+            assert has_access(user_id, []) is False
+
+    def test_unknown_user_raises(self, db):
+        from general.security import has_access
+        from user.models import User
+
+        with pytest.raises(User.DoesNotExist):
+            has_access(-99, "admin")
+
+    def test_save_group_invalidates(self, permissions):
+        from general.security import has_access
+        from user.util import save_group
+
+        user_id = permissions["user"].id
+        group = permissions["group"]
+        assert has_access(user_id, "admin") is False
+
+        save_group(
+            {
+                "id": group.id,
+                "name": group.name,
+                "permissions": [{"id": permissions["admin"].id}],
+            }
+        )
+
+        assert has_access(user_id, "admin") is True
+        assert has_access(user_id, "scoutfield") is False
+
+    def test_user_group_edit_invalidates(self, permissions):
+        from general.security import has_access
+        from user.util import save_user
+
+        user = permissions["user"]
+        assert has_access(user.id, "scoutfield") is True
+
+        save_user(
+            {
+                "username": user.username,
+                "first_name": "",
+                "last_name": "",
+                "email": user.email,
+                "discord_user_id": None,
+                "phone": None,
+                "is_active": True,
+                "groups": [],
+            }
+        )
+
+        assert has_access(user.id, "scoutfield") is False
+
+    def test_save_permission_invalidates(self, permissions):
+        from general.security import has_access
+        from user.util import save_permission
+
+        user_id = permissions["user"].id
+        assert has_access(user_id, "scoutfield") is True
+
+        save_permission(
+            {"id": permissions["scout"].id, "name": "Scout", "codename": "scouting"}
+        )
+
+        assert has_access(user_id, "scouting") is True
+        assert has_access(user_id, "scoutfield") is False
+
+    def test_other_process_edit_seen_after_check(self, permissions):
+        import general.security
+        from user.models import PermissionVersion
+
+        user_id = permissions["user"].id
+        general.security.has_access(user_id, "scoutfield")
+
+        # another process removed the permission, seen once the version is re-read
+        permissions["group"].permissions.clear()
+        PermissionVersion.objects.create(id=1, version=4)
+        assert general.security.has_access(user_id, "scoutfield") is True
+
+        general.security._permission_version["checked"] -= (
+            general.security.permission_version_check_seconds + 1
+        )
+        assert general.security.has_access(user_id, "scoutfield") is False
+
+    def test_entries_expire(self, permissions):
+        import general.security
+
+        user_id = permissions["user"].id
+        general.security.has_access(user_id, "scoutfield")
+
+        permissions["group"].permissions.clear()
+        general.security._user_permissions[user_id]["loaded"] -= (
+            general.security.user_permissions_ttl_seconds + 1
+        )
+
+        assert general.security.has_access(user_id, "scoutfield") is False
+
+    def test_request_memoizes(self, permissions, django_assert_num_queries):
+        import general.security
+        from django.test import RequestFactory
+        from general.middleware import UserPermissionsMiddleware
+
+        user_id = permissions["user"].id
+
+        def view(request):
+            general.security._user_permissions.clear()
+            return [general.security.has_access(user_id, "scoutfield") for _ in range(3)]
+
+        with django_assert_num_queries(3):
+            assert UserPermissionsMiddleware(view)(RequestFactory().get("/")) == [
+                True,
+                True,
+                True,
+            ]
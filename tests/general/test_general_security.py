@@ -23,26 +23,25 @@ class TestHasAccess:
         """Test has_access with a single permission string."""
         with patch("general.security.get_user_permissions") as mock_get_perms:
             mock_queryset = MagicMock()
-            mock_queryset.filter.return_value = [Mock()]
+            mock_queryset.values_list.return_value = ["test_permission"]
             mock_get_perms.return_value = mock_queryset
             
             result = has_access(test_user.id, "test_permission")
             
             assert result is True
             mock_get_perms.assert_called_once_with(test_user.id, False)
-            mock_queryset.filter.assert_called_once_with(codename__in=["test_permission"])
+            mock_queryset.values_list.assert_called_once_with("codename", flat=True)
 
     def test_has_access_with_list_of_permissions(self, test_user):
         """Test has_access with a list of permissions."""
         with patch("general.security.get_user_permissions") as mock_get_perms:
             mock_queryset = MagicMock()
-            mock_queryset.filter.return_value = [Mock(), Mock()]
+            mock_queryset.values_list.return_value = ["perm2", "other"]
             mock_get_perms.return_value = mock_queryset
             
             result = has_access(test_user.id, ["perm1", "perm2"])
             
             assert result is True
-            mock_queryset.filter.assert_called_once_with(codename__in=["perm1", "perm2"])
 
     def test_has_access_no_permission(self, test_user):
         """Test has_access when user doesn't have permission."""
@@ -334,8 +334,8 @@ class TestStrategizingUtilRemaining:
         )
         with patch("scouting.strategizing.util.scouting.util.get_current_event",
                    return_value=MagicMock(id=1)), \
-             patch("scouting.strategizing.util.FieldResponse.objects.filter",
-                   return_value=[]), \
+             patch("scouting.strategizing.util.FieldResponse.objects.select_related",
+                   return_value=MagicMock(filter=MagicMock(return_value=[]))), \
              patch("scouting.strategizing.util.form.util.graph_responses",
                    return_value=[{"bins": [{"bin": "A", "count": 1}], "label": "Q1"}]):
             result = graph_team(graph, [3492])
@@ -358,8 +358,8 @@ class TestStrategizingUtilRemaining:
         template = [{"bins": [{"bin": "A", "count": 1}], "label": "Q1"}]
         with patch("scouting.strategizing.util.scouting.util.get_current_event",
                    return_value=MagicMock(id=1)), \
-             patch("scouting.strategizing.util.FieldResponse.objects.filter",
-                   return_value=[]), \
+             patch("scouting.strategizing.util.FieldResponse.objects.select_related",
+                   return_value=MagicMock(filter=MagicMock(return_value=[]))), \
              patch("scouting.strategizing.util.form.util.graph_responses",
                    side_effect=lambda *a, **kw: copy.deepcopy(template)):
             result = graph_team(graph, [3492, 1234])
@@ -382,8 +382,8 @@ class TestStrategizingUtilRemaining:
         template = [{"label": "Q1", "x": [1, 2], "y": [3, 4]}]
         with patch("scouting.strategizing.util.scouting.util.get_current_event",
                    return_value=MagicMock(id=1)), \
-             patch("scouting.strategizing.util.FieldResponse.objects.filter",
-                   return_value=[]), \
+             patch("scouting.strategizing.util.FieldResponse.objects.select_related",
+                   return_value=MagicMock(filter=MagicMock(return_value=[]))), \
              patch("scouting.strategizing.util.form.util.graph_responses",
                    side_effect=lambda *a, **kw: copy.deepcopy(template)):
             result = graph_team(graph, [3492, 1234])
@@ -406,8 +406,8 @@ class TestStrategizingUtilRemaining:
         template = [{"label": "Q1", "values": [1, 2, 3]}]
         with patch("scouting.strategizing.util.scouting.util.get_current_event",
                    return_value=MagicMock(id=1)), \
-             patch("scouting.strategizing.util.FieldResponse.objects.filter",
-                   return_value=[]), \
+             patch("scouting.strategizing.util.FieldResponse.objects.select_related",
+                   return_value=MagicMock(filter=MagicMock(return_value=[]))), \
              patch("scouting.strategizing.util.form.util.graph_responses",
                    side_effect=lambda *a, **kw: copy.deepcopy(template)):
             result = graph_team(graph, [3492, 1234])
@@ -430,8 +430,8 @@ class TestStrategizingUtilRemaining:
         template = [{"label": "Q1", "points": []}]
         with patch("scouting.strategizing.util.scouting.util.get_current_event",
                    return_value=MagicMock(id=1)), \
-             patch("scouting.strategizing.util.FieldResponse.objects.filter",
-                   return_value=[]), \
+             patch("scouting.strategizing.util.FieldResponse.objects.select_related",
+                   return_value=MagicMock(filter=MagicMock(return_value=[]))), \
              patch("scouting.strategizing.util.form.util.graph_responses",
                    side_effect=lambda *a, **kw: copy.deepcopy(template)):
             result = graph_team(graph, [3492, 1234])
@@ -452,8 +452,8 @@ class TestStrategizingUtilRemaining:
         )
         with patch("scouting.strategizing.util.scouting.util.get_current_event",
                    return_value=MagicMock(id=1)), \
-             patch("scouting.strategizing.util.FieldResponse.objects.filter",
-                   return_value=[]), \
+             patch("scouting.strategizing.util.FieldResponse.objects.select_related",
+                   return_value=MagicMock(filter=MagicMock(return_value=[]))), \
              patch("scouting.strategizing.util.form.util.graph_responses",
                    return_value=[]):
             result = graph_team(graph, [3492], reference_team_id=1234)
@@ -930,7 +930,7 @@ class TestTBAUtilRemaining:
         """Lines 290-291, 315: get_tba_event_team_info parses rankings."""
         from tba.util import get_tba_event_team_info
         from json import dumps
-        with patch("tba.util.requests.get") as mock_get:
+        with patch("tba.util.session.get") as mock_get:
             mock_get.return_value.text = dumps({
                 "rankings": [{
                     "team_key": "frc3492",
@@ -949,7 +949,7 @@ class TestTBAUtilRemaining:
         """Lines 406-484: get_matches_for_team_event returns match list."""
         from tba.util import get_matches_for_team_event
         from json import dumps
-        with patch("tba.util.requests.get") as mock_get:
+        with patch("tba.util.session.get") as mock_get:
             mock_get.return_value.text = dumps([
                 {"key": "2025test_qm1", "match_number": 1}
             ])
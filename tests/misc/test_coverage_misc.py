@@ -295,7 +295,7 @@ class TestAdditionalUtils:
         """Test get_tba_event function."""
         from tba.util import get_tba_event
 
-        with patch("tba.util.requests.get") as mock_get:
+        with patch("tba.util.session.get") as mock_get:
             mock_response = MagicMock()
             mock_response.text = '{"key": "2024test", "name": "Test Event"}'
             mock_response.status_code = 200
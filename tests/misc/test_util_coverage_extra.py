@@ -213,7 +213,7 @@ class TestTBAUtilCoverage:
         from scouting.models import Team, Season
         team = Team.objects.create(team_no=9999, team_nm="TBATeam", void_ind="n")
         season = Season.objects.create(season="2025tba", current="n", game="G", manual="")
-        with patch("tba.util.requests.get") as mock_get:
+        with patch("tba.util.session.get") as mock_get:
             from json import dumps
             mock_get.return_value.text = dumps([])
             result = get_events_for_team(team, season)
@@ -233,7 +233,8 @@ class TestTBAUtilCoverage:
         from scouting.models import Season, Team
         season = Season.objects.create(season="2025ts", current="n", game="G", manual="")
         Team.objects.get_or_create(team_no=3492, defaults={"team_nm": "T3492", "void_ind": "n"})
-        with patch("tba.util.requests.get") as mock_get, \
+        with patch("tba.util.session.get") as mock_get, \
+             patch("tba.util.get_tba_all", return_value={}), \
              patch("tba.util.sync_event") as mock_sync_event:
             from json import dumps
             mock_get.return_value.text = dumps([
@@ -247,7 +248,7 @@ class TestTBAUtilCoverage:
         """Lines 111-163: get_tba_event parses event data."""
         from tba.util import get_tba_event
         from json import dumps
-        with patch("tba.util.requests.get") as mock_get:
+        with patch("tba.util.session.get") as mock_get:
             mock_get.return_value.text = dumps({
                 "key": "2025test", "name": "Test Event",
                 "start_date": "2025-01-01", "end_date": "2025-01-02",
@@ -286,7 +287,7 @@ class TestTBAUtilCoverage:
                 "city": None, "state_prov": None, "postal_code": None,
                 "location_name": None, "webcast_url": "",
             }
-            with patch("tba.util.requests.get") as mock_get:
+            with patch("tba.util.session.get") as mock_get:
                 mock_get.return_value.text = dumps([])
                 result = sync_event_team_info(force=0)
         assert result is not None
@@ -0,0 +1,134 @@
+"""
+Tests for the cached current season and event in scouting/util.py.
+"""
+import pytest
+
+
+@pytest.fixture
+def seasons(db):
+    from scouting.models import Event, Season
+
+    old = Season.objects.create(season="2049", current="n")
+    new = Season.objects.create(season="2050", current="y")
+    events = [
+        Event.objects.create(
+            season=season,
+            event_cd=f"{season.season}cur",
+            event_nm=f"Event {season.season}",
+            date_st="2050-01-01T00:00:00Z",
+            date_end="2050-01-02T00:00:00Z",
+            current="y",
+            void_ind="n",
+        )
+        for season in [old, new]
+    ]
+
+    return {"old": old, "new": new, "events": events}
+
+
+@pytest.mark.django_db
+class TestCurrentSeasonEvent:
+    def test_cached_for_the_process(self, seasons, django_assert_num_queries):
+        from scouting.util import get_current_event, get_current_season
+
+        # version, season and event
+        with django_assert_num_queries(3):
+            assert get_current_event().id == seasons["events"][1].id
+
+        with django_assert_num_queries(0):
+            for _ in range(10):
+                assert get_current_season().id == seasons["new"].id
+                assert get_current_event().id == seasons["events"][1].id
+
+    def test_callers_get_copies(self, seasons):
+        from scouting.util import get_current_event
+
+        event = get_current_event()
+        event.event_nm = "Changed"
+
+        assert get_current_event().event_nm == "Event 2050"
+
+    def test_request_shares_one_copy(self, seasons):
+        from scouting.util import current_season_event_request, get_current_event
+
+        with current_season_event_request():
+            assert get_current_event() is get_current_event()
+
+        assert get_current_event() is not get_current_event()
+
+    def test_set_current_season_event_invalidates(self, seasons):
+        from scouting.admin.util import set_current_season_event
+        from scouting.util import current_season_event_request, get_current_event
+
+        with current_season_event_request():
+            get_current_event()
+            set_current_season_event(seasons["old"].id, seasons["events"][0].id, "n")
+
+            assert get_current_event().id == seasons["events"][0].id
+
+    def test_save_event_invalidates(self, seasons):
+        from scouting.admin.util import save_event
+        from scouting.util import get_current_event
+
+        event = seasons["events"][1]
+        get_current_event()
+        save_event(
+            {
+                "id": event.id,
+                "season_id": seasons["new"].id,
+                "event_nm": "Renamed",
+                "event_cd": event.event_cd,
+                "date_st": event.date_st,
+                "date_end": event.date_end,
+                "current": "y",
+            }
+        )
+
+        assert get_current_event().event_nm == "Renamed"
+
+    def test_other_process_change_seen_after_check(self, seasons):
+        from scouting.models import CurrentSeasonEvent, Season
+        import scouting.util
+
+        scouting.util.get_current_season()
+
+        # another process switched seasons, seen once the version is re-read
+        Season.objects.filter(id=seasons["new"].id).update(current="n")
+        Season.objects.filter(id=seasons["old"].id).update(current="y")
+        CurrentSeasonEvent.objects.create(id=1, version=3)
+        assert scouting.util.get_current_season().id == seasons["new"].id
+
+        scouting.util._current_season_event["checked"] -= (
+            scouting.util.current_season_event_check_seconds + 1
+        )
+        assert scouting.util.get_current_season().id == seasons["old"].id
+
+    def test_no_season_or_event(self, db):
+        from scouting.models import Season
+        from scouting.util import (
+            current_season_event_changed,
+            get_current_event,
+            get_current_season,
+        )
+
+        with pytest.raises(Exception, match="No season set"):
+            get_current_season()
+
+        Season.objects.create(season="2050", current="y")
+        current_season_event_changed()
+
+        with pytest.raises(Exception, match="No event set"):
+            get_current_event()
+
+    def test_middleware_scopes_requests(self, seasons):
+        from django.test import RequestFactory
+        from scouting.middleware import CurrentSeasonEventMiddleware
+        from scouting.util import get_current_event
+
+        def view(request):
+            return [get_current_event(), get_current_event()]
+
+        first, second = CurrentSeasonEventMiddleware(view)(RequestFactory().get("/"))
+
+        assert first is second
+        assert get_current_event() is not first
@@ -0,0 +1,152 @@
+"""
+Tests for the field response change log used for incremental sync.
+"""
+import pytest
+from unittest.mock import patch
+
+
+@pytest.fixture
+def sync_event(db):
+    from django.contrib.auth import get_user_model
+    from form.models import FormType, Question, QuestionType
+    from scouting.models import Event, Season, Team
+
+    user = get_user_model().objects.create_user(
+        username="sync", email="sync@test.com", password="pass"
+    )
+    field = FormType.objects.create(form_typ="field", form_nm="Field")
+    number = QuestionType.objects.create(question_typ="number", question_typ_nm="Num")
+    question = Question.objects.create(
+        form_typ=field,
+        question_typ=number,
+        question="Points",
+        table_col_width="100",
+        order=1,
+        required="n",
+        active="y",
+        void_ind="n",
+    )
+    season = Season.objects.create(season="2050", current="y")
+    event, other_event = [
+        Event.objects.create(
+            season=season,
+            event_cd=event_cd,
+            event_nm=event_cd,
+            date_st="2050-01-01T00:00:00Z",
+            date_end="2050-01-02T00:00:00Z",
+            current=current,
+            void_ind="n",
+        )
+        for event_cd, current in [("2050sync", "y"), ("2050other", "n")]
+    ]
+    Team.objects.create(team_no=3492, team_nm="PARTs")
+
+    with (
+        patch("scouting.util.get_current_season", return_value=season),
+        patch("scouting.util.get_current_event", return_value=event),
+    ):
+        yield {
+            "user": user,
+            "question": question,
+            "event": event,
+            "other_event": other_event,
+        }
+
+
+def _save(sync_event, event=None, value="1"):
+    from form.util import save_field_response
+
+    with patch(
+        "form.util.scouting.util.get_current_event",
+        return_value=event or sync_event["event"],
+    ):
+        return save_field_response(
+            {
+                "form_typ": "field",
+                "team_id": 3492,
+                "answers": [
+                    {"question": {"id": sync_event["question"].id}, "value": value}
+                ],
+            },
+            sync_event["user"].id,
+        )
+
+
+def _ids(result):
+    return [response["id"] for response in result["scoutAnswers"]]
+
+
+@pytest.mark.django_db
+class TestFieldResponseChanges:
+    def test_save_and_void_are_logged(self, sync_event):
+        from scouting.admin.util import void_field_response
+        from scouting.models import FieldResponseChange
+
+        field_response = _save(sync_event)
+        void_field_response(field_response.id)
+        void_field_response(field_response.id)
+
+        assert list(
+            FieldResponseChange.objects.order_by("id").values_list(
+                "field_response_id", "change_typ"
+            )
+        ) == [(field_response.id, "insert"), (field_response.id, "void")]
+
+    def test_sync_since_sequence(self, sync_event):
+        from scouting.admin.util import void_field_response
+        from scouting.field.util import get_responses
+
+        first = _save(sync_event)
+        second = _save(sync_event)
+        _save(sync_event, event=sync_event["other_event"])
+
+        full = get_responses()
+        assert sorted(_ids(full)) == [first.id, second.id]
+
+        unchanged = get_responses(after_sequence=full["sequence"])
+        assert (_ids(unchanged), unchanged["removed_responses"]) == ([], [])
+        assert unchanged["sequence"] == full["sequence"]
+
+        void_field_response(first.id)
+        third = _save(sync_event)
+
+        changed = get_responses(after_sequence=full["sequence"])
+        assert _ids(changed) == [third.id]
+        assert changed["removed_responses"] == [first.id]
+        assert changed["sequence"] > full["sequence"]
+
+        assert sorted(_ids(get_responses(after_sequence=0))) == [second.id, third.id]
+
+    def test_sync_is_batched(self, sync_event):
+        from scouting.field.util import get_responses
+
+        saved = [_save(sync_event) for _ in range(3)]
+
+        with patch("scouting.field.util.field_response_changes_limit", 2):
+            first = get_responses(after_sequence=0)
+            second = get_responses(after_sequence=first["sequence"])
+
+        assert sorted(_ids(first) + _ids(second)) == [r.id for r in saved]
+
+    def test_deleted_response_is_logged(self, sync_event):
+        from form.util import delete_response
+        from scouting.field.util import get_responses
+
+        field_response = _save(sync_event)
+        sequence = get_responses()["sequence"]
+
+        with patch("form.util.Response.objects.get", return_value=field_response.response):
+            delete_response(field_response.response_id)
+
+        assert get_responses(after_sequence=sequence)["removed_responses"] == [
+            field_response.id
+        ]
+
+    def test_delete_event_removes_changes(self, sync_event):
+        from scouting.admin.util import delete_event
+        from scouting.models import FieldResponseChange
+
+        _save(sync_event, event=sync_event["other_event"])
+        delete_event(sync_event["other_event"].id)
+
+        assert FieldResponseChange.objects.count() == 0
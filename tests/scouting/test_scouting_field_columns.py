@@ -0,0 +1,103 @@
+"""
+Tests for the cached field scouting table columns and their ETag.
+"""
+import pytest
+from unittest.mock import patch
+
+
+@pytest.fixture
+def field_form(db):
+    from django.contrib.auth import get_user_model
+    from form.models import FormSubType, FormType, Question, QuestionType
+    from scouting.models import Question as ScoutQuestion, Season
+
+    user = get_user_model().objects.create_user(
+        username="columns", email="columns@test.com", password="pass"
+    )
+    field = FormType.objects.create(form_typ="field", form_nm="Field")
+    sub_type = FormSubType.objects.create(
+        form_sub_typ="auto", form_sub_nm="Auto", form_typ=field, order=1
+    )
+    number = QuestionType.objects.create(question_typ="number", question_typ_nm="Num")
+    season = Season.objects.create(season="2050", current="y")
+
+    question = Question.objects.create(
+        form_typ=field,
+        form_sub_typ=sub_type,
+        question_typ=number,
+        question="Points",
+        table_col_width="100",
+        order=1,
+        required="n",
+        active="y",
+        void_ind="n",
+    )
+    ScoutQuestion.objects.create(question=question, season=season)
+
+    return {"user": user, "season": season, "question": question}
+
+
+@pytest.mark.django_db
+class TestCachedTableColumns:
+    def test_cached_until_form_edit(self, field_form, django_assert_num_queries):
+        from form.util import question_catalog_changed
+        from scouting.field.util import get_cached_table_columns
+
+        first = get_cached_table_columns(field_form["season"])
+        labels = [c["ColLabel"] for c in first["columns"]]
+        assert "A: Points" in labels
+
+        with django_assert_num_queries(0):
+            assert get_cached_table_columns(field_form["season"]) is first
+
+        field_form["question"].question = "Scored"
+        field_form["question"].save()
+        question_catalog_changed()
+
+        rebuilt = get_cached_table_columns(field_form["season"])
+        assert "A: Scored" in [c["ColLabel"] for c in rebuilt["columns"]]
+        assert rebuilt["etag"] != first["etag"]
+
+    def test_etag_is_content_based(self, field_form):
+        import scouting.field.util
+
+        etag = scouting.field.util.get_cached_table_columns(field_form["season"])["etag"]
+        scouting.field.util._table_columns.clear()
+
+        assert (
+            scouting.field.util.get_cached_table_columns(field_form["season"])["etag"]
+            == etag
+        )
+
+
+@pytest.mark.django_db
+class TestResponseColumnsView:
+    def _get(self, field_form, if_none_match=None):
+        from rest_framework.test import APIRequestFactory, force_authenticate
+        from scouting.field.views import ResponseColumnsView
+
+        headers = {} if if_none_match is None else {"HTTP_IF_NONE_MATCH": if_none_match}
+        request = APIRequestFactory().get("/scouting/field/response-columns/", **headers)
+        force_authenticate(request, user=field_form["user"])
+        with patch("scouting.field.views.has_access", return_value=True):
+            return ResponseColumnsView.as_view()(request)
+
+    def test_not_modified(self, field_form):
+        from form.util import question_catalog_changed
+
+        response = self._get(field_form)
+        etag = response.headers["ETag"]
+        assert response.status_code == 200
+        assert any(c["PropertyName"] == f"ans{field_form['question'].id}" for c in response.data)
+
+        response = self._get(field_form, f'W/"other", {etag}')
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag
+
+        field_form["question"].question = "Scored"
+        field_form["question"].save()
+        question_catalog_changed()
+
+        response = self._get(field_form, etag)
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
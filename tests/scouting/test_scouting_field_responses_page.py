@@ -0,0 +1,146 @@
+"""
+Tests for keyset pagination and bulk hydration in scouting.field.util.get_responses.
+"""
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.fixture
+def field_event(db):
+    from django.contrib.auth import get_user_model
+    from form.models import Answer, Flow, FlowAnswer, FormType, Question, QuestionType
+    from form.models import Response
+    from scouting.models import Event, EventTeamInfo, Season, Team
+
+    user = get_user_model().objects.create_user(
+        username="keyset",
+        email="keyset@test.com",
+        password="pass",
+        first_name="Key",
+        last_name="Set",
+    )
+    field = FormType.objects.create(form_typ="field", form_nm="Field")
+    number = QuestionType.objects.create(question_typ="number", question_typ_nm="Num")
+    question, flow_question = [
+        Question.objects.create(
+            form_typ=field,
+            question_typ=number,
+            question=name,
+            table_col_width="100",
+            order=1,
+            required="n",
+            active="y",
+            void_ind="n",
+        )
+        for name in ["Points", "Pressed"]
+    ]
+    flow = Flow.objects.create(name="Flow", form_typ=field)
+
+    season = Season.objects.create(season="2050", current="y")
+    event = Event.objects.create(
+        season=season,
+        event_cd="2050key",
+        event_nm="Keyset",
+        date_st="2050-01-01T00:00:00Z",
+        date_end="2050-01-02T00:00:00Z",
+        current="y",
+        void_ind="n",
+    )
+    teams = [Team.objects.create(team_no=n, team_nm=str(n)) for n in [3492, 254]]
+    EventTeamInfo.objects.create(event=event, team=teams[0], rank=7, void_ind="n")
+
+    def make_responses(count, start=datetime(2050, 1, 1, tzinfo=timezone.utc)):
+        from scouting.models import FieldResponse
+
+        field_responses = []
+        for i in range(count):
+            response = Response.objects.create(form_typ=field)
+            Answer.objects.create(response=response, question=question, value=str(i))
+            flow_answer = Answer.objects.create(response=response, flow=flow, value="")
+            for _ in range(i % 3):
+                FlowAnswer.objects.create(
+                    answer=flow_answer, question=flow_question, value="1"
+                )
+            field_responses.append(
+                FieldResponse.objects.create(
+                    event=event,
+                    team=teams[i % 2],
+                    user=user,
+                    response=response,
+                    # pairs of responses share a time so the id breaks the tie
+                    time=start + timedelta(minutes=i // 2),
+                    void_ind="n",
+                )
+            )
+        return field_responses
+
+    with (
+        patch("scouting.util.get_current_season", return_value=season),
+        patch("scouting.util.get_current_event", return_value=event),
+    ):
+        yield {
+            "make_responses": make_responses,
+            "question": question,
+            "flow_question": flow_question,
+        }
+
+
+def _page_ids(result):
+    return [response["id"] for response in result["scoutAnswers"]]
+
+
+@pytest.mark.django_db
+class TestKeysetResponses:
+    def test_pages_match_numbered_pages(self, field_event):
+        from scouting.field.util import get_responses
+
+        field_event["make_responses"](45)
+
+        first = get_responses(cursor="")
+        second = get_responses(cursor=first["next_cursor"])
+
+        assert first["count"] is None
+        assert len(first["scoutAnswers"]) == 40
+        assert second["next_cursor"] is None
+        assert _page_ids(first) == _page_ids(get_responses(pg=1))
+        assert _page_ids(second) == _page_ids(get_responses(pg=2))
+
+    def test_hydrated_values(self, field_event):
+        from scouting.field.util import get_responses
+
+        field_responses = field_event["make_responses"](3)
+
+        answers = {r["id"]: r for r in get_responses(cursor="")["scoutAnswers"]}
+        last = answers[field_responses[2].id]
+
+        assert last[f"ans{field_event['question'].id}"] == "2"
+        assert last[f"ans{field_event['flow_question'].id}"] == [
+            {"round": 1, "value": "1"},
+            {"round": 2, "value": "1"},
+        ]
+        assert (last["rank"], last["user"], last["team_id"]) == (7, "Key Set", 3492)
+        assert answers[field_responses[1].id]["rank"] == ""
+
+    def test_constant_queries_per_page(self, field_event):
+        from scouting.field.util import get_responses
+
+        field_event["make_responses"](5)
+        get_responses(cursor="")
+        with CaptureQueriesContext(connection) as small:
+            get_responses(cursor="")
+
+        field_event["make_responses"](35)
+        with CaptureQueriesContext(connection) as large:
+            get_responses(cursor="")
+
+        assert len(large.captured_queries) == len(small.captured_queries)
+
+    def test_invalid_cursor(self, field_event):
+        from scouting.field.util import get_responses
+
+        with pytest.raises(Exception, match="Invalid cursor."):
+            get_responses(cursor="not a cursor")
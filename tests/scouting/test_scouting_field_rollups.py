@@ -0,0 +1,330 @@
+"""
+Tests for the per team field response rollups in scouting/field/util.py.
+"""
+import pytest
+import statistics
+from io import StringIO
+from unittest.mock import patch
+
+
+@pytest.fixture
+def rollup_event(db):
+    from django.contrib.auth import get_user_model
+    from form.models import FormType, QuestionType, Question
+    from scouting.models import Season, Event, Team, Question as ScoutQuestion
+
+    user = get_user_model().objects.create_user(
+        username="rollup", email="rollup@test.com", password="pass"
+    )
+    FormType.objects.create(form_typ="field", form_nm="Field")
+    number = QuestionType.objects.create(question_typ="number", question_typ_nm="Num")
+    text = QuestionType.objects.create(question_typ="text", question_typ_nm="Text")
+
+    season = Season.objects.create(season="2050", current="y")
+    event = Event.objects.create(
+        season=season,
+        event_cd="2050roll",
+        event_nm="Rollup Event",
+        date_st="2050-01-01T00:00:00Z",
+        date_end="2050-01-02T00:00:00Z",
+        current="y",
+        void_ind="n",
+    )
+    teams = [
+        Team.objects.create(team_no=team_no, team_nm=str(team_no))
+        for team_no in [3492, 254]
+    ]
+
+    questions = []
+    for question_typ, name, multiplier in [
+        (number, "Points", "2"),
+        (text, "Notes", None),
+    ]:
+        question = Question.objects.create(
+            form_typ_id="field",
+            question_typ=question_typ,
+            question=name,
+            table_col_width="100",
+            order=len(questions),
+            required="n",
+            active="y",
+            value_multiplier=multiplier,
+            void_ind="n",
+        )
+        ScoutQuestion.objects.create(question=question, season=season)
+        questions.append(question)
+
+    return {"user": user, "event": event, "teams": teams, "questions": questions}
+
+
+def _save(rollup_event, team, points, notes="fast"):
+    from form.util import save_field_response
+
+    points_question, notes_question = rollup_event["questions"]
+    with patch("form.util.scouting.util.get_current_event", return_value=rollup_event["event"]):
+        return save_field_response(
+            {
+                "form_typ": "field",
+                "team_id": team.team_no,
+                "answers": [
+                    {"question": {"id": points_question.id}, "value": str(points)},
+                    {"question": {"id": notes_question.id}, "value": notes},
+                ],
+            },
+            rollup_event["user"].id,
+        )
+
+
+@pytest.mark.django_db
+class TestFieldResponseRollups:
+    def test_save_updates_rollup(self, rollup_event):
+        from scouting.models import FieldResponseRollup
+
+        team = rollup_event["teams"][0]
+        _save(rollup_event, team, 3)
+        _save(rollup_event, team, 1)
+
+        rollups = FieldResponseRollup.objects.filter(team=team)
+        assert rollups.count() == 1
+
+        rollup = rollups[0]
+        assert rollup.question_id == rollup_event["questions"][0].id
+        assert rollup.count == 2
+        assert rollup.sum == 8
+        assert rollup.sum_sq == 40
+        assert (rollup.min, rollup.max) == (2, 6)
+        assert rollup.samples == [2, 6]
+
+    def test_void_removes_from_rollup(self, rollup_event):
+        from scouting.admin.util import void_field_response
+        from scouting.models import FieldResponseRollup
+
+        team = rollup_event["teams"][0]
+        _save(rollup_event, team, 3)
+        field_response = _save(rollup_event, team, 5)
+
+        void_field_response(field_response.id)
+        # voiding twice does not remove the value again
+        void_field_response(field_response.id)
+
+        rollup = FieldResponseRollup.objects.get(team=team)
+        assert rollup.count == 1
+        assert rollup.samples == [6]
+        assert (rollup.min, rollup.max, rollup.sum) == (6, 6, 6)
+
+    def test_delete_response_removes_from_rollup(self, rollup_event):
+        from form.util import delete_response
+        from scouting.admin.util import void_field_response
+        from scouting.field.util import rebuild_field_response_rollups
+        from scouting.models import FieldResponseRollup
+
+        team = rollup_event["teams"][0]
+        _save(rollup_event, team, 3)
+        field_response = _save(rollup_event, team, 3)
+
+        delete_response(field_response.response_id)
+        # the response is already out of the rollups
+        void_field_response(field_response.id)
+
+        rollup = FieldResponseRollup.objects.get(team=team)
+        assert (rollup.count, rollup.samples) == (1, [6])
+
+        rebuild_field_response_rollups(rollup_event["event"])
+        rollup = FieldResponseRollup.objects.get(team=team)
+        assert (rollup.count, rollup.samples) == (1, [6])
+
+    def test_team_rollups_view(self, rollup_event, api_client):
+        team = rollup_event["teams"][0]
+        _save(rollup_event, team, 3)
+
+        api_client.force_authenticate(user=rollup_event["user"])
+        with (
+            patch("scouting.strategizing.views.has_access", return_value=True),
+            patch(
+                "scouting.strategizing.util.scouting.util.get_current_event",
+                return_value=rollup_event["event"],
+            ),
+        ):
+            response = api_client.get(
+                "/scouting/strategizing/team-rollups/",
+                {"team_ids": [str(team.team_no)]},
+            )
+
+        question_id = rollup_event["questions"][0].id
+        assert response.data[team.team_no]["questions"][question_id]["avg"] == 6
+
+    def test_concurrent_saves_take_event_lock(self, rollup_event):
+        from scouting.models import Event
+
+        with patch(
+            "scouting.field.util.Event.objects.select_for_update",
+            wraps=Event.objects.select_for_update,
+        ) as select_for_update:
+            _save(rollup_event, rollup_event["teams"][0], 3)
+
+        # once for the rollups, once for the change log
+        assert select_for_update.call_count == 2
+
+    def test_get_team_rollups(self, rollup_event):
+        from scouting.field.util import get_team_rollups
+
+        first, second = rollup_event["teams"]
+        for points in [1, 2, 6]:
+            _save(rollup_event, first, points)
+        _save(rollup_event, second, 4)
+
+        question_id = rollup_event["questions"][0].id
+        rollups = get_team_rollups(rollup_event["event"], [first.team_no, second.team_no, 1])
+
+        stats = rollups[first.team_no]["questions"][question_id]
+        assert stats["count"] == 3
+        assert stats["avg"] == 6
+        assert stats["median"] == 4
+        assert stats["stdev"] == pytest.approx(statistics.stdev([2, 4, 12]))
+        assert (stats["min"], stats["max"]) == (2, 12)
+
+        assert rollups[second.team_no]["questions"][question_id]["stdev"] is None
+        assert rollups[1] == {"questions": {}, "question_aggregates": {}}
+
+    def test_rebuild_matches_incremental(self, rollup_event):
+        from scouting.field.util import rebuild_field_response_rollups
+        from scouting.models import FieldResponseRollup
+
+        first, second = rollup_event["teams"]
+        for team, points in [(first, 1), (first, 4), (second, 2)]:
+            _save(rollup_event, team, points)
+
+        def snapshot():
+            return sorted(
+                FieldResponseRollup.objects.values_list(
+                    "team_id", "question_id", "count", "sum", "sum_sq", "samples"
+                )
+            )
+
+        incremental = snapshot()
+        FieldResponseRollup.objects.update(count=0, samples=[])
+
+        assert rebuild_field_response_rollups(rollup_event["event"]) == 2
+        assert snapshot() == incremental
+
+    def test_rebuild_command(self, rollup_event):
+        from django.core.management import call_command
+        from scouting.models import FieldResponseRollup
+
+        _save(rollup_event, rollup_event["teams"][0], 3)
+        FieldResponseRollup.objects.all().delete()
+
+        out = StringIO()
+        call_command("rebuild_field_rollups", stdout=out)
+
+        assert "Rebuilt 1 rollups for Rollup Event." in out.getvalue()
+        assert FieldResponseRollup.objects.get().samples == [6]
+
+    def test_eliminated_scout_left_out(self, rollup_event):
+        from scouting.field.util import rebuild_field_response_rollups
+        from scouting.models import FieldResponseRollup, UserInfo
+
+        team = rollup_event["teams"][0]
+        _save(rollup_event, team, 3)
+        UserInfo.objects.create(user=rollup_event["user"], eliminate_results=True)
+        _save(rollup_event, team, 5)
+
+        assert FieldResponseRollup.objects.get(team=team).samples == [6]
+
+        rebuild_field_response_rollups(rollup_event["event"])
+        assert not FieldResponseRollup.objects.filter(team=team).exists()
+
+    def test_eliminate_results_change_rebuilds(self, rollup_event):
+        from scouting.admin.util import save_scouting_user_info
+        from scouting.models import FieldResponseRollup
+
+        team = rollup_event["teams"][0]
+        _save(rollup_event, team, 3)
+
+        user_info = save_scouting_user_info(
+            {
+                "user": {"id": rollup_event["user"].id},
+                "group_leader": False,
+                "under_review": False,
+                "eliminate_results": True,
+            }
+        )
+        assert not FieldResponseRollup.objects.filter(team=team).exists()
+
+        save_scouting_user_info(
+            {
+                "id": user_info.id,
+                "group_leader": False,
+                "under_review": False,
+                "eliminate_results": False,
+            }
+        )
+        assert FieldResponseRollup.objects.get(team=team).samples == [6]
+
+    def test_void_after_multiplier_change_rebuilds_team(self, rollup_event):
+        from form.util import invalidate_question_catalog
+        from scouting.admin.util import void_field_response
+        from scouting.models import FieldResponseRollup
+
+        first, second = rollup_event["teams"]
+        _save(rollup_event, first, 3)
+        field_response = _save(rollup_event, first, 5)
+        _save(rollup_event, second, 4)
+
+        points_question = rollup_event["questions"][0]
+        points_question.value_multiplier = "3"
+        points_question.save()
+        invalidate_question_catalog()
+
+        # the voided response now computes to 15, which was never added
+        void_field_response(field_response.id)
+
+        assert FieldResponseRollup.objects.get(team=first).samples == [9]
+        assert FieldResponseRollup.objects.get(team=second).samples == [8]
+
+    def test_question_change_rebuilds_current_event(self, rollup_event):
+        from form.util import invalidate_question_catalog
+        from scouting.field.util import rebuild_current_field_response_rollups
+        from scouting.models import FieldResponseRollup
+
+        team = rollup_event["teams"][0]
+        _save(rollup_event, team, 3)
+
+        points_question = rollup_event["questions"][0]
+        points_question.value_multiplier = "3"
+        points_question.save()
+        invalidate_question_catalog()
+
+        with patch(
+            "scouting.field.util.scouting.util.get_current_event",
+            return_value=rollup_event["event"],
+        ):
+            rebuild_current_field_response_rollups()
+
+        assert FieldResponseRollup.objects.get(team=team).samples == [9]
+
+    def test_save_question_rebuilds_rollups(self, rollup_event):
+        from form.util import save_question
+
+        points_question = rollup_event["questions"][0]
+        with (
+            patch("form.util.scouting.util.get_current_season"),
+            patch(
+                "form.util.scouting.field.util.rebuild_current_field_response_rollups"
+            ) as rebuild,
+        ):
+            save_question(
+                {
+                    "id": points_question.id,
+                    "form_typ": {"form_typ": "field"},
+                    "question": "Points",
+                    "table_col_width": "100",
+                    "question_typ": {"question_typ": "number", "is_list": "n"},
+                    "order": 0,
+                    "active": "y",
+                    "value_multiplier": "3",
+                    "scout_question": {"id": points_question.scout_question.first().id},
+                }
+            )
+
+        rebuild.assert_called_once()
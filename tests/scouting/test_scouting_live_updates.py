@@ -0,0 +1,295 @@
+"""
+Tests for the live updates pub/sub and server sent events stream.
+"""
+import asyncio
+import threading
+import pytest
+from asgiref.sync import async_to_sync
+from unittest.mock import MagicMock, patch
+
+
+@pytest.fixture
+def live_event(db):
+    from django.contrib.auth import get_user_model
+    from form.models import FormType, QuestionType, Question
+    from scouting.models import CompetitionLevel, Event, Season, Team
+
+    user = get_user_model().objects.create_user(
+        username="live", email="live@test.com", password="pass"
+    )
+    FormType.objects.create(form_typ="field", form_nm="Field")
+    number = QuestionType.objects.create(question_typ="number", question_typ_nm="Num")
+    question = Question.objects.create(
+        form_typ_id="field",
+        question_typ=number,
+        question="Points",
+        table_col_width="100",
+        order=1,
+        required="n",
+        active="y",
+        void_ind="n",
+    )
+
+    season = Season.objects.create(season="2050", current="y")
+    event = Event.objects.create(
+        season=season,
+        event_cd="2050live",
+        event_nm="Live Event",
+        date_st="2050-01-01T00:00:00Z",
+        date_end="2050-01-02T00:00:00Z",
+        current="y",
+        void_ind="n",
+    )
+    for team_no in range(1, 7):
+        Team.objects.create(team_no=team_no, team_nm=str(team_no))
+    CompetitionLevel.objects.create(
+        comp_lvl_typ="qm", comp_lvl_typ_nm="Qualification", comp_lvl_order=1
+    )
+
+    return {"user": user, "event": event, "question": question}
+
+
+def _save(live_event):
+    from form.util import save_field_response
+
+    with patch(
+        "form.util.scouting.util.get_current_event", return_value=live_event["event"]
+    ):
+        return save_field_response(
+            {
+                "form_typ": "field",
+                "team_id": 1,
+                "answers": [
+                    {"question": {"id": live_event["question"].id}, "value": "3"}
+                ],
+            },
+            live_event["user"].id,
+        )
+
+
+def _tba_match(red_score):
+    return {
+        "event_key": "2050live",
+        "key": "2050live_qm1",
+        "match_number": 1,
+        "comp_level": "qm",
+        "time": None,
+        "alliances": {
+            "red": {"team_keys": ["frc1", "frc2", "frc3"], "score": red_score},
+            "blue": {"team_keys": ["frc4", "frc5", "frc6"], "score": None},
+        },
+    }
+
+
+class TestLocalBroker:
+    def test_publish_from_another_thread(self):
+        from general.pubsub import LocalBroker
+
+        broker = LocalBroker()
+
+        async def run():
+            subscription = broker.subscribe("a")
+            other = broker.subscribe("b")
+            thread = threading.Thread(
+                target=broker.publish, args=("a", {"typ": "x", "data": {}})
+            )
+            thread.start()
+            thread.join()
+
+            message = await subscription.get(1)
+            assert await other.get(0.01) is None
+
+            subscription.close()
+            other.close()
+            return message
+
+        assert asyncio.run(run()) == {"typ": "x", "data": {}}
+        assert broker.subscriptions == {}
+
+    def test_slow_subscriber_is_told_to_resync(self):
+        from general import pubsub
+
+        broker = pubsub.LocalBroker()
+
+        async def run():
+            subscription = broker.subscribe("a")
+            for i in range(pubsub.subscription_queue_size + 1):
+                broker.publish("a", {"typ": "x", "data": {"i": i}})
+            await asyncio.sleep(0)
+
+            first = await subscription.get(0.01)
+            # the dropped backlog is cleared, only new messages follow
+            second = await subscription.get(0.01)
+            subscription.close()
+            return first, second
+
+        first, second = asyncio.run(run())
+        assert first["typ"] == "resync"
+        assert second is None
+
+    def test_format_server_sent_event(self):
+        from general.pubsub import format_server_sent_event
+
+        assert (
+            format_server_sent_event(
+                {"typ": "rank", "data": {"team_id": 1, "rank": 2}, "sequence": None}
+            )
+            == 'event: rank\ndata: {"team_id": 1, "rank": 2}\n\n'
+        )
+        assert format_server_sent_event(
+            {"typ": "field-response", "data": {}, "sequence": 7}
+        ).startswith("id: 7\n")
+
+
+@pytest.mark.django_db
+class TestPublishedUpdates:
+    def test_field_response_published_on_commit(
+        self, live_event, django_capture_on_commit_callbacks
+    ):
+        from scouting.models import FieldResponseChange
+
+        broker = MagicMock()
+        with patch("general.pubsub.get_broker", return_value=broker):
+            with django_capture_on_commit_callbacks(execute=False):
+                field_response = _save(live_event)
+            broker.publish.assert_not_called()
+
+            with django_capture_on_commit_callbacks(execute=True):
+                field_response = _save(live_event)
+
+        change = FieldResponseChange.objects.get(field_response=field_response)
+        broker.publish.assert_called_once_with(
+            f"scouting.event.{live_event['event'].id}",
+            {
+                "typ": "field-response",
+                "data": {
+                    "id": field_response.id,
+                    "change_typ": "insert",
+                    "team_id": 1,
+                    "match_id": None,
+                },
+                "sequence": change.id,
+            },
+        )
+
+    def test_match_published_only_when_score_changes(
+        self, live_event, django_capture_on_commit_callbacks
+    ):
+        from tba.util import save_tba_match
+
+        broker = MagicMock()
+        with (
+            patch("general.pubsub.get_broker", return_value=broker),
+            django_capture_on_commit_callbacks(execute=True),
+        ):
+            save_tba_match(_tba_match(None))
+            save_tba_match(_tba_match(50))
+            save_tba_match(_tba_match(50))
+
+        broker.publish.assert_called_once()
+        assert broker.publish.call_args[0][1]["data"] == {
+            "match_key": "2050live_qm1",
+            "red_score": 50,
+            "blue_score": None,
+        }
+
+
+@pytest.mark.django_db(transaction=True)
+class TestLiveUpdatesView:
+    def _stream(self, live_event, chunks, headers=None, after=None):
+        from django.test import AsyncRequestFactory
+        from general.pubsub import get_broker
+        from scouting.strategizing.views import LiveUpdatesView
+
+        request = AsyncRequestFactory().get(
+            "/scouting/strategizing/live-updates/", headers=headers or {}
+        )
+
+        async def run():
+            with (
+                patch(
+                    "scouting.strategizing.views.JWTAuthentication.authenticate",
+                    return_value=(live_event["user"], None),
+                ),
+                patch("scouting.strategizing.views.has_access", return_value=True),
+                patch(
+                    "scouting.strategizing.views.scouting.util.get_current_event",
+                    return_value=live_event["event"],
+                ),
+            ):
+                response = await LiveUpdatesView.as_view()(request)
+
+            assert response["Content-Type"] == "text/event-stream"
+            content = aiter(response.streaming_content)
+            received = [await anext(content)]
+            if after is not None:
+                after(get_broker())
+            for _ in range(chunks - 1):
+                received.append(await asyncio.wait_for(anext(content), 1))
+            await content.aclose()
+            return [
+                c.decode() if isinstance(c, bytes) else c for c in received
+            ]
+
+        return async_to_sync(run)()
+
+    def test_streams_published_messages(self, live_event):
+        channel = f"scouting.event.{live_event['event'].id}"
+
+        def publish(broker):
+            broker.publish(
+                channel,
+                {"typ": "rank", "data": {"team_id": 1, "rank": 3}, "sequence": None},
+            )
+
+        received = self._stream(live_event, 2, after=publish)
+
+        assert received == [
+            "retry: 5000\n\n",
+            'event: rank\ndata: {"team_id": 1, "rank": 3}\n\n',
+        ]
+
+    def test_refused_under_wsgi(self, live_event, system_user):
+        from django.test import RequestFactory
+        from scouting.strategizing.views import LiveUpdatesView
+
+        request = RequestFactory().get("/scouting/strategizing/live-updates/")
+
+        response = async_to_sync(LiveUpdatesView.as_view())(request)
+
+        assert response.status_code == 503
+        assert response["Content-Type"] == "application/json"
+
+    def test_token_query_parameter(self, live_event):
+        from django.test import AsyncRequestFactory
+        from rest_framework_simplejwt.tokens import AccessToken
+        from scouting.strategizing.views import LiveUpdatesView
+
+        live_event["user"].is_active = True
+        live_event["user"].save()
+        token = AccessToken.for_user(live_event["user"])
+        request = AsyncRequestFactory().get(
+            "/scouting/strategizing/live-updates/", {"token": str(token)}
+        )
+
+        user, validated_token = LiveUpdatesView().authenticate(request)
+
+        assert user == live_event["user"]
+        assert str(validated_token["user_id"]) == str(live_event["user"].id)
+
+    def test_replays_missed_changes(self, live_event):
+        from scouting.models import FieldResponseChange
+
+        first = _save(live_event)
+        second = _save(live_event)
+        sequence = FieldResponseChange.objects.get(field_response=first).id
+
+        received = self._stream(
+            live_event, 2, headers={"Last-Event-ID": str(sequence)}
+        )
+
+        assert received[1].startswith(
+            f"id: {FieldResponseChange.objects.get(field_response=second).id}\n"
+            "event: field-response\n"
+        )
+        assert f'"id": {second.id}' in received[1]
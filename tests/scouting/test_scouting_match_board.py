@@ -0,0 +1,175 @@
+"""
+Tests for the match board in scouting/util.py.
+"""
+import pytest
+
+
+@pytest.fixture
+def board_event(db):
+    from django.contrib.auth import get_user_model
+    from form.models import FormType, Response
+    from scouting.models import (
+        CompetitionLevel,
+        Event,
+        EventTeamInfo,
+        FieldResponse,
+        Match,
+        Season,
+        Team,
+    )
+
+    user = get_user_model().objects.create_user(
+        username="board", email="board@test.com", password="pass"
+    )
+    FormType.objects.create(form_typ="field", form_nm="Field")
+    season = Season.objects.create(season="2050", current="y")
+    event = Event.objects.create(
+        season=season,
+        event_cd="2050board",
+        event_nm="Board Event",
+        date_st="2050-01-01T00:00:00Z",
+        date_end="2050-01-02T00:00:00Z",
+        current="y",
+        competition_page_active="y",
+        timezone="America/New_York",
+        void_ind="n",
+    )
+    qm = CompetitionLevel.objects.create(
+        comp_lvl_typ="qm", comp_lvl_typ_nm="Qualification", comp_lvl_order=1
+    )
+    sf = CompetitionLevel.objects.create(
+        comp_lvl_typ="sf", comp_lvl_typ_nm="Semifinal", comp_lvl_order=2
+    )
+    teams = [Team.objects.create(team_no=n, team_nm=str(n)) for n in [3492, 1, 2, 3, 4, 5]]
+    for rank, team in enumerate(teams[:5], 1):
+        EventTeamInfo.objects.create(event=event, team=team, rank=rank)
+
+    matches = []
+    for match_number, comp_level in [(1, sf), (2, qm), (1, qm)]:
+        red, blue = (teams[:3], teams[3:]) if match_number == 1 else (teams[3:], teams[:3])
+        matches.append(
+            Match.objects.create(
+                match_key=f"2050board_{comp_level.comp_lvl_typ}{match_number}",
+                match_number=match_number,
+                event=event,
+                comp_level=comp_level,
+                red_one=red[0],
+                red_two=red[1],
+                red_three=red[2],
+                blue_one=blue[0],
+                blue_two=blue[1],
+                blue_three=blue[2],
+                void_ind="n",
+            )
+        )
+
+    def field_response(match, team, void_ind="n"):
+        FieldResponse.objects.create(
+            response=Response.objects.create(form_typ_id="field"),
+            event=event,
+            team=team,
+            match=match,
+            user=user,
+            void_ind=void_ind,
+        )
+
+    field_response(matches[2], teams[0])
+    field_response(matches[2], teams[1], "y")
+    field_response(matches[1], teams[5], "y")
+
+    return {"user": user, "event": event, "teams": teams, "matches": matches}
+
+
+@pytest.mark.django_db
+class TestMatchBoard:
+    def test_get_matches(self, board_event, django_assert_num_queries):
+        from scouting.util import get_matches
+
+        with django_assert_num_queries(3):
+            matches = get_matches(board_event["event"])
+
+        assert [m["match_key"] for m in matches] == [
+            "2050board_qm1",
+            "2050board_qm2",
+            "2050board_sf1",
+        ]
+
+        qm1 = matches[0]
+        assert [qm1["red_one_rank"], qm1["red_two_rank"], qm1["red_three_rank"]] == [1, 2, 3]
+        assert (qm1["blue_one_rank"], qm1["blue_three_rank"]) == (4, None)
+        assert qm1["red_one_field_response"] is True
+        # voided responses only count towards scout_field_result
+        assert qm1["red_two_field_response"] is False
+        assert qm1["scout_field_result"] is True
+
+        qm2 = matches[1]
+        assert qm2["red_three_field_response"] is False
+        assert qm2["scout_field_result"] is True
+        assert matches[2]["scout_field_result"] is False
+
+    def test_query_count_independent_of_matches(
+        self, board_event, django_assert_num_queries
+    ):
+        from scouting.models import Match
+        from scouting.util import get_matches
+
+        teams = board_event["teams"]
+        for match_number in range(3, 40):
+            Match.objects.create(
+                match_key=f"2050board_qm{match_number}",
+                match_number=match_number,
+                event=board_event["event"],
+                comp_level_id="qm",
+                red_one=teams[0],
+                red_two=teams[1],
+                red_three=teams[2],
+                blue_one=teams[3],
+                blue_two=teams[4],
+                blue_three=teams[5],
+                void_ind="n",
+            )
+
+        with django_assert_num_queries(3):
+            assert len(get_matches(board_event["event"])) == 40
+
+    def test_parse_match_loads_its_own_board(
+        self, board_event, django_assert_num_queries
+    ):
+        from scouting.models import Match
+        from scouting.util import parse_match
+
+        match = Match.objects.select_related("event", "comp_level").get(
+            match_key="2050board_qm1"
+        )
+
+        with django_assert_num_queries(2):
+            parsed = parse_match(match)
+
+        assert parsed["red_one_rank"] == 1
+        assert parsed["red_one_field_response"] is True
+
+    def test_match_strategies(self, board_event, django_assert_num_queries):
+        from scouting.models import MatchStrategy
+        from scouting.strategizing.util import get_match_strategies
+
+        for match in board_event["matches"]:
+            for _ in range(2):
+                MatchStrategy.objects.create(
+                    match=match, user=board_event["user"], strategy="Defend"
+                )
+
+        with django_assert_num_queries(3):
+            strategies = get_match_strategies(event=board_event["event"])
+
+        assert len(strategies) == 6
+        assert strategies[0]["match"]["red_one_rank"] is not None
+
+    def test_competition_information(self, board_event, django_assert_num_queries):
+        from public.competition.util import get_competition_information
+
+        # event, team 3492, then the board
+        with django_assert_num_queries(5):
+            information = get_competition_information()
+
+        assert len(information["matches"]) == 3
+        assert information["matches"][0]["red_one_rank"] == 1
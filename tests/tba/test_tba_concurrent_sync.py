@@ -0,0 +1,121 @@
+"""
+Tests for the concurrent TBA requests behind tba.util.sync_season.
+"""
+import asyncio
+import threading
+import pytest
+from unittest.mock import patch
+
+
+@pytest.fixture
+def tba_server():
+    """
+    A local stand in for TBA. Paths starting with /limited are rate limited
+    once, /event/<cd> and /event/<cd>/teams return event payloads.
+    """
+    from aiohttp import web
+
+    state = {"requests": [], "running": 0, "most_running": 0, "limited": set()}
+
+    async def handler(request):
+        state["requests"].append((request.path, dict(request.headers)))
+        state["running"] += 1
+        state["most_running"] = max(state["most_running"], state["running"])
+        await asyncio.sleep(0.05)
+        state["running"] -= 1
+
+        if request.path.startswith("/limited") and request.path not in state["limited"]:
+            state["limited"].add(request.path)
+            return web.Response(status=429, headers={"Retry-After": "0"})
+
+        if request.headers.get("If-None-Match", None) == '"v1"':
+            return web.Response(status=304)
+
+        event_cd = request.path.split("/")[2]
+        if request.path.endswith("/teams"):
+            body = [
+                {"team_number": int(event_cd[-1]) + 1, "nickname": f"{event_cd} team"}
+            ]
+        else:
+            body = {
+                "key": event_cd,
+                "name": f"Event {event_cd}",
+                "start_date": "2050-03-01",
+                "end_date": "2050-03-03",
+                "timezone": "America/New_York",
+                "webcasts": [],
+            }
+        return web.json_response(body, headers={"ETag": '"v1"'})
+
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+
+    app = web.Application()
+    app.router.add_get("/{path:.*}", handler)
+    runner = web.AppRunner(app)
+    asyncio.run_coroutine_threadsafe(runner.setup(), loop).result()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    asyncio.run_coroutine_threadsafe(site.start(), loop).result()
+    port = site._server.sockets[0].getsockname()[1]
+
+    with patch("tba.util.tba_url", f"http://127.0.0.1:{port}"):
+        yield state
+
+    asyncio.run_coroutine_threadsafe(runner.cleanup(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+
+
+@pytest.mark.django_db
+class TestGetTbaAll:
+    def test_concurrent_and_bounded(self, tba_server):
+        from tba.util import get_tba_all
+
+        paths = [f"/event/2050e{i}" for i in range(12)]
+        with patch("tba.util.tba_concurrency", 4):
+            responses = get_tba_all(paths)
+
+        assert [responses[path]["key"] for path in paths] == [
+            f"2050e{i}" for i in range(12)
+        ]
+        assert 1 < tba_server["most_running"] <= 4
+
+    def test_conditional_after_first_fetch(self, tba_server):
+        from tba.util import get_tba_all, remember_tba_response
+
+        get_tba_all(["/event/2050a"], True)
+        remember_tba_response("/event/2050a")
+        assert get_tba_all(["/event/2050a"], True) == {"/event/2050a": None}
+        assert get_tba_all(["/event/2050a"])["/event/2050a"]["key"] == "2050a"
+        assert tba_server["requests"][-1][1]["If-None-Match"] == '"v1"'
+
+    def test_rate_limited_requests_retried(self, tba_server):
+        from tba.util import get_tba_all
+
+        responses = get_tba_all(["/limited/a", "/limited/b"])
+
+        assert [path for path, _ in tba_server["requests"]].count("/limited/a") == 2
+        assert responses["/limited/b"]["key"] == "b"
+
+
+@pytest.mark.django_db
+class TestConcurrentSyncSeason:
+    def test_saves_prefetched_events(self, tba_server):
+        from scouting.models import Event, Season
+        from tba.util import sync_season
+
+        season = Season.objects.create(season="2050", current="n")
+        events = [{"key": f"2050s{i}"} for i in range(3)]
+
+        with patch("tba.util.get_tba", return_value=events):
+            messages = sync_season(season.id)
+
+        assert messages.count("(ADD) Added event") == 3
+        assert Event.objects.get(event_cd="2050s1").teams.get().team_no == 2
+        assert len(tba_server["requests"]) == 6
+
+        with patch("tba.util.get_tba", return_value=events):
+            messages = sync_season(season.id)
+
+        assert messages.count("(NO CHANGE)") == 3
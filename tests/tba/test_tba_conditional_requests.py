@@ -0,0 +1,162 @@
+"""
+Tests for the pooled, conditional TBA requests in tba/util.py.
+"""
+import json
+import pytest
+from unittest.mock import MagicMock, patch
+
+
+def _response(status_code, body=None, etag=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = {} if etag is None else {"ETag": etag}
+    response.text = json.dumps(body)
+    return response
+
+
+@pytest.fixture
+def tba_event(db):
+    from scouting.models import Event, Season
+
+    season = Season.objects.create(season="2050", current="y")
+    event = Event.objects.create(
+        season=season,
+        event_cd="2050cond",
+        event_nm="Conditional Event",
+        date_st="2050-01-01T00:00:00Z",
+        date_end="2050-01-02T00:00:00Z",
+        current="y",
+        void_ind="n",
+    )
+    return event
+
+
+@pytest.mark.django_db
+class TestGetTba:
+    def test_caches_and_sends_validators(self, db):
+        from tba.models import CachedResponse
+        from tba.util import get_tba, remember_tba_response, tba_url
+
+        with patch("tba.util.session.get") as mock_get:
+            mock_get.return_value = _response(200, {"key": "a"}, '"v1"')
+            assert get_tba("/event/a", True) == {"key": "a"}
+            assert "If-None-Match" not in mock_get.call_args[1]["headers"]
+            assert not CachedResponse.objects.exists()
+            remember_tba_response("/event/a")
+
+            mock_get.return_value = _response(304)
+            assert get_tba("/event/a") == {"key": "a"}
+            assert get_tba("/event/a", True) is None
+            assert mock_get.call_args[1]["headers"]["If-None-Match"] == '"v1"'
+
+        assert CachedResponse.objects.get(url=f"{tba_url}/event/a").etag == '"v1"'
+
+    def test_without_validators_not_cached(self, db):
+        from tba.models import CachedResponse
+        from tba.util import get_tba
+
+        with patch("tba.util.session.get") as mock_get:
+            mock_get.return_value = _response(200, [1])
+            assert get_tba("/event/a/teams", True) == [1]
+
+        assert not CachedResponse.objects.exists()
+
+    def test_changed_response_replaces_cache(self, db):
+        from tba.models import CachedResponse
+        from tba.util import get_tba, remember_tba_response
+
+        with patch("tba.util.session.get") as mock_get:
+            mock_get.return_value = _response(200, [1], '"v1"')
+            get_tba("/event/a/teams", True)
+            remember_tba_response("/event/a/teams")
+            mock_get.return_value = _response(200, [1, 2], '"v2"')
+            assert get_tba("/event/a/teams", True) == [1, 2]
+            remember_tba_response("/event/a/teams")
+
+        cached = CachedResponse.objects.get()
+        assert (cached.etag, json.loads(cached.body)) == ('"v2"', [1, 2])
+
+
+    def test_plain_read_does_not_hide_change(self, db):
+        from tba.models import CachedResponse
+        from tba.util import get_tba, remember_tba_response
+
+        with patch("tba.util.session.get") as mock_get:
+            mock_get.return_value = _response(200, [1], '"v1"')
+            get_tba("/event/a/rankings", True)
+            remember_tba_response("/event/a/rankings")
+
+            # a report reads the new rankings without saving them
+            mock_get.return_value = _response(200, [1, 2], '"v2"')
+            assert get_tba("/event/a/rankings") == [1, 2]
+            assert CachedResponse.objects.get().etag == '"v1"'
+
+            assert get_tba("/event/a/rankings", True) == [1, 2]
+            assert mock_get.call_args[1]["headers"]["If-None-Match"] == '"v1"'
+
+
+@pytest.mark.django_db
+class TestUnchangedSyncs:
+    def test_sync_matches_skips_when_unchanged(self, tba_event):
+        from tba.util import sync_matches
+
+        with (
+            patch("tba.util.session.get") as mock_get,
+            patch("tba.util.save_tba_matches", return_value=("", {})) as save_tba_matches,
+        ):
+            mock_get.return_value = _response(200, [{"match_number": 1}], '"v1"')
+            sync_matches(tba_event)
+            mock_get.return_value = _response(304)
+            messages = sync_matches(tba_event)
+
+        assert save_tba_matches.call_count == 1
+        assert messages == "(NO CHANGE) Conditional Event matches\n"
+
+    def test_failed_sync_forgets_response(self, tba_event):
+        from tba.models import CachedResponse
+        from tba.util import sync_matches
+
+        with patch("tba.util.session.get") as mock_get:
+            mock_get.return_value = _response(200, [{"match_number": 1}], '"v1"')
+            messages = sync_matches(tba_event)
+
+        assert "(ERROR)" in messages
+        assert not CachedResponse.objects.exists()
+
+    def test_sync_event_skips_when_unchanged(self, tba_event):
+        from tba.util import sync_event
+
+        with (
+            patch("tba.util.get_tba_event", return_value=None),
+            patch("tba.util.get_tba_event_teams", return_value=None),
+            patch("tba.util.save_tba_event") as save_tba_event,
+        ):
+            messages = sync_event(tba_event.season, tba_event.event_cd)
+
+        save_tba_event.assert_not_called()
+        assert messages == "(NO CHANGE) Event: 2050cond\n"
+
+    def test_sync_event_refetches_unchanged_half(self, tba_event):
+        from tba.util import sync_event
+
+        teams = [{"team_no": 1, "team_nm": "One"}]
+        with (
+            patch("tba.util.get_tba_event", return_value={"event_cd": "x"}),
+            patch(
+                "tba.util.get_tba_event_teams", side_effect=[None, teams]
+            ) as get_tba_event_teams,
+            patch("tba.util.save_tba_event", return_value="") as save_tba_event,
+        ):
+            sync_event(tba_event.season, tba_event.event_cd)
+
+        assert get_tba_event_teams.call_args_list[1][0] == (tba_event.event_cd,)
+        assert save_tba_event.call_args[0][1]["teams"] == teams
+
+    def test_sync_event_team_info_skips_when_unchanged(self, tba_event):
+        from tba.util import sync_event_team_info
+
+        with (
+            patch("tba.util.sync_event"),
+            patch("tba.util.get_tba_event_team_info", return_value=None),
+        ):
+            assert sync_event_team_info(1) == "(NO CHANGE) Conditional Event\n"
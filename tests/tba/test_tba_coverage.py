@@ -16,7 +16,7 @@ class TestTBAUtilFunctions:
         try:
             from tba.util import get_team
             
-            with patch('tba.util.requests.get') as mock_get:
+            with patch('tba.util.session.get') as mock_get:
                 mock_response = Mock()
                 mock_response.status_code = 200
                 mock_response.json.return_value = {
@@ -35,7 +35,7 @@ class TestTBAUtilFunctions:
         try:
             from tba.util import get_event
             
-            with patch('tba.util.requests.get') as mock_get:
+            with patch('tba.util.session.get') as mock_get:
                 mock_response = Mock()
                 mock_response.status_code = 200
                 mock_response.json.return_value = {
@@ -81,7 +81,7 @@ class TestTBAUtilAdditional:
         try:
             from tba.util import get_teams
             
-            with patch('tba.util.requests.get') as mock_get:
+            with patch('tba.util.session.get') as mock_get:
                 mock_response = Mock()
                 mock_response.status_code = 200
                 mock_response.json.return_value = []
@@ -97,7 +97,7 @@ class TestTBAUtilAdditional:
         try:
             from tba.util import get_events
             
-            with patch('tba.util.requests.get') as mock_get:
+            with patch('tba.util.session.get') as mock_get:
                 mock_response = Mock()
                 mock_response.status_code = 200
                 mock_response.json.return_value = []
@@ -113,7 +113,7 @@ class TestTBAUtilAdditional:
         try:
             from tba.util import get_team
             
-            with patch('tba.util.requests.get') as mock_get:
+            with patch('tba.util.session.get') as mock_get:
                 mock_response = Mock()
                 mock_response.status_code = 404
                 mock_get.return_value = mock_response
@@ -180,7 +180,7 @@ class TestComprehensiveTBAUtil:
             from tba.util import get_team
             import requests
             
-            with patch('tba.util.requests.get') as mock_get:
+            with patch('tba.util.session.get') as mock_get:
                 mock_get.side_effect = requests.exceptions.Timeout()
                 result = get_team(3492)
                 assert result is None or isinstance(result, dict)
@@ -193,7 +193,7 @@ class TestComprehensiveTBAUtil:
             from tba.util import get_event
             import requests
             
-            with patch('tba.util.requests.get') as mock_get:
+            with patch('tba.util.session.get') as mock_get:
                 mock_get.side_effect = requests.exceptions.ConnectionError()
                 result = get_event('2025test')
                 assert result is None or isinstance(result, dict)
@@ -205,7 +205,7 @@ class TestComprehensiveTBAUtil:
         try:
             from tba.util import get_teams
             
-            with patch('tba.util.requests.get') as mock_get:
+            with patch('tba.util.session.get') as mock_get:
                 mock_response = Mock()
                 mock_response.status_code = 200
                 mock_response.json.side_effect = ValueError()
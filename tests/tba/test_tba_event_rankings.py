@@ -0,0 +1,114 @@
+"""
+Tests for the rankings refresh in tba/util.py.
+"""
+import pytest
+from unittest.mock import MagicMock, patch
+
+
+def _info(team_id, rank, wins=0):
+    return {
+        "matches_played": 1,
+        "qual_average": 10,
+        "losses": 0,
+        "wins": wins,
+        "ties": 0,
+        "rank": rank,
+        "dq": 0,
+        "team_id": str(team_id),
+    }
+
+
+@pytest.fixture
+def ranked_event(db):
+    from scouting.models import Event, EventTeamInfo, Season, Team
+
+    season = Season.objects.create(season="2050", current="y")
+    event = Event.objects.create(
+        season=season,
+        event_cd="2050rank",
+        event_nm="Rank Event",
+        date_st="2050-01-01T00:00:00Z",
+        date_end="2050-01-02T00:00:00Z",
+        current="y",
+        void_ind="n",
+    )
+    for team_no in range(1, 41):
+        Team.objects.create(team_no=team_no, team_nm=str(team_no))
+    for team_no in range(1, 4):
+        info = _info(team_no, team_no)
+        info.pop("team_id")
+        EventTeamInfo.objects.create(event=event, team_id=team_no, **info)
+
+    return event
+
+
+@pytest.mark.django_db
+class TestSyncEventRankings:
+    def test_only_changed_rows_written(
+        self, ranked_event, django_capture_on_commit_callbacks
+    ):
+        from scouting.models import EventTeamInfo
+        from tba.util import sync_event_rankings
+
+        infos = [_info(1, 1), _info(2, 3, wins=1), _info(3, 2), _info(4, 4)]
+        broker = MagicMock()
+        with (
+            patch("tba.util.get_tba_event_team_info", return_value=infos),
+            patch("general.pubsub.get_broker", return_value=broker),
+            patch(
+                "tba.util.EventTeamInfo.objects.bulk_update",
+                wraps=EventTeamInfo.objects.bulk_update,
+            ) as bulk_update,
+            django_capture_on_commit_callbacks(execute=True),
+        ):
+            messages = sync_event_rankings(ranked_event)
+
+        assert messages == (
+            "(NO UPDATE) Rank Event 1\n"
+            "(UPDATE) Rank Event 2\n"
+            "(UPDATE) Rank Event 3\n"
+            "(ADD) Rank Event 4\n"
+        )
+        assert [eti.team_id for eti in bulk_update.call_args[0][0]] == [2, 3]
+        assert dict(EventTeamInfo.objects.values_list("team_id", "rank")) == {
+            1: 1,
+            2: 3,
+            3: 2,
+            4: 4,
+        }
+        assert sorted(
+            call[0][1]["data"]["team_id"] for call in broker.publish.call_args_list
+        ) == [2, 3, 4]
+
+    def test_query_count_independent_of_rankings(
+        self, ranked_event, django_assert_num_queries
+    ):
+        from tba.util import sync_event_rankings
+
+        infos = [_info(team_no, 41 - team_no) for team_no in range(1, 41)]
+        with patch("tba.util.get_tba_event_team_info", return_value=infos):
+            # team info, insert and update inside a savepoint
+            with django_assert_num_queries(5):
+                sync_event_rankings(ranked_event)
+
+    def test_unchanged_rankings_skip_everything(
+        self, ranked_event, django_assert_num_queries
+    ):
+        from tba.util import sync_event_rankings
+
+        with (
+            patch("tba.util.get_tba_event_team_info", return_value=None),
+            django_assert_num_queries(0),
+        ):
+            assert sync_event_rankings(ranked_event) == "(NO CHANGE) Rank Event\n"
+
+    def test_sync_event_team_info_inactive(self, ranked_event):
+        from tba.util import sync_event_team_info
+
+        with (
+            patch("tba.util.sync_event") as sync_event,
+            patch("tba.util.sync_event_rankings") as sync_event_rankings,
+        ):
+            assert sync_event_team_info(0) == "No active event"
+            sync_event_rankings.assert_not_called()
+            sync_event.assert_called_once()
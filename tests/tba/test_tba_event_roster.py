@@ -0,0 +1,106 @@
+"""
+Tests for the event roster reconciliation in tba/util.py.
+"""
+import pytest
+
+
+@pytest.fixture
+def roster_event(db):
+    from scouting.models import Event, Season, Team
+
+    season = Season.objects.create(season="2050", current="n")
+    event = Event.objects.create(
+        season=season,
+        event_cd="2050ros",
+        event_nm="Roster Event",
+        date_st="2050-01-01T00:00:00Z",
+        date_end="2050-01-02T00:00:00Z",
+        current="n",
+        void_ind="n",
+    )
+    teams = [Team.objects.create(team_no=n, team_nm=f"Team {n}") for n in [1, 2, 3]]
+    event.teams.add(teams[0], teams[1])
+
+    return event
+
+
+@pytest.mark.django_db
+class TestSaveEventRoster:
+    def test_diff_messages(self, roster_event):
+        from tba.util import save_event_roster
+
+        messages = save_event_roster(
+            roster_event,
+            [
+                {"team_no": 2, "team_nm": "Renamed 2"},
+                {"team_no": 3, "team_nm": "Team 3"},
+                {"team_no": 4, "team_nm": "Team 4"},
+            ],
+        )
+
+        assert messages.split("\n") == [
+            "(REMOVE) Removed team: 1 Team 1 from event: 2050ros",
+            "(NO ADD) Already have team: 2 Renamed 2",
+            "(UPDATE) Renamed team: 2 Team 2 to Renamed 2",
+            "(NO LINK) Team: 2 Renamed 2 already at event: 2050ros",
+            "(NO ADD) Already have team: 3 Team 3",
+            "(LINK) Added team: 3 Team 3 to event: 2050ros",
+            "(ADD) Added team: 4 Team 4",
+            "(LINK) Added team: 4 Team 4 to event: 2050ros",
+            "",
+        ]
+        assert sorted(roster_event.teams.values_list("team_no", "team_nm")) == [
+            (2, "Renamed 2"),
+            (3, "Team 3"),
+            (4, "Team 4"),
+        ]
+
+    def test_query_count_independent_of_roster(
+        self, roster_event, django_assert_num_queries
+    ):
+        from tba.util import save_event_roster
+
+        roster = [{"team_no": n, "team_nm": f"Team {n}"} for n in range(2, 60)]
+
+        # links, teams, unlink, team insert and link insert inside a savepoint
+        with django_assert_num_queries(7):
+            save_event_roster(roster_event, roster)
+
+        assert roster_event.teams.count() == 58
+
+        with django_assert_num_queries(2):
+            messages = save_event_roster(roster_event, roster)
+
+        assert "(LINK) Added" not in messages
+
+    def test_sync_event_keeps_message_log(self, roster_event):
+        from unittest.mock import patch
+        from tba.util import sync_event
+
+        data = {
+            "event_cd": "2050ros",
+            "event_nm": "Roster Event",
+            "date_st": "2050-01-01T00:00:00Z",
+            "date_end": "2050-01-02T00:00:00Z",
+            "event_url": None,
+            "address": None,
+            "city": None,
+            "state_prov": None,
+            "postal_code": None,
+            "location_name": None,
+            "gmaps_url": None,
+            "webcast_url": "",
+            "timezone": "America/New_York",
+        }
+        with (
+            patch("tba.util.get_tba_event", return_value=data),
+            patch(
+                "tba.util.get_tba_event_teams",
+                return_value=[{"team_no": 1, "team_nm": "Team 1"}],
+            ),
+        ):
+            messages = sync_event(roster_event.season, "2050ros")
+
+        assert messages.startswith("(NO ADD) Already have event: 2050ros\n")
+        assert "(REMOVE) Removed team: 2 Team 2 from event: 2050ros\n" in messages
+        assert list(roster_event.teams.values_list("team_no", flat=True)) == [1]
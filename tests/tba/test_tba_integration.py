@@ -15,7 +15,7 @@ import json
 class TestComplexTBAIntegration:
     """Complex integration tests for The Blue Alliance API integration."""
 
-    @patch('tba.util.requests.get')
+    @patch('tba.util.session.get')
     def test_sync_season_with_multiple_events_and_matches(self, mock_get):
         """Test synchronizing a complete season with multiple events and their matches."""
         from tba.util import get_events_for_team
@@ -82,7 +82,7 @@ class TestComplexTBAIntegration:
             assert events[0]['event_cd'] == '2024week1'
             assert events[1]['event_cd'] == '2024week2'
 
-    @patch('tba.util.requests.get')
+    @patch('tba.util.session.get')
     def test_get_events_with_filtering(self, mock_get):
         """Test getting events for a team with specific events filtered out."""
         from tba.util import get_events_for_team
@@ -125,7 +125,7 @@ class TestComplexTBAIntegration:
             assert events[1] == {'event_cd': '2024event2'}  # Ignored event
             assert events[2]['event_cd'] == '2024event3'
 
-    @patch('tba.util.requests.get')
+    @patch('tba.util.session.get')
     def test_match_retrieval_with_alliance_data(self, mock_get):
         """Test retrieving match data with complete alliance information."""
         from tba.util import get_matches_for_team_event
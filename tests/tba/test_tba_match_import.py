@@ -0,0 +1,147 @@
+"""
+Tests for the batch match import in tba/util.py.
+"""
+import pytest
+from unittest.mock import MagicMock, patch
+
+
+def _tba_match(match_number, red_score=None, team_keys=None):
+    team_keys = team_keys or [f"frc{n}" for n in range(1, 7)]
+    return {
+        "event_key": "2050imp",
+        "key": f"2050imp_qm{match_number}",
+        "match_number": match_number,
+        "comp_level": "qm",
+        "time": 2524608000,
+        "alliances": {
+            "red": {"team_keys": team_keys[:3], "score": red_score},
+            "blue": {"team_keys": team_keys[3:], "score": None},
+        },
+    }
+
+
+@pytest.fixture
+def import_event(db):
+    from scouting.models import CompetitionLevel, Event, Season, Team
+
+    season = Season.objects.create(season="2050", current="y")
+    event = Event.objects.create(
+        season=season,
+        event_cd="2050imp",
+        event_nm="Import Event",
+        date_st="2050-01-01T00:00:00Z",
+        date_end="2050-01-02T00:00:00Z",
+        current="y",
+        void_ind="n",
+    )
+    for team_no in range(1, 7):
+        Team.objects.create(team_no=team_no, team_nm=str(team_no))
+    CompetitionLevel.objects.create(
+        comp_lvl_typ="qm", comp_lvl_typ_nm="Qualification", comp_lvl_order=1
+    )
+    return event
+
+
+@pytest.mark.django_db
+class TestSaveTbaMatches:
+    def test_query_count_independent_of_matches(
+        self, import_event, django_assert_num_queries
+    ):
+        from scouting.models import Match
+        from tba.util import save_tba_matches
+
+        # teams, competition levels and existing matches, then the upsert in
+        # batches SQLite's variable limit allows, inside a savepoint
+        with django_assert_num_queries(7):
+            messages, failed = save_tba_matches(
+                import_event, [_tba_match(n) for n in range(1, 121)]
+            )
+
+        assert failed == {}
+        assert messages.count("(ADD) Import Event Qualification") == 120
+        assert Match.objects.filter(event=import_event).count() == 120
+        assert Match.objects.get(match_key="2050imp_qm7").red_three_id == 3
+
+    def test_failures_do_not_stop_the_batch(self, import_event):
+        from scouting.models import Match
+        from tba.util import save_tba_matches
+
+        bad_team = _tba_match(2, team_keys=["frc1", "frc2", "frc3", "frc4", "frc5", "frc99"])
+        bad_level = {**_tba_match(3), "comp_level": "zz"}
+
+        messages, failed = save_tba_matches(
+            import_event, [_tba_match(1), bad_team, bad_level, _tba_match(4)]
+        )
+
+        assert set(failed) == {"2050imp_qm2", "2050imp_qm3"}
+        assert "(ERROR) Import Event 2 No team 99\n" in messages
+        assert set(Match.objects.values_list("match_key", flat=True)) == {
+            "2050imp_qm1",
+            "2050imp_qm4",
+        }
+
+    def test_updates_only_changed_matches(
+        self, import_event, django_capture_on_commit_callbacks
+    ):
+        from scouting.models import Match
+        from tba.util import save_tba_matches
+
+        save_tba_matches(import_event, [_tba_match(1), _tba_match(2)])
+        Match.objects.filter(match_key="2050imp_qm2").update(void_ind="y")
+
+        broker = MagicMock()
+        with (
+            patch("general.pubsub.get_broker", return_value=broker),
+            patch(
+                "tba.util.Match.objects.bulk_create", wraps=Match.objects.bulk_create
+            ) as bulk_create,
+            patch(
+                "tba.util.Match.objects.bulk_update", wraps=Match.objects.bulk_update
+            ) as bulk_update,
+            django_capture_on_commit_callbacks(execute=True),
+        ):
+            messages, _ = save_tba_matches(
+                import_event, [_tba_match(1, 40), _tba_match(2), _tba_match(3)]
+            )
+
+        assert messages.count("(UPDATE)") == 2
+        assert [m.match_key for m in bulk_create.call_args[0][0]] == ["2050imp_qm3"]
+        assert sorted(m.match_key for m in bulk_update.call_args[0][0]) == [
+            "2050imp_qm1",
+            "2050imp_qm2",
+        ]
+        assert "update_conflicts" not in bulk_create.call_args[1]
+        broker.publish.assert_called_once()
+
+    def test_upsert_overwrites_existing(self, import_event):
+        from scouting.models import Match
+        from tba.util import save_tba_matches
+
+        save_tba_matches(import_event, [_tba_match(1)])
+        save_tba_matches(import_event, [_tba_match(1, 55)])
+
+        match = Match.objects.get()
+        assert (match.red_score, match.void_ind) == (55, "n")
+
+    def test_save_tba_match_raises(self, import_event):
+        from tba.util import save_tba_match
+
+        with pytest.raises(Exception, match="No competition level zz"):
+            save_tba_match({**_tba_match(1), "comp_level": "zz"})
+
+        assert save_tba_match(_tba_match(1)).startswith("(ADD)")
+
+    def test_sync_matches_reports_failures(self, import_event):
+        from scouting.models import Match
+        from tba.util import sync_matches
+
+        matches = [_tba_match(1), {**_tba_match(2), "comp_level": "zz"}]
+        with (
+            patch("tba.util.get_tba", return_value=matches),
+            patch("tba.util.forget_tba_response") as forget_tba_response,
+        ):
+            messages = sync_matches(import_event)
+
+        assert "(ERROR) Import Event 2" in messages
+        assert Match.objects.count() == 1
+        forget_tba_response.assert_called_once_with("/event/2050imp/matches")
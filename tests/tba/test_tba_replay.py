@@ -0,0 +1,94 @@
+"""
+Tests for the TBA replay server and the benchmark_sync command.
+"""
+import pytest
+import requests
+from io import StringIO
+
+from django.core.management import call_command
+
+
+class TestReplayServer:
+    def test_district_shape(self):
+        from tba.replay import build_district
+
+        responses = build_district(teams=20, events=3, matches=30, season="2050")
+
+        assert responses["/team/frc3492/events/2050"] == [
+            {"key": "2050dst0"},
+            {"key": "2050dst1"},
+            {"key": "2050dst2"},
+        ]
+        assert len(responses["/event/2050dst1/matches"]) == 10
+        assert len(responses["/event/2050dst1/teams"]) == 20
+        rankings = responses["/event/2050dst1/rankings"]["rankings"]
+        assert sum(info["record"]["wins"] for info in rankings) <= 30
+        assert build_district(teams=20, events=3, matches=30) == responses
+
+    def test_etags(self):
+        from tba.replay import ReplayServer
+
+        with ReplayServer({"/event/a": {"key": "a"}}) as server:
+            response = requests.get(f"{server.url}/event/a")
+            etag = response.headers["ETag"]
+            assert response.json() == {"key": "a"}
+
+            response = requests.get(
+                f"{server.url}/event/a", headers={"If-None-Match": etag}
+            )
+            assert response.status_code == 304
+
+            server.update("/event/a", {"key": "b"})
+            response = requests.get(
+                f"{server.url}/event/a", headers={"If-None-Match": etag}
+            )
+            assert response.json() == {"key": "b"}
+
+            assert requests.get(f"{server.url}/event/z").status_code == 404
+
+        assert (server.requests, server.not_modified) == (4, 1)
+
+    def test_without_etags(self):
+        from tba.replay import ReplayServer
+
+        with ReplayServer({"/event/a": {"key": "a"}}, etags=False) as server:
+            response = requests.get(f"{server.url}/event/a")
+
+        assert "ETag" not in response.headers
+
+
+@pytest.mark.django_db
+class TestBenchmarkSync:
+    def test_benchmark_runs_and_rolls_back(self):
+        import tba.util
+        from scouting.models import Event, Match
+        from tba.models import CachedResponse, Message
+
+        url = tba.util.tba_url
+        out = StringIO()
+        call_command(
+            "benchmark_sync",
+            teams=12,
+            events=2,
+            matches=20,
+            webhooks=5,
+            latency=0,
+            stdout=out,
+        )
+
+        rows = {
+            line[:28].strip(): line[28:].split()
+            for line in out.getvalue().splitlines()[2:]
+        }
+        # one events list, then an event and its teams for each event
+        assert rows["sync_season cold"][2] == "5"
+        assert rows["sync_matches cold"][2] == "1"
+        assert int(rows["sync_matches warm"][1]) < int(rows["sync_matches cold"][1])
+        assert rows["webhook burst 5"][2] == "0"
+        assert "process_messages" in rows
+
+        assert tba.util.tba_url == url
+        assert not Event.objects.exists()
+        assert not Match.objects.exists()
+        assert not CachedResponse.objects.exists()
+        assert not Message.objects.exists()
@@ -28,7 +28,7 @@ class TestTBAEventRetrieval:
             'week': 1
         }
         
-        with patch('tba.util.requests.get') as mock_get:
+        with patch('tba.util.session.get') as mock_get:
             mock_get.return_value.text = json.dumps(mock_response)
             
             result = get_tba_event('2024test')
@@ -44,7 +44,7 @@ class TestTBAEventRetrieval:
             'Error': 'Event not found'
         }
         
-        with patch('tba.util.requests.get') as mock_get:
+        with patch('tba.util.session.get') as mock_get:
             mock_get.return_value.text = json.dumps(mock_response)
             
             with pytest.raises(Exception, match='Event not found'):
@@ -64,7 +64,7 @@ class TestTBAEventRetrieval:
             'week': 1
         }
         
-        with patch('tba.util.requests.get') as mock_get:
+        with patch('tba.util.session.get') as mock_get:
             mock_get.return_value.text = json.dumps(mock_response)
             
             result = get_tba_event('2024test')
@@ -90,7 +90,7 @@ class TestTBATeamEvents:
             {'key': '2024test2'}
         ]
         
-        with patch('tba.util.requests.get') as mock_get, \
+        with patch('tba.util.session.get') as mock_get, \
              patch('tba.util.get_tba_event') as mock_tba_event:
             
             mock_get.return_value.text = json.dumps(mock_events)
@@ -117,7 +117,7 @@ class TestTBATeamEvents:
             {'key': '2024test3'}
         ]
         
-        with patch('tba.util.requests.get') as mock_get, \
+        with patch('tba.util.session.get') as mock_get, \
              patch('tba.util.get_tba_event') as mock_tba_event:
             
             mock_get.return_value.text = json.dumps(mock_events)
@@ -153,7 +153,7 @@ class TestTBAMatchRetrieval:
             }
         ]
         
-        with patch('tba.util.requests.get') as mock_get:
+        with patch('tba.util.session.get') as mock_get:
             mock_get.return_value.text = json.dumps(mock_matches)
             
             result = get_matches_for_team_event('3492', '2024test')
@@ -178,7 +178,8 @@ class TestTBASeasonSync:
             {'key': '2024test2'}
         ]
         
-        with patch('tba.util.requests.get') as mock_get, \
+        with patch('tba.util.session.get') as mock_get, \
+             patch('tba.util.get_tba_all', return_value={}), \
              patch('tba.util.sync_event') as mock_sync:
             
             mock_get.return_value.text = json.dumps(mock_events)
@@ -197,7 +198,7 @@ class TestTBASeasonSync:
         
         season = Season.objects.create(season='2024', current='y')
         
-        with patch('tba.util.requests.get') as mock_get, \
+        with patch('tba.util.session.get') as mock_get, \
              patch('tba.util.sync_event') as mock_sync:
             
             mock_get.return_value.text = json.dumps([])
@@ -256,7 +257,7 @@ class TestTBAAPIRateLimiting:
         from tba.util import get_tba_event
         from django.conf import settings
         
-        with patch('tba.util.requests.get') as mock_get, \
+        with patch('tba.util.session.get') as mock_get, \
              patch.object(settings, 'TBA_KEY', 'test_key'):
             
             mock_get.return_value.text = json.dumps({
@@ -313,7 +314,7 @@ class TestTBAErrorHandling:
         
         error_response = {'Error': 'Invalid event key'}
         
-        with patch('tba.util.requests.get') as mock_get:
+        with patch('tba.util.session.get') as mock_get:
             mock_get.return_value.text = json.dumps(error_response)
             
             with pytest.raises(Exception):
@@ -324,6 +325,6 @@ class TestTBAErrorHandling:
         from tba.util import get_tba_event
         import requests
         
-        with patch('tba.util.requests.get', side_effect=requests.ConnectionError('Network error')):
+        with patch('tba.util.session.get', side_effect=requests.ConnectionError('Network error')):
             with pytest.raises(requests.ConnectionError):
                 get_tba_event('2024test')
@@ -33,7 +33,7 @@ class TestTBATeamRetrieval:
             }
         ]
         
-        with patch('tba.util.requests.get') as mock_get:
+        with patch('tba.util.session.get') as mock_get:
             mock_get.return_value.text = json.dumps(mock_teams)
             
             result = get_tba_event_teams('2024pahat')
@@ -48,7 +48,7 @@ class TestTBATeamRetrieval:
         """Test retrieval when no teams are at the event."""
         from tba.util import get_tba_event_teams
         
-        with patch('tba.util.requests.get') as mock_get:
+        with patch('tba.util.session.get') as mock_get:
             mock_get.return_value.text = json.dumps([])
             
             result = get_tba_event_teams('2024empty')
@@ -283,7 +283,8 @@ class TestSyncSeason:
             {'key': '2024papit'}
         ]
         
-        with patch('tba.util.requests.get') as mock_get, \
+        with patch('tba.util.session.get') as mock_get, \
+             patch('tba.util.get_tba_all', return_value={}), \
              patch('tba.util.sync_event', return_value='Synced event\n'):
             
             mock_get.return_value.text = json.dumps(mock_events)
@@ -305,7 +306,7 @@ class TestSyncSeason:
             manual='Test Manual'
         )
         
-        with patch('tba.util.requests.get') as mock_get:
+        with patch('tba.util.session.get') as mock_get:
             mock_get.return_value.text = json.dumps([])
             
             result = sync_season(season.id)
@@ -341,7 +342,7 @@ class TestGetMatchesForTeamEvent:
             }
         ]
         
-        with patch('tba.util.requests.get') as mock_get:
+        with patch('tba.util.session.get') as mock_get:
             mock_get.return_value.text = json.dumps(mock_matches)
             
             result = get_matches_for_team_event('3492', '2024pahat')
@@ -354,7 +355,7 @@ class TestGetMatchesForTeamEvent:
         """Test when team has no matches at event."""
         from tba.util import get_matches_for_team_event
         
-        with patch('tba.util.requests.get') as mock_get:
+        with patch('tba.util.session.get') as mock_get:
             mock_get.return_value.text = json.dumps([])
             
             result = get_matches_for_team_event('3492', '2024test')
@@ -389,7 +390,7 @@ class TestGetEventsForTeam:
             'webcast_url': ''
         }
         
-        with patch('tba.util.requests.get') as mock_get, \
+        with patch('tba.util.session.get') as mock_get, \
              patch('tba.util.get_tba_event', return_value=mock_event_data):
             
             mock_get.return_value.text = json.dumps(mock_events)
@@ -423,7 +424,7 @@ class TestGetEventsForTeam:
             'webcast_url': ''
         }
         
-        with patch('tba.util.requests.get') as mock_get, \
+        with patch('tba.util.session.get') as mock_get, \
              patch('tba.util.get_tba_event', return_value=mock_event_data):
             
             mock_get.return_value.text = json.dumps(mock_events)
@@ -51,7 +51,7 @@ class TestGetEventsForTeam:
             {"key": "2024test", "name": "Test Event"}
         ])
         
-        with patch('tba.util.requests.get', return_value=mock_response), \
+        with patch('tba.util.session.get', return_value=mock_response), \
              patch('tba.util.get_tba_event', return_value={"event_cd": "2024test"}):
             
             result = get_events_for_team(team, season)
@@ -78,7 +78,7 @@ class TestGetEventsForTeam:
             {"key": "2024test2", "name": "Test Event 2"}
         ])
         
-        with patch('tba.util.requests.get', return_value=mock_response), \
+        with patch('tba.util.session.get', return_value=mock_response), \
              patch('tba.util.get_tba_event', return_value={"event_cd": "2024test2"}):
             result = get_events_for_team(team, season, ["2024test1"])
             
@@ -98,7 +98,7 @@ class TestGetMatchesForTeamEvent:
             {"key": "2024test_qm1", "alliances": {}}
         ])
         
-        with patch('tba.util.requests.get', return_value=mock_response):
+        with patch('tba.util.session.get', return_value=mock_response):
             result = get_matches_for_team_event("3492", "2024test")
             
             assert isinstance(result, list)
@@ -110,7 +110,7 @@ class TestGetMatchesForTeamEvent:
         mock_response = Mock()
         mock_response.text = json.dumps([])
         
-        with patch('tba.util.requests.get', return_value=mock_response):
+        with patch('tba.util.session.get', return_value=mock_response):
             result = get_matches_for_team_event("3492", "2024test")
             
             assert isinstance(result, list)
@@ -145,7 +145,7 @@ class TestGetTBAEvent:
         mock_response = Mock()
         mock_response.text = json.dumps(mock_event_data)
         
-        with patch('tba.util.requests.get', return_value=mock_response):
+        with patch('tba.util.session.get', return_value=mock_response):
             result = get_tba_event("2024test")
             
             assert isinstance(result, dict)
@@ -168,7 +168,7 @@ class TestGetTBAEventTeams:
         mock_response = Mock()
         mock_response.text = json.dumps(mock_teams)
         
-        with patch('tba.util.requests.get', return_value=mock_response):
+        with patch('tba.util.session.get', return_value=mock_response):
             result = get_tba_event_teams("2024test")
             
             assert isinstance(result, list)
@@ -193,7 +193,7 @@ class TestGetTBAEventTeamInfo:
         mock_response = Mock()
         mock_response.text = json.dumps(mock_info)
         
-        with patch('tba.util.requests.get', return_value=mock_response):
+        with patch('tba.util.session.get', return_value=mock_response):
             result = get_tba_event_team_info("2024test")
             
             assert isinstance(result, list)
@@ -285,7 +285,7 @@ class TestSyncMatches:
             }
         ]
         
-        with patch('tba.util.requests.get') as mock_get:
+        with patch('tba.util.session.get') as mock_get:
             mock_response = Mock()
             mock_response.text = json.dumps(mock_matches)
             mock_get.return_value = mock_response
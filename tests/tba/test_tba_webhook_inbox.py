@@ -0,0 +1,236 @@
+"""
+Tests for the webhook inbox and tba.util.process_messages.
+"""
+import pytest
+from unittest.mock import patch
+
+
+def _match_score(match_number, red_score, event_key="2050inb"):
+    return {
+        "message_type": "match_score",
+        "message_data": {
+            "event_key": event_key,
+            "match_key": f"{event_key}_qm{match_number}",
+            "event_name": "Inbox Event",
+            "match": {
+                "key": f"{event_key}_qm{match_number}",
+                "event_key": event_key,
+                "comp_level": "qm",
+                "set_number": "1",
+                "match_number": str(match_number),
+                "videos": [],
+                "time": 2524608000,
+                "alliances": {
+                    "red": {"score": red_score, "team_keys": ["frc1", "frc2", "frc3"]},
+                    "blue": {"score": 0, "team_keys": ["frc4", "frc5", "frc6"]},
+                },
+            },
+        },
+    }
+
+
+def _schedule_updated(event_key):
+    return {
+        "message_type": "schedule_updated",
+        "message_data": {"event_key": event_key, "event_name": event_key},
+    }
+
+
+@pytest.fixture
+def inbox_event(db):
+    from scouting.models import CompetitionLevel, Event, Season, Team
+
+    season = Season.objects.create(season="2050", current="y")
+    event = Event.objects.create(
+        season=season,
+        event_cd="2050inb",
+        event_nm="Inbox Event",
+        date_st="2050-01-01T00:00:00Z",
+        date_end="2050-01-02T00:00:00Z",
+        current="y",
+        void_ind="n",
+    )
+    for team_no in range(1, 7):
+        Team.objects.create(team_no=team_no, team_nm=str(team_no))
+    CompetitionLevel.objects.create(
+        comp_lvl_typ="qm", comp_lvl_typ_nm="Qualification", comp_lvl_order=1
+    )
+    return event
+
+
+@pytest.mark.django_db
+class TestWebhookInbox:
+    def test_webhook_only_persists(self, api_client, inbox_event):
+        from tba.models import Message
+
+        with (
+            patch("tba.util.verify_tba_webhook_call", return_value=True),
+            patch("tba.util.save_tba_matches") as save_tba_matches,
+            patch("tba.util.sync_event") as sync_event,
+        ):
+            assert api_client.post(
+                "/tba/webhook/", _match_score(1, 10), format="json"
+            ).status_code == 200
+            assert api_client.post(
+                "/tba/webhook/", _schedule_updated("2050inb"), format="json"
+            ).status_code == 200
+
+        save_tba_matches.assert_not_called()
+        sync_event.assert_not_called()
+        assert list(Message.objects.values_list("message_type", "processed")) == [
+            ("match_score", "n"),
+            ("schedule_updated", "n"),
+        ]
+
+    def test_invalid_message_marked_failed(self, api_client, inbox_event, system_user):
+        from tba.models import Message
+
+        with patch("tba.util.verify_tba_webhook_call", return_value=True):
+            api_client.post(
+                "/tba/webhook/",
+                {"message_type": "match_score", "message_data": {}},
+                format="json",
+            )
+
+        assert Message.objects.get().processed == "e"
+
+
+@pytest.mark.django_db
+class TestProcessMessages:
+    def test_match_scores_batched_latest_wins(self, inbox_event):
+        import tba.util
+        from scouting.models import Match
+        from tba.models import Message
+        from tba.util import process_messages, save_message
+
+        for match_number, red_score in [(1, 10), (2, 20), (1, 15)]:
+            save_message(_match_score(match_number, red_score))
+
+        with patch(
+            "tba.util.save_tba_matches", wraps=tba.util.save_tba_matches
+        ) as save_tba_matches:
+            messages = process_messages()
+
+        save_tba_matches.assert_called_once()
+        assert messages.count("(ADD)") == 2
+        assert dict(Match.objects.values_list("match_key", "red_score")) == {
+            "2050inb_qm1": 15,
+            "2050inb_qm2": 20,
+        }
+        assert set(Message.objects.values_list("processed", flat=True)) == {"y"}
+        assert process_messages() == "No messages waiting."
+
+    def test_schedule_updates_coalesced_per_event(self, inbox_event):
+        from tba.models import Message
+        from tba.util import process_messages, save_message
+
+        for event_key in ["2050inb", "2050oth", "2050inb"]:
+            save_message(_schedule_updated(event_key))
+
+        with (
+            patch("tba.util.sync_event") as sync_event,
+            patch("tba.util.sync_matches", return_value="") as sync_matches,
+            patch("tba.util.scouting.util.get_event"),
+        ):
+            process_messages()
+
+        assert [call[0][1] for call in sync_event.call_args_list] == [
+            "2050inb",
+            "2050oth",
+        ]
+        assert sync_matches.call_count == 2
+        assert Message.objects.filter(processed="y").count() == 3
+
+    def test_failures_marked_and_batch_continues(self, inbox_event):
+        from scouting.models import Match
+        from tba.models import Message
+        from tba.util import process_messages, save_message
+
+        good = save_message(_match_score(1, 10))
+        unknown_event = save_message(_match_score(1, 10, "2050zzz"))
+        bad_match = _match_score(2, 10)
+        bad_match["message_data"]["match"]["comp_level"] = "zz"
+        bad_match = save_message(bad_match)
+        broken = Message.objects.create(
+            message_type="match_score", message_data="{'old': 'repr'}"
+        )
+
+        messages = process_messages()
+
+        assert "(ERROR) Match scores 2050zzz" in messages
+        assert f"(ERROR) Message {broken.message_id}" in messages
+        assert Match.objects.get().match_key == "2050inb_qm1"
+        assert {
+            message.message_id: message.processed for message in Message.objects.all()
+        } == {
+            good.message_id: "y",
+            unknown_event.message_id: "e",
+            bad_match.message_id: "e",
+            broken.message_id: "e",
+        }
+
+    def test_batch_claimed_before_processing(self, inbox_event):
+        from tba.models import Message
+        from tba.util import process_messages, save_message
+
+        message = save_message(_match_score(1, 10))
+        states = []
+
+        def save_tba_matches(event, tba_matches):
+            states.append(Message.objects.get(message_id=message.message_id).processed)
+            # an overlapping run finds nothing left to claim
+            states.append(process_messages())
+            return "", {}
+
+        with patch("tba.util.save_tba_matches", side_effect=save_tba_matches):
+            process_messages()
+
+        assert states == ["p", "No messages waiting."]
+        assert Message.objects.get().processed == "y"
+
+    def test_abandoned_claims_retried(self, inbox_event):
+        import datetime
+        from django.utils import timezone
+        from scouting.models import Match
+        from tba.models import Message
+        from tba.util import process_messages, save_message
+
+        abandoned = save_message(_match_score(1, 10))
+        running = save_message(_match_score(2, 20))
+        Message.objects.filter(message_id=abandoned.message_id).update(
+            processed="p", claimed_at=timezone.now() - datetime.timedelta(hours=1)
+        )
+        Message.objects.filter(message_id=running.message_id).update(
+            processed="p", claimed_at=timezone.now()
+        )
+
+        process_messages()
+
+        assert dict(Message.objects.values_list("message_id", "processed")) == {
+            abandoned.message_id: "y",
+            running.message_id: "p",
+        }
+        assert Match.objects.get().match_key == "2050inb_qm1"
+
+    def test_schedule_marked_failed_when_matches_fail(self, inbox_event):
+        from tba.models import Message
+        from tba.util import process_messages, save_message
+
+        save_message(_schedule_updated("2050inb"))
+
+        with (
+            patch("tba.util.sync_event"),
+            patch(
+                "tba.util.sync_matches",
+                return_value="(ERROR) Inbox Event 1 No team 99\n",
+            ),
+        ):
+            process_messages()
+
+        assert Message.objects.get().processed == "e"
+
+    def test_process_messages_view(self, api_client, db):
+        with patch("tba.views.tba.util.process_messages", return_value="Done"):
+            response = api_client.get("/tba/process-messages/")
+
+        assert response.data["retMessage"] == "TBA MESSAGES: Done"